@@ -7,6 +7,7 @@ Core agent interaction functions for running autonomous coding sessions.
 
 import asyncio
 import io
+import json
 import re
 import sys
 from datetime import datetime, timedelta
@@ -44,15 +45,78 @@ from rate_limit_utils import (
     is_rate_limit_error,
     parse_retry_after,
 )
+from server.utils.agent_events import (
+    CLAIM,
+    FAIL,
+    PASS,
+    TOOL_ERROR,
+    TOOL_START,
+    USAGE,
+    EventChannel,
+    get_event_channel,
+)
 
 # Configuration
 AUTO_CONTINUE_DELAY_SECONDS = 3
 
+# Feature MCP tools whose successful result is reported on the event channel
+FEATURE_TOOL_PREFIX = "mcp__features__"
+FEATURE_TOOL_EVENTS = {
+    "feature_claim_and_get": CLAIM,
+    "feature_mark_in_progress": CLAIM,
+    "feature_mark_passing": PASS,
+    "feature_mark_failing": FAIL,
+}
+# Batch tools: event type and the result key listing the features it applies to.
+# feature_claim_batch is left out: a claim event also tells the orchestrator
+# which feature the agent is working on, and a batch claim doesn't say that.
+# Agents call feature_claim_and_get as they start each feature instead.
+FEATURE_BATCH_TOOL_EVENTS = {
+    "feature_mark_passing_many": (PASS, "passed"),
+}
+
+
+def _tool_result_text(content) -> str:
+    """Flatten ToolResultBlock content (a string or a list of text parts)."""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content or "")
+
+
+def _emit_feature_event(events: EventChannel, tool_name: str, tool_input: dict, result_content) -> None:
+    """Emit claim/pass/fail when a feature MCP tool call succeeded."""
+    if not tool_name.startswith(FEATURE_TOOL_PREFIX):
+        return
+    tool = tool_name[len(FEATURE_TOOL_PREFIX):]
+    event_type = FEATURE_TOOL_EVENTS.get(tool)
+    batch = FEATURE_BATCH_TOOL_EVENTS.get(tool)
+    feature_id = tool_input.get("feature_id") if isinstance(tool_input, dict) else None
+    if batch is None and (event_type is None or not isinstance(feature_id, int)):
+        return
+    # The feature tools report failures as {"error": ...} rather than is_error
+    try:
+        result = json.loads(_tool_result_text(result_content))
+    except ValueError:
+        result = None
+    if isinstance(result, dict) and "error" in result:
+        return
+    if batch is None:
+        if event_type is not None:
+            events.emit(event_type, feature_id=feature_id)
+        return
+    # Batch results list the features the call succeeded for
+    event_type, key = batch
+    items = result.get(key) if isinstance(result, dict) else None
+    for item in items or []:
+        if isinstance(item, dict) and isinstance(item.get("id"), int):
+            events.emit(event_type, feature_id=item["id"])
+
 
 async def run_agent_session(
     client: ClaudeSDKClient,
     message: str,
     project_dir: Path,
+    events: EventChannel | None = None,
 ) -> tuple[str, str]:
     """
     Run a single agent session using Claude Agent SDK.
@@ -61,6 +125,7 @@ async def run_agent_session(
         client: Claude SDK client
         message: The prompt to send
         project_dir: Project directory path
+        events: Channel for structured events (tool use, claims, usage)
 
     Returns:
         (status, response_text) where status is:
@@ -68,6 +133,10 @@ async def run_agent_session(
         - "error" if an error occurred
     """
     print("Sending prompt to Claude Agent SDK...\n")
+    if events is None:
+        events = EventChannel(None)
+    # tool_use_id -> (name, input), to attribute results to their call
+    pending_tools: dict[str, tuple[str, dict]] = {}
 
     try:
         # Send the query
@@ -88,6 +157,8 @@ async def run_agent_session(
                         print(block.text, end="", flush=True)
                     elif block_type == "ToolUseBlock" and hasattr(block, "name"):
                         print(f"\n[Tool: {block.name}]", flush=True)
+                        events.emit(TOOL_START, tool=block.name)
+                        pending_tools[getattr(block, "id", "")] = (block.name, getattr(block, "input", {}))
                         if hasattr(block, "input"):
                             input_str = str(block.input)
                             if len(input_str) > 200:
@@ -103,17 +174,34 @@ async def run_agent_session(
                     if block_type == "ToolResultBlock":
                         result_content = getattr(block, "content", "")
                         is_error = getattr(block, "is_error", False)
+                        tool_name, tool_input = pending_tools.pop(getattr(block, "tool_use_id", ""), ("", {}))
 
                         # Check if command was blocked by security hook
                         if "blocked" in str(result_content).lower():
                             print(f"   [BLOCKED] {result_content}", flush=True)
+                            events.emit(TOOL_ERROR, tool=tool_name, blocked=True)
                         elif is_error:
                             # Show errors (truncated)
                             error_str = str(result_content)[:500]
                             print(f"   [Error] {error_str}", flush=True)
+                            events.emit(TOOL_ERROR, tool=tool_name, blocked=False)
                         else:
                             # Tool succeeded - just show brief confirmation
                             print("   [Done]", flush=True)
+                            _emit_feature_event(events, tool_name, tool_input, result_content)
+
+            # Handle ResultMessage (end of turn: token usage and cost)
+            elif msg_type == "ResultMessage":
+                usage = getattr(msg, "usage", None) or {}
+                events.emit(
+                    USAGE,
+                    input_tokens=usage.get("input_tokens", 0),
+                    output_tokens=usage.get("output_tokens", 0),
+                    cache_read_input_tokens=usage.get("cache_read_input_tokens", 0),
+                    cache_creation_input_tokens=usage.get("cache_creation_input_tokens", 0),
+                    cost_usd=getattr(msg, "total_cost_usd", None),
+                    num_turns=getattr(msg, "num_turns", None),
+                )
 
         print("\n" + "-" * 70 + "\n")
         return "continue", response_text
@@ -211,6 +299,9 @@ async def run_autonomous_agent(
         print("Running as CODING agent")
         print_progress_summary(project_dir)
 
+    # Structured events for the orchestrator (disabled when run standalone)
+    events = get_event_channel()
+
     # Main loop
     iteration = 0
     rate_limit_retries = 0  # Track consecutive rate limit errors for exponential backoff
@@ -262,7 +353,7 @@ async def run_autonomous_agent(
         # Wrap in try/except to handle MCP server startup failures gracefully
         try:
             async with client:
-                status, response = await run_agent_session(client, prompt, project_dir)
+                status, response = await run_agent_session(client, prompt, project_dir, events)
         except Exception as e:
             print(f"Client/MCP server error: {e}")
             # Don't crash - return error status so the loop can retry
@@ -414,6 +505,8 @@ async def run_autonomous_agent(
             await asyncio.sleep(1)
 
     # Final summary
+    events.close()
+
     print("\n" + "=" * 70)
     print("  SESSION COMPLETE")
     print("=" * 70)
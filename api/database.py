@@ -6,9 +6,10 @@ SQLite database schema for feature storage using SQLAlchemy.
 """
 
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Callable, Generator, Optional
 
 
 def _utc_now() -> datetime:
@@ -19,6 +20,7 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Connection,
     DateTime,
     ForeignKey,
     Index,
@@ -32,6 +34,10 @@ from sqlalchemy import (
 from sqlalchemy.orm import DeclarativeBase, Session, relationship, sessionmaker
 from sqlalchemy.types import JSON
 
+from api import tool_metrics
+from api.engine_cache import EngineCache
+from api.sqlite_profiles import SQLiteProfile, apply_sqlite_profile, resolve_sqlite_profile
+
 
 class Base(DeclarativeBase):
     """SQLAlchemy 2.0 style declarative base."""
@@ -47,6 +53,12 @@ class Feature(Base):
     # Used by feature_get_stats, get_ready_features, and other status queries
     __table_args__ = (
         Index('ix_feature_status', 'passes', 'in_progress', 'needs_human_input'),
+        # Partial indexes over the rows agents poll for (see _migrate_v2_to_v3).
+        # Queries must repeat the WHERE terms verbatim for SQLite to use them.
+        # get_ready_feature_keys() names ix_features_ready with INDEXED BY.
+        Index('ix_features_ready', 'priority', 'id',
+              sqlite_where=text('passes = 0 AND in_progress = 0 AND needs_human_input = 0')),
+        Index('ix_features_not_passing', 'id', sqlite_where=text('passes = 0')),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -66,6 +78,12 @@ class Feature(Base):
     human_input_request = Column(JSON, nullable=True, default=None)   # Agent's structured request
     human_input_response = Column(JSON, nullable=True, default=None)  # Human's response
 
+    # Value of the feature_change_counter when the row was last inserted or
+    # updated, set by SQLite triggers (see _migrate_v3_to_v4). Lets readers
+    # fetch only rows that changed since their last poll instead of
+    # rescanning the whole table.
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+
     def to_dict(self) -> dict:
         """Convert feature to dictionary for JSON serialization."""
         return {
@@ -95,6 +113,76 @@ class Feature(Base):
         return []
 
 
+class FeatureDependency(Base):
+    """One edge of the dependency graph: feature_id depends on depends_on_id.
+
+    Derived from Feature.dependencies by SQLite triggers (see
+    _migrate_v1_to_v2), so reverse lookups ("who depends on X"), blocked
+    checks and cycle detection are index lookups instead of parsing the JSON
+    column of every row. Never written by application code. depends_on_id
+    may name a feature that no longer exists, like the JSON it mirrors.
+    """
+
+    __tablename__ = "feature_dependencies"
+
+    # Reverse lookups: dependents of a feature
+    __table_args__ = (
+        Index('ix_feature_dependencies_depends_on', 'depends_on_id', 'feature_id'),
+    )
+
+    feature_id = Column(Integer, primary_key=True)
+    depends_on_id = Column(Integer, primary_key=True)
+
+
+class FeatureChangeCounter(Base):
+    """Single-row counter behind Feature.change_seq.
+
+    Every insert, update and delete of a feature bumps seq (see
+    _migrate_v3_to_v4), and inserted or updated rows take the new value as
+    their change_seq. Unlike MAX(change_seq), the counter never moves back
+    when the row holding the maximum is deleted, so a reader that saw seq N
+    can rely on every later write carrying a value above N.
+    """
+
+    __tablename__ = "feature_change_counter"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    seq = Column(Integer, nullable=False, default=0)
+    # Bumped only by changes to the dependency graph: inserts, deletes and
+    # updates of priority or dependencies (see _migrate_v5_to_v6)
+    graph_seq = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class FeatureEvent(Base):
+    """Append-only change log entry for the features table.
+
+    Written in the same transaction as the mutation it describes, so a reader
+    that tails events by id never sees an event for an uncommitted change and
+    never misses a committed one. Only the newest FEATURE_EVENT_RETENTION
+    events are kept (see _migrate_v4_to_v5).
+    """
+
+    __tablename__ = "feature_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # Cursor for since()
+    feature_id = Column(Integer, nullable=False, index=True)
+    # created, claimed, released, passed, failed, skipped, updated, deleted,
+    # dependencies_changed, human_input_requested, human_input_resolved
+    event_type = Column(String(30), nullable=False)
+    data = Column(JSON, nullable=True, default=None)
+    created_at = Column(DateTime, nullable=False, default=_utc_now)
+
+    def to_dict(self) -> dict:
+        """Convert event to dictionary for JSON serialization."""
+        return {
+            "id": self.id,
+            "feature_id": self.feature_id,
+            "event_type": self.event_type,
+            "data": self.data,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
 class Schedule(Base):
     """Time-based schedule for automated agent start/stop."""
 
@@ -205,47 +293,47 @@ def get_database_url(project_dir: Path) -> str:
     return f"sqlite:///{db_path.as_posix()}"
 
 
-def _migrate_add_in_progress_column(engine) -> None:
+# Schema migrations
+# -----------------
+# The helpers below run on the connection of the schema migration transaction
+# (see _migrate_schema) and must not commit.
+
+
+def _migrate_add_in_progress_column(conn) -> None:
     """Add in_progress column to existing databases that don't have it."""
-    with engine.connect() as conn:
-        # Check if column exists
-        result = conn.execute(text("PRAGMA table_info(features)"))
-        columns = [row[1] for row in result.fetchall()]
+    # Check if column exists
+    result = conn.execute(text("PRAGMA table_info(features)"))
+    columns = [row[1] for row in result.fetchall()]
 
-        if "in_progress" not in columns:
-            # Add the column with default value
-            conn.execute(text("ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0"))
-            conn.commit()
+    if "in_progress" not in columns:
+        # Add the column with default value
+        conn.execute(text("ALTER TABLE features ADD COLUMN in_progress BOOLEAN DEFAULT 0"))
 
 
-def _migrate_fix_null_boolean_fields(engine) -> None:
+def _migrate_fix_null_boolean_fields(conn) -> None:
     """Fix NULL values in passes and in_progress columns."""
-    with engine.connect() as conn:
-        # Fix NULL passes values
-        conn.execute(text("UPDATE features SET passes = 0 WHERE passes IS NULL"))
-        # Fix NULL in_progress values
-        conn.execute(text("UPDATE features SET in_progress = 0 WHERE in_progress IS NULL"))
-        conn.commit()
+    # Fix NULL passes values
+    conn.execute(text("UPDATE features SET passes = 0 WHERE passes IS NULL"))
+    # Fix NULL in_progress values
+    conn.execute(text("UPDATE features SET in_progress = 0 WHERE in_progress IS NULL"))
 
 
-def _migrate_add_dependencies_column(engine) -> None:
+def _migrate_add_dependencies_column(conn) -> None:
     """Add dependencies column to existing databases that don't have it.
 
     Uses NULL default for backwards compatibility - existing features
     without dependencies will have NULL which is treated as empty list.
     """
-    with engine.connect() as conn:
-        # Check if column exists
-        result = conn.execute(text("PRAGMA table_info(features)"))
-        columns = [row[1] for row in result.fetchall()]
+    # Check if column exists
+    result = conn.execute(text("PRAGMA table_info(features)"))
+    columns = [row[1] for row in result.fetchall()]
 
-        if "dependencies" not in columns:
-            # Use TEXT for SQLite JSON storage, NULL default for backwards compat
-            conn.execute(text("ALTER TABLE features ADD COLUMN dependencies TEXT DEFAULT NULL"))
-            conn.commit()
+    if "dependencies" not in columns:
+        # Use TEXT for SQLite JSON storage, NULL default for backwards compat
+        conn.execute(text("ALTER TABLE features ADD COLUMN dependencies TEXT DEFAULT NULL"))
 
 
-def _migrate_add_testing_columns(engine) -> None:
+def _migrate_add_testing_columns(conn) -> None:
     """Legacy migration - no longer adds testing columns.
 
     The testing_in_progress and last_tested_at columns were removed from the
@@ -311,56 +399,308 @@ def _is_network_path(path: Path) -> bool:
     return False
 
 
-def _migrate_add_human_input_columns(engine) -> None:
+def _migrate_add_human_input_columns(conn) -> None:
     """Add human input columns to existing databases that don't have them."""
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(features)"))
-        columns = [row[1] for row in result.fetchall()]
-
-        if "needs_human_input" not in columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN needs_human_input BOOLEAN DEFAULT 0"))
-        if "human_input_request" not in columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN human_input_request TEXT DEFAULT NULL"))
-        if "human_input_response" not in columns:
-            conn.execute(text("ALTER TABLE features ADD COLUMN human_input_response TEXT DEFAULT NULL"))
-        conn.commit()
+    result = conn.execute(text("PRAGMA table_info(features)"))
+    columns = [row[1] for row in result.fetchall()]
 
+    if "needs_human_input" not in columns:
+        conn.execute(text("ALTER TABLE features ADD COLUMN needs_human_input BOOLEAN DEFAULT 0"))
+    if "human_input_request" not in columns:
+        conn.execute(text("ALTER TABLE features ADD COLUMN human_input_request TEXT DEFAULT NULL"))
+    if "human_input_response" not in columns:
+        conn.execute(text("ALTER TABLE features ADD COLUMN human_input_response TEXT DEFAULT NULL"))
 
-def _migrate_add_schedules_tables(engine) -> None:
+
+def _migrate_add_change_seq_column(conn) -> None:
+    """Add the change_seq column and the triggers that maintain it.
+
+    Triggers (rather than application code) bump change_seq so that every
+    writer - MCP servers issuing raw UPDATEs, the REST API, the orchestrator -
+    is covered without changes. The WHEN guard keeps the UPDATE trigger from
+    re-firing on its own write if recursive_triggers is ever enabled.
+
+    MAX(change_seq) + 1 goes back down after a delete; _migrate_v3_to_v4
+    replaces these triggers with ones drawing from a monotonic counter.
+    """
+    result = conn.execute(text("PRAGMA table_info(features)"))
+    columns = [row[1] for row in result.fetchall()]
+
+    if "change_seq" not in columns:
+        conn.execute(text("ALTER TABLE features ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_features_change_seq ON features (change_seq)"))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS trg_features_change_seq_insert
+        AFTER INSERT ON features
+        BEGIN
+            UPDATE features
+            SET change_seq = (SELECT COALESCE(MAX(change_seq), 0) + 1 FROM features)
+            WHERE id = NEW.id;
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS trg_features_change_seq_update
+        AFTER UPDATE ON features
+        WHEN NEW.change_seq = OLD.change_seq
+        BEGIN
+            UPDATE features
+            SET change_seq = (SELECT COALESCE(MAX(change_seq), 0) + 1 FROM features)
+            WHERE id = NEW.id;
+        END
+    """))
+
+
+def _migrate_add_schedules_tables(conn) -> None:
     """Create schedules and schedule_overrides tables if they don't exist."""
     from sqlalchemy import inspect
 
-    inspector = inspect(engine)
+    inspector = inspect(conn)
     existing_tables = inspector.get_table_names()
 
     # Create schedules table if missing
     if "schedules" not in existing_tables:
-        Schedule.__table__.create(bind=engine)  # type: ignore[attr-defined]
+        Schedule.__table__.create(bind=conn)  # type: ignore[attr-defined]
 
     # Create schedule_overrides table if missing
     if "schedule_overrides" not in existing_tables:
-        ScheduleOverride.__table__.create(bind=engine)  # type: ignore[attr-defined]
+        ScheduleOverride.__table__.create(bind=conn)  # type: ignore[attr-defined]
 
     # Add crash_count column if missing (for upgrades)
     if "schedules" in existing_tables:
         columns = [c["name"] for c in inspector.get_columns("schedules")]
         if "crash_count" not in columns:
-            with engine.connect() as conn:
-                conn.execute(
-                    text("ALTER TABLE schedules ADD COLUMN crash_count INTEGER DEFAULT 0")
-                )
-                conn.commit()
+            conn.execute(text("ALTER TABLE schedules ADD COLUMN crash_count INTEGER DEFAULT 0"))
 
         # Add max_concurrency column if missing (for upgrades)
         if "max_concurrency" not in columns:
-            with engine.connect() as conn:
-                conn.execute(
-                    text("ALTER TABLE schedules ADD COLUMN max_concurrency INTEGER DEFAULT 3")
-                )
-                conn.commit()
+            conn.execute(text("ALTER TABLE schedules ADD COLUMN max_concurrency INTEGER DEFAULT 3"))
+
+
+def _migrate_v0_to_v1(conn) -> None:
+    """Baseline schema: create all tables and apply every migration that
+    predates versioning.
+
+    Each step is idempotent, so this also upgrades databases created before
+    PRAGMA user_version was tracked (they report version 0).
+    """
+    Base.metadata.create_all(bind=conn)
+    _migrate_add_in_progress_column(conn)
+    _migrate_fix_null_boolean_fields(conn)
+    _migrate_add_dependencies_column(conn)
+    _migrate_add_testing_columns(conn)
+    _migrate_add_human_input_columns(conn)
+    _migrate_add_change_seq_column(conn)
+    _migrate_add_schedules_tables(conn)
+
+
+def _migrate_v1_to_v2(conn) -> None:
+    """Add the feature_dependencies edge table, its triggers and its rows.
+
+    Triggers keep the table in sync with features.dependencies on every
+    insert, update of the column and delete, whichever process writes. Only
+    integer entries become edges; a malformed JSON value yields none rather
+    than failing the write.
+    """
+    FeatureDependency.__table__.create(bind=conn, checkfirst=True)  # type: ignore[attr-defined]
+    new_edges = """
+        SELECT NEW.id, value FROM json_each(
+            CASE WHEN json_valid(NEW.dependencies) THEN NEW.dependencies END
+        ) WHERE type = 'integer'
+    """
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_insert
+        AFTER INSERT ON features
+        BEGIN
+            INSERT OR IGNORE INTO feature_dependencies (feature_id, depends_on_id)
+            {new_edges};
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_update
+        AFTER UPDATE OF dependencies ON features
+        BEGIN
+            DELETE FROM feature_dependencies WHERE feature_id = OLD.id;
+            INSERT OR IGNORE INTO feature_dependencies (feature_id, depends_on_id)
+            {new_edges};
+        END
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_delete
+        AFTER DELETE ON features
+        BEGIN
+            DELETE FROM feature_dependencies WHERE feature_id = OLD.id;
+        END
+    """))
+    conn.execute(text("DELETE FROM feature_dependencies"))
+    conn.execute(text("""
+        INSERT OR IGNORE INTO feature_dependencies (feature_id, depends_on_id)
+        SELECT features.id, deps.value
+        FROM features, json_each(
+            CASE WHEN json_valid(features.dependencies) THEN features.dependencies END
+        ) AS deps
+        WHERE deps.type = 'integer'
+    """))
+
+
+def _migrate_v2_to_v3(conn) -> None:
+    """Add the partial indexes behind the SQL ready and blocked queries."""
+    for index in Feature.__table__.indexes:  # type: ignore[attr-defined]
+        if index.name in ("ix_features_ready", "ix_features_not_passing"):
+            index.create(bind=conn, checkfirst=True)
+
+
+def _migrate_v3_to_v4(conn) -> None:
+    """Draw change_seq from the feature_change_counter table.
+
+    The v1 triggers set change_seq to MAX(change_seq) + 1, which goes back
+    down when the row holding the maximum is deleted: the next insert reuses
+    its value and pollers that already saw it miss the new row. The counter
+    only moves forward, and deletes bump it too, so any write at all changes
+    it. It starts at the highest change_seq already handed out.
+    """
+    FeatureChangeCounter.__table__.create(bind=conn, checkfirst=True)  # type: ignore[attr-defined]
+    conn.execute(text("""
+        INSERT OR IGNORE INTO feature_change_counter (id, seq)
+        SELECT 1, COALESCE(MAX(change_seq), 0) FROM features
+    """))
+    bump = "UPDATE feature_change_counter SET seq = seq + 1 WHERE id = 1;"
+    stamp = "UPDATE features SET change_seq = (SELECT seq FROM feature_change_counter WHERE id = 1) WHERE id = NEW.id;"
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_features_change_seq_insert"))
+    conn.execute(text("DROP TRIGGER IF EXISTS trg_features_change_seq_update"))
+    conn.execute(text(f"""
+        CREATE TRIGGER trg_features_change_seq_insert
+        AFTER INSERT ON features
+        BEGIN
+            {bump}
+            {stamp}
+        END
+    """))
+    # The WHEN guard keeps the trigger from re-firing on its own write if
+    # recursive_triggers is ever enabled
+    conn.execute(text(f"""
+        CREATE TRIGGER trg_features_change_seq_update
+        AFTER UPDATE ON features
+        WHEN NEW.change_seq = OLD.change_seq
+        BEGIN
+            {bump}
+            {stamp}
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_features_change_seq_delete
+        AFTER DELETE ON features
+        BEGIN
+            {bump}
+        END
+    """))
+
+
+# The change log keeps the newest FEATURE_EVENT_RETENTION events. Every
+# FEATURE_EVENT_TRIM_INTERVAL-th insert drops the rows that fell out of that
+# window, so the table stays below RETENTION + TRIM_INTERVAL rows. Both are
+# baked into the trigger: changing them needs a new migration.
+FEATURE_EVENT_RETENTION = 10000
+FEATURE_EVENT_TRIM_INTERVAL = 1000
+
+
+def _migrate_v4_to_v5(conn) -> None:
+    """Cap the feature_events change log.
+
+    Events were never deleted, so the table grew with every claim and pass
+    for the life of the project. Cursors are held by stateless HTTP clients,
+    so there is no oldest live cursor to trim to; the log keeps a fixed
+    number of rows instead, and feature_events_trimmed() tells a client
+    whose cursor fell behind to re-read the feature list.
+
+    Event ids are rowids (no AUTOINCREMENT). Trimming never deletes the
+    newest row, so new ids keep counting up from the last one.
+    """
+    conn.execute(text(f"""
+        DELETE FROM feature_events
+        WHERE id <= (SELECT MAX(id) FROM feature_events) - {FEATURE_EVENT_RETENTION}
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_feature_events_retention
+        AFTER INSERT ON feature_events
+        WHEN NEW.id % {FEATURE_EVENT_TRIM_INTERVAL} = 0
+        BEGIN
+            DELETE FROM feature_events WHERE id <= NEW.id - {FEATURE_EVENT_RETENTION};
+        END
+    """))
+
+
+def _migrate_v5_to_v6(conn) -> None:
+    """Count dependency graph changes separately from other feature writes.
+
+    Scheduling scores depend only on each feature's id, priority and
+    dependencies, but seq moves on every claim and pass, so scores memoized
+    on it were recomputed after almost every write. graph_seq moves only on
+    inserts, deletes and updates that change priority or dependencies.
+    """
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(feature_change_counter)"))}
+    if "graph_seq" not in columns:
+        conn.execute(text("ALTER TABLE feature_change_counter ADD COLUMN graph_seq INTEGER NOT NULL DEFAULT 0"))
+    bump = "UPDATE feature_change_counter SET graph_seq = graph_seq + 1 WHERE id = 1;"
+    for operation in ("INSERT", "DELETE"):
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_features_graph_seq_{operation.lower()}
+            AFTER {operation} ON features
+            BEGIN
+                {bump}
+            END
+        """))
+    conn.execute(text(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_features_graph_seq_update
+        AFTER UPDATE OF priority, dependencies ON features
+        WHEN NEW.priority IS NOT OLD.priority OR NEW.dependencies IS NOT OLD.dependencies
+        BEGIN
+            {bump}
+        END
+    """))
+
+
+# SCHEMA_MIGRATIONS[n] upgrades a database from user_version n to n + 1.
+# Append new migrations; never edit or reorder released ones.
+SCHEMA_MIGRATIONS: list[Callable[[Connection], None]] = [
+    _migrate_v0_to_v1,
+    _migrate_v1_to_v2,
+    _migrate_v2_to_v3,
+    _migrate_v3_to_v4,
+    _migrate_v4_to_v5,
+    _migrate_v5_to_v6,
+]
+SCHEMA_VERSION = len(SCHEMA_MIGRATIONS)
+
+
+def _migrate_schema(engine) -> int:
+    """Apply pending schema migrations in one write transaction.
+
+    The version is re-read after BEGIN IMMEDIATE, so when several processes
+    open an outdated database at once, one migrates and the rest find it
+    current. A database from a newer release is left untouched.
+
+    Returns:
+        The schema version found before migrating.
+    """
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+        if version >= SCHEMA_VERSION:
+            conn.rollback()
+            return version
+        for migrate in SCHEMA_MIGRATIONS[version:]:
+            migrate(conn)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        return version
+
 
+def _count_tool_steps(dbapi_connection) -> None:
+    """Report SQLite work to the feature tool metrics, in processes that record them."""
+    if tool_metrics.count_sqlite_steps():
+        dbapi_connection.set_progress_handler(tool_metrics.sqlite_progress, tool_metrics.SQLITE_STEP_UNIT)
 
-def _configure_sqlite_immediate_transactions(engine) -> None:
+
+def _configure_sqlite_immediate_transactions(engine, profile: SQLiteProfile, wal: bool) -> None:
     """Configure engine for IMMEDIATE transactions via event hooks.
 
     Per SQLAlchemy docs: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html
@@ -370,6 +710,8 @@ def _configure_sqlite_immediate_transactions(engine) -> None:
     - Acquires write lock immediately, preventing stale reads
     - Works correctly regardless of prior ORM operations
     - Future-proof: won't break when pysqlite legacy mode is removed in Python 3.16
+
+    New connections also get the PRAGMAs of the project's SQLite profile.
     """
     @event.listens_for(engine, "connect")
     def do_connect(dbapi_connection, connection_record):
@@ -382,19 +724,54 @@ def _configure_sqlite_immediate_transactions(engine) -> None:
             cursor.execute("PRAGMA busy_timeout=30000")
         finally:
             cursor.close()
+        apply_sqlite_profile(dbapi_connection, profile, wal)
+        _count_tool_steps(dbapi_connection)
 
     @event.listens_for(engine, "begin")
     def do_begin(conn):
-        # Use IMMEDIATE for all transactions to prevent stale reads
+        # Use IMMEDIATE for all transactions to prevent stale reads. This is
+        # where busy_timeout waits for other writers, so time it for the
+        # feature tool metrics.
+        started = time.perf_counter()
         conn.exec_driver_sql("BEGIN IMMEDIATE")
+        tool_metrics.record_lock_wait(time.perf_counter() - started)
+
+
+def _configure_sqlite_read_only_transactions(engine, profile: SQLiteProfile, wal: bool) -> None:
+    """Configure a read-only engine for DEFERRED transactions.
+
+    A deferred BEGIN takes no lock until the first read, and under WAL a
+    reader then works from its own snapshot without blocking writers or
+    other readers. PRAGMA query_only makes any accidental write fail instead
+    of silently upgrading the transaction to a writer.
+    """
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        # Disable pysqlite's implicit transaction handling
+        dbapi_connection.isolation_level = None
+
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA busy_timeout=30000")
+            cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+        apply_sqlite_profile(dbapi_connection, profile, wal)
+        _count_tool_steps(dbapi_connection)
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN DEFERRED")
 
 
 def create_database(project_dir: Path) -> tuple:
     """
     Create database and return engine + session maker.
 
-    Uses a cache to avoid creating new engines for each request, which improves
-    performance by reusing database connections.
+    Uses a bounded LRU cache (see api/engine_cache.py) to avoid creating new
+    engines for each request, which improves performance by reusing database
+    connections. Connection PRAGMAs and pool size come from the project's
+    SQLite profile (see api/sqlite_profiles.py).
 
     Args:
         project_dir: Directory containing the project
@@ -402,11 +779,11 @@ def create_database(project_dir: Path) -> tuple:
     Returns:
         Tuple of (engine, SessionLocal)
     """
-    cache_key = project_dir.as_posix()
+    return _engine_cache.get_or_create(project_dir.as_posix(), lambda: _open_database(project_dir))
 
-    if cache_key in _engine_cache:
-        return _engine_cache[cache_key]
 
+def _open_database(project_dir: Path) -> tuple:
+    """Open, configure and migrate a project's database (create_database cache miss)."""
     db_url = get_database_url(project_dir)
 
     # Ensure parent directory exists (for .autoforge/ layout)
@@ -417,11 +794,12 @@ def create_database(project_dir: Path) -> tuple:
     # WAL mode doesn't work reliably on network filesystems and can cause corruption
     is_network = _is_network_path(project_dir)
     journal_mode = "DELETE" if is_network else "WAL"
+    profile = resolve_sqlite_profile(project_dir)
 
     engine = create_engine(db_url, connect_args={
         "check_same_thread": False,
         "timeout": 30  # Wait up to 30s for locks
-    })
+    }, **profile.engine_kwargs())
 
     # Set journal mode BEFORE configuring event hooks
     # PRAGMA journal_mode must run outside of a transaction, and our event hooks
@@ -435,58 +813,107 @@ def create_database(project_dir: Path) -> tuple:
         try:
             cursor.execute(f"PRAGMA journal_mode={journal_mode}")
             cursor.execute("PRAGMA busy_timeout=30000")
+            schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
         finally:
             cursor.close()
+        # This first connection is pooled and reused, and predates the hooks below
+        apply_sqlite_profile(raw_conn, profile, wal=not is_network)
+        _count_tool_steps(raw_conn)
 
     # Configure IMMEDIATE transactions via event hooks AFTER setting PRAGMAs
-    # This must happen before create_all() and migrations run
-    _configure_sqlite_immediate_transactions(engine)
+    # This must happen before migrations run
+    _configure_sqlite_immediate_transactions(engine, profile, wal=not is_network)
 
-    Base.metadata.create_all(bind=engine)
+    # An up-to-date database needs nothing beyond the user_version read above
+    if schema_version < SCHEMA_VERSION:
+        _migrate_schema(engine)
 
-    # Migrate existing databases
-    _migrate_add_in_progress_column(engine)
-    _migrate_fix_null_boolean_fields(engine)
-    _migrate_add_dependencies_column(engine)
-    _migrate_add_testing_columns(engine)
-    _migrate_add_human_input_columns(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return engine, SessionLocal
 
-    # Migrate to add schedules tables
-    _migrate_add_schedules_tables(engine)
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def create_read_only_database(project_dir: Path) -> tuple:
+    """
+    Create a read-only engine + session maker for a project's database.
 
-    # Cache the engine and session maker
-    _engine_cache[cache_key] = (engine, SessionLocal)
+    Sessions from it use deferred transactions, so pure reads (stats, lists,
+    the orchestrator's feature graph) neither wait for nor block the
+    BEGIN IMMEDIATE write lock. Use create_database() for anything that
+    writes, including read-modify-write sequences that must see the latest
+    committed state.
 
-    return engine, SessionLocal
+    Args:
+        project_dir: Directory containing the project
+
+    Returns:
+        Tuple of (engine, ReadSessionLocal)
+    """
+    return _read_engine_cache.get_or_create(project_dir.as_posix(), lambda: _open_read_only_database(project_dir))
+
+
+def _open_read_only_database(project_dir: Path) -> tuple:
+    """Create the read-only engine (create_read_only_database cache miss)."""
+    # Schema, migrations and journal mode are set up by the read-write engine
+    create_database(project_dir)
+
+    profile = resolve_sqlite_profile(project_dir)
+    engine = create_engine(get_database_url(project_dir), connect_args={
+        "check_same_thread": False,
+        "timeout": 30
+    }, **profile.engine_kwargs())
+    _configure_sqlite_read_only_transactions(engine, profile, wal=not _is_network_path(project_dir))
+
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return engine, ReadSessionLocal
 
 
 def dispose_engine(project_dir: Path) -> bool:
-    """Dispose of and remove the cached engine for a project.
+    """Dispose of and remove the cached engines for a project.
 
     This closes all database connections, releasing file locks on Windows.
     Should be called before deleting the database file.
 
+    Waits for an engine of the project that is still being created, so
+    nothing opened before this call keeps the file open afterwards.
+
     Returns:
         True if an engine was disposed, False if no engine was cached.
     """
     cache_key = project_dir.as_posix()
+    disposed = False
 
-    if cache_key in _engine_cache:
-        engine, _ = _engine_cache.pop(cache_key)
-        engine.dispose()
-        return True
+    # Read-only first, since creating one also creates the read-write engine
+    for cache in (_read_engine_cache, _engine_cache):
+        if cache.dispose(cache_key):
+            disposed = True
 
-    return False
+    return disposed
+
+
+def engine_cache_stats() -> list[dict]:
+    """Return hit rate, eviction and size counters for both engine caches."""
+    return [_engine_cache.stats(), _read_engine_cache.stats()]
+
+
+def dispose_idle_engines() -> int:
+    """Dispose engines unused for longer than the cache idle timeout.
+
+    Returns:
+        Number of engines disposed.
+    """
+    return _read_engine_cache.dispose_idle() + _engine_cache.dispose_idle()
 
 
 # Global session maker - will be set when server starts
 _session_maker: Optional[sessionmaker] = None
 
-# Engine cache to avoid creating new engines for each request
+# Engine cache to avoid creating new engines for each request, bounded so a
+# long-running server doesn't keep every project it ever touched open
 # Key: project directory path (as posix string), Value: (engine, SessionLocal)
-_engine_cache: dict[str, tuple] = {}
+_engine_cache: EngineCache[tuple] = EngineCache("features", lambda entry: entry[0].dispose())
+
+# Read-only engines (deferred transactions), same keys as _engine_cache
+_read_engine_cache: EngineCache[tuple] = EngineCache("features-read", lambda entry: entry[0].dispose())
 
 
 def set_session_maker(session_maker: sessionmaker) -> None:
@@ -559,3 +986,229 @@ def atomic_transaction(session_maker):
         raise
     finally:
         session.close()
+
+
+# =============================================================================
+# Feature Change Log
+# =============================================================================
+# Mutations append a FeatureEvent in their own transaction; consumers tail the
+# log with feature_events_since() instead of rescanning the features table.
+# Old events are trimmed (see FEATURE_EVENT_RETENTION); consumers that fall
+# that far behind find out from feature_events_trimmed().
+
+
+def record_feature_event(
+    session: Session,
+    feature_id: int,
+    event_type: str,
+    data: Optional[dict] = None,
+) -> None:
+    """Append a change event in the caller's transaction.
+
+    Must be called before the caller commits. Uses a core INSERT so it works
+    alongside the raw UPDATE statements used by the MCP server without
+    depending on ORM flush order.
+    """
+    session.execute(
+        FeatureEvent.__table__.insert().values(  # type: ignore[attr-defined]
+            feature_id=feature_id,
+            event_type=event_type,
+            data=data,
+            created_at=_utc_now(),
+        )
+    )
+
+
+def record_feature_events(session: Session, events: list[dict]) -> None:
+    """Append several change events in one executemany.
+
+    Args:
+        session: Session whose transaction the events belong to
+        events: Dicts with feature_id, event_type and optional data
+    """
+    if not events:
+        return
+    now = _utc_now()
+    session.execute(
+        FeatureEvent.__table__.insert(),  # type: ignore[attr-defined]
+        [
+            {
+                "feature_id": e["feature_id"],
+                "event_type": e["event_type"],
+                "data": e.get("data"),
+                "created_at": now,
+            }
+            for e in events
+        ],
+    )
+
+
+def feature_events_since(
+    session: Session,
+    cursor: int = 0,
+    limit: int = 1000,
+) -> tuple[list[dict], int]:
+    """Read change events committed after ``cursor``.
+
+    Args:
+        session: Database session
+        cursor: Last event id the caller has seen (0 = from the beginning)
+        limit: Maximum number of events to return
+
+    Returns:
+        Tuple of (events, next_cursor). next_cursor is the id of the last
+        returned event, or ``cursor`` unchanged when there is nothing new.
+    """
+    rows = (
+        session.query(FeatureEvent)
+        .filter(FeatureEvent.id > cursor)  # type: ignore[arg-type]
+        .order_by(FeatureEvent.id)
+        .limit(limit)
+        .all()
+    )
+    events = [row.to_dict() for row in rows]
+    next_cursor = events[-1]["id"] if events else cursor
+    return events, next_cursor
+
+
+def feature_events_trimmed(session: Session, cursor: int = 0) -> bool:
+    """Whether events committed after ``cursor`` have already been trimmed.
+
+    Committed event ids are contiguous, so a gap between the cursor and the
+    oldest retained event means the caller missed events and should re-read
+    the feature list rather than rely on the log.
+    """
+    oldest = session.execute(text("SELECT MIN(id) FROM feature_events")).scalar()
+    return oldest is not None and cursor < oldest - 1
+
+
+# =============================================================================
+# Dependency Edge Queries
+# =============================================================================
+# Indexed reads of the feature_dependencies table, which triggers derive from
+# Feature.dependencies (see FeatureDependency). Writers keep setting the JSON
+# column; these replace loading and parsing every row for reverse lookups.
+
+
+def get_dependency_edges(session: Session) -> list[tuple[int, int]]:
+    """Return every (feature_id, depends_on_id) edge, ordered by feature."""
+    rows = session.execute(text(
+        "SELECT feature_id, depends_on_id FROM feature_dependencies "
+        "ORDER BY feature_id, depends_on_id"
+    ))
+    return [(row[0], row[1]) for row in rows]
+
+
+def get_dependent_ids(session: Session, feature_id: int) -> list[int]:
+    """Return the IDs of features that list feature_id as a dependency."""
+    rows = session.execute(text(
+        "SELECT feature_id FROM feature_dependencies WHERE depends_on_id = :id "
+        "ORDER BY feature_id"
+    ), {"id": feature_id})
+    return [row[0] for row in rows]
+
+
+# Dependencies that do not name a passing feature (deleted ones included)
+_UNMET_DEPENDENCIES = """
+    SELECT 1 FROM feature_dependencies d
+    LEFT JOIN features dep ON dep.id = d.depends_on_id
+    WHERE d.feature_id = f.id AND dep.passes IS NOT 1
+"""
+
+
+def get_blocking_dependencies(
+    session: Session,
+    limit: Optional[int] = None,
+    after_id: int = 0,
+) -> dict[int, list[int]]:
+    """Map each non-passing feature with unmet dependencies to their IDs.
+
+    A dependency is unmet unless it names a passing feature, so references
+    to deleted features block, as they do in resolve_dependencies().
+
+    Args:
+        session: Database session
+        limit: Only return the lowest `limit` blocked feature IDs
+        after_id: Only consider features with a higher ID (keyset paging)
+
+    Returns:
+        Dict of blocked feature ID -> unmet dependency IDs, ordered by ID
+    """
+    page = (
+        "SELECT f.id FROM features f WHERE f.passes = 0 AND f.id > :after_id "
+        "AND EXISTS (" + _UNMET_DEPENDENCIES + ") ORDER BY f.id"
+    )
+    params: dict[str, int] = {"after_id": after_id}
+    if limit is not None:
+        page += " LIMIT :limit"
+        params["limit"] = limit
+    rows = session.execute(text(f"""
+        SELECT d.feature_id, d.depends_on_id
+        FROM feature_dependencies d
+        LEFT JOIN features dep ON dep.id = d.depends_on_id
+        WHERE d.feature_id IN ({page}) AND dep.passes IS NOT 1
+        ORDER BY d.feature_id, d.depends_on_id
+    """), params)
+    blocking: dict[int, list[int]] = {}
+    for feature_id, dep_id in rows:
+        blocking.setdefault(feature_id, []).append(dep_id)
+    return blocking
+
+
+def count_blocked_features(session: Session) -> int:
+    """Count non-passing features with at least one unmet dependency."""
+    return session.execute(text(
+        "SELECT COUNT(*) FROM features f WHERE f.passes = 0 AND EXISTS (" + _UNMET_DEPENDENCIES + ")"
+    )).scalar() or 0
+
+
+def get_ready_feature_keys(session: Session) -> list[tuple[int, int]]:
+    """Return (priority, id) of features an agent can start, in that order.
+
+    Ready means not passing, not in progress, not waiting for human input and
+    every dependency passing. Candidates are scanned in order from the
+    ix_features_ready partial index (named explicitly: without it the planner
+    prefers ix_feature_status plus a sort). Only keys are read, so callers
+    materialize just the rows they return.
+    """
+    rows = session.execute(text(
+        "SELECT f.priority, f.id FROM features f INDEXED BY ix_features_ready "
+        "WHERE f.passes = 0 AND f.in_progress = 0 AND f.needs_human_input = 0 "
+        "AND NOT EXISTS (" + _UNMET_DEPENDENCIES + ") "
+        "ORDER BY f.priority, f.id"
+    ))
+    return [(row[0], row[1]) for row in rows]
+
+
+def get_feature_change_seq(session: Session) -> int:
+    """Return the feature change counter, which grows on every insert, update and delete."""
+    return session.execute(text("SELECT seq FROM feature_change_counter WHERE id = 1")).scalar() or 0
+
+
+def get_feature_graph_seq(session: Session) -> int:
+    """Return the graph change counter, which grows on inserts, deletes and priority or dependency updates."""
+    return session.execute(text("SELECT graph_seq FROM feature_change_counter WHERE id = 1")).scalar() or 0
+
+
+def would_create_circular_dependency_db(session: Session, source_id: int, target_id: int) -> bool:
+    """Database-backed api.dependency_resolver.would_create_circular_dependency.
+
+    Adding "source_id depends on target_id" closes a cycle when target_id
+    already reaches source_id through existing dependencies. The recursive
+    CTE walks feature_dependencies; UNION drops revisited IDs, so diamonds
+    and pre-existing cycles terminate without a depth limit.
+    """
+    if source_id == target_id:
+        return True  # Self-reference is a cycle
+
+    row = session.execute(text("""
+        WITH RECURSIVE reachable(id) AS (
+            SELECT :target_id
+            UNION
+            SELECT d.depends_on_id
+            FROM feature_dependencies d
+            JOIN reachable r ON d.feature_id = r.id
+        )
+        SELECT 1 FROM reachable WHERE id = :source_id LIMIT 1
+    """), {"source_id": source_id, "target_id": target_id}).first()
+    return row is not None
@@ -7,8 +7,9 @@ Includes cycle detection, validation, and helper functions for dependency manage
 """
 
 import heapq
-from collections import deque
-from typing import TypedDict
+from typing import Hashable, TypedDict
+
+from api.score_engine import score_engine
 
 # Security: Prevent DoS via excessive dependencies
 MAX_DEPENDENCIES_PER_FEATURE = 20
@@ -79,10 +80,11 @@ def resolve_dependencies(features: list[dict]) -> DependencyResult:
                     (dep_feature.get("priority", 999), dependent_id, dep_feature)
                 )
 
-    # Detect cycles (features not in ordered = part of cycle)
+    # Detect cycles (features not in ordered = part of or behind a cycle)
     cycles: list[list[int]] = []
     if len(ordered) < len(features):
-        remaining = [f for f in features if f not in ordered]
+        ordered_ids = {f["id"] for f in ordered}
+        remaining = [f for f in features if f["id"] not in ordered_ids]
         cycles = _detect_cycles(remaining, feature_map)
         ordered.extend(remaining)  # Add cyclic features at end
 
@@ -230,48 +232,81 @@ def validate_dependencies(
 
 
 def _detect_cycles(features: list[dict], feature_map: dict) -> list[list[int]]:
-    """Detect cycles using DFS with recursion tracking.
+    """Detect cycles using an iterative Tarjan strongly connected components pass.
+
+    Runs in O(nodes + edges) with an explicit stack, so arbitrarily long
+    dependency chains cannot hit the recursion limit.
 
     Args:
         features: List of features to check for cycles
         feature_map: Map of feature_id -> feature dict
 
     Returns:
-        List of cycles, where each cycle is a list of feature IDs
+        List of cycles, where each cycle is a list of feature IDs in the
+        order they were reached by following dependencies
     """
+    candidates = {f["id"] for f in features}
+    index: dict[int, int] = {}
+    lowlink: dict[int, int] = {}
+    stack_pos: dict[int, int] = {}  # feature_id -> position in stack while on it
+    stack: list[int] = []
     cycles: list[list[int]] = []
-    visited: set[int] = set()
-    rec_stack: set[int] = set()
-    path: list[int] = []
-
-    def dfs(fid: int) -> bool:
-        visited.add(fid)
-        rec_stack.add(fid)
-        path.append(fid)
 
+    def deps_of(fid: int) -> list[int]:
         feature = feature_map.get(fid)
-        if feature:
-            for dep_id in feature.get("dependencies") or []:
-                if dep_id not in visited:
-                    if dfs(dep_id):
-                        return True
-                elif dep_id in rec_stack:
-                    cycle_start = path.index(dep_id)
-                    cycles.append(path[cycle_start:])
-                    return True
-
-        path.pop()
-        rec_stack.remove(fid)
-        return False
+        return (feature.get("dependencies") or []) if feature else []
 
     for f in features:
-        if f["id"] not in visited:
-            dfs(f["id"])
+        root = f["id"]
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack_pos[root] = len(stack)
+        stack.append(root)
+        work = [(root, iter(deps_of(root)))]
+
+        while work:
+            fid, deps = work[-1]
+            descended = False
+            for dep_id in deps:
+                if dep_id not in candidates:
+                    continue
+                if dep_id not in index:
+                    index[dep_id] = lowlink[dep_id] = len(index)
+                    stack_pos[dep_id] = len(stack)
+                    stack.append(dep_id)
+                    work.append((dep_id, iter(deps_of(dep_id))))
+                    descended = True
+                    break
+                if dep_id in stack_pos:
+                    lowlink[fid] = min(lowlink[fid], index[dep_id])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[fid])
+
+            if lowlink[fid] == index[fid]:
+                # fid is the root of a strongly connected component
+                start = stack_pos[fid]
+                component = stack[start:]
+                del stack[start:]
+                for member in component:
+                    del stack_pos[member]
+                if len(component) > 1 or fid in deps_of(fid):
+                    cycles.append(component)
 
     return cycles
 
 
-def compute_scheduling_scores(features: list[dict]) -> dict[int, float]:
+def compute_scheduling_scores(
+    features: list[dict],
+    version: Hashable | None = None,
+    downstream_mode: str | None = None,
+) -> dict[int, float]:
     """Compute scheduling scores for all features.
 
     Higher scores mean higher priority for scheduling. The algorithm considers:
@@ -281,75 +316,22 @@ def compute_scheduling_scores(features: list[dict]) -> dict[int, float]:
 
     Score formula: (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
 
+    The graph is evaluated as CSR integer arrays (NumPy-backed when available),
+    see api.score_engine.
+
     Args:
         features: List of feature dicts with id, priority, dependencies fields
+        version: Optional graph version key. Results are memoized per key, so
+            pass a value that changes whenever priorities or dependencies may
+            have changed. The returned dict must then not be mutated.
+        downstream_mode: "paths" (default) counts dependents once per path,
+            "distinct" counts each transitive dependent once. None uses the
+            AUTOFORGE_SCORE_DOWNSTREAM environment variable.
 
     Returns:
         Dict mapping feature_id -> score (higher = schedule first)
     """
-    if not features:
-        return {}
-
-    # Build adjacency lists
-    children: dict[int, list[int]] = {f["id"]: [] for f in features}  # who depends on me
-    parents: dict[int, list[int]] = {f["id"]: [] for f in features}   # who I depend on
-
-    for f in features:
-        for dep_id in (f.get("dependencies") or []):
-            if dep_id in children:  # Only valid deps
-                children[dep_id].append(f["id"])
-                parents[f["id"]].append(dep_id)
-
-    # Calculate depths via BFS from roots
-    # Use visited set to prevent infinite loops from circular dependencies
-    # Use deque for O(1) popleft instead of list.pop(0) which is O(n)
-    depths: dict[int, int] = {}
-    visited: set[int] = set()
-    roots = [f["id"] for f in features if not parents[f["id"]]]
-    bfs_queue: deque[tuple[int, int]] = deque((root, 0) for root in roots)
-    while bfs_queue:
-        node_id, depth = bfs_queue.popleft()
-        if node_id in visited:
-            continue  # Skip already visited nodes (handles cycles)
-        visited.add(node_id)
-        depths[node_id] = depth
-        for child_id in children[node_id]:
-            if child_id not in visited:
-                bfs_queue.append((child_id, depth + 1))
-
-    # Handle orphaned nodes (shouldn't happen but be safe)
-    for f in features:
-        if f["id"] not in depths:
-            depths[f["id"]] = 0
-
-    # Calculate transitive downstream counts (reverse topo order)
-    downstream: dict[int, int] = {f["id"]: 0 for f in features}
-    # Process in reverse depth order (leaves first)
-    for fid in sorted(depths.keys(), key=lambda x: -depths[x]):
-        for parent_id in parents[fid]:
-            downstream[parent_id] += 1 + downstream[fid]
-
-    # Normalize and compute scores
-    max_depth = max(depths.values()) if depths else 0
-    max_downstream = max(downstream.values()) if downstream else 0
-
-    scores: dict[int, float] = {}
-    for f in features:
-        fid = f["id"]
-
-        # Unblocking score: 0-1, higher = unblocks more
-        unblock = downstream[fid] / max_downstream if max_downstream > 0 else 0
-
-        # Depth score: 0-1, higher = closer to root (no deps)
-        depth_score = 1 - (depths[fid] / max_depth) if max_depth > 0 else 1
-
-        # Priority factor: 0-1, lower priority number = higher factor
-        priority = f.get("priority", 999)
-        priority_factor = (10 - min(priority, 10)) / 10
-
-        scores[fid] = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
-
-    return scores
+    return score_engine.scores(features, version, downstream_mode)
 
 
 def get_ready_features(features: list[dict], limit: int = 10) -> list[dict]:
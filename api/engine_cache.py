@@ -0,0 +1,206 @@
+"""
+Engine Cache
+============
+
+Size-bounded LRU cache with idle expiry for per-project SQLAlchemy engines.
+
+The web server opens a features engine, a read-only features engine and an
+assistant engine for every project the UI touches. Without a bound each of
+them keeps a connection pool and its file handles open for the life of the
+server. EngineCache keeps at most ``max_size`` entries, disposes the least
+recently used one when a new project pushes past that, and disposes entries
+unused for ``idle_timeout`` seconds on the next cache access (or an explicit
+dispose_idle() call).
+
+Creation and explicit disposal of a key are serialized by a per-key lock, so
+dispose_engine() during project delete/reset waits for an engine that is
+still being created and disposes it too, instead of racing with it.
+
+Evicting an engine that a caller still holds is safe: dispose() closes the
+pooled connections, checked-out ones close when returned, and the engine
+reconnects on its next use. Long-lived holders just fall outside the bound.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# Defaults for every cache; both can be overridden per process
+ENGINE_CACHE_MAX_SIZE = int(os.environ.get("AUTOFORGE_ENGINE_CACHE_SIZE", "16"))
+ENGINE_CACHE_IDLE_SECONDS = float(os.environ.get("AUTOFORGE_ENGINE_IDLE_SECONDS", "600"))
+
+
+def count_open_fds() -> Optional[int]:
+    """Return the number of file descriptors (handles on Windows) this process has open."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    try:
+        import psutil
+        process = psutil.Process()
+        return int(process.num_handles() if hasattr(process, "num_handles") else process.num_fds())
+    except Exception:
+        return None
+
+
+class EngineCache(Generic[V]):
+    """Thread-safe LRU of per-project values that own an engine.
+
+    Args:
+        name: Label used in logs and stats
+        dispose: Called with a value once it leaves the cache
+        max_size: Maximum number of cached values
+        idle_timeout: Seconds after last use before a value is disposed
+            (0 disables idle expiry)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dispose: Callable[[V], None],
+        max_size: int = ENGINE_CACHE_MAX_SIZE,
+        idle_timeout: float = ENGINE_CACHE_IDLE_SECONDS,
+    ):
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self._dispose = dispose
+        # key -> (value, monotonic time of last use), least recently used first
+        self._entries: OrderedDict[str, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _lookup(self, key: str) -> Optional[V]:
+        """Return the cached value and mark it used; caller holds _lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries[key] = (entry[0], time.monotonic())
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _take_expired(self, now: float) -> list[tuple[str, V]]:
+        """Remove idle and over-capacity entries; caller holds _lock."""
+        removed = []
+        if self.idle_timeout > 0:
+            for key, (value, last_used) in list(self._entries.items()):
+                if now - last_used < self.idle_timeout:
+                    break  # Ordered by last use, the rest are newer
+                del self._entries[key]
+                self.idle_evictions += 1
+                removed.append((key, value))
+        while len(self._entries) > self.max_size:
+            key, (value, _) = self._entries.popitem(last=False)
+            self.evictions += 1
+            removed.append((key, value))
+        return removed
+
+    def _dispose_all(self, removed: list[tuple[str, V]], reason: str) -> None:
+        for key, value in removed:
+            try:
+                self._dispose(value)
+                logger.debug("Disposed %s engine for %s (%s)", self.name, key, reason)
+            except Exception as e:
+                logger.warning("Failed to dispose %s engine for %s: %s", self.name, key, e)
+
+    def get_or_create(self, key: str, factory: Callable[[], V]) -> V:
+        """Return the cached value for key, creating it with factory() on a miss."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                removed = self._take_expired(time.monotonic())
+        if value is not None:
+            self._dispose_all(removed, "expired")
+            return value
+
+        with self._key_lock(key):
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    # Created by another thread while we waited for the key lock
+                    self.hits += 1
+                    return value
+
+            value = factory()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (value, time.monotonic())
+                removed = self._take_expired(time.monotonic())
+
+        self._dispose_all(removed, "expired")
+        return value
+
+    def dispose(self, key: str) -> bool:
+        """Remove and dispose the value for key.
+
+        Waits for a concurrent get_or_create() of the same key to finish, so
+        nothing created before this call survives it.
+
+        Returns:
+            True if a value was disposed, False if none was cached.
+        """
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._dispose_all([(key, entry[0])], "explicit")
+            return True
+
+    def dispose_idle(self) -> int:
+        """Dispose values idle longer than idle_timeout; returns how many."""
+        with self._lock:
+            removed = self._take_expired(time.monotonic())
+        self._dispose_all(removed, "expired")
+        return len(removed)
+
+    def dispose_all(self) -> None:
+        """Dispose every cached value (server shutdown)."""
+        with self._lock:
+            removed = [(key, value) for key, (value, _) in self._entries.items()]
+            self._entries.clear()
+        self._dispose_all(removed, "shutdown")
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit rate, eviction and size counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "idle_timeout": self.idle_timeout,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "idle_evictions": self.idle_evictions,
+            }
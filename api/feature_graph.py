@@ -0,0 +1,187 @@
+"""
+Feature Graph
+=============
+
+Incrementally maintained in-memory view of the features table.
+
+The orchestrator used to reload every row, convert it with to_dict() and
+recompute scheduling scores on every loop iteration. FeatureGraph loads the
+table once, then on each refresh() fetches only the rows whose change_seq
+advanced since the previous poll (change_seq is stamped from a monotonic
+counter by SQLite triggers, see api.database._migrate_v3_to_v4). The passing
+set, ready set and scheduling scores are updated from those deltas.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Feature, get_feature_change_seq
+from api.dependency_resolver import compute_scheduling_scores
+
+
+class FeatureGraph:
+    """In-memory feature snapshot kept in sync with the database via change_seq.
+
+    Attributes:
+        passing_ids: IDs of features with passes=True
+        in_progress_ids: IDs of features with in_progress=True and passes=False
+        ready_ids: IDs of features that are not passing, not in progress, not
+            waiting for human input, and whose dependencies are all passing
+        version: Incremented every time refresh() applies at least one change
+    """
+
+    def __init__(self, session_maker: sessionmaker):
+        self._session_maker = session_maker
+        self._features: dict[int, dict] = {}
+        # dep_id -> IDs of features that list dep_id as a dependency
+        self._children: dict[int, set[int]] = {}
+        self.passing_ids: set[int] = set()
+        self.in_progress_ids: set[int] = set()
+        self.ready_ids: set[int] = set()
+        self.version = 0
+        self._last_seq = -1  # -1 = never loaded
+        self._dicts_cache: Optional[list[dict]] = None
+        self._scores: Optional[dict[int, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def get(self, feature_id: int) -> Optional[dict]:
+        """Return the cached dict for a feature, or None if unknown."""
+        return self._features.get(feature_id)
+
+    def refresh(self) -> bool:
+        """Apply rows changed since the last refresh.
+
+        Falls back to a full reload on first use and whenever rows were
+        deleted. Deletes advance the change counter but leave no row to
+        fetch, so they show up as cached features the table no longer has.
+
+        Returns:
+            True if anything changed, False if the snapshot was already current.
+        """
+        session = self._session_maker()
+        try:
+            seq = get_feature_change_seq(session)
+
+            if self._last_seq < 0:
+                self._load_all(session, seq)
+                return True
+
+            if seq == self._last_seq:
+                return False
+
+            changed = (
+                session.query(Feature)
+                .filter(Feature.change_seq > self._last_seq)
+                .all()
+            )
+            for row in changed:
+                self._apply(row.to_dict())
+
+            # Every live row is now cached, so extra cached rows were deleted
+            if len(self._features) != session.query(func.count(Feature.id)).scalar():
+                self._load_all(session, seq)
+                return True
+
+            self._last_seq = seq
+            self._dicts_cache = None
+            self.version += 1
+            return True
+        finally:
+            session.close()
+
+    def feature_dicts(self) -> list[dict]:
+        """Return all cached feature dicts (rebuilt only after a change)."""
+        if self._dicts_cache is None:
+            self._dicts_cache = list(self._features.values())
+        return self._dicts_cache
+
+    def ready_features(self) -> list[dict]:
+        """Return dicts for every feature currently in the ready set."""
+        return [self._features[fid] for fid in self.ready_ids]
+
+    @property
+    def scheduling_scores(self) -> dict[int, float]:
+        """Scheduling scores, recomputed only when priorities or dependencies change.
+
+        Status changes (passes/in_progress) are the common case and don't
+        affect scores, so they reuse the cached result.
+        """
+        if self._scores is None:
+            self._scores = compute_scheduling_scores(self.feature_dicts())
+        return self._scores
+
+    def _load_all(self, session, seq: int) -> None:
+        """Rebuild the snapshot from a full table scan."""
+        self._features = {}
+        self._children = {}
+        self.passing_ids = set()
+        self.in_progress_ids = set()
+        self.ready_ids = set()
+        for row in session.query(Feature).all():
+            fd = row.to_dict()
+            fid = fd["id"]
+            self._features[fid] = fd
+            for dep_id in fd["dependencies"]:
+                self._children.setdefault(dep_id, set()).add(fid)
+            if fd["passes"]:
+                self.passing_ids.add(fid)
+            elif fd["in_progress"]:
+                self.in_progress_ids.add(fid)
+        for fid in self._features:
+            self._update_ready(fid)
+        self._last_seq = seq
+        self._dicts_cache = None
+        self._scores = None
+        self.version += 1
+
+    def _apply(self, fd: dict) -> None:
+        """Merge one changed row into the snapshot."""
+        fid = fd["id"]
+        old = self._features.get(fid)
+        self._features[fid] = fd
+
+        old_deps = old["dependencies"] if old else []
+        if old is None or old_deps != fd["dependencies"] or old["priority"] != fd["priority"]:
+            self._scores = None
+        if old_deps != fd["dependencies"]:
+            for dep_id in old_deps:
+                children = self._children.get(dep_id)
+                if children is not None:
+                    children.discard(fid)
+            for dep_id in fd["dependencies"]:
+                self._children.setdefault(dep_id, set()).add(fid)
+
+        was_passing = fid in self.passing_ids
+        if fd["passes"]:
+            self.passing_ids.add(fid)
+            self.in_progress_ids.discard(fid)
+        else:
+            self.passing_ids.discard(fid)
+            if fd["in_progress"]:
+                self.in_progress_ids.add(fid)
+            else:
+                self.in_progress_ids.discard(fid)
+
+        self._update_ready(fid)
+        if was_passing != bool(fd["passes"]):
+            # Passing status gates readiness of every dependent
+            for child_id in self._children.get(fid, ()):
+                self._update_ready(child_id)
+
+    def _update_ready(self, fid: int) -> None:
+        """Recompute ready-set membership for a single feature."""
+        fd = self._features.get(fid)
+        if (
+            fd is not None
+            and not fd["passes"]
+            and not fd["in_progress"]
+            and not fd["needs_human_input"]
+            and all(dep_id in self.passing_ids for dep_id in fd["dependencies"])
+        ):
+            self.ready_ids.add(fid)
+        else:
+            self.ready_ids.discard(fid)
@@ -0,0 +1,248 @@
+"""
+Bulk Feature Import
+===================
+
+Core-level bulk insert of features, shared by the feature_create_bulk MCP
+tool and the REST bulk and NDJSON import endpoints.
+
+Rows are written with one executemany INSERT per chunk instead of one ORM
+object per feature flushed through the unit of work. IDs are assigned up
+front from MAX(id) (the features table has no AUTOINCREMENT, so these are
+the IDs SQLite would pick), which lets depends_on_indices resolve to IDs
+before the insert and keeps the chunk a single statement. The change_seq
+and feature_dependencies triggers still run for every row.
+
+Callers choose the transaction boundary: feed every chunk through one
+session for an all-or-nothing import, or commit after each chunk so a long
+import releases the write lock between chunks and agents keep running.
+Because of that, ID and priority counters are re-read from the table at
+the start of every chunk.
+"""
+
+import json
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from api.database import Feature, record_feature_events
+from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE
+
+# Features per executemany INSERT (and per commit for chunked imports)
+BULK_INSERT_CHUNK_SIZE = 500
+
+REQUIRED_FIELDS = ("category", "name", "description", "steps")
+
+
+class FeatureImportError(ValueError):
+    """A feature in a bulk import is invalid.
+
+    Attributes:
+        index: 0-based position of the offending feature in the import
+        created: Features already committed when the error was raised
+            (only non-zero for chunked commits)
+    """
+
+    def __init__(self, message: str, index: int, created: int = 0):
+        super().__init__(message)
+        self.index = index
+        self.created = created
+
+
+def validate_feature_item(index: int, data: dict) -> None:
+    """Check one bulk import item.
+
+    Items need category, name, description and steps. dependencies, if
+    given, must be feature IDs. depends_on_indices may only reference
+    earlier items of the same import, at most MAX_DEPENDENCIES_PER_FEATURE
+    of them, without duplicates.
+
+    Raises:
+        FeatureImportError: If the item is invalid
+    """
+    if not isinstance(data, dict) or not all(key in data for key in REQUIRED_FIELDS):
+        raise FeatureImportError(
+            f"Feature at index {index} missing required fields (category, name, description, steps)", index
+        )
+
+    dependencies = data.get("dependencies") or []
+    if not isinstance(dependencies, list) or not all(
+        isinstance(d, int) and not isinstance(d, bool) for d in dependencies
+    ):
+        raise FeatureImportError(f"Feature at index {index} has invalid dependencies (expected feature IDs)", index)
+
+    indices = data.get("depends_on_indices") or []
+    if not isinstance(indices, list):
+        raise FeatureImportError(f"Feature at index {index} has invalid depends_on_indices (expected a list)", index)
+    if len(indices) > MAX_DEPENDENCIES_PER_FEATURE:
+        raise FeatureImportError(
+            f"Feature at index {index} has {len(indices)} dependencies, max is {MAX_DEPENDENCIES_PER_FEATURE}",
+            index,
+        )
+    if len(indices) != len(set(indices)):
+        raise FeatureImportError(f"Feature at index {index} has duplicate dependencies", index)
+    for idx in indices:
+        if not isinstance(idx, int) or isinstance(idx, bool) or idx < 0:
+            raise FeatureImportError(f"Feature at index {index} has invalid dependency index: {idx}", index)
+        if idx >= index:
+            raise FeatureImportError(
+                f"Feature at index {index} cannot depend on feature at index {idx} (forward reference not allowed)",
+                index,
+            )
+
+
+def parse_ndjson_line(line: str | bytes, index: int) -> Optional[dict]:
+    """Decode one NDJSON line into a feature dict (None for a blank line).
+
+    Raises:
+        FeatureImportError: If the line is not a JSON object
+    """
+    if not line.strip():
+        return None
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        raise FeatureImportError(f"Feature at index {index} is not valid JSON: {e}", index) from e
+    if not isinstance(item, dict):
+        raise FeatureImportError(f"Feature at index {index} is not a JSON object", index)
+    return item
+
+
+def iter_ndjson(lines: Iterable[str | bytes]) -> Iterator[dict]:
+    """Decode newline-delimited JSON objects one line at a time (e.g. from an open file).
+
+    Raises:
+        FeatureImportError: If a line is not a JSON object (index counts
+            features, not lines)
+    """
+    index = 0
+    for line in lines:
+        item = parse_ndjson_line(line, index)
+        if item is not None:
+            yield item
+            index += 1
+
+
+class FeatureBulkInserter:
+    """Inserts a stream of features chunk by chunk.
+
+    Keeps the ID assigned to every item so later chunks can depend on
+    earlier ones by index. Each item may carry depends_on_indices (positions
+    in this import) and/or dependencies (existing feature IDs).
+
+    Args:
+        start_priority: Priority of the first feature; None continues after
+            the highest existing priority
+    """
+
+    def __init__(self, start_priority: Optional[int] = None):
+        self.ids: list[int] = []
+        self.with_dependencies = 0
+        self._next_priority = start_priority
+        self._follow_max_priority = start_priority is None
+
+    @property
+    def created(self) -> int:
+        return len(self.ids)
+
+    def add_chunk(self, session: Session, features: list[dict]) -> list[int]:
+        """Validate and insert features in the caller's transaction.
+
+        Nothing is written if any item in the chunk is invalid.
+
+        Returns:
+            IDs assigned to the chunk's features, in order
+
+        Raises:
+            FeatureImportError: If an item is invalid
+        """
+        if not features:
+            return []
+        base = len(self.ids)
+        for offset, data in enumerate(features):
+            validate_feature_item(base + offset, data)
+
+        max_id: int | None
+        max_priority: int | None
+        max_id, max_priority = session.query(func.max(Feature.id), func.max(Feature.priority)).one()
+        next_id = (max_id or 0) + 1
+        if self._follow_max_priority:
+            self._next_priority = max(self._next_priority or 0, (max_priority or 0) + 1)
+        priority = self._next_priority or 1
+
+        chunk_ids = list(range(next_id, next_id + len(features)))
+        rows = []
+        for offset, data in enumerate(features):
+            dep_ids = set(data.get("dependencies") or [])
+            dep_ids.update(
+                self.ids[idx] if idx < base else chunk_ids[idx - base]
+                for idx in data.get("depends_on_indices") or []
+            )
+            if dep_ids:
+                self.with_dependencies += 1
+            rows.append({
+                "id": chunk_ids[offset],
+                "priority": priority + offset,
+                "category": data["category"],
+                "name": data["name"],
+                "description": data["description"],
+                "steps": data["steps"],
+                "dependencies": sorted(dep_ids) if dep_ids else None,
+                "passes": False,
+                "in_progress": False,
+            })
+
+        session.execute(Feature.__table__.insert(), rows)  # type: ignore[attr-defined]
+        record_feature_events(session, [
+            {"feature_id": fid, "event_type": "created"} for fid in chunk_ids
+        ])
+        self.ids.extend(chunk_ids)
+        self._next_priority = priority + len(features)
+        return chunk_ids
+
+
+def bulk_insert_features(
+    session: Session,
+    features: Iterable[dict],
+    start_priority: Optional[int] = None,
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+    commit_chunks: bool = False,
+) -> FeatureBulkInserter:
+    """Insert features from any iterable (a list, or a streaming iter_ndjson()).
+
+    Only one chunk of input is held in memory at a time.
+
+    Args:
+        session: Write session
+        features: Feature dicts (see FeatureBulkInserter)
+        start_priority: Priority of the first feature (None = after the max)
+        chunk_size: Features per INSERT statement
+        commit_chunks: Commit after each chunk; otherwise the caller commits
+            once and the import is all-or-nothing
+
+    Returns:
+        The inserter, with the created IDs and with_dependencies count
+
+    Raises:
+        FeatureImportError: If an item is invalid. With commit_chunks, the
+            chunks before it stay committed and error.created counts them.
+    """
+    inserter = FeatureBulkInserter(start_priority)
+    chunk: list[dict] = []
+
+    def flush() -> None:
+        inserter.add_chunk(session, chunk)
+        if commit_chunks:
+            session.commit()
+        chunk.clear()
+
+    try:
+        for data in features:
+            chunk.append(data)
+            if len(chunk) >= chunk_size:
+                flush()
+        flush()
+    except FeatureImportError as e:
+        e.created = inserter.created if commit_chunks else 0
+        raise
+    return inserter
@@ -0,0 +1,245 @@
+"""
+Feature Projection and Pagination
+=================================
+
+Helpers behind the fields= and cursor= parameters of the list-returning
+feature MCP tools and REST endpoints.
+
+fields names the keys each returned feature carries ("id" is always
+included). Only the matching columns are read, so a caller asking for ids
+and status never loads descriptions and steps.
+
+Cursors are opaque strings holding the sort key of the last item returned.
+The next page starts strictly after that key (keyset pagination), so it is
+served from the (priority, id) or primary key index without scanning the
+skipped rows, and a feature inserted meanwhile can't shift the pages.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Query, Session
+
+from api.database import Feature
+
+# Keys of Feature.to_dict(), each backed by the column of the same name
+FEATURE_FIELDS = (
+    "id", "priority", "category", "name", "description", "steps", "passes", "in_progress",
+    "dependencies", "needs_human_input", "human_input_request", "human_input_response",
+)
+
+# Keys of a dependency graph node
+GRAPH_NODE_FIELDS = ("id", "name", "category", "status", "priority", "dependencies")
+
+# Largest page any list tool or endpoint returns
+MAX_PAGE_SIZE = 1000
+
+
+class PageRequestError(ValueError):
+    """Unknown field name or malformed cursor."""
+
+
+def parse_fields(
+    fields: str | Sequence[str] | None,
+    allowed: Sequence[str] = FEATURE_FIELDS,
+) -> Optional[list[str]]:
+    """Validate a fields= value.
+
+    Args:
+        fields: Comma-separated string or list of names; None or empty means all
+        allowed: Names the caller may select
+
+    Returns:
+        The selected names in `allowed` order with "id" first, or None for all
+
+    Raises:
+        PageRequestError: If a name is not in allowed
+    """
+    if not fields:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else list(fields)
+    requested = {name.strip() for name in names if name.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise PageRequestError(f"Unknown fields {unknown}; choose from {list(allowed)}")
+    requested.add("id")
+    return [name for name in allowed if name in requested]
+
+
+def project(item: dict, fields: Optional[Sequence[str]]) -> dict:
+    """Keep only the selected keys of item (all of them when fields is None)."""
+    if fields is None:
+        return item
+    return {key: item[key] for key in fields if key in item}
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Encode a sort key as an opaque cursor string."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[tuple]:
+    """Decode a cursor from encode_cursor() holding a sort key of `size` numbers.
+
+    Raises:
+        PageRequestError: If the cursor was not produced for this kind of list
+    """
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise PageRequestError("Invalid cursor") from None
+    if (
+        not isinstance(key, list)
+        or len(key) != size
+        or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in key)
+    ):
+        raise PageRequestError("Invalid cursor")
+    return tuple(key)
+
+
+def _feature_dict(row, columns: Sequence[str]) -> dict:
+    """Build a to_dict()-shaped dict from a column-projected row."""
+    item = dict(zip(columns, row))
+    for flag in ("passes", "in_progress", "needs_human_input"):
+        if flag in item and item[flag] is None:
+            item[flag] = False  # Legacy NULLs, as in to_dict()
+    if "dependencies" in item and not item["dependencies"]:
+        item["dependencies"] = []
+    return item
+
+
+def load_features(session: Session, ids: Sequence[int], fields: Optional[Sequence[str]]) -> list[dict]:
+    """Load features by ID in the given order, reading only the selected columns.
+
+    Missing IDs are skipped. fields=None loads every to_dict() key.
+    """
+    if not ids:
+        return []
+    columns = list(fields or FEATURE_FIELDS)
+    if "id" not in columns:
+        columns.insert(0, "id")
+    rows = session.query(*(getattr(Feature, c) for c in columns)).filter(Feature.id.in_(ids)).all()
+    by_id = {item["id"]: item for item in (_feature_dict(row, columns) for row in rows)}
+    return [by_id[fid] for fid in ids if fid in by_id]
+
+
+def feature_page(
+    session: Session,
+    columns: Sequence[str],
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """Read features in (priority, id) order, one keyset page at a time.
+
+    Args:
+        session: Database session
+        columns: Feature columns to read ("id" and "priority" are added)
+        limit: Page size; None returns every remaining feature
+        cursor: next_cursor of the previous page
+
+    Returns:
+        Tuple of (feature dicts, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        PageRequestError: If the cursor is invalid
+    """
+    after = decode_cursor(cursor, 2)
+    columns = ["id", "priority"] + [c for c in columns if c not in ("id", "priority")]
+    query = session.query(*(getattr(Feature, c) for c in columns)).order_by(Feature.priority, Feature.id)
+    if after is not None:
+        query = query.filter(tuple_(Feature.priority, Feature.id) > tuple_(*after))
+    if limit is not None:
+        query = query.limit(limit + 1)
+    page = [_feature_dict(row, columns) for row in query.all()]
+
+    next_cursor = None
+    if limit is not None and len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor((page[-1]["priority"], page[-1]["id"]))
+    return page, next_cursor
+
+
+def graph_page(
+    session: Session,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], list[tuple[int, int]], Optional[str]]:
+    """Read dependency graph nodes in ID order, one keyset page at a time.
+
+    Nodes carry GRAPH_NODE_FIELDS; status is done, needs_human_input,
+    blocked, in_progress or pending, in that precedence. Only the edges
+    leading into the page's nodes are returned, so every page's edges
+    together make up the whole graph.
+
+    Returns:
+        Tuple of (nodes, (feature_id, depends_on_id) edges, next_cursor)
+
+    Raises:
+        PageRequestError: If the cursor is invalid
+    """
+    after = decode_cursor(cursor, 1)
+    after_id = after[0] if after else 0
+    query: Query = (
+        session.query(
+            Feature.id, Feature.name, Feature.category, Feature.priority,
+            Feature.passes, Feature.in_progress, Feature.needs_human_input,
+        )
+        .filter(Feature.id > after_id)  # type: ignore[arg-type]
+        .order_by(Feature.id)
+    )
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor((rows[-1].id,))
+    if not rows:
+        return [], [], None
+
+    # Edges into the page, with whether each dependency is passing
+    edge_rows = session.execute(text("""
+        SELECT d.feature_id, d.depends_on_id, dep.passes IS 1
+        FROM feature_dependencies d
+        LEFT JOIN features dep ON dep.id = d.depends_on_id
+        WHERE d.feature_id BETWEEN :first AND :last
+        ORDER BY d.feature_id, d.depends_on_id
+    """), {"first": rows[0].id, "last": rows[-1].id}).all()
+
+    deps_by_feature: dict[int, list[int]] = {}
+    blocked_ids = set()
+    for feature_id, dep_id, dep_passing in edge_rows:
+        deps_by_feature.setdefault(feature_id, []).append(dep_id)
+        if not dep_passing:
+            blocked_ids.add(feature_id)
+
+    nodes = []
+    for f in rows:
+        if f.passes:
+            status = "done"
+        elif f.needs_human_input:
+            status = "needs_human_input"
+        elif f.id in blocked_ids:
+            status = "blocked"
+        elif f.in_progress:
+            status = "in_progress"
+        else:
+            status = "pending"
+        nodes.append({
+            "id": f.id,
+            "name": f.name,
+            "category": f.category,
+            "status": status,
+            "priority": f.priority,
+            "dependencies": deps_by_feature.get(f.id, []),
+        })
+
+    edges = [(feature_id, dep_id) for feature_id, dep_id, _ in edge_rows]
+    return nodes, edges, next_cursor
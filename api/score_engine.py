@@ -0,0 +1,432 @@
+"""
+Scheduling Score Engine
+=======================
+
+Array-backed implementation of compute_scheduling_scores.
+
+The feature DAG is stored in CSR form (compressed sparse rows: an indptr
+array of row offsets plus a flat indices array) for both directions, with
+features addressed by their position in the input list. Depths, downstream
+counts and scores are then computed over integer arrays instead of dicts of
+lists. NumPy is used when installed and the graph is large enough to benefit;
+otherwise the same arrays are walked with plain Python lists.
+
+Both backends reproduce the original dict-based algorithm exactly (BFS visit
+order, processing order of the downstream pass, and the floating point
+expression), so scores are bit-for-bit identical.
+
+The original downstream pass adds 1 + child count along every parent edge,
+so it counts paths: on diamond-heavy graphs shared descendants are counted
+once per path and the numbers grow exponentially with depth. The "distinct"
+downstream mode instead counts each descendant once, using per-node
+reachability bitsets (Python ints). Select it per call or with the
+AUTOFORGE_SCORE_DOWNSTREAM environment variable; "paths" stays the default.
+
+Results are memoized on a caller-supplied graph version key, so repeated
+calls for an unchanged graph return immediately.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Below this many features the pure Python path is faster than NumPy setup
+NUMPY_MIN_FEATURES = 1000
+
+# Downstream counting modes
+DOWNSTREAM_PATHS = "paths"  # Original behavior: one count per path
+DOWNSTREAM_DISTINCT = "distinct"  # Each descendant counted once
+DOWNSTREAM_MODES = (DOWNSTREAM_PATHS, DOWNSTREAM_DISTINCT)
+SCORE_DOWNSTREAM_ENV = "AUTOFORGE_SCORE_DOWNSTREAM"
+
+
+def _env_downstream_mode() -> str:
+    """Mode selected by the environment; unknown names are logged and ignored."""
+    mode = os.environ.get(SCORE_DOWNSTREAM_ENV, "").strip().lower()
+    if not mode:
+        return DOWNSTREAM_PATHS
+    if mode not in DOWNSTREAM_MODES:
+        logger.warning("Ignoring unknown downstream mode %r from %s", mode, SCORE_DOWNSTREAM_ENV)
+        return DOWNSTREAM_PATHS
+    return mode
+
+
+DEFAULT_DOWNSTREAM_MODE = _env_downstream_mode()
+
+# Largest integer every value of which converts to float64 exactly
+_MAX_EXACT_FLOAT_INT = 2**53
+
+
+class FeatureCSR:
+    """Feature dependency graph as CSR integer arrays.
+
+    Attributes:
+        ids: Feature IDs, indexed by position
+        priorities: Feature priorities (missing treated as 999)
+        child_indptr / child_indices: Positions of features that depend on each feature
+        parent_indptr / parent_indices: Positions of each feature's dependencies
+    """
+
+    __slots__ = (
+        "ids", "priorities",
+        "child_indptr", "child_indices",
+        "parent_indptr", "parent_indices",
+    )
+
+    def __init__(self, features: list[dict]):
+        self.ids = [f["id"] for f in features]
+        self.priorities = [f.get("priority", 999) for f in features]
+        position = {fid: i for i, fid in enumerate(self.ids)}
+
+        # Parent rows come out grouped already (one feature at a time)
+        parent_indptr = [0]
+        parent_indices: list[int] = []
+        for f in features:
+            for dep_id in (f.get("dependencies") or []):
+                dep_pos = position.get(dep_id)
+                if dep_pos is not None:  # Only valid deps
+                    parent_indices.append(dep_pos)
+            parent_indptr.append(len(parent_indices))
+
+        # Child rows: stable counting sort of the same edges by dependency,
+        # preserving the order children were appended in the dict version
+        n = len(self.ids)
+        counts = [0] * (n + 1)
+        for dep_pos in parent_indices:
+            counts[dep_pos + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        child_indptr = counts[:]
+        fill = counts[:n]
+        child_indices = [0] * len(parent_indices)
+        for child_pos in range(n):
+            for k in range(parent_indptr[child_pos], parent_indptr[child_pos + 1]):
+                dep_pos = parent_indices[k]
+                child_indices[fill[dep_pos]] = child_pos
+                fill[dep_pos] += 1
+
+        self.parent_indptr = parent_indptr
+        self.parent_indices = parent_indices
+        self.child_indptr = child_indptr
+        self.child_indices = child_indices
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _bfs_order_python(csr: FeatureCSR) -> tuple[list[int], list[int]]:
+    """Breadth-first depths from the roots.
+
+    Returns:
+        (depths by position, positions in the order BFS first reached them).
+        Features not reachable from a root (cycles) get depth 0.
+    """
+    n = len(csr)
+    child_indptr, child_indices = csr.child_indptr, csr.child_indices
+    parent_indptr = csr.parent_indptr
+    depth = [-1] * n
+    order: list[int] = []
+
+    frontier = [i for i in range(n) if parent_indptr[i] == parent_indptr[i + 1]]
+    for i in frontier:
+        depth[i] = 0
+    level = 0
+    while frontier:
+        order.extend(frontier)
+        level += 1
+        next_frontier = []
+        for i in frontier:
+            for k in range(child_indptr[i], child_indptr[i + 1]):
+                child = child_indices[k]
+                if depth[child] < 0:
+                    depth[child] = level
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return [d if d >= 0 else 0 for d in depth], order
+
+
+def _bfs_order_numpy(csr: FeatureCSR) -> tuple[list[int], list[int]]:
+    """NumPy version of _bfs_order_python (same depths and visit order)."""
+    n = len(csr)
+    child_indptr = np.asarray(csr.child_indptr, dtype=np.int64)
+    child_indices = np.asarray(csr.child_indices, dtype=np.int64)
+    parent_counts = np.diff(np.asarray(csr.parent_indptr, dtype=np.int64))
+    depth = np.full(n, -1, dtype=np.int64)
+    order = []
+
+    frontier = np.flatnonzero(parent_counts == 0)
+    depth[frontier] = 0
+    level = 0
+    while frontier.size:
+        order.append(frontier)
+        level += 1
+        # Gather every child row of the frontier, in frontier order
+        starts = child_indptr[frontier]
+        lengths = child_indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            break
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        children = child_indices[offsets + np.arange(total)]
+        children = children[depth[children] < 0]
+        # First occurrence of each child, kept in encounter order
+        _, first = np.unique(children, return_index=True)
+        frontier = children[np.sort(first)]
+        depth[frontier] = level
+
+    depth[depth < 0] = 0
+    flat = np.concatenate(order).tolist() if order else []
+    return depth.tolist(), flat
+
+
+def _downstream_counts(csr: FeatureCSR, depth: list[int], order: list[int]) -> list[int]:
+    """Accumulate transitive downstream counts, leaves first.
+
+    Matches the original pass exactly: features are processed by descending
+    depth (stable over BFS order, with unreached features last at depth 0),
+    and every parent edge adds 1 + the child's count at that moment. This
+    counts paths rather than distinct descendants, and stays in Python ints
+    because path counts can exceed 64 bits.
+    """
+    n = len(csr)
+    reached = [False] * n
+    for i in order:
+        reached[i] = True
+    sequence = order + [i for i in range(n) if not reached[i]]
+    sequence.sort(key=lambda i: -depth[i])
+
+    parent_indptr, parent_indices = csr.parent_indptr, csr.parent_indices
+    downstream = [0] * n
+    for i in sequence:
+        for k in range(parent_indptr[i], parent_indptr[i + 1]):
+            downstream[parent_indices[k]] += 1 + downstream[i]
+    return downstream
+
+
+def _distinct_downstream_counts(csr: FeatureCSR) -> list[int]:
+    """Count distinct transitive dependents of every feature.
+
+    An iterative Tarjan pass over child edges emits strongly connected
+    components children-first, so each component's reachability bitset is the
+    union of its children's bitsets (already final) plus, for a cycle, its own
+    members. Linear in nodes plus edges, times the bitset width.
+    """
+    n = len(csr)
+    child_indptr, child_indices = csr.child_indptr, csr.child_indices
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    stack: list[int] = []
+    reach = [0] * n  # Bitset of descendants, including cycle members
+    counter = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, child_indptr[root])]
+
+        while work:
+            node, k = work[-1]
+            end = child_indptr[node + 1]
+            while k < end:
+                child = child_indices[k]
+                k += 1
+                if index[child] < 0:
+                    work[-1] = (node, k)
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, child_indptr[child]))
+                    break
+                if on_stack[child] and index[child] < lowlink[node]:
+                    lowlink[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        members.append(member)
+                        if member == node:
+                            break
+                    bits = 0
+                    cyclic = len(members) > 1
+                    for member in members:
+                        for j in range(child_indptr[member], child_indptr[member + 1]):
+                            child = child_indices[j]
+                            if child == member:
+                                cyclic = True
+                            bits |= (1 << child) | reach[child]
+                    if cyclic:
+                        for member in members:
+                            bits |= 1 << member
+                    for member in members:
+                        reach[member] = bits
+
+    return [(reach[i] & ~(1 << i)).bit_count() for i in range(n)]
+
+
+def _scores_python(csr: FeatureCSR, depth: list[int], downstream: list[int]) -> dict[int, float]:
+    max_depth = max(depth) if depth else 0
+    max_downstream = max(downstream) if downstream else 0
+    scores: dict[int, float] = {}
+    for i, fid in enumerate(csr.ids):
+        unblock = downstream[i] / max_downstream if max_downstream > 0 else 0
+        depth_score = 1 - (depth[i] / max_depth) if max_depth > 0 else 1
+        priority_factor = (10 - min(csr.priorities[i], 10)) / 10
+        scores[fid] = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
+    return scores
+
+
+def _scores_numpy(csr: FeatureCSR, depth: list[int], downstream: list[int]) -> dict[int, float]:
+    depth_arr = np.asarray(depth, dtype=np.float64)
+    max_depth = depth_arr.max()
+    max_downstream = max(downstream)
+
+    if max_downstream > 0:
+        unblock = np.asarray(downstream, dtype=np.float64) / float(max_downstream)
+    else:
+        unblock = np.zeros(len(csr))
+    depth_score = 1 - depth_arr / max_depth if max_depth > 0 else np.ones(len(csr))
+    priorities = np.asarray(csr.priorities, dtype=np.int64)
+    priority_factor = (10 - np.minimum(priorities, 10)) / 10
+
+    total = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
+    return dict(zip(csr.ids, total.tolist()))
+
+
+def _can_use_numpy(csr: FeatureCSR, downstream: list[int]) -> bool:
+    """NumPy float/int64 math is exact only for these inputs."""
+    return (
+        max(downstream) < _MAX_EXACT_FLOAT_INT
+        and all(type(p) is int and abs(p) < _MAX_EXACT_FLOAT_INT for p in csr.priorities)
+    )
+
+
+def _resolve_mode(downstream_mode: Optional[str]) -> str:
+    mode = downstream_mode or DEFAULT_DOWNSTREAM_MODE
+    if mode not in DOWNSTREAM_MODES:
+        raise ValueError(f"Unknown downstream mode {mode!r}, expected one of {DOWNSTREAM_MODES}")
+    return mode
+
+
+def compute_scores(
+    features: list[dict],
+    use_numpy: Optional[bool] = None,
+    downstream_mode: Optional[str] = None,
+) -> dict[int, float]:
+    """Compute scheduling scores (see dependency_resolver.compute_scheduling_scores).
+
+    Args:
+        features: List of feature dicts with id, priority, dependencies fields
+        use_numpy: Force (True) or disable (False) the NumPy backend. None
+            picks NumPy when installed and the graph has at least
+            NUMPY_MIN_FEATURES features.
+        downstream_mode: DOWNSTREAM_PATHS or DOWNSTREAM_DISTINCT. None uses
+            DEFAULT_DOWNSTREAM_MODE (AUTOFORGE_SCORE_DOWNSTREAM).
+
+    Returns:
+        Dict mapping feature_id -> score (higher = schedule first)
+    """
+    mode = _resolve_mode(downstream_mode)
+    if not features:
+        return {}
+    if use_numpy is None:
+        use_numpy = np is not None and len(features) >= NUMPY_MIN_FEATURES
+    elif use_numpy and np is None:
+        raise RuntimeError("NumPy backend requested but numpy is not installed")
+
+    csr = FeatureCSR(features)
+    depth, order = _bfs_order_numpy(csr) if use_numpy else _bfs_order_python(csr)
+    if mode == DOWNSTREAM_DISTINCT:
+        downstream = _distinct_downstream_counts(csr)
+    else:
+        downstream = _downstream_counts(csr, depth, order)
+    if use_numpy and _can_use_numpy(csr, downstream):
+        return _scores_numpy(csr, depth, downstream)
+    return _scores_python(csr, depth, downstream)
+
+
+class SchedulingScoreEngine:
+    """Memoizes scheduling scores on a graph version key.
+
+    Callers pass any hashable key that changes whenever priorities or
+    dependencies may have changed (for example a FeatureGraph version, or a
+    (project, feature change counter) tuple). Calls without a key always
+    recompute. Safe to share between threads; scores are computed outside
+    the lock.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self._max_entries = max_entries
+        self._cache: OrderedDict[tuple[Hashable, str], dict[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scores(
+        self,
+        features: list[dict],
+        version: Optional[Hashable] = None,
+        downstream_mode: Optional[str] = None,
+    ) -> dict[int, float]:
+        """Return scores for features, reusing the result cached for version.
+
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        mode = _resolve_mode(downstream_mode)
+        if version is None:
+            return compute_scores(features, downstream_mode=mode)
+
+        cached = self.cached(version, mode)
+        if cached is not None:
+            return cached
+
+        scores = compute_scores(features, downstream_mode=mode)
+        with self._lock:
+            self._cache[(version, mode)] = scores
+            if len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return scores
+
+    def cached(
+        self,
+        version: Hashable,
+        downstream_mode: Optional[str] = None,
+    ) -> Optional[dict[int, float]]:
+        """Return the scores memoized for version, or None.
+
+        Lets callers skip loading the feature list when it would not be used.
+        """
+        key = (version, _resolve_mode(downstream_mode))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        return cached
+
+    def clear(self) -> None:
+        """Drop all memoized results."""
+        with self._lock:
+            self._cache.clear()
+
+
+# Shared engine used by compute_scheduling_scores
+score_engine = SchedulingScoreEngine()
@@ -0,0 +1,153 @@
+"""
+SQLite Performance Profiles
+===========================
+
+Named sets of per-connection PRAGMAs and pool sizes applied to every SQLite
+database the app opens: the per-project features DB, the per-project
+assistant DB and the global registry.db.
+
+Profiles:
+- safe:       synchronous=FULL, small page cache, no mmap. Every commit is
+              durable, even across power loss. These are SQLite's own
+              defaults, which every database used before profiles existed.
+- balanced:   synchronous=NORMAL (durable across application crashes; the
+              last commits may be lost on power loss in WAL mode), larger
+              cache, in-memory temp tables and a modest mmap window.
+- throughput: synchronous=OFF, large cache and mmap window, less frequent
+              WAL checkpoints and a bigger pool. An OS crash can corrupt the
+              database; intended for throwaway or benchmark projects.
+
+Selection, highest precedence first:
+1. the AUTOFORGE_SQLITE_PROFILE environment variable
+2. the project's sqlite_profile in the registry
+3. the global "sqlite_profile" registry setting
+4. DEFAULT_SQLITE_PROFILE
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PROFILE_ENV = "AUTOFORGE_SQLITE_PROFILE"
+SQLITE_PROFILE_SETTING = "sqlite_profile"
+DEFAULT_SQLITE_PROFILE = "safe"
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """PRAGMA values and connection pool sizes for one profile."""
+
+    name: str
+    synchronous: str
+    cache_size: int  # Negative values are KiB, as in PRAGMA cache_size
+    mmap_size: int  # Bytes
+    temp_store: str
+    wal_autocheckpoint: int  # Pages
+    pool_size: int
+    max_overflow: int
+
+    def connection_pragmas(self, wal: bool = True) -> list[str]:
+        """Return the PRAGMA statements to run on each new connection.
+
+        Outside WAL mode (network filesystems use DELETE) synchronous is
+        never relaxed below FULL and mmap is disabled, since neither is
+        safe there.
+        """
+        synchronous = self.synchronous if wal else "FULL"
+        mmap_size = self.mmap_size if wal else 0
+        pragmas = [
+            f"PRAGMA synchronous={synchronous}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA mmap_size={mmap_size}",
+            f"PRAGMA temp_store={self.temp_store}",
+        ]
+        if wal:
+            pragmas.append(f"PRAGMA wal_autocheckpoint={self.wal_autocheckpoint}")
+        return pragmas
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Return the create_engine() pool arguments for this profile."""
+        return {"pool_size": self.pool_size, "max_overflow": self.max_overflow}
+
+
+SQLITE_PROFILES: dict[str, SQLiteProfile] = {
+    "safe": SQLiteProfile(
+        name="safe",
+        synchronous="FULL",
+        cache_size=-2000,
+        mmap_size=0,
+        temp_store="DEFAULT",
+        wal_autocheckpoint=1000,
+        pool_size=5,
+        max_overflow=10,
+    ),
+    "balanced": SQLiteProfile(
+        name="balanced",
+        synchronous="NORMAL",
+        cache_size=-16000,
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint=1000,
+        pool_size=5,
+        max_overflow=10,
+    ),
+    "throughput": SQLiteProfile(
+        name="throughput",
+        synchronous="OFF",
+        cache_size=-64000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint=4000,
+        pool_size=10,
+        max_overflow=20,
+    ),
+}
+
+
+def get_sqlite_profile(name: str) -> SQLiteProfile:
+    """Return the profile called name.
+
+    Raises:
+        ValueError: If no such profile exists.
+    """
+    try:
+        return SQLITE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown SQLite profile '{name}'. Must be one of: {list(SQLITE_PROFILES)}"
+        ) from None
+
+
+def resolve_sqlite_profile(project_dir: Optional[Path] = None) -> SQLiteProfile:
+    """Return the profile selected for a project (or globally if None).
+
+    Unknown names from the environment or the registry are logged and
+    ignored rather than failing the database open.
+    """
+    candidates = [(SQLITE_PROFILE_ENV, os.environ.get(SQLITE_PROFILE_ENV))]
+    if not candidates[0][1]:
+        from registry import get_sqlite_profile_name
+        candidates.append(("registry", get_sqlite_profile_name(project_dir)))
+
+    for source, name in candidates:
+        if not name:
+            continue
+        if name in SQLITE_PROFILES:
+            return SQLITE_PROFILES[name]
+        logger.warning("Ignoring unknown SQLite profile %r from %s", name, source)
+
+    return SQLITE_PROFILES[DEFAULT_SQLITE_PROFILE]
+
+
+def apply_sqlite_profile(dbapi_connection, profile: SQLiteProfile, wal: bool = True) -> None:
+    """Run the profile's PRAGMAs on a raw DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in profile.connection_pragmas(wal):
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
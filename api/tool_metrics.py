@@ -0,0 +1,310 @@
+"""
+Feature Tool Metrics
+====================
+
+Per-tool latency histograms for the feature MCP server, together with how
+long each call waited for SQLite's write lock and how much SQLite work it
+did.
+
+The server runs every tool call inside ToolMetrics.track(). While a call
+runs, the engine hooks in api/database.py report into it:
+
+- lock wait: time spent in BEGIN IMMEDIATE, which is where a writer sits
+  in busy_timeout (up to 30 s) while another connection holds the lock
+- SQLite steps: progress handler callbacks, one per SQLITE_STEP_UNIT
+  virtual machine instructions. Python's sqlite3 doesn't expose rows
+  scanned, but a scan costs a roughly constant number of instructions per
+  row visited, so steps grow with rows scanned and a full table scan
+  stands out against an index lookup.
+
+Each process keeps the deltas since its last flush and merges them into the
+project's tool_metrics.json at most every FLUSH_INTERVAL seconds (the server
+runs flush() once flush_due() says so), under a lock file. Per-agent stdio servers and the shared server therefore all add
+into one small file that the orchestrator and web UI read with
+load_tool_metrics() and summarize_tool_metrics().
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_VERSION = 1
+
+# Upper bounds (ms) of the latency histogram buckets; one more bucket holds the rest
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# A BEGIN IMMEDIATE slower than this waited for another writer
+CONTENDED_LOCK_MS = 1.0
+
+# SQLite VM instructions per progress handler callback (one "step")
+SQLITE_STEP_UNIT = 1000
+
+FLUSH_INTERVAL = 5.0  # Seconds between merges into the metrics file
+_FILE_LOCK_TIMEOUT = 0.5  # Give up (and retry next flush) after this long
+_STALE_FILE_LOCK = 10.0  # A lock file older than this was left by a dead process
+
+_SUM_KEYS = ("calls", "errors", "total_ms", "transactions", "contended", "lock_wait_ms", "sqlite_steps")
+_MAX_KEYS = ("max_ms", "max_lock_wait_ms")
+
+
+class ToolCall:
+    """What one running tool call did; filled in by the engine hooks."""
+
+    __slots__ = ("transactions", "contended", "lock_wait", "max_lock_wait", "sqlite_steps", "error")
+
+    def __init__(self):
+        self.transactions = 0
+        self.contended = 0
+        self.lock_wait = 0.0
+        self.max_lock_wait = 0.0
+        self.sqlite_steps = 0
+        self.error = False
+
+
+_current_call: contextvars.ContextVar[Optional[ToolCall]] = contextvars.ContextVar(
+    "feature_tool_call", default=None
+)
+_count_sqlite_steps = False
+
+
+def count_sqlite_steps() -> bool:
+    """Whether new connections should install the step counting progress handler."""
+    return _count_sqlite_steps
+
+
+def record_lock_wait(seconds: float) -> None:
+    """Attribute one BEGIN IMMEDIATE to the running tool call, if any."""
+    call = _current_call.get()
+    if call is None:
+        return
+    call.transactions += 1
+    call.lock_wait += seconds
+    call.max_lock_wait = max(call.max_lock_wait, seconds)
+    if seconds * 1000 > CONTENDED_LOCK_MS:
+        call.contended += 1
+
+
+def sqlite_progress() -> int:
+    """sqlite3 progress handler counting steps for the running tool call."""
+    call = _current_call.get()
+    if call is not None:
+        call.sqlite_steps += 1
+    return 0  # Non-zero would abort the statement
+
+
+def _empty_tool_stats() -> dict:
+    stats: dict = {key: 0 for key in _SUM_KEYS + _MAX_KEYS}
+    stats["buckets"] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    return stats
+
+
+def _empty_metrics() -> dict:
+    return {
+        "version": METRICS_VERSION,
+        "buckets_ms": list(LATENCY_BUCKETS_MS),
+        "since": None,
+        "updated_at": None,
+        "tools": {},
+    }
+
+
+def _merge_tools(total: dict, delta: dict) -> None:
+    """Add per-tool stats from delta into total."""
+    for name, stats in delta.items():
+        into = total.setdefault(name, _empty_tool_stats())
+        for key in _SUM_KEYS:
+            into[key] = round(into[key] + stats[key], 3)
+        for key in _MAX_KEYS:
+            into[key] = max(into[key], stats[key])
+        into["buckets"] = [a + b for a, b in zip(into["buckets"], stats["buckets"])]
+
+
+class ToolMetrics:
+    """Process-wide recorder for feature tool calls.
+
+    Args:
+        path: Metrics file to merge into; None keeps the numbers in memory only
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        global _count_sqlite_steps
+        _count_sqlite_steps = True
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+        self._last_flush = time.monotonic()
+
+    @contextmanager
+    def track(self, tool: str) -> Iterator[ToolCall]:
+        """Time a tool call and collect what the engine hooks report for it.
+
+        Set call.error for calls that return an error result; calls that
+        raise are counted as errors automatically.
+        """
+        call = ToolCall()
+        token = _current_call.set(call)
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call.error = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _current_call.reset(token)
+            self._record(tool, elapsed_ms, call)
+
+    def _record(self, tool: str, elapsed_ms: float, call: ToolCall) -> None:
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound), len(LATENCY_BUCKETS_MS)
+        )
+        with self._lock:
+            stats = self._pending.setdefault(tool, _empty_tool_stats())
+            stats["calls"] += 1
+            stats["errors"] += int(call.error)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], round(elapsed_ms, 3))
+            stats["buckets"][bucket] += 1
+            stats["transactions"] += call.transactions
+            stats["contended"] += call.contended
+            stats["lock_wait_ms"] += call.lock_wait * 1000
+            stats["max_lock_wait_ms"] = max(stats["max_lock_wait_ms"], round(call.max_lock_wait * 1000, 3))
+            stats["sqlite_steps"] += call.sqlite_steps
+
+    def flush_due(self) -> bool:
+        """Whether FLUSH_INTERVAL has passed since the last flush."""
+        return time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+
+    def snapshot(self) -> dict:
+        """Per-tool stats recorded since the last successful flush."""
+        with self._lock:
+            total: dict = {}
+            _merge_tools(total, self._pending)
+            return total
+
+    def flush(self) -> bool:
+        """Merge the pending stats into the metrics file.
+
+        Returns:
+            False if the file couldn't be updated; the stats stay pending
+            and are merged by a later flush
+        """
+        # The file is written outside self._lock, so calls finishing meanwhile
+        # don't wait for the file lock
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self.path is None or not self._pending:
+                return True
+            pending, self._pending = self._pending, {}
+        try:
+            with _file_lock(self.path):
+                data = load_tool_metrics(self.path)
+                now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                data["since"] = data["since"] or now
+                data["updated_at"] = now
+                _merge_tools(data["tools"], pending)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+                os.replace(tmp, self.path)
+        except (OSError, TimeoutError) as e:
+            logger.debug("Tool metrics flush failed: %s", e)
+            with self._lock:
+                _merge_tools(self._pending, pending)
+            return False
+        return True
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold <path>.lock, created atomically, for a read-modify-write of path."""
+    lock_path = path.with_name(path.name + ".lock")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + _FILE_LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > _STALE_FILE_LOCK:
+                    lock_path.unlink(missing_ok=True)
+                    continue
+            except OSError:
+                continue  # Released meanwhile
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{lock_path} is held by another process")
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+def load_tool_metrics(path: Path) -> dict:
+    """Read a metrics file; missing, unreadable or outdated files read as empty."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _empty_metrics()
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != METRICS_VERSION
+        or data.get("buckets_ms") != list(LATENCY_BUCKETS_MS)
+    ):
+        return _empty_metrics()
+    return data
+
+
+def _percentile_ms(stats: dict, fraction: float) -> float:
+    """Upper bound of the histogram bucket holding the given fraction of calls."""
+    rank = fraction * stats["calls"]
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, stats["buckets"]):
+        seen += count
+        if seen >= rank:
+            return min(float(bound), float(stats["max_ms"]))
+    return float(stats["max_ms"])
+
+
+def summarize_tool_metrics(data: dict) -> dict:
+    """Turn a metrics file into per-tool averages and percentiles.
+
+    Tools are ordered by total time spent in them, largest first. p50/p95
+    are histogram bucket bounds, so they overestimate by at most one bucket.
+    """
+    tools = []
+    for name, stats in data["tools"].items():
+        calls = stats["calls"] or 1
+        tools.append({
+            "name": name,
+            "calls": stats["calls"],
+            "errors": stats["errors"],
+            "total_ms": round(stats["total_ms"], 1),
+            "avg_ms": round(stats["total_ms"] / calls, 2),
+            "p50_ms": _percentile_ms(stats, 0.5),
+            "p95_ms": _percentile_ms(stats, 0.95),
+            "max_ms": stats["max_ms"],
+            "transactions": stats["transactions"],
+            "contended": stats["contended"],
+            "lock_wait_ms": round(stats["lock_wait_ms"], 1),
+            "max_lock_wait_ms": stats["max_lock_wait_ms"],
+            "sqlite_steps_avg": round(stats["sqlite_steps"] / calls, 1),
+        })
+    tools.sort(key=lambda t: t["total_ms"], reverse=True)
+    return {
+        "since": data["since"],
+        "updated_at": data["updated_at"],
+        "calls": sum(t["calls"] for t in tools),
+        "total_ms": round(sum(t["total_ms"] for t in tools), 1),
+        "lock_wait_ms": round(sum(t["lock_wait_ms"] for t in tools), 1),
+        "tools": tools,
+    }
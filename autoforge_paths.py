@@ -23,6 +23,7 @@ import logging
 import shutil
 import sqlite3
 from pathlib import Path
+from typing import Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,8 @@ assistant.db-shm
 .claude_settings.expand.*.json
 .progress_cache
 .migration_version
+tool_metrics.json
+tool_metrics.json.lock
 """
 
 
@@ -178,6 +181,37 @@ def get_expand_settings_path(project_dir: Path, uuid_hex: str) -> Path:
     return project_dir / ".autoforge" / f".claude_settings.expand.{uuid_hex}.json"
 
 
+def get_tool_metrics_path(project_dir: Path) -> Path:
+    """Return the path to ``tool_metrics.json`` (feature MCP tool latency metrics).
+
+    Always uses the new location; the file is recreated when missing.
+    """
+    return project_dir / ".autoforge" / "tool_metrics.json"
+
+
+# ---------------------------------------------------------------------------
+# Change detection
+# ---------------------------------------------------------------------------
+
+StatSignature = tuple[tuple[int, int] | None, ...]
+
+
+def stat_signature(paths: Iterable[Path]) -> StatSignature:
+    """Return ``(mtime_ns, size)`` per path, ``None`` for missing files.
+
+    Comparing two signatures tells whether any of the files was created,
+    deleted or written in between, at the cost of one ``stat()`` each.
+    """
+    signature: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            st = path.stat()
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
 # ---------------------------------------------------------------------------
 # Lock-file safety check
 # ---------------------------------------------------------------------------
@@ -36,6 +36,8 @@ Example Usage:
 
 import argparse
 import asyncio
+import json
+import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -50,8 +52,8 @@ from agent import run_autonomous_agent
 from registry import DEFAULT_MODEL, get_effective_sdk_env, get_project_path
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments (sys.argv if argv is None)."""
     parser = argparse.ArgumentParser(
         description="Autonomous Coding Agent Demo - Unified orchestrator pattern",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -186,13 +188,49 @@ Authentication:
         help="Max features per coding agent batch (1-3, default: 3)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--warm-worker",
+        action="store_true",
+        default=False,
+        help="Start up, then wait for the real arguments on stdin (used by orchestrator's warm agent pool)",
+    )
+
+    return parser.parse_args(argv)
+
+
+def wait_for_assignment() -> list[str] | None:
+    """Warm worker mode: finish startup, then block until assigned work.
+
+    Heavy imports happen before announcing readiness on the event channel, so
+    the orchestrator's spawn-to-work latency excludes them. The assignment is
+    one JSON line on stdin: {"argv": [...], "env": {...}}. Returns the argv to
+    run with, or None if stdin closed without an assignment (pool shutdown).
+    """
+    # Modules every agent session needs; agent.py already pulled in the SDK,
+    # client, prompts and progress modules
+    import api.database  # noqa: F401
+    import security  # noqa: F401
+    from server.utils.agent_events import WORKER_READY, get_event_channel
+
+    get_event_channel().emit(WORKER_READY, pid=os.getpid())
+
+    line = sys.stdin.readline()
+    if not line.strip():
+        return None
+    assignment = json.loads(line)
+    os.environ.update(assignment.get("env", {}))
+    return list(assignment["argv"])
 
 
 def main() -> None:
     """Main entry point."""
     print("[ENTRY] autonomous_agent_demo.py starting...", flush=True)
     args = parse_args()
+    if args.warm_worker:
+        argv = wait_for_assignment()
+        if argv is None:
+            return
+        args = parse_args(argv)
 
     # Note: Authentication is handled by start.bat/start.sh before this script runs.
     # The Claude SDK auto-detects credentials from ~/.claude/.credentials.json
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Database Startup Benchmark
+==========================
+
+Measures how long each process type spends opening a project's feature
+database, in fresh interpreters:
+
+- create_database: the shared open path on its own
+- mcp_server: feature_mcp.init_database() (once per agent in stdio mode)
+- orchestrator: ParallelOrchestrator(project_dir)
+- web_server: first features-router session (first request for a project)
+
+Each is timed against a database whose schema is current (PRAGMA
+user_version matches, so migrations are skipped) and one reset to
+user_version 0, which runs every migration as each start did before
+versioning.
+
+Usage:
+    python benchmarks/db_startup.py [--runs 9] [--features 2000]
+"""
+
+import argparse
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api.database import Feature, atomic_transaction, create_database, dispose_engine, get_database_path
+
+# Each snippet prints the seconds spent opening the database
+PROCESS_TYPES = {
+    "create_database": """
+        from api.database import create_database
+        start = time.perf_counter()
+        create_database(Path(project_dir))
+    """,
+    "mcp_server": """
+        os.environ["PROJECT_DIR"] = project_dir
+        from mcp_server import feature_mcp
+        start = time.perf_counter()
+        feature_mcp.init_database()
+    """,
+    "orchestrator": """
+        from parallel_orchestrator import ParallelOrchestrator
+        start = time.perf_counter()
+        ParallelOrchestrator(Path(project_dir))
+    """,
+    "web_server": """
+        from sqlalchemy import text
+        from server.routers.features import get_db_session
+        start = time.perf_counter()
+        with get_db_session(Path(project_dir), read_only=True) as session:
+            session.execute(text("SELECT COUNT(*) FROM features"))
+    """,
+}
+
+
+def _time_process(snippet: str, project_dir: Path) -> float:
+    code = textwrap.dedent("""
+        import os, sys, time
+        from pathlib import Path
+        sys.path.insert(0, {root!r})
+        project_dir = {project_dir!r}
+    """).format(root=str(ROOT), project_dir=str(project_dir))
+    code += textwrap.dedent(snippet) + "print(time.perf_counter() - start)\n"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _reset_schema_version(project_dir: Path) -> None:
+    conn = sqlite3.connect(get_database_path(project_dir))
+    try:
+        conn.execute("PRAGMA user_version = 0")
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=9, help="Processes started per measurement (default: 9)")
+    parser.add_argument("--features", type=int, default=2000, help="Rows in the features table (default: 2000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        _, session_maker = create_database(project_dir)
+        with atomic_transaction(session_maker) as session:
+            for i in range(1, args.features + 1):
+                session.add(Feature(priority=i, category="bench", name=f"Feature {i}",
+                                    description="Benchmark feature", steps=["step"]))
+        dispose_engine(project_dir)
+
+        print(f"{args.features} features, median of {args.runs} processes (ms)")
+        print(f"{'process':<16} {'unversioned':>12} {'current':>10}")
+        for name, snippet in PROCESS_TYPES.items():
+            # Interleaved, so background noise hits both columns alike
+            unversioned, current = [], []
+            for _ in range(args.runs):
+                _reset_schema_version(project_dir)
+                unversioned.append(_time_process(snippet, project_dir))
+                current.append(_time_process(snippet, project_dir))
+            print(f"{name:<16} {statistics.median(unversioned) * 1000:>12.1f} "
+                  f"{statistics.median(current) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Feature Import Benchmark
+========================
+
+Measures bulk feature creation throughput (features/s) for the paths an
+initializer run or an import can take:
+
+    orm     the previous feature_create_bulk: decode the whole JSON list,
+            one ORM object per feature, flush, then set dependencies
+    core    feature_create_bulk now: decode the whole JSON list, then
+            bulk_insert_features() in one transaction
+    ndjson  POST /features/import: decode an NDJSON file line by line and
+            commit every chunk (see api/feature_import.py)
+
+Every path starts from its serialized payload and a fresh database, and
+about a third of the features depend on up to three earlier ones through
+depends_on_indices.
+
+Usage:
+    python benchmarks/feature_import.py [--features 10000] [--chunk-size 500]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api.database import Feature, atomic_transaction, create_database, dispose_engine, record_feature_events
+from api.feature_import import bulk_insert_features, iter_ndjson
+
+
+def make_features(count: int) -> list[dict]:
+    rng = random.Random(0)
+    features = []
+    for i in range(count):
+        item: dict[str, object] = {
+            "category": f"Category {i % 20}",
+            "name": f"Feature {i}",
+            "description": "Benchmark feature " * 10,
+            "steps": [f"Step {n}" for n in range(5)],
+        }
+        if i and rng.random() < 0.33:
+            item["depends_on_indices"] = sorted(rng.sample(range(i), min(i, rng.randint(1, 3))))
+        features.append(item)
+    return features
+
+
+def import_orm(session_maker, payload: Path, chunk_size: int) -> None:
+    features = json.loads(payload.read_text())
+    with atomic_transaction(session_maker) as session:
+        start = (session.query(Feature.priority).order_by(Feature.priority.desc()).limit(1).scalar() or 0) + 1
+        created = []
+        for i, data in enumerate(features):
+            feature = Feature(priority=start + i, category=data["category"], name=data["name"],
+                              description=data["description"], steps=data["steps"], passes=False, in_progress=False)
+            session.add(feature)
+            created.append(feature)
+        session.flush()
+        for i, data in enumerate(features):
+            if data.get("depends_on_indices"):
+                created[i].dependencies = sorted(created[idx].id for idx in data["depends_on_indices"])
+        record_feature_events(session, [{"feature_id": f.id, "event_type": "created"} for f in created])
+
+
+def import_core(session_maker, payload: Path, chunk_size: int) -> None:
+    features = json.loads(payload.read_text())
+    with atomic_transaction(session_maker) as session:
+        bulk_insert_features(session, features, chunk_size=chunk_size)
+
+
+def import_ndjson(session_maker, payload: Path, chunk_size: int) -> None:
+    session = session_maker()
+    try:
+        with payload.open("rb") as f:
+            bulk_insert_features(session, iter_ndjson(f), chunk_size=chunk_size, commit_chunks=True)
+    finally:
+        session.close()
+
+
+MODES = {"orm": import_orm, "core": import_core, "ndjson": import_ndjson}
+
+
+def _import_once(mode: str, features: list[dict], chunk_size: int, trace_memory: bool) -> tuple[float, float]:
+    """Import into a fresh database; returns (seconds, peak traced MiB)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        payload = project_dir / "features.payload"
+        if mode == "ndjson":
+            payload.write_text("".join(json.dumps(f) + "\n" for f in features))
+        else:
+            payload.write_text(json.dumps(features))
+        _, session_maker = create_database(project_dir)
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        MODES[mode](session_maker, payload, chunk_size)
+        elapsed = time.perf_counter() - started
+        peak = 0.0
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+
+        session = session_maker()
+        try:
+            assert session.query(Feature).count() == len(features)
+        finally:
+            session.close()
+        dispose_engine(project_dir)
+    return elapsed, peak
+
+
+def run(mode: str, features: list[dict], chunk_size: int) -> tuple[float, float]:
+    """Return (features/s, peak traced memory in MiB) for one mode.
+
+    Memory is traced in a second import because tracemalloc slows the
+    allocation-heavy paths several times over.
+    """
+    elapsed, _ = _import_once(mode, features, chunk_size, trace_memory=False)
+    _, peak = _import_once(mode, features, chunk_size, trace_memory=True)
+    return len(features) / elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", type=int, default=10000, help="Features per import (default: 10000)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Features per INSERT/commit (default: 500)")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES),
+                        help="Import paths to compare (default: all)")
+    args = parser.parse_args()
+
+    features = make_features(args.features)
+    print(f"{args.features} features, chunk size {args.chunk_size}")
+    print(f"{'mode':<8} {'features/s':>11} {'peak MiB':>9}")
+    for mode in args.modes:
+        rate, peak = run(mode, features, args.chunk_size)
+        print(f"{mode:<8} {rate:>11.0f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
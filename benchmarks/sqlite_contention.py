@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+SQLite Read/Write Contention Benchmark
+======================================
+
+Measures feature-database throughput with N concurrent reader processes and
+M concurrent writer processes, the way agents, the orchestrator and the web
+UI share a project's database.
+
+Readers run the feature_get_stats aggregate; writers toggle a feature's
+in_progress flag in an atomic_transaction (BEGIN IMMEDIATE). Each mode is run
+against a fresh WAL database:
+
+- immediate: readers use the read-write engine, so every read takes the
+  write lock first (the previous behaviour)
+- deferred: readers use create_read_only_database() sessions
+
+Readers loop as fast as they can unless --read-interval paces them like the
+UI's and orchestrator's polling. On machines with fewer cores than workers,
+unpaced deferred readers also compete with writers for CPU, so compare the
+total as well as each column.
+
+Usage:
+    python benchmarks/sqlite_contention.py [--readers 8] [--writers 2] [--seconds 5] [--read-interval 0]
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import case, func
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.database import (
+    Feature,
+    atomic_transaction,
+    create_database,
+    create_read_only_database,
+    dispose_engine,
+)
+
+
+def _seed(project_dir: Path, count: int) -> None:
+    _, session_maker = create_database(project_dir)
+    with atomic_transaction(session_maker) as session:
+        for i in range(1, count + 1):
+            session.add(Feature(priority=i, category="bench", name=f"Feature {i}",
+                                description="Benchmark feature", steps=["step"]))
+
+
+def _read_stats(session_maker) -> None:
+    session = session_maker()
+    try:
+        session.query(
+            func.count(Feature.id),
+            func.sum(case((Feature.passes == True, 1), else_=0)),
+            func.sum(case((Feature.in_progress == True, 1), else_=0)),
+        ).one()
+    finally:
+        session.close()
+
+
+def _toggle_feature(session_maker, feature_count: int) -> None:
+    feature_id = random.randint(1, feature_count)
+    with atomic_transaction(session_maker) as session:
+        feature = session.query(Feature).filter(Feature.id == feature_id).one()
+        feature.in_progress = not feature.in_progress
+
+
+def _worker(role: str, mode: str, project_dir: str, feature_count: int, read_interval: float,
+            start, stop, results) -> None:
+    """Reader or writer process: loop until stop is set, then report."""
+    path = Path(project_dir)
+    if role == "writer" or mode == "immediate":
+        _, session_maker = create_database(path)
+    else:
+        _, session_maker = create_read_only_database(path)
+    done, latencies = 0, []
+    start.wait()
+    while not stop.is_set():
+        started = time.perf_counter()
+        if role == "reader":
+            _read_stats(session_maker)
+            if read_interval:
+                stop.wait(read_interval)
+        else:
+            _toggle_feature(session_maker, feature_count)
+        latencies.append(time.perf_counter() - started)
+        done += 1
+    results.put((role, done, latencies))
+
+
+def run_mode(mode: str, readers: int, writers: int, seconds: float, feature_count: int,
+             read_interval: float = 0.0) -> dict:
+    """Run one mode against a fresh database and return throughput numbers."""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        _seed(Path(tmp), feature_count)
+        dispose_engine(Path(tmp))
+
+        start, stop, results = ctx.Barrier(readers + writers + 1), ctx.Event(), ctx.Queue()
+        roles = ["reader"] * readers + ["writer"] * writers
+        procs = [ctx.Process(target=_worker, args=(role, mode, tmp, feature_count, read_interval,
+                                                         start, stop, results))
+                 for role in roles]
+        for p in procs:
+            p.start()
+        start.wait()
+        time.sleep(seconds)
+        stop.set()
+        reports = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    counts = {"reader": 0, "writer": 0}
+    read_latencies: list[float] = []
+    for role, done, latencies in reports:
+        counts[role] += done
+        if role == "reader":
+            read_latencies.extend(latencies)
+    read_latencies.sort()
+    p95 = read_latencies[int(0.95 * (len(read_latencies) - 1))] if read_latencies else 0.0
+    return {
+        "mode": mode,
+        "reads_per_s": counts["reader"] / seconds,
+        "writes_per_s": counts["writer"] / seconds,
+        "read_p95_ms": p95 * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent reader processes (default: 8)")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent writer processes (default: 2)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each mode (default: 5)")
+    parser.add_argument("--features", type=int, default=200, help="Rows in the features table (default: 200)")
+    parser.add_argument("--read-interval", type=float, default=0.0,
+                        help="Seconds each reader sleeps between reads (default: 0)")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per mode, "
+          f"{args.features} features, read interval {args.read_interval:g}s")
+    print(f"{'mode':<10} {'reads/s':>10} {'writes/s':>10} {'total/s':>10} {'read p95 ms':>12}")
+    results = [run_mode(mode, args.readers, args.writers, args.seconds, args.features, args.read_interval)
+               for mode in ("immediate", "deferred")]
+    for r in results:
+        total = r["reads_per_s"] + r["writes_per_s"]
+        print(f"{r['mode']:<10} {r['reads_per_s']:>10.0f} {r['writes_per_s']:>10.0f} {total:>10.0f} "
+              f"{r['read_p95_ms']:>12.2f}")
+    before, after = results
+    if before["reads_per_s"]:
+        print(f"Read throughput: {after['reads_per_s'] / before['reads_per_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
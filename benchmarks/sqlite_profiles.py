@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Benchmark
+========================
+
+Replays an orchestrator + feature MCP workload against each SQLite profile
+(see api/sqlite_profiles.py) and reports throughput and latency.
+
+The workload is a trace of MCP tool calls, one list per agent, in the order
+a coding agent issues them for each feature it works on:
+
+    feature_get_stats, feature_get_ready, feature_claim_and_get,
+    feature_get_by_id, feature_mark_passing
+
+Agents run as separate processes calling the real feature_mcp tool
+functions, while an orchestrator process refreshes a FeatureGraph on a
+read-only session at its polling interval, as run_loop does. Each profile
+gets a fresh copy of the same seeded database and is selected through
+AUTOFORGE_SQLITE_PROFILE.
+
+A trace can be saved with --record and replayed later with --trace, so the
+same workload can be compared across machines or commits.
+
+Usage:
+    python benchmarks/sqlite_profiles.py [--agents 4] [--features 400] [--poll-ms 50]
+    python benchmarks/sqlite_profiles.py --record trace.json
+    python benchmarks/sqlite_profiles.py --trace trace.json --profiles safe balanced
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from api.database import Feature, atomic_transaction, create_database, dispose_engine
+from api.sqlite_profiles import SQLITE_PROFILE_ENV, SQLITE_PROFILES
+
+AGENT_CALLS = ("feature_get_stats", "feature_get_ready", "feature_claim_and_get",
+               "feature_get_by_id", "feature_mark_passing")
+
+
+def record_workload(agents: int, features: int) -> dict:
+    """Build a trace that spreads the features round-robin over the agents."""
+    trace: dict = {"features": features, "agents": [[] for _ in range(agents)]}
+    for feature_id in range(1, features + 1):
+        calls = trace["agents"][(feature_id - 1) % agents]
+        for tool in AGENT_CALLS:
+            if tool == "feature_get_stats":
+                calls.append([tool, {}])
+            elif tool == "feature_get_ready":
+                calls.append([tool, {"limit": 10}])
+            else:
+                calls.append([tool, {"feature_id": feature_id}])
+    return trace
+
+
+def _seed(project_dir: Path, count: int) -> None:
+    _, session_maker = create_database(project_dir)
+    with atomic_transaction(session_maker) as session:
+        for i in range(1, count + 1):
+            # Every fifth feature depends on the one before it
+            deps = [i - 1] if i % 5 == 0 else None
+            session.add(Feature(priority=i, category="bench", name=f"Feature {i}",
+                                description="Benchmark feature", steps=["step"], dependencies=deps))
+    dispose_engine(project_dir)
+
+
+def _agent(project_dir: str, calls: list, start, results) -> None:
+    """Replay one agent's tool calls through the feature MCP server functions."""
+    os.environ["PROJECT_DIR"] = project_dir
+    from mcp_server import feature_mcp
+
+    feature_mcp.init_database()
+    latencies: dict[str, list[float]] = {tool: [] for tool in AGENT_CALLS}
+    start.wait()
+    for tool, kwargs in calls:
+        started = time.perf_counter()
+        getattr(feature_mcp, tool)(**kwargs)
+        latencies[tool].append(time.perf_counter() - started)
+    feature_mcp.close_database()
+    results.put(("agent", latencies))
+
+
+def _orchestrator(project_dir: str, poll_ms: float, start, stop, results) -> None:
+    """Refresh a FeatureGraph at the orchestrator's polling interval until stopped."""
+    from api.database import create_read_only_database
+    from api.feature_graph import FeatureGraph
+
+    _, session_maker = create_read_only_database(Path(project_dir))
+    graph = FeatureGraph(session_maker)
+    refreshes: list[float] = []
+    start.wait()
+    while not stop.is_set():
+        started = time.perf_counter()
+        graph.refresh()
+        graph.ready_ids  # noqa: B018 - what the scheduler reads after each refresh
+        refreshes.append(time.perf_counter() - started)
+        stop.wait(poll_ms / 1000)
+    results.put(("orchestrator", {"refresh": refreshes}))
+
+
+def _p95(values: list[float]) -> float:
+    values = sorted(values)
+    return values[int(0.95 * (len(values) - 1))] * 1000 if values else 0.0
+
+
+def run_profile(profile: str, trace: dict, seed_dir: Path, poll_ms: float) -> dict:
+    """Replay the trace against a copy of the seeded database using one profile."""
+    ctx = multiprocessing.get_context("spawn")
+    os.environ[SQLITE_PROFILE_ENV] = profile
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = Path(tmp)
+        for src in seed_dir.rglob("*"):
+            if src.is_file():
+                dst = project_dir / src.relative_to(seed_dir)
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                dst.write_bytes(src.read_bytes())
+
+        agents = trace["agents"]
+        start, stop, results = ctx.Barrier(len(agents) + 2), ctx.Event(), ctx.Queue()
+        agent_procs = [ctx.Process(target=_agent, args=(tmp, calls, start, results)) for calls in agents]
+        orch = ctx.Process(target=_orchestrator, args=(tmp, poll_ms, start, stop, results))
+        for p in agent_procs + [orch]:
+            p.start()
+        start.wait()
+        started = time.perf_counter()
+        reports = [results.get() for _ in agent_procs]
+        elapsed = time.perf_counter() - started
+        stop.set()
+        reports.append(results.get())
+        for p in agent_procs + [orch]:
+            p.join()
+
+    tool_latencies: dict[str, list[float]] = {tool: [] for tool in AGENT_CALLS}
+    refreshes: list[float] = []
+    for role, latencies in reports:
+        if role == "agent":
+            for tool, values in latencies.items():
+                tool_latencies[tool].extend(values)
+        else:
+            refreshes = latencies["refresh"]
+    calls = sum(len(v) for v in tool_latencies.values())
+    return {
+        "profile": profile,
+        "seconds": elapsed,
+        "calls_per_s": calls / elapsed,
+        "write_p95_ms": _p95(tool_latencies["feature_claim_and_get"] + tool_latencies["feature_mark_passing"]),
+        "read_p95_ms": _p95(tool_latencies["feature_get_stats"] + tool_latencies["feature_get_ready"]
+                            + tool_latencies["feature_get_by_id"]),
+        "refresh_median_ms": statistics.median(refreshes) * 1000 if refreshes else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=4, help="Concurrent agent processes (default: 4)")
+    parser.add_argument("--features", type=int, default=400, help="Features in the workload (default: 400)")
+    parser.add_argument("--poll-ms", type=float, default=50.0,
+                        help="Orchestrator FeatureGraph refresh interval (default: 50)")
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES),
+                        help="Profiles to compare (default: all)")
+    parser.add_argument("--record", type=Path, help="Write the generated trace to this file and exit")
+    parser.add_argument("--trace", type=Path, help="Replay a trace written by --record")
+    args = parser.parse_args()
+
+    trace = json.loads(args.trace.read_text()) if args.trace else record_workload(args.agents, args.features)
+    if args.record:
+        args.record.write_text(json.dumps(trace))
+        print(f"Wrote {sum(len(a) for a in trace['agents'])} calls to {args.record}")
+        return
+
+    with tempfile.TemporaryDirectory() as seed_tmp:
+        seed_dir = Path(seed_tmp)
+        _seed(seed_dir, trace["features"])
+
+        print(f"{len(trace['agents'])} agents, {trace['features']} features, "
+              f"orchestrator poll {args.poll_ms:g} ms")
+        print(f"{'profile':<11} {'seconds':>8} {'calls/s':>9} {'write p95 ms':>13} "
+              f"{'read p95 ms':>12} {'refresh ms':>11}")
+        for profile in args.profiles:
+            r = run_profile(profile, trace, seed_dir, args.poll_ms)
+            print(f"{r['profile']:<11} {r['seconds']:>8.2f} {r['calls_per_s']:>9.0f} {r['write_p95_ms']:>13.2f} "
+                  f"{r['read_p95_ms']:>12.2f} {r['refresh_median_ms']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
 from claude_agent_sdk.types import HookContext, HookInput, HookMatcher, SyncHookJSONOutput
 from dotenv import load_dotenv
 
+from mcp_server import FEATURE_MCP_TOKEN_ENV, FEATURE_MCP_URL_ENV
 from security import SENSITIVE_DIRECTORIES, bash_security_hook
 
 # Load environment variables from .env file if present
@@ -150,12 +151,15 @@ CODING_AGENT_TOOLS = [
     "mcp__features__feature_get_stats",
     "mcp__features__feature_get_by_id",
     "mcp__features__feature_get_summary",
+    "mcp__features__feature_get_many",
     "mcp__features__feature_get_ready",
     "mcp__features__feature_get_blocked",
     "mcp__features__feature_get_graph",
     "mcp__features__feature_claim_and_get",
+    "mcp__features__feature_claim_batch",
     "mcp__features__feature_mark_in_progress",
     "mcp__features__feature_mark_passing",
+    "mcp__features__feature_mark_passing_many",
     "mcp__features__feature_mark_failing",
     "mcp__features__feature_skip",
     "mcp__features__feature_clear_in_progress",
@@ -165,10 +169,12 @@ TESTING_AGENT_TOOLS = [
     "mcp__features__feature_get_stats",
     "mcp__features__feature_get_by_id",
     "mcp__features__feature_get_summary",
+    "mcp__features__feature_get_many",
     "mcp__features__feature_get_ready",
     "mcp__features__feature_get_blocked",
     "mcp__features__feature_get_graph",
     "mcp__features__feature_mark_passing",
+    "mcp__features__feature_mark_passing_many",
     "mcp__features__feature_mark_failing",
 ]
 
@@ -205,6 +211,32 @@ BUILTIN_TOOLS = [
 ]
 
 
+def get_feature_mcp_config(project_dir: Path) -> dict:
+    """
+    MCP server config for the feature tools.
+
+    Attaches to the orchestrator's shared server when its URL is in the
+    environment, otherwise starts a stdio server for this agent.
+    """
+    shared_url = os.getenv(FEATURE_MCP_URL_ENV, "")
+    if shared_url:
+        return {
+            "type": "http",
+            "url": shared_url,
+            "headers": {"Authorization": f"Bearer {os.getenv(FEATURE_MCP_TOKEN_ENV, '')}"},
+        }
+    return {
+        "command": sys.executable,  # Use the same Python that's running this script
+        "args": ["-m", "mcp_server.feature_mcp"],
+        "env": {
+            # Only specify variables the MCP server needs
+            # (subprocess inherits parent environment automatically)
+            "PROJECT_DIR": str(project_dir.resolve()),
+            "PYTHONPATH": str(Path(__file__).parent.resolve()),
+        },
+    }
+
+
 def create_client(
     project_dir: Path,
     model: str,
@@ -311,10 +343,12 @@ def create_client(
     if extra_read_paths:
         print(f"   - Extra read paths (validated): {', '.join(str(p) for p in extra_read_paths)}")
     print("   - Bash commands restricted to allowlist (see security.py)")
+    features_server = get_feature_mcp_config(project_dir)
+    features_label = "features (database, shared)" if features_server.get("type") == "http" else "features (database)"
     if yolo_mode:
-        print("   - MCP servers: features (database) - YOLO MODE (no browser testing)")
+        print(f"   - MCP servers: {features_label} - YOLO MODE (no browser testing)")
     else:
-        print("   - MCP servers: features (database)")
+        print(f"   - MCP servers: {features_label}")
     print("   - Project settings enabled (skills, commands, CLAUDE.md)")
     print()
 
@@ -327,16 +361,7 @@ def create_client(
 
     # Build MCP servers config - features is always included, playwright only in standard mode
     mcp_servers = {
-        "features": {
-            "command": sys.executable,  # Use the same Python that's running this script
-            "args": ["-m", "mcp_server.feature_mcp"],
-            "env": {
-                # Only specify variables the MCP server needs
-                # (subprocess inherits parent environment automatically)
-                "PROJECT_DIR": str(project_dir.resolve()),
-                "PYTHONPATH": str(Path(__file__).parent.resolve()),
-            },
-        },
+        "features": features_server,
     }
     # Build environment overrides for API endpoint configuration
     # Uses get_effective_sdk_env() which reads provider settings from the database,
@@ -0,0 +1,60 @@
+"""
+Shared pytest fixtures
+======================
+
+feature_db: a fresh project database with write and read-only engines, wired
+into the feature MCP server module so its tools read and write it.
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import Feature, atomic_transaction, create_database, create_read_only_database, dispose_engine
+from mcp_server import feature_mcp
+
+
+@dataclass
+class FeatureDB:
+    """A test project's database and its session makers."""
+
+    project_dir: Path
+    session_maker: sessionmaker
+    read_session_maker: sessionmaker
+
+    def add(self, *features: dict) -> None:
+        """Insert features in one transaction.
+
+        Each dict holds Feature columns; category, description and steps
+        default to placeholders and name to "f<id>".
+        """
+        with atomic_transaction(self.session_maker) as session:
+            for values in features:
+                values = {"category": "c", "description": "d", "steps": ["s"], **values}
+                values.setdefault("name", f"f{values['id']}")
+                session.add(Feature(**values))
+
+
+@pytest.fixture
+def feature_db(tmp_path, monkeypatch):
+    """Empty feature database in tmp_path/"proj", used by the feature MCP tools.
+
+    Request fixtures that must exist before the engines connect (such as
+    ToolMetrics, which counts SQLite steps on new connections) ahead of this
+    one.
+    """
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    _, session_maker = create_database(project_dir)
+    _, read_session_maker = create_read_only_database(project_dir)
+    monkeypatch.setattr(feature_mcp, "_session_maker", session_maker)
+    monkeypatch.setattr(feature_mcp, "_read_session_maker", read_session_maker)
+    monkeypatch.setattr(feature_mcp, "PROJECT_DIR", project_dir)
+    yield FeatureDB(project_dir, session_maker, read_session_maker)
+    dispose_engine(project_dir)
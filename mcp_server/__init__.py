@@ -1 +1,8 @@
 """MCP Server Package for Feature Management."""
+
+# Shared server mode: the orchestrator hosts one feature MCP server per
+# project (python -m mcp_server.feature_mcp --shared) and hands agents its
+# URL and bearer token through these variables. Unset or empty means the
+# agent starts its own stdio server.
+FEATURE_MCP_URL_ENV = "AUTOFORGE_FEATURE_MCP_URL"
+FEATURE_MCP_TOKEN_ENV = "AUTOFORGE_FEATURE_MCP_TOKEN"
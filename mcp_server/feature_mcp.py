@@ -9,11 +9,14 @@ Tools:
 - feature_get_stats: Get progress statistics
 - feature_get_by_id: Get a specific feature by ID
 - feature_get_summary: Get minimal feature info (id, name, status, deps)
+- feature_get_many: Get several features by ID in one call
 - feature_mark_passing: Mark a feature as passing
+- feature_mark_passing_many: Mark several features as passing in one transaction
 - feature_mark_failing: Mark a feature as failing (regression detected)
 - feature_skip: Skip a feature (move to end of queue)
 - feature_mark_in_progress: Mark a feature as in-progress
 - feature_claim_and_get: Atomically claim and get feature details
+- feature_claim_batch: Atomically claim several features and get their details
 - feature_clear_in_progress: Clear in-progress status
 - feature_create_bulk: Create multiple features at once
 - feature_create: Create a single feature
@@ -25,29 +28,80 @@ Tools:
 
 Note: Feature selection (which feature to work on) is handled by the
 orchestrator, not by agents. Agents receive pre-assigned feature IDs.
+
+Transports:
+- stdio (default): one server process per agent, started by the Claude CLI.
+- --shared: one long-lived streamable HTTP server per project, hosted by the
+  orchestrator on 127.0.0.1 and shared by all its agents. It binds a free
+  port, reports its URL as an mcp_server_ready event, and only accepts
+  requests carrying the bearer token from AUTOFORGE_FEATURE_MCP_TOKEN. Tools
+  run in worker threads, so a write waiting in busy_timeout for another
+  process's write lock doesn't hold up other agents' reads. Write tools run
+  one at a time, so agents' writes are serialized in-process instead of
+  racing for BEGIN IMMEDIATE.
+
+Every tool call is timed, with its write lock wait and SQLite work, and
+merged into the project's .autoforge/tool_metrics.json (see
+api/tool_metrics.py).
 """
 
+import asyncio
+import bisect
+import functools
+import hmac
 import json
 import os
+import signal
+import socket
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Annotated
 
+import anyio
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import text, update
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Add parent directory to path so we can import from api module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.database import Feature, atomic_transaction, create_database
+from api.database import (
+    Feature,
+    atomic_transaction,
+    count_blocked_features,
+    create_database,
+    create_read_only_database,
+    dispose_engine,
+    get_blocking_dependencies,
+    get_feature_graph_seq,
+    get_ready_feature_keys,
+    record_feature_event,
+    record_feature_events,
+    would_create_circular_dependency_db,
+)
 from api.dependency_resolver import (
     MAX_DEPENDENCIES_PER_FEATURE,
     compute_scheduling_scores,
-    would_create_circular_dependency,
+)
+from api.feature_import import bulk_insert_features
+from api.feature_pages import (
+    GRAPH_NODE_FIELDS,
+    MAX_PAGE_SIZE,
+    PageRequestError,
+    decode_cursor,
+    encode_cursor,
+    graph_page,
+    load_features,
+    parse_fields,
+    project,
 )
 from api.migration import migrate_json_to_sqlite
+from api.score_engine import score_engine
+from api.tool_metrics import ToolMetrics
+from autoforge_paths import get_tool_metrics_path
 
 # Configuration from environment
 PROJECT_DIR = Path(os.environ.get("PROJECT_DIR", ".")).resolve()
@@ -92,38 +146,145 @@ class BulkCreateInput(BaseModel):
     features: list[FeatureCreateItem] = Field(..., min_length=1, description="List of features to create")
 
 
-# Global database session maker (initialized on startup)
+# Batch tools take a list of feature IDs; agents handle a few features per
+# session, so this only guards against runaway inputs.
+MAX_BATCH_FEATURES = 50
+FeatureIdList = Annotated[
+    list[Annotated[int, Field(ge=1)]],
+    Field(min_length=1, max_length=MAX_BATCH_FEATURES, description="Feature IDs (duplicates are ignored)"),
+]
+
+# Projection and paging parameters shared by the list-returning tools
+FieldsParam = Annotated[
+    list[str] | None,
+    Field(default=None, description="Only return these keys of each feature (id is always included), "
+                                    "e.g. [\"id\", \"name\", \"passes\"]. Omit for all keys."),
+]
+CursorParam = Annotated[
+    str | None,
+    Field(default=None, description="next_cursor from the previous call, to get the next page"),
+]
+
+
+# Global database session makers (initialized on startup). Read-only tools
+# use deferred transactions so they don't queue behind the write lock.
 _session_maker = None
+_read_session_maker = None
 _engine = None
+_tool_metrics: ToolMetrics | None = None
 
-# NOTE: The old threading.Lock() was removed because it only worked per-process,
-# not cross-process. In parallel mode, multiple MCP servers run in separate
-# processes, so the lock was useless. We now use atomic SQL operations instead.
+# Cross-process safety comes from atomic SQL operations (guarded UPDATEs in
+# BEGIN IMMEDIATE transactions), since per-agent stdio servers run in separate
+# processes. The shared server also serializes its own write tools on one
+# limiter (see run_sync_tools_in_threads), so agents attached to it never
+# contend for the write lock with each other.
 
 
-@asynccontextmanager
-async def server_lifespan(server: FastMCP):
-    """Initialize database on startup, cleanup on shutdown."""
-    global _session_maker, _engine
+def init_database() -> None:
+    """Open the project database (creating and migrating it if needed)."""
+    global _session_maker, _read_session_maker, _engine, _tool_metrics
 
     # Create project directory if it doesn't exist
     PROJECT_DIR.mkdir(parents=True, exist_ok=True)
 
+    # Before the engines, so their connections report SQLite work
+    _tool_metrics = ToolMetrics(get_tool_metrics_path(PROJECT_DIR))
+
     # Initialize database
     _engine, _session_maker = create_database(PROJECT_DIR)
 
     # Run migration if needed (converts legacy JSON to SQLite)
     migrate_json_to_sqlite(PROJECT_DIR, _session_maker)
 
-    yield
+    _, _read_session_maker = create_read_only_database(PROJECT_DIR)
+
 
-    # Cleanup
+def close_database() -> None:
+    """Dispose the database engines."""
+    global _session_maker, _read_session_maker, _engine, _tool_metrics
+
+    if _tool_metrics is not None:
+        _tool_metrics.flush()
     if _engine:
-        _engine.dispose()
+        dispose_engine(PROJECT_DIR)
+    _engine = _session_maker = _read_session_maker = _tool_metrics = None
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Initialize database on startup, cleanup on shutdown."""
+    if _session_maker is not None:
+        # Shared server: entered once per client session, while the
+        # database stays open for the life of the process
+        yield
+        return
+
+    init_database()
+    try:
+        yield
+    finally:
+        close_database()
+
+
+def _is_error_result(result) -> bool:
+    """Whether a converted tool result is one of the {"error": ...} payloads."""
+    content = result[0] if isinstance(result, tuple) else result
+    first = content[0] if isinstance(content, list) and content else None
+    return getattr(first, "text", "").startswith('{"error"')
+
+
+def _writes(fn):
+    """Mark a tool as writing to the database (see run_sync_tools_in_threads)."""
+    fn._feature_writes = True
+    return fn
+
+
+def _in_worker_thread(fn, limiter: anyio.CapacityLimiter | None = None):
+    """Wrap a sync tool function so it runs in a worker thread.
+
+    Context variables are copied into the thread, so the engine hooks still
+    report into the running call's metrics. Calls sharing a limiter with one
+    token run one at a time; waiting calls don't hold a thread.
+    """
+    async def run(**kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, **kwargs), limiter=limiter)
+    return run
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP that records metrics for every tool call it dispatches."""
+
+    async def call_tool(self, name: str, arguments: dict):
+        if _tool_metrics is None:
+            return await super().call_tool(name, arguments)
+        with _tool_metrics.track(name) as call:
+            result = await super().call_tool(name, arguments)
+            call.error = _is_error_result(result)
+        if _tool_metrics.flush_due():
+            # File I/O under a lock file; keep it off the event loop
+            await anyio.to_thread.run_sync(_tool_metrics.flush)
+        return result
+
+    def run_sync_tools_in_threads(self) -> None:
+        """Dispatch the sync tools to worker threads instead of the event loop.
+
+        FastMCP calls sync tools directly on the event loop. That is fine for
+        a stdio server with one client, but in the shared server a write
+        sitting in busy_timeout would stall every other agent's calls. Reads
+        run concurrently; tools marked with @_writes share one limiter, so
+        the server's writes are serialized in-process and only ever wait for
+        writers in other processes. Must be called from the event loop.
+        """
+        write_limiter = anyio.CapacityLimiter(1)
+        for tool in self._tool_manager.list_tools():
+            if not tool.is_async:
+                limiter = write_limiter if getattr(tool.fn, "_feature_writes", False) else None
+                tool.fn = _in_worker_thread(tool.fn, limiter)
+                tool.is_async = True
 
 
 # Initialize the MCP server
-mcp = FastMCP("features", lifespan=server_lifespan)
+mcp = InstrumentedFastMCP("features", lifespan=server_lifespan)
 
 
 def get_session():
@@ -133,6 +294,13 @@ def get_session():
     return _session_maker()
 
 
+def get_read_session():
+    """Get a new read-only database session (deferred transactions)."""
+    if _read_session_maker is None:
+        raise RuntimeError("Database not initialized")
+    return _read_session_maker()
+
+
 @mcp.tool()
 def feature_get_stats() -> str:
     """Get statistics about feature completion progress.
@@ -145,7 +313,7 @@ def feature_get_stats() -> str:
     """
     from sqlalchemy import case, func
 
-    session = get_session()
+    session = get_read_session()
     try:
         # Single aggregate query instead of 3 separate COUNT queries
         result = session.query(
@@ -187,7 +355,7 @@ def feature_get_by_id(
     Returns:
         JSON with feature details, or error if not found.
     """
-    session = get_session()
+    session = get_read_session()
     try:
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
@@ -214,7 +382,7 @@ def feature_get_summary(
     Returns:
         JSON with: id, name, passes, in_progress, dependencies
     """
-    session = get_session()
+    session = get_read_session()
     try:
         feature = session.query(Feature).filter(Feature.id == feature_id).first()
         if feature is None:
@@ -232,6 +400,39 @@ def feature_get_summary(
 
 
 @mcp.tool()
+def feature_get_many(feature_ids: FeatureIdList, fields: FieldsParam = None) -> str:
+    """Get several features by ID in one call.
+
+    Use this instead of repeated feature_get_by_id calls when you need the
+    details of all your assigned features.
+
+    Args:
+        feature_ids: IDs of the features to retrieve
+        fields: Only return these keys of each feature (default: all)
+
+    Returns:
+        JSON with: features (list in request order), not_found (list of IDs)
+    """
+    ids = list(dict.fromkeys(feature_ids))
+    try:
+        selected = parse_fields(fields)
+    except PageRequestError as e:
+        return json.dumps({"error": str(e)})
+
+    session = get_read_session()
+    try:
+        features = load_features(session, ids, selected)
+        found = {f["id"] for f in features}
+        return json.dumps({
+            "features": features,
+            "not_found": [fid for fid in ids if fid not in found],
+        })
+    finally:
+        session.close()
+
+
+@mcp.tool()
+@_writes
 def feature_mark_passing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)]
 ) -> str:
@@ -254,6 +455,8 @@ def feature_mark_passing(
             SET passes = 1, in_progress = 0
             WHERE id = :id AND passes = 0
         """), {"id": feature_id})
+        if result.rowcount:
+            record_feature_event(session, feature_id, "passed")
         session.commit()
 
         if result.rowcount == 0:
@@ -276,6 +479,56 @@ def feature_mark_passing(
 
 
 @mcp.tool()
+@_writes
+def feature_mark_passing_many(feature_ids: FeatureIdList) -> str:
+    """Mark several features as passing in one transaction.
+
+    Same as calling feature_mark_passing for each ID, but in one round trip
+    and one database write. Features that are already passing or don't exist
+    are reported and left unchanged; the rest are all marked together.
+
+    Args:
+        feature_ids: IDs of the features to mark as passing
+
+    Returns:
+        JSON with: passed (list of {id, name}), already_passing (list of IDs),
+        not_found (list of IDs)
+    """
+    ids = list(dict.fromkeys(feature_ids))
+    session = get_session()
+    try:
+        # The SELECT starts the BEGIN IMMEDIATE transaction, so the write lock
+        # is held from here and the states read can't change before the UPDATE
+        rows = {
+            row.id: row
+            for row in session.query(Feature.id, Feature.name, Feature.passes).filter(Feature.id.in_(ids))
+        }
+        to_pass = [fid for fid in ids if fid in rows and not rows[fid].passes]
+        if to_pass:
+            session.execute(
+                update(Feature)
+                .where(Feature.id.in_(to_pass), Feature.passes == False)
+                .values(passes=True, in_progress=False)
+            )
+            record_feature_events(session, [
+                {"feature_id": fid, "event_type": "passed"} for fid in to_pass
+            ])
+        session.commit()
+
+        return json.dumps({
+            "passed": [{"id": fid, "name": rows[fid].name} for fid in to_pass],
+            "already_passing": [fid for fid in ids if fid in rows and rows[fid].passes],
+            "not_found": [fid for fid in ids if fid not in rows],
+        })
+    except Exception as e:
+        session.rollback()
+        return json.dumps({"error": f"Failed to mark features passing: {str(e)}"})
+    finally:
+        session.close()
+
+
+@mcp.tool()
+@_writes
 def feature_mark_failing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as failing", ge=1)]
 ) -> str:
@@ -310,6 +563,7 @@ def feature_mark_failing(
             SET passes = 0, in_progress = 0
             WHERE id = :id
         """), {"id": feature_id})
+        record_feature_event(session, feature_id, "failed")
         session.commit()
 
         # Refresh to get updated state
@@ -327,6 +581,7 @@ def feature_mark_failing(
 
 
 @mcp.tool()
+@_writes
 def feature_skip(
     feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)]
 ) -> str:
@@ -368,12 +623,12 @@ def feature_skip(
                 in_progress = 0
             WHERE id = :id
         """), {"id": feature_id})
+        new_priority = session.execute(
+            text("SELECT priority FROM features WHERE id = :id"), {"id": feature_id}
+        ).scalar()
+        record_feature_event(session, feature_id, "skipped", {"priority": new_priority})
         session.commit()
 
-        # Refresh to get new priority
-        session.refresh(feature)
-        new_priority = feature.priority
-
         return json.dumps({
             "id": feature_id,
             "name": name,
@@ -389,6 +644,7 @@ def feature_skip(
 
 
 @mcp.tool()
+@_writes
 def feature_mark_in_progress(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)]
 ) -> str:
@@ -411,6 +667,8 @@ def feature_mark_in_progress(
             SET in_progress = 1
             WHERE id = :id AND passes = 0 AND in_progress = 0 AND needs_human_input = 0
         """), {"id": feature_id})
+        if result.rowcount:
+            record_feature_event(session, feature_id, "claimed")
         session.commit()
 
         if result.rowcount == 0:
@@ -437,6 +695,7 @@ def feature_mark_in_progress(
 
 
 @mcp.tool()
+@_writes
 def feature_claim_and_get(
     feature_id: Annotated[int, Field(description="The ID of the feature to claim", ge=1)]
 ) -> str:
@@ -470,6 +729,8 @@ def feature_claim_and_get(
             SET in_progress = 1
             WHERE id = :id AND passes = 0 AND in_progress = 0 AND needs_human_input = 0
         """), {"id": feature_id})
+        if result.rowcount:
+            record_feature_event(session, feature_id, "claimed")
         session.commit()
 
         # Determine if we claimed it or it was already claimed
@@ -493,6 +754,76 @@ def feature_claim_and_get(
 
 
 @mcp.tool()
+@_writes
+def feature_claim_batch(feature_ids: FeatureIdList) -> str:
+    """Atomically claim several features (mark in-progress) and return their details.
+
+    Same as calling feature_claim_and_get for each ID, but in one round trip
+    and one database write. Features already in progress are returned with
+    already_claimed=true; passing, missing and human-input-blocked features
+    are listed in errors and the rest are still claimed. Still call
+    feature_claim_and_get when you start working on each of them.
+
+    Args:
+        feature_ids: IDs of the features to claim, in the order to work on them
+
+    Returns:
+        JSON with: features (list of feature details with already_claimed, in
+        request order), errors (list of {feature_id, error})
+    """
+    ids = list(dict.fromkeys(feature_ids))
+    session = get_session()
+    try:
+        # The SELECT starts the BEGIN IMMEDIATE transaction, so the write lock
+        # is held from here and the states read can't change before the UPDATE
+        by_id = {f.id: f for f in session.query(Feature).filter(Feature.id.in_(ids)).all()}
+        errors = []
+        claimable = []
+        for fid in ids:
+            feature = by_id.get(fid)
+            if feature is None:
+                errors.append({"feature_id": fid, "error": f"Feature with ID {fid} not found"})
+            elif feature.passes:
+                errors.append({"feature_id": fid, "error": f"Feature with ID {fid} is already passing"})
+            elif getattr(feature, 'needs_human_input', False):
+                errors.append({"feature_id": fid, "error": f"Feature with ID {fid} is blocked waiting for human input"})
+            else:
+                claimable.append(feature)
+
+        to_claim = [f.id for f in claimable if not f.in_progress]
+        if to_claim:
+            session.execute(
+                update(Feature)
+                .where(
+                    Feature.id.in_(to_claim),
+                    Feature.passes == False,
+                    Feature.in_progress == False,
+                    Feature.needs_human_input == False,
+                )
+                .values(in_progress=True)
+            )
+            record_feature_events(session, [
+                {"feature_id": fid, "event_type": "claimed"} for fid in to_claim
+            ])
+
+        # The UPDATE synchronized the loaded objects, so the payload is built
+        # before commit instead of re-reading every row afterwards
+        features = []
+        for feature in claimable:
+            feature_dict = feature.to_dict()
+            feature_dict["already_claimed"] = feature.id not in to_claim
+            features.append(feature_dict)
+        session.commit()
+        return json.dumps({"features": features, "errors": errors})
+    except Exception as e:
+        session.rollback()
+        return json.dumps({"error": f"Failed to claim features: {str(e)}"})
+    finally:
+        session.close()
+
+
+@mcp.tool()
+@_writes
 def feature_clear_in_progress(
     feature_id: Annotated[int, Field(description="The ID of the feature to clear in-progress status", ge=1)]
 ) -> str:
@@ -520,6 +851,7 @@ def feature_clear_in_progress(
             SET in_progress = 0
             WHERE id = :id
         """), {"id": feature_id})
+        record_feature_event(session, feature_id, "released")
         session.commit()
 
         session.refresh(feature)
@@ -532,6 +864,7 @@ def feature_clear_in_progress(
 
 
 @mcp.tool()
+@_writes
 def feature_create_bulk(
     features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, and steps")]
 ) -> str:
@@ -558,84 +891,20 @@ def feature_create_bulk(
         JSON with: created (int) - number of features created, with_dependencies (int)
     """
     try:
-        # Use atomic transaction for bulk inserts to prevent priority conflicts
+        # One transaction: priorities follow the current max and the whole
+        # list is created or none of it is
         with atomic_transaction(_session_maker) as session:
-            # Get the starting priority atomically within the transaction
-            result = session.execute(text("""
-                SELECT COALESCE(MAX(priority), 0) FROM features
-            """)).fetchone()
-            start_priority = (result[0] or 0) + 1
-
-            # First pass: validate all features and their index-based dependencies
-            for i, feature_data in enumerate(features):
-                # Validate required fields
-                if not all(key in feature_data for key in ["category", "name", "description", "steps"]):
-                    return json.dumps({
-                        "error": f"Feature at index {i} missing required fields (category, name, description, steps)"
-                    })
-
-                # Validate depends_on_indices
-                indices = feature_data.get("depends_on_indices", [])
-                if indices:
-                    # Check max dependencies
-                    if len(indices) > MAX_DEPENDENCIES_PER_FEATURE:
-                        return json.dumps({
-                            "error": f"Feature at index {i} has {len(indices)} dependencies, max is {MAX_DEPENDENCIES_PER_FEATURE}"
-                        })
-                    # Check for duplicates
-                    if len(indices) != len(set(indices)):
-                        return json.dumps({
-                            "error": f"Feature at index {i} has duplicate dependencies"
-                        })
-                    # Check for forward references (can only depend on earlier features)
-                    for idx in indices:
-                        if not isinstance(idx, int) or idx < 0:
-                            return json.dumps({
-                                "error": f"Feature at index {i} has invalid dependency index: {idx}"
-                            })
-                        if idx >= i:
-                            return json.dumps({
-                                "error": f"Feature at index {i} cannot depend on feature at index {idx} (forward reference not allowed)"
-                            })
-
-            # Second pass: create all features with reserved priorities
-            created_features: list[Feature] = []
-            for i, feature_data in enumerate(features):
-                db_feature = Feature(
-                    priority=start_priority + i,
-                    category=feature_data["category"],
-                    name=feature_data["name"],
-                    description=feature_data["description"],
-                    steps=feature_data["steps"],
-                    passes=False,
-                    in_progress=False,
-                )
-                session.add(db_feature)
-                created_features.append(db_feature)
-
-            # Flush to get IDs assigned
-            session.flush()
-
-            # Third pass: resolve index-based dependencies to actual IDs
-            deps_count = 0
-            for i, feature_data in enumerate(features):
-                indices = feature_data.get("depends_on_indices", [])
-                if indices:
-                    # Convert indices to actual feature IDs
-                    dep_ids = [created_features[idx].id for idx in indices]
-                    created_features[i].dependencies = sorted(dep_ids)  # type: ignore[assignment]  # SQLAlchemy JSON Column accepts list at runtime
-                    deps_count += 1
-
-            # Commit happens automatically on context manager exit
+            inserter = bulk_insert_features(session, features)
             return json.dumps({
-                "created": len(created_features),
-                "with_dependencies": deps_count
+                "created": inserter.created,
+                "with_dependencies": inserter.with_dependencies
             })
     except Exception as e:
         return json.dumps({"error": str(e)})
 
 
 @mcp.tool()
+@_writes
 def feature_create(
     category: Annotated[str, Field(min_length=1, max_length=100, description="Feature category (e.g., 'Authentication', 'API', 'UI')")],
     name: Annotated[str, Field(min_length=1, max_length=255, description="Feature name")],
@@ -678,6 +947,7 @@ def feature_create(
             session.flush()  # Get the ID
 
             feature_dict = db_feature.to_dict()
+            record_feature_event(session, db_feature.id, "created")  # type: ignore[arg-type]
             # Commit happens automatically on context manager exit
 
         return json.dumps({
@@ -690,6 +960,7 @@ def feature_create(
 
 
 @mcp.tool()
+@_writes
 def feature_add_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to add dependency to")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of the dependency feature")]
@@ -733,13 +1004,13 @@ def feature_add_dependency(
 
             # Security: Circular dependency check
             # Within IMMEDIATE transaction, snapshot is protected by write lock
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            if would_create_circular_dependency(all_features, feature_id, dependency_id):
+            if would_create_circular_dependency_db(session, feature_id, dependency_id):
                 return json.dumps({"error": "Cannot add: would create circular dependency"})
 
             # Add dependency atomically
             new_deps = sorted(current_deps + [dependency_id])
             feature.dependencies = new_deps
+            record_feature_event(session, feature_id, "dependencies_changed", {"dependencies": new_deps})
             # Commit happens automatically on context manager exit
 
             return json.dumps({
@@ -752,6 +1023,7 @@ def feature_add_dependency(
 
 
 @mcp.tool()
+@_writes
 def feature_remove_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to remove dependency from")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of dependency to remove")]
@@ -779,6 +1051,7 @@ def feature_remove_dependency(
             # Remove dependency atomically
             new_deps = [d for d in current_deps if d != dependency_id]
             feature.dependencies = new_deps if new_deps else None
+            record_feature_event(session, feature_id, "dependencies_changed", {"dependencies": new_deps})
             # Commit happens automatically on context manager exit
 
             return json.dumps({
@@ -792,7 +1065,9 @@ def feature_remove_dependency(
 
 @mcp.tool()
 def feature_get_ready(
-    limit: Annotated[int, Field(default=10, ge=1, le=50, description="Max features to return")] = 10
+    limit: Annotated[int, Field(default=10, ge=1, le=50, description="Max features to return")] = 10,
+    fields: FieldsParam = None,
+    cursor: CursorParam = None,
 ) -> str:
     """Get all features ready to start (dependencies satisfied, not in progress).
 
@@ -801,34 +1076,50 @@ def feature_get_ready(
 
     Args:
         limit: Maximum number of features to return (1-50, default 10)
+        fields: Only return these keys of each feature, e.g. ["id", "name"] (default: all)
+        cursor: next_cursor from the previous call, to get the next page
 
     Returns:
-        JSON with: features (list), count (int), total_ready (int)
+        JSON with: features (list), count (int), total_ready (int),
+        next_cursor (str, or null on the last page)
     """
-    session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        ready = []
-        all_dicts = [f.to_dict() for f in all_features]
-        for f in all_features:
-            if f.passes or f.in_progress:
-                continue
-            if getattr(f, 'needs_human_input', False):
-                continue
-            deps = f.dependencies or []
-            if all(dep_id in passing_ids for dep_id in deps):
-                ready.append(f.to_dict())
-
-        # Sort by scheduling score (higher = first), then priority, then id
-        scores = compute_scheduling_scores(all_dicts)
-        ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
+        selected = parse_fields(fields)
+        after = decode_cursor(cursor, 3)
+    except PageRequestError as e:
+        return json.dumps({"error": str(e)})
+
+    session = get_read_session()
+    try:
+        ready_keys = get_ready_feature_keys(session)
+
+        # Sort by scheduling score (higher = first), then priority, then id.
+        # Scores only change with the dependency graph, so calls between graph
+        # changes (inserts, deletes, priority or dependency updates) reuse the
+        # cached scores without reading the table, however many claims and
+        # passes happen in between.
+        graph_version = (str(PROJECT_DIR), get_feature_graph_seq(session))
+        scores = score_engine.cached(graph_version)
+        if scores is None:
+            rows = session.query(Feature.id, Feature.priority, Feature.dependencies).order_by(Feature.id).all()
+            score_inputs = [
+                {"id": fid, "priority": priority, "dependencies": deps or []}
+                for fid, priority, deps in rows
+            ]
+            scores = compute_scheduling_scores(score_inputs, graph_version)
+
+        # The cursor is the (-score, priority, id) sort key of the last feature returned
+        keys = sorted((-scores.get(fid, 0), priority, fid) for priority, fid in ready_keys)
+        if after is not None:
+            keys = keys[bisect.bisect_right(keys, after):]
+        next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit else None
+        ready = load_features(session, [key[2] for key in keys[:limit]], selected)
 
         return json.dumps({
-            "features": ready[:limit],
-            "count": len(ready[:limit]),
-            "total_ready": len(ready)
+            "features": ready,
+            "count": len(ready),
+            "total_ready": len(ready_keys),
+            "next_cursor": next_cursor
         })
     finally:
         session.close()
@@ -836,7 +1127,9 @@ def feature_get_ready(
 
 @mcp.tool()
 def feature_get_blocked(
-    limit: Annotated[int, Field(default=20, ge=1, le=100, description="Max features to return")] = 20
+    limit: Annotated[int, Field(default=20, ge=1, le=100, description="Max features to return")] = 20,
+    fields: FieldsParam = None,
+    cursor: CursorParam = None,
 ) -> str:
     """Get features that are blocked by unmet dependencies.
 
@@ -845,90 +1138,87 @@ def feature_get_blocked(
 
     Args:
         limit: Maximum number of features to return (1-100, default 20)
+        fields: Only return these keys of each feature, besides blocked_by (default: all)
+        cursor: next_cursor from the previous call, to get the next page
 
     Returns:
-        JSON with: features (list with blocked_by field), count (int), total_blocked (int)
+        JSON with: features (list with blocked_by field), count (int), total_blocked (int),
+        next_cursor (str, or null on the last page)
     """
-    session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        blocked = []
-        for f in all_features:
-            if f.passes:
-                continue
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-            if blocking:
-                blocked.append({
-                    **f.to_dict(),
-                    "blocked_by": blocking
-                })
+        selected = parse_fields(fields)
+        after = decode_cursor(cursor, 1)
+    except PageRequestError as e:
+        return json.dumps({"error": str(e)})
+
+    session = get_read_session()
+    try:
+        # One extra row tells whether another page follows
+        blocking = get_blocking_dependencies(session, limit=limit + 1, after_id=after[0] if after else 0)
+        page_ids = sorted(blocking)[:limit]
+        next_cursor = encode_cursor((page_ids[-1],)) if len(blocking) > limit else None
+        blocked = [
+            {**f, "blocked_by": blocking[f["id"]]}
+            for f in load_features(session, page_ids, selected)
+        ]
 
         return json.dumps({
-            "features": blocked[:limit],
-            "count": len(blocked[:limit]),
-            "total_blocked": len(blocked)
+            "features": blocked,
+            "count": len(blocked),
+            "total_blocked": count_blocked_features(session),
+            "next_cursor": next_cursor
         })
     finally:
         session.close()
 
 
 @mcp.tool()
-def feature_get_graph() -> str:
+def feature_get_graph(
+    fields: Annotated[
+        list[str] | None,
+        Field(default=None, description=f"Only return these node keys (id is always included): {list(GRAPH_NODE_FIELDS)}"),
+    ] = None,
+    limit: Annotated[
+        int | None,
+        Field(default=None, ge=1, le=MAX_PAGE_SIZE, description="Max nodes per page (default: the whole graph)"),
+    ] = None,
+    cursor: CursorParam = None,
+) -> str:
     """Get dependency graph data for visualization.
 
     Returns nodes (features) and edges (dependencies) for rendering a graph.
     Each node includes status: 'pending', 'in_progress', 'done', or 'blocked'.
+    With a limit, nodes come in ID order and each page carries the edges
+    leading into its nodes.
+
+    Args:
+        fields: Only return these node keys (default: all)
+        limit: Maximum number of nodes to return (default: all)
+        cursor: next_cursor from the previous call, to get the next page
 
     Returns:
-        JSON with: nodes (list), edges (list of {source, target})
+        JSON with: nodes (list), edges (list of {source, target}),
+        next_cursor (str, or null on the last page)
     """
-    session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        nodes = []
-        edges = []
-
-        for f in all_features:
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-
-            if f.passes:
-                status = "done"
-            elif getattr(f, 'needs_human_input', False):
-                status = "needs_human_input"
-            elif blocking:
-                status = "blocked"
-            elif f.in_progress:
-                status = "in_progress"
-            else:
-                status = "pending"
-
-            nodes.append({
-                "id": f.id,
-                "name": f.name,
-                "category": f.category,
-                "status": status,
-                "priority": f.priority,
-                "dependencies": deps
-            })
-
-            for dep_id in deps:
-                edges.append({"source": dep_id, "target": f.id})
+        selected = parse_fields(fields, GRAPH_NODE_FIELDS)
+        session = get_read_session()
+        try:
+            nodes, edges, next_cursor = graph_page(session, limit, cursor)
+        finally:
+            session.close()
+    except PageRequestError as e:
+        return json.dumps({"error": str(e)})
 
-        return json.dumps({
-            "nodes": nodes,
-            "edges": edges
-        })
-    finally:
-        session.close()
+    return json.dumps({
+        "nodes": [project(node, selected) for node in nodes],
+        "edges": [{"source": dep_id, "target": feature_id} for feature_id, dep_id in edges],
+        "next_cursor": next_cursor
+    })
 
 
 @mcp.tool()
+@_writes
 def feature_set_dependencies(
     feature_id: Annotated[int, Field(ge=1, description="Feature to set dependencies for")],
     dependency_ids: Annotated[list[int], Field(description="List of dependency feature IDs")]
@@ -964,28 +1254,26 @@ def feature_set_dependencies(
                 return json.dumps({"error": f"Feature {feature_id} not found"})
 
             # Validate all dependencies exist
-            all_feature_ids = {f.id for f in session.query(Feature).all()}
-            missing = [d for d in dependency_ids if d not in all_feature_ids]
+            existing_ids = {
+                row[0] for row in session.query(Feature.id).filter(Feature.id.in_(dependency_ids))
+            }
+            missing = [d for d in dependency_ids if d not in existing_ids]
             if missing:
                 return json.dumps({"error": f"Dependencies not found: {missing}"})
 
             # Check for circular dependencies
-            # Within IMMEDIATE transaction, snapshot is protected by write lock
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            test_features = []
-            for f in all_features:
-                if f["id"] == feature_id:
-                    test_features.append({**f, "dependencies": dependency_ids})
-                else:
-                    test_features.append(f)
-
+            # Within IMMEDIATE transaction, snapshot is protected by write lock.
+            # A path from a new dependency back to feature_id closes a cycle
+            # whatever feature_id currently depends on, so the old edges of
+            # feature_id don't need replacing for the check.
             for dep_id in dependency_ids:
-                if would_create_circular_dependency(test_features, feature_id, dep_id):
+                if would_create_circular_dependency_db(session, feature_id, dep_id):
                     return json.dumps({"error": f"Cannot add dependency {dep_id}: would create circular dependency"})
 
             # Set dependencies atomically
             sorted_deps = sorted(dependency_ids) if dependency_ids else None
             feature.dependencies = sorted_deps
+            record_feature_event(session, feature_id, "dependencies_changed", {"dependencies": sorted_deps or []})
             # Commit happens automatically on context manager exit
 
             return json.dumps({
@@ -998,6 +1286,7 @@ def feature_set_dependencies(
 
 
 @mcp.tool()
+@_writes
 def feature_request_human_input(
     feature_id: Annotated[int, Field(description="The ID of the feature that needs human input", ge=1)],
     prompt: Annotated[str, Field(min_length=1, description="Explain what you need from the human and why")],
@@ -1068,6 +1357,8 @@ def feature_request_human_input(
                 human_input_response = NULL
             WHERE id = :id AND passes = 0 AND in_progress = 1
         """), {"id": feature_id, "request": json.dumps(request_data)})
+        if result.rowcount:
+            record_feature_event(session, feature_id, "human_input_requested")
         session.commit()
 
         if result.rowcount == 0:
@@ -1124,5 +1415,58 @@ def ask_user(
     return "Questions presented to the user. Their response will arrive as your next message."
 
 
+def _require_bearer_token(app: ASGIApp, token: str) -> ASGIApp:
+    """Wrap an ASGI app so HTTP requests without the bearer token get 401."""
+    expected = f"Bearer {token}".encode()
+
+    async def guarded(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            provided = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(provided, expected):
+                await PlainTextResponse("Unauthorized", status_code=401)(scope, receive, send)
+                return
+        await app(scope, receive, send)
+
+    return guarded
+
+
+async def run_shared_server() -> None:
+    """Serve the tools over streamable HTTP on a free localhost port."""
+    import uvicorn
+
+    from mcp_server import FEATURE_MCP_TOKEN_ENV
+    from server.utils.agent_events import MCP_SERVER_READY, get_event_channel
+
+    token = os.environ.get(FEATURE_MCP_TOKEN_ENV, "")
+    if not token:
+        raise SystemExit(f"{FEATURE_MCP_TOKEN_ENV} must be set for --shared")
+
+    # uvicorn handles SIGTERM itself, then re-raises it after shutdown through
+    # the handler installed before serve(). Exiting from there still runs the
+    # finally block below, so the tool metrics are flushed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    init_database()
+    mcp.run_sync_tools_in_threads()
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((mcp.settings.host, 0))
+        sock.listen(128)
+        port = sock.getsockname()[1]
+
+        app = _require_bearer_token(mcp.streamable_http_app(), token)
+        server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+        # Connections queue on the listening socket until serve() accepts them
+        get_event_channel().emit(
+            MCP_SERVER_READY,
+            url=f"http://{mcp.settings.host}:{port}{mcp.settings.streamable_http_path}",
+        )
+        await server.serve(sockets=[sock])
+    finally:
+        close_database()
+
+
 if __name__ == "__main__":
-    mcp.run()
+    if "--shared" in sys.argv[1:]:
+        asyncio.run(run_shared_server())
+    else:
+        mcp.run()
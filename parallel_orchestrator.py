@@ -20,67 +20,242 @@ Usage:
 
 import asyncio
 import atexit
+import gzip
+import json
 import logging
 import os
-import re
+import queue
+import secrets
+import shutil
 import signal
-import subprocess
 import sys
 import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Literal
 
 from sqlalchemy import text
 
-from api.database import Feature, create_database
+from api.database import (
+    Feature,
+    create_database,
+    create_read_only_database,
+    dispose_engine,
+    get_database_path,
+    record_feature_event,
+    record_feature_events,
+)
 from api.dependency_resolver import are_dependencies_satisfied, compute_scheduling_scores
+from api.feature_graph import FeatureGraph
+from api.tool_metrics import load_tool_metrics, summarize_tool_metrics
+from autoforge_paths import stat_signature
+from mcp_server import FEATURE_MCP_TOKEN_ENV, FEATURE_MCP_URL_ENV
 from progress import has_features
-from server.utils.process_utils import kill_process_tree
+from server.utils import agent_events
+from server.utils.agent_events import EventChannel
+from server.utils.agent_pool import WarmAgentPool
+from server.utils.agent_supervisor import AgentSupervisor, SupervisedAgent
 
 logger = logging.getLogger(__name__)
 
 # Root directory of autoforge (where this script and autonomous_agent_demo.py live)
 AUTOFORGE_ROOT = Path(__file__).parent.resolve()
 
-# Debug log file path
-DEBUG_LOG_FILE = AUTOFORGE_ROOT / "orchestrator_debug.log"
+# Debug log file path (JSON lines, one record per entry)
+DEBUG_LOG_FILE = AUTOFORGE_ROOT / "orchestrator_debug.jsonl"
+# Rotate the debug log past this size; keep this many gzipped old segments
+DEBUG_LOG_MAX_BYTES = int(os.environ.get("AUTOFORGE_DEBUG_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+DEBUG_LOG_BACKUPS = int(os.environ.get("AUTOFORGE_DEBUG_LOG_BACKUPS", "3"))
+# Records queued beyond this are dropped (and counted) rather than growing memory
+DEBUG_LOG_MAX_PENDING = 100_000
 
 
 class DebugLogger:
-    """Thread-safe debug logger that writes to a file."""
+    """Debug logger that never blocks callers on disk I/O.
 
-    def __init__(self, log_file: Path = DEBUG_LOG_FILE):
+    log()/section()/start_session() enqueue a record and return. A background
+    writer thread drains the queue in batches into one long-lived file handle
+    (one write and flush per batch), writing one JSON object per line:
+
+        {"ts": "...", "category": "SPAWN", "message": "...", "data": {...}}
+
+    When the file exceeds max_bytes it is rotated to <name>.1.gz (older
+    segments shift up, at most `backups` are kept); compression also happens
+    on the writer thread.
+
+    Once closed (explicitly or at interpreter exit) the logger stays closed:
+    later records are dropped rather than starting a new writer.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        log_file: Path = DEBUG_LOG_FILE,
+        max_bytes: int = DEBUG_LOG_MAX_BYTES,
+        backups: int = DEBUG_LOG_BACKUPS,
+    ):
         self.log_file = log_file
-        self._lock = threading.Lock()
-        self._session_started = False
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        atexit.register(self.close)
         # DON'T clear on import - only mark session start when run_loop begins
 
     def start_session(self):
-        """Mark the start of a new orchestrator session. Clears previous logs."""
-        with self._lock:
-            self._session_started = True
-            with open(self.log_file, "w") as f:
-                f.write(f"=== Orchestrator Debug Log Started: {datetime.now().isoformat()} ===\n")
-                f.write(f"=== PID: {os.getpid()} ===\n\n")
+        """Mark the start of a new orchestrator session.
+
+        The previous session's log is rotated into a compressed segment.
+        """
+        self._put(("session", datetime.now().isoformat(), os.getpid()))
 
     def log(self, category: str, message: str, **kwargs):
-        """Write a timestamped log entry."""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        with self._lock:
-            with open(self.log_file, "a") as f:
-                f.write(f"[{timestamp}] [{category}] {message}\n")
-                for key, value in kwargs.items():
-                    f.write(f"    {key}: {value}\n")
-                f.write("\n")
+        """Queue a timestamped log entry (fields are serialized by the writer)."""
+        self._put(("record", datetime.now().isoformat(timespec="milliseconds"), category, message, kwargs))
 
     def section(self, title: str):
-        """Write a section header."""
-        with self._lock:
-            with open(self.log_file, "a") as f:
-                f.write(f"\n{'='*60}\n")
-                f.write(f"  {title}\n")
-                f.write(f"{'='*60}\n\n")
+        """Queue a section marker."""
+        self._put(("record", datetime.now().isoformat(timespec="milliseconds"), "SECTION", title, {}))
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Wait until everything queued so far has been written."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write pending records and stop the writer thread for good."""
+        with self._start_lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout=5)
+
+    def _put(self, item: tuple) -> None:
+        if self._closed:
+            return
+        if self._thread is None:
+            self._start_writer()
+        if self._queue.qsize() >= DEBUG_LOG_MAX_PENDING:
+            self.dropped += 1
+            return
+        self._queue.put(item)
+
+    def _start_writer(self) -> None:
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="debug-log-writer", daemon=True)
+                self._thread.start()
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        handle = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < 1000:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                handle, stop = self._write_batch(handle, batch)
+                if stop:
+                    return
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def _write_batch(self, handle, batch: list) -> tuple:
+        """Write one batch; returns (handle, stop_requested)."""
+        lines: list[str] = []
+        flushed: list[threading.Event] = []
+        stop = False
+        for item in batch:
+            if item is self._STOP:
+                stop = True
+            elif item[0] == "flush":
+                flushed.append(item[1])
+            elif item[0] == "session":
+                handle = self._emit(handle, lines)
+                lines = []
+                if handle is not None:
+                    handle.close()
+                    handle = None
+                if self.log_file.exists() and self.log_file.stat().st_size > 0:
+                    self._rotate()
+                lines.append(self._encode(item[1], "SESSION", "Orchestrator debug log started", {"pid": item[2]}))
+            else:
+                _, ts, category, message, fields = item
+                lines.append(self._encode(ts, category, message, fields))
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            lines.append(self._encode(datetime.now().isoformat(timespec="milliseconds"), "DROPPED",
+                f"{dropped} records dropped (writer backlog)", {}))
+        handle = self._emit(handle, lines)
+        for event in flushed:
+            event.set()
+        return handle, stop
+
+    @staticmethod
+    def _encode(ts: str, category: str, message: str, fields: dict) -> str:
+        record: dict = {"ts": ts, "category": category, "message": message}
+        if fields:
+            record["data"] = fields
+        try:
+            return json.dumps(record, default=str)
+        except (TypeError, ValueError, RuntimeError):
+            # e.g. a field mutated while being serialized
+            record["data"] = {key: repr(value) for key, value in list(fields.items())}
+            return json.dumps(record, default=str)
+
+    def _emit(self, handle, lines: list[str]):
+        """Append lines, rotating first if the file is over the size limit."""
+        if not lines:
+            return handle
+        try:
+            if handle is not None and self.max_bytes > 0 and handle.tell() >= self.max_bytes:
+                handle.close()
+                handle = None
+                self._rotate()
+            if handle is None:
+                self.log_file.parent.mkdir(parents=True, exist_ok=True)
+                handle = open(self.log_file, "a", encoding="utf-8")
+            handle.write("\n".join(lines) + "\n")
+            handle.flush()
+        except OSError as e:
+            logger.debug("Debug log write failed: %s", e)
+            if handle is not None:
+                handle.close()
+            handle = None
+        return handle
+
+    def _rotate(self) -> None:
+        """Move the current file to <name>.1.gz, shifting older segments up."""
+        try:
+            if self.backups <= 0:
+                self.log_file.unlink(missing_ok=True)
+                return
+            for index in range(self.backups - 1, 0, -1):
+                older = self._segment_path(index)
+                if older.exists():
+                    os.replace(older, self._segment_path(index + 1))
+            with open(self.log_file, "rb") as src, gzip.open(self._segment_path(1), "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            self.log_file.unlink()
+        except OSError as e:
+            logger.debug("Debug log rotation failed: %s", e)
+
+    def _segment_path(self, index: int) -> Path:
+        return self.log_file.with_name(f"{self.log_file.name}.{index}.gz")
 
 
 # Global debug logger instance
@@ -132,9 +307,115 @@ MAX_PARALLEL_AGENTS = 5
 MAX_TOTAL_AGENTS = 10
 DEFAULT_CONCURRENCY = 3
 DEFAULT_TESTING_BATCH_SIZE = 3  # Number of features per testing batch (1-5)
-POLL_INTERVAL = 5  # seconds between checking for ready features
+POLL_INTERVAL = 5  # safety-net seconds between checks when no event arrives
+WATCH_INTERVAL = 0.25  # seconds between stat checks of the database and drain file
 MAX_FEATURE_RETRIES = 3  # Maximum times to retry a failed feature
 INITIALIZER_TIMEOUT = 1800  # 30 minutes timeout for initializer
+# Idle pre-started agent workers kept by the orchestrator (0 disables the pool)
+WARM_AGENT_POOL_SIZE = int(os.environ.get("AUTOFORGE_WARM_AGENTS", "2"))
+# Host one feature MCP server for all agents instead of one per agent ("0" disables)
+SHARED_FEATURE_MCP = os.environ.get("AUTOFORGE_SHARED_FEATURE_MCP", "1") != "0"
+FEATURE_MCP_START_TIMEOUT = 30.0  # Seconds to wait for the shared server to listen
+
+
+class SlotIdleMetrics:
+    """Measures how long coding slots sit free while schedulable work exists.
+
+    Two numbers matter for throughput:
+    - refill latency: time from a slot being freed (agent exit) to the next
+      agent being spawned into it
+    - idle slot-seconds: free slots integrated over time, counted only while
+      ready or resumable features were waiting
+
+    Time a slot spends free because every remaining feature is blocked is not
+    counted as scheduler latency.
+
+    Thread-safe: slot_freed() is called from output reader threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._freed_at: list[float] = []  # Monotonic timestamps of unfilled frees
+        self._latencies: list[float] = []
+        self._idle_slot_seconds = 0.0
+        self._last_observed: float | None = None
+        self._last_idle_slots = 0
+
+    def slot_freed(self) -> None:
+        """Record that a coding slot became free."""
+        with self._lock:
+            self._freed_at.append(time.monotonic())
+
+    def slot_filled(self) -> None:
+        """Record that an agent was spawned into a free slot."""
+        now = time.monotonic()
+        with self._lock:
+            if self._freed_at:
+                self._latencies.append(now - self._freed_at.pop(0))
+
+    def observe(self, free_slots: int, has_work: bool) -> None:
+        """Record the scheduler's view at the start of a loop iteration.
+
+        Args:
+            free_slots: Coding slots not currently running an agent
+            has_work: Whether any ready or resumable feature exists
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._last_observed is not None:
+                self._idle_slot_seconds += self._last_idle_slots * (now - self._last_observed)
+            self._last_observed = now
+            self._last_idle_slots = free_slots if has_work else 0
+            if not has_work:
+                # Slots freed while nothing is schedulable are starved, not slow
+                self._freed_at.clear()
+
+    def snapshot(self) -> dict:
+        """Return the metrics as a JSON-serializable dict."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            count = len(latencies)
+            return {
+                "refills": count,
+                "refill_latency_ms_avg": round(sum(latencies) / count * 1000, 2) if count else 0.0,
+                "refill_latency_ms_p95": round(latencies[int(0.95 * (count - 1))] * 1000, 2) if count else 0.0,
+                "refill_latency_ms_max": round(latencies[-1] * 1000, 2) if count else 0.0,
+                "idle_slot_seconds": round(self._idle_slot_seconds, 3),
+            }
+
+
+class SpawnLatencyMetrics:
+    """Time from starting an agent to its first tool call, cold vs warm.
+
+    A cold start includes interpreter startup and imports; a warm start only
+    the assignment hand-off to a pooled worker. Both include creating the
+    Claude client and the first model turn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = {"cold": [], "warm": []}
+
+    def record(self, warm: bool, seconds: float) -> None:
+        with self._lock:
+            samples = self._latencies["warm" if warm else "cold"]
+            samples.append(seconds)
+            if len(samples) > 1000:
+                del samples[0]
+
+    def snapshot(self) -> dict:
+        """Return the metrics as a JSON-serializable dict."""
+        result = {}
+        with self._lock:
+            for kind, samples in self._latencies.items():
+                latencies = sorted(samples)
+                count = len(latencies)
+                result[kind] = {
+                    "count": count,
+                    "first_tool_ms_avg": round(sum(latencies) / count * 1000, 2) if count else 0.0,
+                    "first_tool_ms_p95": round(latencies[int(0.95 * (count - 1))] * 1000, 2) if count else 0.0,
+                }
+        return result
 
 
 class ParallelOrchestrator:
@@ -185,15 +466,20 @@ class ParallelOrchestrator:
 
         # Thread-safe state
         self._lock = threading.Lock()
-        # Coding agents: feature_id -> process
+        # Agent subprocesses are spawned and read on the event loop (no
+        # per-agent reader threads); see server/utils/agent_supervisor.py
+        self._supervisor = AgentSupervisor()
+        # Structured events for the web server (see server/utils/agent_events.py);
+        # disabled unless the parent process asked for them
+        self._events = EventChannel.from_env()
+        # Coding agents: feature_id -> supervised process
         # Safe to key by feature_id because start_feature() checks for duplicates before spawning
-        self.running_coding_agents: dict[int, subprocess.Popen] = {}
-        # Testing agents: pid -> (feature_id, process)
+        self.running_coding_agents: dict[int, SupervisedAgent] = {}
+        # Testing agents: pid -> (feature_id, supervised process)
         # Keyed by PID (not feature_id) because multiple agents can test the same feature
-        self.running_testing_agents: dict[int, tuple[int, subprocess.Popen]] = {}
+        self.running_testing_agents: dict[int, tuple[int, SupervisedAgent]] = {}
         # Legacy alias for backward compatibility
         self.running_agents = self.running_coding_agents
-        self.abort_events: dict[int, threading.Event] = {}
         self._testing_session_counter = 0
         self.is_running = False
 
@@ -219,19 +505,46 @@ class ParallelOrchestrator:
         # Session tracking for logging/debugging
         self.session_start_time: datetime | None = None
 
-        # Event signaled when any agent completes, allowing the main loop to wake
-        # immediately instead of waiting for the full POLL_INTERVAL timeout.
-        # This reduces latency when spawning the next feature after completion.
-        self._agent_completed_event: asyncio.Event | None = None  # Created in run_loop
+        # Event signaled whenever the scheduler has something to react to (agent
+        # exited, database changed, drain file changed, shutdown). The main loop
+        # sleeps on it instead of fixed delays, so a freed slot is refilled as
+        # soon as the wake-up is processed. POLL_INTERVAL is only a safety net.
+        self._wake_event: asyncio.Event | None = None  # Created in run_loop
+        self._wake_reasons: set[str] = set()
         self._event_loop: asyncio.AbstractEventLoop | None = None  # Stored for thread-safe signaling
-
-        # Database session for this orchestrator
+        self._watch_task: asyncio.Task | None = None
+
+        # Slot refill latency / idle time, reported in get_status()
+        self.slot_metrics = SlotIdleMetrics()
+        # Pre-started agent workers (see server/utils/agent_pool.py); created
+        # after the initializer phase, None when disabled
+        self._agent_pool: WarmAgentPool | None = None
+        # Spawn-to-first-tool-call latency, cold vs warm, reported in get_status()
+        self.spawn_metrics = SpawnLatencyMetrics()
+        # Shared feature MCP server (see mcp_server/feature_mcp.py --shared);
+        # agents fall back to their own stdio server while the URL is None
+        self._feature_mcp: SupervisedAgent | None = None
+        self._feature_mcp_url: str | None = None
+        self._feature_mcp_token = secrets.token_urlsafe(32)
+        self._feature_mcp_start: asyncio.Task | None = None
+
+        # Database sessions for this orchestrator: read-write (BEGIN IMMEDIATE)
+        # and read-only (deferred, doesn't wait for agents' write locks)
         self._engine, self._session_maker = create_database(project_dir)
+        self._read_engine, self._read_session_maker = create_read_only_database(project_dir)
+
+        # Incrementally refreshed view of the features table. run_loop refreshes
+        # it once per iteration; only rows whose change_seq advanced are re-read.
+        self._feature_graph = FeatureGraph(self._read_session_maker)
 
     def get_session(self):
         """Get a new database session."""
         return self._session_maker()
 
+    def get_read_session(self):
+        """Get a new read-only database session (for queries that don't write)."""
+        return self._read_session_maker()
+
     def _get_random_passing_feature(self) -> int | None:
         """Get a random passing feature for regression testing (no claim needed).
 
@@ -245,7 +558,7 @@ class ParallelOrchestrator:
         """
         from sqlalchemy.sql.expression import func
 
-        session = self.get_session()
+        session = self.get_read_session()
         try:
             # Find a passing feature that's not currently being coded
             # Multiple testing agents can test the same feature - that's fine
@@ -278,7 +591,7 @@ class ParallelOrchestrator:
             List of feature IDs to test, may be shorter than batch_size if
             fewer passing features are available. Empty list if none available.
         """
-        session = self.get_session()
+        session = self.get_read_session()
         try:
             session.expire_all()
             passing = (
@@ -474,17 +787,18 @@ class ParallelOrchestrator:
         where a previous session was interrupted before completing the feature.
 
         Args:
-            feature_dicts: Pre-fetched list of feature dicts. If None, queries the database.
-            scheduling_scores: Pre-computed scheduling scores. If None, computed from feature_dicts.
+            feature_dicts: Pre-fetched list of feature dicts. If None, uses the
+                in-progress set of the orchestrator's feature graph.
+            scheduling_scores: Pre-computed scheduling scores. If None, computed from feature_dicts
+                (or taken from the feature graph).
         """
         if feature_dicts is None:
-            session = self.get_session()
-            try:
-                session.expire_all()
-                all_features = session.query(Feature).all()
-                feature_dicts = [f.to_dict() for f in all_features]
-            finally:
-                session.close()
+            graph = self._feature_graph
+            candidates = [fd for fid in graph.in_progress_ids if (fd := graph.get(fid)) is not None]
+            if scheduling_scores is None:
+                scheduling_scores = graph.scheduling_scores
+        else:
+            candidates = feature_dicts
 
         # Snapshot running IDs once (include all batch feature IDs)
         with self._lock:
@@ -493,7 +807,7 @@ class ParallelOrchestrator:
                 running_ids.update(batch_ids)
 
         resumable = []
-        for fd in feature_dicts:
+        for fd in candidates:
             if not fd.get("in_progress") or fd.get("passes"):
                 continue
             # Skip if blocked for human input
@@ -509,7 +823,7 @@ class ParallelOrchestrator:
 
         # Sort by scheduling score (higher = first), then priority, then id
         if scheduling_scores is None:
-            scheduling_scores = compute_scheduling_scores(feature_dicts)
+            scheduling_scores = compute_scheduling_scores(candidates)
         resumable.sort(key=lambda f: (-scheduling_scores.get(f["id"], 0), f["priority"], f["id"]))
         return resumable
 
@@ -521,27 +835,24 @@ class ParallelOrchestrator:
         """Get features with satisfied dependencies, not already running.
 
         Args:
-            feature_dicts: Pre-fetched list of feature dicts. If None, queries the database.
-            scheduling_scores: Pre-computed scheduling scores. If None, computed from feature_dicts.
+            feature_dicts: Pre-fetched list of feature dicts. If None, starts from the
+                incrementally maintained ready set of the orchestrator's feature graph
+                instead of scanning every feature.
+            scheduling_scores: Pre-computed scheduling scores. If None, computed from feature_dicts
+                (or taken from the feature graph).
         """
-        if feature_dicts is None:
-            session = self.get_session()
-            try:
-                session.expire_all()
-                all_features = session.query(Feature).all()
-                feature_dicts = [f.to_dict() for f in all_features]
-            finally:
-                session.close()
-
-        # Pre-compute passing_ids once to avoid O(n^2) in the loop
-        passing_ids = {fd["id"] for fd in feature_dicts if fd.get("passes")}
-
         # Snapshot running IDs once (include all batch feature IDs)
         with self._lock:
             running_ids = set(self.running_coding_agents.keys())
             for batch_ids in self._batch_features.values():
                 running_ids.update(batch_ids)
 
+        if feature_dicts is None:
+            return self._get_ready_from_graph(running_ids, scheduling_scores)
+
+        # Pre-compute passing_ids once to avoid O(n^2) in the loop
+        passing_ids = {fd["id"] for fd in feature_dicts if fd.get("passes")}
+
         ready = []
         skipped_reasons = {"passes": 0, "in_progress": 0, "running": 0, "failed": 0, "deps": 0, "needs_human_input": 0}
         for fd in feature_dicts:
@@ -588,22 +899,53 @@ class ParallelOrchestrator:
 
         return ready
 
+    def _get_ready_from_graph(
+        self,
+        running_ids: set[int],
+        scheduling_scores: dict[int, float] | None = None,
+    ) -> list[dict]:
+        """Ready features taken from the feature graph's ready set.
+
+        The graph already guarantees passes/in_progress/needs_human_input/deps,
+        so only the orchestrator-local filters (running, retry limit) remain.
+        """
+        graph = self._feature_graph
+        ready = []
+        skipped_reasons = {"running": 0, "failed": 0}
+        for fd in graph.ready_features():
+            if fd["id"] in running_ids:
+                skipped_reasons["running"] += 1
+                continue
+            if self._failure_counts.get(fd["id"], 0) >= MAX_FEATURE_RETRIES:
+                skipped_reasons["failed"] += 1
+                continue
+            ready.append(fd)
+
+        if scheduling_scores is None:
+            scheduling_scores = graph.scheduling_scores
+        ready.sort(key=lambda f: (-scheduling_scores.get(f["id"], 0), f["priority"], f["id"]))
+
+        debug_log.log("READY", "get_ready_features() called",
+            ready_count=len(ready),
+            ready_ids=[f['id'] for f in ready[:5]],  # First 5 only
+            passing=len(graph.passing_ids),
+            in_progress=len(graph.in_progress_ids),
+            total=len(graph),
+            skipped=skipped_reasons)
+
+        return ready
+
     def get_all_complete(self, feature_dicts: list[dict] | None = None) -> bool:
         """Check if all features are complete or permanently failed.
 
         Returns False if there are no features (initialization needed).
 
         Args:
-            feature_dicts: Pre-fetched list of feature dicts. If None, queries the database.
+            feature_dicts: Pre-fetched list of feature dicts. If None, uses the
+                orchestrator's feature graph.
         """
         if feature_dicts is None:
-            session = self.get_session()
-            try:
-                session.expire_all()
-                all_features = session.query(Feature).all()
-                feature_dicts = [f.to_dict() for f in all_features]
-            finally:
-                session.close()
+            feature_dicts = self._feature_graph.feature_dicts()
 
         # No features = NOT complete, need initialization
         if len(feature_dicts) == 0:
@@ -631,19 +973,14 @@ class ParallelOrchestrator:
         """Get the number of passing features.
 
         Args:
-            feature_dicts: Pre-fetched list of feature dicts. If None, queries the database.
+            feature_dicts: Pre-fetched list of feature dicts. If None, uses the
+                orchestrator's feature graph.
         """
         if feature_dicts is None:
-            session = self.get_session()
-            try:
-                session.expire_all()
-                count: int = session.query(Feature).filter(Feature.passes == True).count()
-                return count
-            finally:
-                session.close()
+            return len(self._feature_graph.passing_ids)
         return sum(1 for fd in feature_dicts if fd.get("passes"))
 
-    def _maintain_testing_agents(self, feature_dicts: list[dict] | None = None) -> None:
+    async def _maintain_testing_agents(self, feature_dicts: list[dict] | None = None) -> None:
         """Maintain the desired count of testing agents independently.
 
         This runs every loop iteration and spawns testing agents as needed to maintain
@@ -659,7 +996,8 @@ class ParallelOrchestrator:
         - No passing features exist yet
 
         Args:
-            feature_dicts: Pre-fetched list of feature dicts. If None, queries the database.
+            feature_dicts: Pre-fetched list of feature dicts. If None, uses the
+                orchestrator's feature graph.
         """
         # Skip if testing is disabled
         if self.yolo_mode or self.testing_agent_ratio == 0:
@@ -698,12 +1036,12 @@ class ParallelOrchestrator:
 
             # Spawn outside lock (I/O bound operation)
             logger.debug("Spawning testing agent (%d/%d)", spawn_index, desired)
-            success, msg = self._spawn_testing_agent()
+            success, msg = await self._spawn_testing_agent()
             if not success:
                 debug_log.log("TESTING", f"Spawn failed, stopping: {msg}")
                 return
 
-    def start_feature(self, feature_id: int, resume: bool = False) -> tuple[bool, str]:
+    async def start_feature(self, feature_id: int, resume: bool = False) -> tuple[bool, str]:
         """Start a single coding agent for a feature.
 
         Args:
@@ -741,12 +1079,13 @@ class ParallelOrchestrator:
                 if feature.in_progress:
                     return False, "Feature already in progress"
                 feature.in_progress = True
+                record_feature_event(session, feature_id, "claimed")
                 session.commit()
         finally:
             session.close()
 
         # Start coding agent subprocess
-        success, message = self._spawn_coding_agent(feature_id)
+        success, message = await self._spawn_coding_agent(feature_id)
         if not success:
             return False, message
 
@@ -755,7 +1094,7 @@ class ParallelOrchestrator:
 
         return True, f"Started feature {feature_id}"
 
-    def start_feature_batch(self, feature_ids: list[int], resume: bool = False) -> tuple[bool, str]:
+    async def start_feature_batch(self, feature_ids: list[int], resume: bool = False) -> tuple[bool, str]:
         """Start a coding agent for a batch of features.
 
         Args:
@@ -770,7 +1109,7 @@ class ParallelOrchestrator:
 
         # Single feature falls back to start_feature
         if len(feature_ids) == 1:
-            return self.start_feature(feature_ids[0], resume=resume)
+            return await self.start_feature(feature_ids[0], resume=resume)
 
         with self._lock:
             # Check if any feature in batch is already running
@@ -803,20 +1142,25 @@ class ParallelOrchestrator:
 
             for feature in features_to_mark:
                 feature.in_progress = True
+            record_feature_events(session, [
+                {"feature_id": feature.id, "event_type": "claimed"} for feature in features_to_mark
+            ])
             session.commit()
         finally:
             session.close()
 
         # Spawn batch coding agent
-        success, message = self._spawn_coding_agent_batch(feature_ids)
+        success, message = await self._spawn_coding_agent_batch(feature_ids)
         if not success:
             # Clear in_progress on failure
             session = self.get_session()
             try:
                 for fid in feature_ids:
                     feature = session.query(Feature).filter(Feature.id == fid).first()
-                    if feature and not resume:
+                    # _spawn_coding_agent_batch may have released it already
+                    if feature and feature.in_progress and not resume:
                         feature.in_progress = False
+                        record_feature_event(session, fid, "released")
                 session.commit()
             finally:
                 session.close()
@@ -824,44 +1168,107 @@ class ParallelOrchestrator:
 
         return True, f"Started batch [{', '.join(str(fid) for fid in feature_ids)}]"
 
-    def _spawn_coding_agent(self, feature_id: int) -> tuple[bool, str]:
-        """Spawn a coding agent subprocess for a specific feature."""
-        # Create abort event
-        abort_event = threading.Event()
+    def _agent_env(self, playwright_session: str | None = None) -> dict[str, str]:
+        """Environment for agent subprocesses."""
+        env = {**os.environ, "PYTHONUNBUFFERED": "1", "NODE_COMPILE_CACHE": ""}
+        env.update(self._agent_session_env(playwright_session))
+        return env
+
+    def _agent_session_env(self, playwright_session: str | None = None) -> dict[str, str]:
+        """Per-agent environment variables (also sent to warm pool workers,
+        whose environment was fixed when they started)."""
+        env = {
+            FEATURE_MCP_URL_ENV: self._feature_mcp_url or "",
+            FEATURE_MCP_TOKEN_ENV: self._feature_mcp_token if self._feature_mcp_url else "",
+        }
+        if playwright_session is not None:
+            env["PLAYWRIGHT_CLI_SESSION"] = playwright_session
+        return env
 
-        # Start subprocess for this feature
-        cmd = [
-            sys.executable,
-            "-u",  # Force unbuffered stdout/stderr
-            str(AUTOFORGE_ROOT / "autonomous_agent_demo.py"),
+    async def _start_feature_mcp_server(self) -> None:
+        """Start the shared feature MCP server and wait until it listens.
+
+        run_loop runs this as a background task so the first agents aren't
+        held back by the server's startup; until the URL is set (and on
+        failure, or if the server exits later) agents start their own stdio
+        server, so this never stops the run.
+        """
+        if not SHARED_FEATURE_MCP or self._feature_mcp is not None:
+            return
+        ready: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+
+        def on_event(event: dict) -> None:
+            if event["type"] == agent_events.MCP_SERVER_READY and not ready.done():
+                ready.set_result(event["url"])
+
+        def on_exit(server: SupervisedAgent) -> None:
+            if not ready.done():
+                ready.set_exception(RuntimeError(f"exited with code {server.returncode}"))
+            if self._feature_mcp is server:
+                self._feature_mcp = None
+                self._feature_mcp_url = None
+                if not server.stopping:
+                    print(f"WARNING: Shared feature MCP server exited (code {server.returncode}); "
+                          "new agents will start their own", flush=True)
+                    debug_log.log("MCP", "Shared feature MCP server exited", returncode=server.returncode)
+
+        try:
+            self._feature_mcp = await self._supervisor.spawn(
+                [sys.executable, "-u", "-m", "mcp_server.feature_mcp", "--shared"],
+                cwd=self.project_dir,
+                env={
+                    **os.environ,
+                    "PYTHONUNBUFFERED": "1",
+                    "PROJECT_DIR": str(self.project_dir.resolve()),
+                    "PYTHONPATH": str(AUTOFORGE_ROOT),
+                    FEATURE_MCP_TOKEN_ENV: self._feature_mcp_token,
+                },
+                on_line=lambda line: print(f"[Feature MCP] {line}", flush=True),
+                on_event=on_event,
+                on_exit=on_exit,
+            )
+            self._feature_mcp_url = await asyncio.wait_for(ready, timeout=FEATURE_MCP_START_TIMEOUT)
+        except Exception as e:
+            print(f"WARNING: Shared feature MCP server unavailable ({e}); agents will start their own",
+                  flush=True)
+            debug_log.log("MCP", "Shared feature MCP server failed to start", error=str(e))
+            server, self._feature_mcp = self._feature_mcp, None
+            if server is not None:
+                await self._supervisor.stop(server, timeout=5.0)
+            return
+        debug_log.log("MCP", "Shared feature MCP server listening",
+            url=self._feature_mcp_url, pid=self._feature_mcp.pid)
+        print(f"Shared feature MCP server: {self._feature_mcp_url}", flush=True)
+
+    async def _stop_feature_mcp_server(self) -> None:
+        """Stop the shared feature MCP server, if running or still starting."""
+        start, self._feature_mcp_start = self._feature_mcp_start, None
+        if start is not None and not start.done():
+            start.cancel()
+            try:
+                await start
+            except asyncio.CancelledError:
+                pass
+        server, self._feature_mcp = self._feature_mcp, None
+        self._feature_mcp_url = None
+        if server is not None:
+            await self._supervisor.stop(server, timeout=5.0)
+
+    async def _spawn_coding_agent(self, feature_id: int) -> tuple[bool, str]:
+        """Spawn a coding agent subprocess for a specific feature."""
+        agent_args = [
             "--project-dir", str(self.project_dir),
             "--max-iterations", "1",
             "--agent-type", "coding",
             "--feature-id", str(feature_id),
         ]
         if self.model:
-            cmd.extend(["--model", self.model])
+            agent_args.extend(["--model", self.model])
         if self.yolo_mode:
-            cmd.append("--yolo")
+            agent_args.append("--yolo")
 
         try:
-            # CREATE_NO_WINDOW on Windows prevents console window pop-ups
-            # stdin=DEVNULL prevents blocking on stdin reads
-            # encoding="utf-8" and errors="replace" fix Windows CP1252 issues
-            popen_kwargs: dict[str, Any] = {
-                "stdin": subprocess.DEVNULL,
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.STDOUT,
-                "text": True,
-                "encoding": "utf-8",
-                "errors": "replace",
-                "cwd": str(self.project_dir),  # Run from project dir so CLI creates .claude/ in project
-                "env": {**os.environ, "PYTHONUNBUFFERED": "1", "NODE_COMPILE_CACHE": "", "PLAYWRIGHT_CLI_SESSION": f"coding-{feature_id}"},
-            }
-            if sys.platform == "win32":
-                popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-
-            proc = subprocess.Popen(cmd, **popen_kwargs)
+            agent = await self._launch_agent(agent_args, feature_id, "coding", f"coding-{feature_id}")
         except Exception as e:
             # Reset in_progress on failure
             session = self.get_session()
@@ -869,62 +1276,39 @@ class ParallelOrchestrator:
                 feature = session.query(Feature).filter(Feature.id == feature_id).first()
                 if feature:
                     feature.in_progress = False
+                    record_feature_event(session, feature_id, "released")
                     session.commit()
             finally:
                 session.close()
             return False, f"Failed to start agent: {e}"
 
         with self._lock:
-            self.running_coding_agents[feature_id] = proc
-            self.abort_events[feature_id] = abort_event
-
-        # Start output reader thread
-        threading.Thread(
-            target=self._read_output,
-            args=(feature_id, proc, abort_event, "coding"),
-            daemon=True
-        ).start()
+            self.running_coding_agents[feature_id] = agent
 
         if self.on_status is not None:
             self.on_status(feature_id, "running")
 
         print(f"Started coding agent for feature #{feature_id}", flush=True)
+        self._events.emit(agent_events.AGENT_START, agent_type="coding", feature_ids=[feature_id], pid=agent.pid)
         return True, f"Started feature {feature_id}"
 
-    def _spawn_coding_agent_batch(self, feature_ids: list[int]) -> tuple[bool, str]:
+    async def _spawn_coding_agent_batch(self, feature_ids: list[int]) -> tuple[bool, str]:
         """Spawn a coding agent subprocess for a batch of features."""
         primary_id = feature_ids[0]
-        abort_event = threading.Event()
 
-        cmd = [
-            sys.executable,
-            "-u",
-            str(AUTOFORGE_ROOT / "autonomous_agent_demo.py"),
+        agent_args = [
             "--project-dir", str(self.project_dir),
             "--max-iterations", "1",
             "--agent-type", "coding",
             "--feature-ids", ",".join(str(fid) for fid in feature_ids),
         ]
         if self.model:
-            cmd.extend(["--model", self.model])
+            agent_args.extend(["--model", self.model])
         if self.yolo_mode:
-            cmd.append("--yolo")
+            agent_args.append("--yolo")
 
         try:
-            popen_kwargs: dict[str, Any] = {
-                "stdin": subprocess.DEVNULL,
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.STDOUT,
-                "text": True,
-                "encoding": "utf-8",
-                "errors": "replace",
-                "cwd": str(self.project_dir),  # Run from project dir so CLI creates .claude/ in project
-                "env": {**os.environ, "PYTHONUNBUFFERED": "1", "NODE_COMPILE_CACHE": "", "PLAYWRIGHT_CLI_SESSION": f"coding-{primary_id}"},
-            }
-            if sys.platform == "win32":
-                popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-
-            proc = subprocess.Popen(cmd, **popen_kwargs)
+            agent = await self._launch_agent(agent_args, primary_id, "coding", f"coding-{primary_id}")
         except Exception as e:
             # Reset in_progress on failure
             session = self.get_session()
@@ -933,34 +1317,28 @@ class ParallelOrchestrator:
                     feature = session.query(Feature).filter(Feature.id == fid).first()
                     if feature:
                         feature.in_progress = False
+                        record_feature_event(session, fid, "released")
                         session.commit()
             finally:
                 session.close()
             return False, f"Failed to start batch agent: {e}"
 
         with self._lock:
-            self.running_coding_agents[primary_id] = proc
-            self.abort_events[primary_id] = abort_event
+            self.running_coding_agents[primary_id] = agent
             self._batch_features[primary_id] = list(feature_ids)
             for fid in feature_ids:
                 self._feature_to_primary[fid] = primary_id
 
-        # Start output reader thread
-        threading.Thread(
-            target=self._read_output,
-            args=(primary_id, proc, abort_event, "coding"),
-            daemon=True
-        ).start()
-
         if self.on_status is not None:
             for fid in feature_ids:
                 self.on_status(fid, "running")
 
         ids_str = ", ".join(f"#{fid}" for fid in feature_ids)
         print(f"Started coding agent for features {ids_str}", flush=True)
+        self._events.emit(agent_events.AGENT_START, agent_type="coding", feature_ids=list(feature_ids), pid=agent.pid)
         return True, f"Started batch [{ids_str}]"
 
-    def _spawn_testing_agent(self) -> tuple[bool, str]:
+    async def _spawn_testing_agent(self) -> tuple[bool, str]:
         """Spawn a testing agent subprocess for batch regression testing.
 
         Selects a prioritized batch of passing features using weighted scoring
@@ -992,63 +1370,36 @@ class ParallelOrchestrator:
         batch_str = ",".join(str(fid) for fid in batch)
         debug_log.log("TESTING", f"Selected batch for testing: [{batch_str}]")
 
-        # Spawn the testing agent
-        with self._lock:
-            # Re-check limits in case another thread spawned while we were selecting
-            current_testing_count = len(self.running_testing_agents)
-            if current_testing_count >= self.max_concurrency:
-                return False, f"At max testing agents ({current_testing_count})"
-
-            cmd = [
-                sys.executable,
-                "-u",
-                str(AUTOFORGE_ROOT / "autonomous_agent_demo.py"),
-                "--project-dir", str(self.project_dir),
-                "--max-iterations", "1",
-                "--agent-type", "testing",
-                "--testing-feature-ids", batch_str,
-            ]
-            if self.model:
-                cmd.extend(["--model", self.model])
-
-            try:
-                # CREATE_NO_WINDOW on Windows prevents console window pop-ups
-                # stdin=DEVNULL prevents blocking on stdin reads
-                # encoding="utf-8" and errors="replace" fix Windows CP1252 issues
-                popen_kwargs: dict[str, Any] = {
-                    "stdin": subprocess.DEVNULL,
-                    "stdout": subprocess.PIPE,
-                    "stderr": subprocess.STDOUT,
-                    "text": True,
-                    "encoding": "utf-8",
-                    "errors": "replace",
-                    "cwd": str(self.project_dir),  # Run from project dir so CLI creates .claude/ in project
-                    "env": {**os.environ, "PYTHONUNBUFFERED": "1", "NODE_COMPILE_CACHE": "", "PLAYWRIGHT_CLI_SESSION": f"testing-{self._testing_session_counter}"},
-                }
-                self._testing_session_counter += 1
-                if sys.platform == "win32":
-                    popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        agent_args = [
+            "--project-dir", str(self.project_dir),
+            "--max-iterations", "1",
+            "--agent-type", "testing",
+            "--testing-feature-ids", batch_str,
+        ]
+        if self.model:
+            agent_args.extend(["--model", self.model])
 
-                proc = subprocess.Popen(cmd, **popen_kwargs)
-            except Exception as e:
-                debug_log.log("TESTING", f"FAILED to spawn testing agent: {e}")
-                return False, f"Failed to start testing agent: {e}"
+        # Spawning happens only on the event loop, so nothing else can take the
+        # slot checked above while we await; the lock is not held across await.
+        session_name = f"testing-{self._testing_session_counter}"
+        self._testing_session_counter += 1
+        try:
+            # Primary feature ID for log attribution
+            agent = await self._launch_agent(agent_args, primary_feature_id, "testing", session_name)
+        except Exception as e:
+            debug_log.log("TESTING", f"FAILED to spawn testing agent: {e}")
+            return False, f"Failed to start testing agent: {e}"
 
+        with self._lock:
             # Register process by PID (not feature_id) to avoid overwrites
             # when multiple agents test the same feature
-            self.running_testing_agents[proc.pid] = (primary_feature_id, proc)
+            self.running_testing_agents[agent.pid] = (primary_feature_id, agent)
             testing_count = len(self.running_testing_agents)
 
-        # Start output reader thread with primary feature ID for log attribution
-        threading.Thread(
-            target=self._read_output,
-            args=(primary_feature_id, proc, threading.Event(), "testing"),
-            daemon=True
-        ).start()
-
-        print(f"Started testing agent for features [{batch_str}] (PID {proc.pid})", flush=True)
+        print(f"Started testing agent for features [{batch_str}] (PID {agent.pid})", flush=True)
+        self._events.emit(agent_events.AGENT_START, agent_type="testing", feature_ids=batch, pid=agent.pid)
         debug_log.log("TESTING", f"Successfully spawned testing agent for batch [{batch_str}]",
-            pid=proc.pid,
+            pid=agent.pid,
             feature_ids=batch,
             total_testing_agents=testing_count)
         return True, f"Started testing agent for features [{batch_str}]"
@@ -1073,103 +1424,159 @@ class ParallelOrchestrator:
             cmd.extend(["--model", self.model])
 
         print("Running initializer agent...", flush=True)
+        self._events.emit(agent_events.INIT_START)
 
-        # CREATE_NO_WINDOW on Windows prevents console window pop-ups
-        # stdin=DEVNULL prevents blocking on stdin reads
-        # encoding="utf-8" and errors="replace" fix Windows CP1252 issues
-        popen_kwargs: dict[str, Any] = {
-            "stdin": subprocess.DEVNULL,
-            "stdout": subprocess.PIPE,
-            "stderr": subprocess.STDOUT,
-            "text": True,
-            "encoding": "utf-8",
-            "errors": "replace",
-            "cwd": str(AUTOFORGE_ROOT),
-            "env": {**os.environ, "PYTHONUNBUFFERED": "1", "NODE_COMPILE_CACHE": ""},
-        }
-        if sys.platform == "win32":
-            popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        def on_line(line: str) -> None:
+            line = line.rstrip()
+            print(line, flush=True)
+            if self.on_output is not None:
+                self.on_output(0, line)  # Use 0 as feature_id for initializer
 
-        proc = subprocess.Popen(cmd, **popen_kwargs)
+        agent = await self._supervisor.spawn(
+            cmd, cwd=AUTOFORGE_ROOT, env=self._agent_env(), on_line=on_line,
+        )
 
-        debug_log.log("INIT", "Initializer subprocess started", pid=proc.pid)
+        debug_log.log("INIT", "Initializer subprocess started", pid=agent.pid)
 
         # Stream output with timeout
-        loop = asyncio.get_running_loop()
         try:
-            async def stream_output():
-                while True:
-                    line = await loop.run_in_executor(None, proc.stdout.readline)
-                    if not line:
-                        break
-                    print(line.rstrip(), flush=True)
-                    if self.on_output is not None:
-                        self.on_output(0, line.rstrip())  # Use 0 as feature_id for initializer
-                proc.wait()
-
-            await asyncio.wait_for(stream_output(), timeout=INITIALIZER_TIMEOUT)
-
+            await asyncio.wait_for(agent.wait(), timeout=INITIALIZER_TIMEOUT)
         except asyncio.TimeoutError:
             print(f"ERROR: Initializer timed out after {INITIALIZER_TIMEOUT // 60} minutes", flush=True)
             debug_log.log("INIT", "TIMEOUT - Initializer exceeded time limit",
                 timeout_minutes=INITIALIZER_TIMEOUT // 60)
-            result = kill_process_tree(proc)
+            result = await self._supervisor.stop(agent)
             debug_log.log("INIT", "Killed timed-out initializer process tree",
                 status=result.status, children_found=result.children_found)
             return False
 
         debug_log.log("INIT", "Initializer subprocess completed",
-            return_code=proc.returncode,
-            success=proc.returncode == 0)
+            return_code=agent.returncode,
+            success=agent.returncode == 0)
 
-        if proc.returncode != 0:
-            print(f"ERROR: Initializer failed with exit code {proc.returncode}", flush=True)
+        if agent.returncode != 0:
+            print(f"ERROR: Initializer failed with exit code {agent.returncode}", flush=True)
             return False
 
         return True
 
-    # Pattern to detect when a batch agent claims a new feature
-    _CLAIM_FEATURE_PATTERN = re.compile(
-        r"feature_claim_and_get\b.*?['\"]?feature_id['\"]?\s*[:=]\s*(\d+)"
-    )
+    async def _launch_agent(
+        self,
+        agent_args: list[str],
+        feature_id: int,
+        agent_type: Literal["coding", "testing"],
+        playwright_session: str,
+    ) -> SupervisedAgent:
+        """Start an agent session, on a warm pooled worker when one is ready.
+
+        agent_args are autonomous_agent_demo.py's arguments. Falls back to a
+        cold subprocess when the pool is disabled or has no idle worker.
 
-    def _read_output(
+        Raises:
+            OSError: If a cold subprocess could not be started
+        """
+        pool = self._agent_pool
+        launch = {"started_at": time.monotonic(), "warm": pool is not None and pool.idle_count > 0}
+        handlers = self._agent_handlers(feature_id, agent_type, launch)
+
+        def on_exit(agent: SupervisedAgent):
+            return self._handle_agent_exit(feature_id, agent, agent_type)
+
+        if pool is not None:
+            agent = await pool.acquire(
+                agent_args,
+                env=self._agent_session_env(playwright_session),
+                on_exit=on_exit,
+                on_line=handlers["on_line"],
+                on_event=handlers["on_event"],
+            )
+            if agent is not None:
+                return agent
+        launch["warm"] = False
+        return await self._supervisor.spawn(
+            [sys.executable, "-u", str(AUTOFORGE_ROOT / "autonomous_agent_demo.py"), *agent_args],
+            cwd=self.project_dir,  # Run from project dir so CLI creates .claude/ in project
+            env=self._agent_env(playwright_session),
+            on_exit=on_exit,
+            on_line=handlers["on_line"],
+            on_event=handlers["on_event"],
+        )
+
+    async def _start_agent_pool(self) -> None:
+        """Start the warm agent pool (no-op if disabled or already started)."""
+        if self._agent_pool is not None or WARM_AGENT_POOL_SIZE <= 0:
+            return
+        self._agent_pool = WarmAgentPool(
+            self._supervisor,
+            [
+                sys.executable, "-u", str(AUTOFORGE_ROOT / "autonomous_agent_demo.py"),
+                "--project-dir", str(self.project_dir), "--warm-worker",
+            ],
+            cwd=self.project_dir,
+            env=self._agent_env(),
+            # Idle workers don't count against MAX_TOTAL_AGENTS; keep the pool
+            # no larger than the number of agents that can start together
+            size=min(WARM_AGENT_POOL_SIZE, self.max_concurrency),
+        )
+        await self._agent_pool.start()
+
+    def _agent_handlers(
         self,
-        feature_id: int | None,
-        proc: subprocess.Popen,
-        abort: threading.Event,
-        agent_type: Literal["coding", "testing"] = "coding",
-    ):
-        """Read output from subprocess and emit events."""
+        feature_id: int,
+        agent_type: Literal["coding", "testing"],
+        launch: dict | None = None,
+    ) -> dict[str, Callable[[Any], None]]:
+        """Build the per-agent output and event handlers (on_line, on_event).
+
+        Output lines are attributed to the feature the agent is currently
+        working on, which changes when a batch agent reports a claim on its
+        event channel. Agent events are forwarded to the server tagged with
+        the agent's primary feature ID and type. When launch ({started_at,
+        warm}) is given, the time to the agent's first tool call is recorded
+        in spawn_metrics.
+        """
         current_feature_id = feature_id
-        try:
-            if proc.stdout is None:
-                proc.wait()
-                return
-            for line in proc.stdout:
-                if abort.is_set():
-                    break
-                line = line.rstrip()
-                # Detect when a batch agent claims a new feature
-                claim_match = self._CLAIM_FEATURE_PATTERN.search(line)
-                if claim_match:
-                    claimed_id = int(claim_match.group(1))
-                    if claimed_id != current_feature_id:
-                        current_feature_id = claimed_id
-                if self.on_output is not None:
-                    self.on_output(current_feature_id or 0, line)
-                else:
-                    # Both coding and testing agents now use [Feature #X] format
-                    print(f"[Feature #{current_feature_id}] {line}", flush=True)
-            proc.wait()
-        finally:
-            # CRITICAL: Kill the process tree to clean up any child processes (e.g., Claude CLI)
-            # This prevents zombie processes from accumulating
-            try:
-                kill_process_tree(proc, timeout=2.0)
-            except Exception as e:
-                debug_log.log("CLEANUP", f"Error killing process tree for {agent_type} agent", error=str(e))
-            self._on_agent_complete(feature_id, proc.returncode, agent_type, proc)
+
+        def on_line(line: str) -> None:
+            line = line.rstrip()
+            if self.on_output is not None:
+                self.on_output(current_feature_id, line)
+            else:
+                # Both coding and testing agents now use [Feature #X] format
+                print(f"[Feature #{current_feature_id}] {line}", flush=True)
+
+        def on_event(event: dict) -> None:
+            nonlocal current_feature_id
+            fields = dict(event)
+            event_type = fields.pop("type")
+            if event_type == agent_events.TOOL_START and launch is not None and "started_at" in launch:
+                self.spawn_metrics.record(launch["warm"], time.monotonic() - launch.pop("started_at"))
+            if event_type == agent_events.CLAIM and isinstance(fields.get("feature_id"), int):
+                current_feature_id = fields["feature_id"]
+            elif event_type == agent_events.USAGE:
+                debug_log.log("USAGE", f"{agent_type} agent for feature #{feature_id}", **fields)
+            fields.setdefault("feature_id", current_feature_id)
+            fields.pop("agent_type", None)
+            fields.pop("agent_feature_id", None)
+            self._events.emit(event_type, agent_type=agent_type, agent_feature_id=feature_id, **fields)
+
+        return {"on_line": on_line, "on_event": on_event}
+
+    async def _handle_agent_exit(
+        self,
+        feature_id: int | None,
+        agent: SupervisedAgent,
+        agent_type: Literal["coding", "testing"],
+    ) -> None:
+        """Supervisor exit handler: run completion bookkeeping off the event loop.
+
+        _on_agent_complete touches the database (which may wait on SQLite's
+        busy timeout), so it runs in a worker thread; the supervisor awaits it,
+        so completions are fully processed in the order agents exit.
+        """
+        # Called once the process has exited, so returncode is set
+        return_code = agent.returncode if agent.returncode is not None else -1
+        await asyncio.to_thread(self._on_agent_complete, feature_id, return_code, agent_type, agent)
 
     def _run_inter_session_cleanup(self):
         """Run lightweight cleanup between agent sessions.
@@ -1187,55 +1594,101 @@ class ParallelOrchestrator:
     def _signal_agent_completed(self):
         """Signal that an agent has completed, waking the main loop.
 
-        This method is safe to call from any thread. It schedules the event.set()
-        call to run on the event loop thread to avoid cross-thread issues with
-        asyncio.Event.
+        Safe to call from any thread.
         """
-        if self._agent_completed_event is not None and self._event_loop is not None:
-            try:
-                # Use the stored event loop reference to schedule the set() call
-                # This is necessary because asyncio.Event is not thread-safe and
-                # asyncio.get_event_loop() fails in threads without an event loop
-                if self._event_loop.is_running():
-                    self._event_loop.call_soon_threadsafe(self._agent_completed_event.set)
-                else:
-                    # Fallback: set directly if loop isn't running (shouldn't happen during normal operation)
-                    self._agent_completed_event.set()
-            except RuntimeError:
-                # Event loop closed, ignore (orchestrator may be shutting down)
-                pass
+        self._wake("agent_exited")
+
+    def _wake(self, reason: str) -> None:
+        """Wake the main loop with a reason. Safe to call from any thread.
+
+        asyncio.Event is not thread-safe, so the set() is scheduled onto the
+        stored event loop when called from elsewhere.
+        """
+        if self._wake_event is None or self._event_loop is None:
+            return
+        try:
+            if self._event_loop.is_running():
+                self._event_loop.call_soon_threadsafe(self._set_wake, reason)
+            else:
+                # Fallback: set directly if loop isn't running (shouldn't happen during normal operation)
+                self._set_wake(reason)
+        except RuntimeError:
+            # Event loop closed, ignore (orchestrator may be shutting down)
+            pass
+
+    def _set_wake(self, reason: str) -> None:
+        """Record a wake reason and set the event (event loop thread only)."""
+        self._wake_reasons.add(reason)
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    def request_shutdown(self) -> None:
+        """Ask the main loop to stop. Only sets flags, so it is signal-handler safe."""
+        self._shutdown_requested = True
+        self.is_running = False
+        self._wake("shutdown")
 
-    async def _wait_for_agent_completion(self, timeout: float = POLL_INTERVAL):
-        """Wait for an agent to complete or until timeout expires.
+    async def _wait_for_event(self, timeout: float = POLL_INTERVAL) -> set[str]:
+        """Wait until something happens that the scheduler should react to.
 
-        This replaces fixed `asyncio.sleep(POLL_INTERVAL)` calls with event-based
-        waiting. When an agent completes, _signal_agent_completed() sets the event,
-        causing this method to return immediately. If no agent completes within
-        the timeout, we return anyway to check for ready features.
+        Returns immediately if an event arrived since the last wait, so no
+        wake-up is lost while an iteration is running.
 
         Args:
-            timeout: Maximum seconds to wait (default: POLL_INTERVAL)
+            timeout: Safety-net maximum seconds to wait (default: POLL_INTERVAL)
+
+        Returns:
+            The wake reasons collected since the last wait (empty on timeout)
         """
-        if self._agent_completed_event is None:
+        if self._wake_event is None:
             # Fallback if event not initialized (shouldn't happen in normal operation)
             await asyncio.sleep(timeout)
-            return
+            return set()
 
         try:
-            await asyncio.wait_for(self._agent_completed_event.wait(), timeout=timeout)
-            # Event was set - an agent completed. Clear it for the next wait cycle.
-            self._agent_completed_event.clear()
-            debug_log.log("EVENT", "Woke up immediately - agent completed")
+            await asyncio.wait_for(self._wake_event.wait(), timeout=timeout)
         except asyncio.TimeoutError:
-            # Timeout reached without agent completion - this is normal, just check anyway
+            # Timeout reached without any event - this is normal, just check anyway
             pass
+        self._wake_event.clear()
+        reasons, self._wake_reasons = self._wake_reasons, set()
+        if reasons:
+            debug_log.log("EVENT", "Woke up", reasons=sorted(reasons))
+        return reasons
+
+    def _watched_paths(self) -> dict[str, list[Path]]:
+        """Files whose changes should wake the main loop, by wake reason."""
+        from autoforge_paths import get_pause_drain_path
+
+        db_path = get_database_path(self.project_dir)
+        return {
+            "db_changed": [db_path, db_path.with_name(db_path.name + "-wal")],
+            "drain_changed": [get_pause_drain_path(self.project_dir)],
+        }
+
+    async def _watch_files(self) -> None:
+        """Wake the main loop when the database or the drain signal file changes.
+
+        Agents claim and pass features by committing to features.db from their
+        own processes, which is visible here as a change to the database or
+        its WAL file. A stat() every WATCH_INTERVAL is cheap and portable.
+        """
+        watched = self._watched_paths()
+        signatures = {reason: stat_signature(paths) for reason, paths in watched.items()}
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            for reason, paths in watched.items():
+                signature = stat_signature(paths)
+                if signature != signatures[reason]:
+                    signatures[reason] = signature
+                    self._set_wake(reason)
 
     def _on_agent_complete(
         self,
         feature_id: int | None,
         return_code: int,
         agent_type: Literal["coding", "testing"],
-        proc: subprocess.Popen,
+        proc: SupervisedAgent | None,
     ):
         """Handle agent completion.
 
@@ -1249,20 +1702,24 @@ class ParallelOrchestrator:
         - Remove from running dict (no claim to release - concurrent testing is allowed).
         """
         if agent_type == "testing":
+            pid = proc.pid if proc is not None else None
             with self._lock:
                 # Remove by PID
-                self.running_testing_agents.pop(proc.pid, None)
+                if pid is not None:
+                    self.running_testing_agents.pop(pid, None)
 
             status = "completed" if return_code == 0 else "failed"
             print(f"Feature #{feature_id} testing {status}", flush=True)
+            self._events.emit(agent_events.AGENT_COMPLETE, agent_type="testing", feature_ids=[feature_id],
+                success=return_code == 0)
             debug_log.log("COMPLETE", f"Testing agent for feature #{feature_id} finished",
-                pid=proc.pid,
+                pid=pid,
                 feature_id=feature_id,
                 status=status)
-            # Run lightweight cleanup between sessions
-            self._run_inter_session_cleanup()
             # Signal main loop that an agent slot is available
             self._signal_agent_completed()
+            # Run lightweight cleanup between sessions
+            self._run_inter_session_cleanup()
             return
 
         # feature_id is required for coding agents (always passed from start_feature)
@@ -1277,7 +1734,6 @@ class ParallelOrchestrator:
                 for fid in batch_ids:
                     self._feature_to_primary.pop(fid, None)
             self.running_coding_agents.pop(feature_id, None)
-            self.abort_events.pop(feature_id, None)
 
         all_feature_ids = batch_ids or [feature_id]
 
@@ -1299,6 +1755,7 @@ class ParallelOrchestrator:
                     in_progress=feature_in_progress)
                 if feature and feature.in_progress and not feature.passes:
                     feature.in_progress = False
+                    record_feature_event(session, fid, "released")
                     session.commit()
                     debug_log.log("DB", f"Cleared in_progress for feature #{fid} (agent failed)")
         finally:
@@ -1326,13 +1783,17 @@ class ParallelOrchestrator:
             print(f"Features {ids_str} {status}", flush=True)
         else:
             print(f"Feature #{feature_id} {status}", flush=True)
+        self._events.emit(agent_events.AGENT_COMPLETE, agent_type="coding", feature_ids=all_feature_ids,
+            success=return_code == 0)
 
-        # Run lightweight cleanup between sessions
-        self._run_inter_session_cleanup()
+        self.slot_metrics.slot_freed()
         # Signal main loop that an agent slot is available
         self._signal_agent_completed()
+        # Run lightweight cleanup between sessions (after waking the loop, so
+        # refilling the slot doesn't wait on it)
+        self._run_inter_session_cleanup()
 
-    def stop_feature(self, feature_id: int) -> tuple[bool, str]:
+    async def stop_feature(self, feature_id: int) -> tuple[bool, str]:
         """Stop a running coding agent and all its child processes."""
         with self._lock:
             # Check if this feature is part of a batch
@@ -1340,52 +1801,57 @@ class ParallelOrchestrator:
             if primary_id not in self.running_coding_agents:
                 return False, "Feature not running"
 
-            abort = self.abort_events.get(primary_id)
-            proc = self.running_coding_agents.get(primary_id)
+            agent = self.running_coding_agents.get(primary_id)
 
-        if abort:
-            abort.set()
-        if proc:
-            result = kill_process_tree(proc, timeout=5.0)
+        if agent:
+            # Returns after the exit handler (_on_agent_complete) has run
+            result = await self._supervisor.stop(agent, timeout=5.0)
             debug_log.log("STOP", f"Killed feature {feature_id} (primary {primary_id}) process tree",
                 status=result.status, children_found=result.children_found,
                 children_terminated=result.children_terminated, children_killed=result.children_killed)
 
         return True, f"Stopped feature {feature_id}"
 
-    def stop_all(self) -> None:
-        """Stop all running agents (coding and testing)."""
+    async def stop_all(self) -> None:
+        """Stop all running agents (coding and testing) and idle warm workers."""
         self.is_running = False
 
+        if self._agent_pool is not None:
+            await self._agent_pool.close()
+
         # Stop coding agents
         with self._lock:
             feature_ids = list(self.running_coding_agents.keys())
 
         for fid in feature_ids:
-            self.stop_feature(fid)
+            await self.stop_feature(fid)
 
         # Stop testing agents (no claim to release - concurrent testing is allowed)
         with self._lock:
             testing_items = list(self.running_testing_agents.items())
 
-        for pid, (feature_id, proc) in testing_items:
-            result = kill_process_tree(proc, timeout=5.0)
+        for pid, (feature_id, agent) in testing_items:
+            result = await self._supervisor.stop(agent, timeout=5.0)
             debug_log.log("STOP", f"Killed testing agent for feature #{feature_id} (PID {pid})",
                 status=result.status, children_found=result.children_found,
                 children_terminated=result.children_terminated, children_killed=result.children_killed)
 
-        # Clear dict so get_status() doesn't report stale agents while
-        # _on_agent_complete callbacks are still in flight.
+        # Clear dict so get_status() doesn't report stale agents if an exit
+        # handler is still in flight (stop() gives up waiting after its timeout).
         with self._lock:
             self.running_testing_agents.clear()
 
+        # Last, so agents never lose their feature tools mid-call
+        await self._stop_feature_mcp_server()
+
     async def run_loop(self):
         """Main orchestration loop."""
         self.is_running = True
 
-        # Initialize the agent completion event for this run
+        # Initialize the wake event for this run
         # Must be created in the async context where it will be used
-        self._agent_completed_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
+        self._wake_reasons = set()
         # Store the event loop reference for thread-safe signaling from output reader threads
         self._event_loop = asyncio.get_running_loop()
 
@@ -1439,6 +1905,7 @@ class ParallelOrchestrator:
             print("  INITIALIZATION COMPLETE - Starting feature loop", flush=True)
             print("=" * 70, flush=True)
             print(flush=True)
+            self._events.emit(agent_events.INIT_COMPLETE)
 
             # CRITICAL: Recreate database connection after initializer subprocess commits
             # The initializer runs as a subprocess and commits to the database file.
@@ -1448,9 +1915,10 @@ class ParallelOrchestrator:
             debug_log.section("INITIALIZATION COMPLETE")
             debug_log.log("INIT", "Disposing old database engine and creating fresh connection")
             logger.debug("Recreating database connection after initialization")
-            if self._engine is not None:
-                self._engine.dispose()
+            dispose_engine(self.project_dir)
             self._engine, self._session_maker = create_database(self.project_dir)
+            self._read_engine, self._read_session_maker = create_read_only_database(self.project_dir)
+            self._feature_graph = FeatureGraph(self._read_session_maker)
 
             # Debug: Show state immediately after initialization
             logger.debug("Post-initialization state check")
@@ -1458,7 +1926,7 @@ class ParallelOrchestrator:
                 self.max_concurrency, self.yolo_mode, self.testing_agent_ratio)
 
             # Verify features were created and are visible
-            session = self.get_session()
+            session = self.get_read_session()
             try:
                 feature_count = session.query(Feature).count()
                 all_features = session.query(Feature).all()
@@ -1475,6 +1943,7 @@ class ParallelOrchestrator:
 
         # Phase 2: Feature loop
         # Check for features to resume from previous session
+        self._feature_graph.refresh()
         resumable = self.get_resumable_features()
         if resumable:
             print(f"Found {len(resumable)} feature(s) to resume from previous session:", flush=True)
@@ -1483,22 +1952,77 @@ class ParallelOrchestrator:
             print(flush=True)
 
         debug_log.section("FEATURE LOOP STARTING")
+        tools_before = self._tool_metrics_summary()
+        # Agents spawned before the shared server listens use stdio servers
+        self._feature_mcp_start = asyncio.create_task(self._start_feature_mcp_server())
+        # Warm workers import while the first agents are cold-spawned
+        await self._start_agent_pool()
+        self._watch_task = asyncio.create_task(self._watch_files())
+        try:
+            await self._feature_loop()
+        finally:
+            self._watch_task.cancel()
+            self._watch_task = None
+            if self._agent_pool is not None:
+                await self._agent_pool.close()
+            await self._stop_feature_mcp_server()
+
+        metrics = self.slot_metrics.snapshot()
+        debug_log.log("METRICS", "Coding slot idle metrics", **metrics)
+        print(
+            f"Slot refills: {metrics['refills']}, "
+            f"refill latency avg {metrics['refill_latency_ms_avg']} ms / max {metrics['refill_latency_ms_max']} ms, "
+            f"idle slot-seconds with work waiting: {metrics['idle_slot_seconds']}",
+            flush=True,
+        )
+        spawn_metrics = self._spawn_metrics_status()
+        debug_log.log("METRICS", "Spawn-to-first-tool-call latency", **spawn_metrics)
+        for kind in ("cold", "warm"):
+            kind_metrics = spawn_metrics[kind]
+            if kind_metrics["count"]:
+                print(
+                    f"{kind.capitalize()} agent starts: {kind_metrics['count']}, "
+                    f"spawn to first tool call avg {kind_metrics['first_tool_ms_avg']} ms / "
+                    f"p95 {kind_metrics['first_tool_ms_p95']} ms",
+                    flush=True,
+                )
+        tool_metrics = self._tool_metrics_summary()
+        debug_log.log("METRICS", "Feature MCP tool latency", **tool_metrics)
+        tool_calls = tool_metrics["calls"] - tools_before["calls"]
+        if tool_calls:
+            print(
+                f"Feature MCP tool calls: {tool_calls}, "
+                f"{(tool_metrics['total_ms'] - tools_before['total_ms']) / 1000:.1f} s in tools, "
+                f"{(tool_metrics['lock_wait_ms'] - tools_before['lock_wait_ms']) / 1000:.1f} s of it "
+                f"waiting for the write lock",
+                flush=True,
+            )
+        print("Orchestrator finished.", flush=True)
+
+    async def _feature_loop(self):
+        """Phase 2 scheduling loop.
+
+        Every pass either starts agents or waits on the wake event; there are
+        no fixed sleeps. The orchestrator marks features in_progress before
+        spawning and tracks running IDs itself, so the next pass can run
+        immediately without double-dispatching.
+        """
         loop_iteration = 0
         while self.is_running and not self._shutdown_requested:
             loop_iteration += 1
             if loop_iteration <= 3:
                 logger.debug("=== Loop iteration %d ===", loop_iteration)
 
-            # Query all features ONCE per iteration and build reusable snapshot.
-            # Every sub-method receives this snapshot instead of re-querying the DB.
-            session = self.get_session()
-            session.expire_all()
-            all_features = session.query(Feature).all()
-            feature_dicts = [f.to_dict() for f in all_features]
-            session.close()
+            # Refresh the feature graph ONCE per iteration. Only rows changed since
+            # the previous iteration are re-read; every sub-method receives this
+            # snapshot instead of re-querying the DB.
+            graph = self._feature_graph
+            graph.refresh()
+            feature_dicts = graph.feature_dicts()
 
-            # Pre-compute scheduling scores once (BFS + reverse topo sort)
-            scheduling_scores = compute_scheduling_scores(feature_dicts)
+            # Scheduling scores are cached by the graph and only recomputed when
+            # priorities or dependencies change
+            scheduling_scores = graph.scheduling_scores
 
             # Log every iteration to debug file (first 10, then every 5th)
             if loop_iteration <= 10 or loop_iteration % 5 == 0:
@@ -1518,38 +2042,44 @@ class ParallelOrchestrator:
                 # Check if all complete
                 if self.get_all_complete(feature_dicts):
                     print("\nAll features complete!", flush=True)
+                    self._events.emit(agent_events.ALL_COMPLETE)
                     break
 
                 # --- Graceful pause (drain mode) ---
                 if not self._drain_requested and self._check_drain_signal():
                     self._drain_requested = True
                     print("Graceful pause requested - draining running agents...", flush=True)
+                    self._events.emit(agent_events.DRAIN_START)
                     debug_log.log("DRAIN", "Graceful pause requested, draining running agents")
 
                 if self._drain_requested:
+                    # Slots are idle on purpose while draining
+                    self.slot_metrics.observe(0, has_work=False)
                     with self._lock:
                         coding_count = len(self.running_coding_agents)
                         testing_count = len(self.running_testing_agents)
 
                     if coding_count == 0 and testing_count == 0:
                         print("All agents drained - paused.", flush=True)
+                        self._events.emit(agent_events.DRAIN_COMPLETE)
                         debug_log.log("DRAIN", "All agents drained, entering paused state")
                         # Wait until signal file is removed (resume) or shutdown
                         while self._check_drain_signal() and self.is_running and not self._shutdown_requested:
-                            await asyncio.sleep(1)
+                            await self._wait_for_event()
                         if not self.is_running or self._shutdown_requested:
                             break
                         self._drain_requested = False
                         print("Resuming from graceful pause...", flush=True)
+                        self._events.emit(agent_events.DRAIN_RESUME)
                         debug_log.log("DRAIN", "Resuming from graceful pause")
                         continue
                     else:
                         debug_log.log("DRAIN", f"Waiting for agents to finish: coding={coding_count}, testing={testing_count}")
-                        await self._wait_for_agent_completion()
+                        await self._wait_for_event()
                         continue
 
                 # Maintain testing agents independently (runs every iteration)
-                self._maintain_testing_agents(feature_dicts)
+                await self._maintain_testing_agents(feature_dicts)
 
                 # Check capacity
                 with self._lock:
@@ -1565,46 +2095,54 @@ class ParallelOrchestrator:
                     at_capacity=(current >= self.max_concurrency))
 
                 if current >= self.max_concurrency:
+                    self.slot_metrics.observe(0, has_work=True)
                     debug_log.log("CAPACITY", "At max capacity, waiting for agent completion...")
-                    await self._wait_for_agent_completion()
+                    self._events.emit(agent_events.AT_CAPACITY, running=current, max_concurrency=self.max_concurrency)
+                    await self._wait_for_event()
                     continue
 
                 # Priority 1: Resume features from previous session
-                resumable = self.get_resumable_features(feature_dicts, scheduling_scores)
+                resumable = self.get_resumable_features(scheduling_scores=scheduling_scores)
+                ready = [] if resumable else self.get_ready_features(scheduling_scores=scheduling_scores)
+                self.slot_metrics.observe(self.max_concurrency - current, has_work=bool(resumable or ready))
+
                 if resumable:
                     slots = self.max_concurrency - current
+                    started = 0
                     for feature in resumable[:slots]:
                         print(f"Resuming feature #{feature['id']}: {feature['name']}", flush=True)
-                        self.start_feature(feature["id"], resume=True)
-                    await asyncio.sleep(0.5)  # Brief delay for subprocess to claim feature before re-querying
+                        success, _ = await self.start_feature(feature["id"], resume=True)
+                        if success:
+                            self.slot_metrics.slot_filled()
+                            started += 1
+                    if not started:
+                        # Nothing could be started; don't spin on the same candidates
+                        await self._wait_for_event()
                     continue
 
                 # Priority 2: Start new ready features
-                ready = self.get_ready_features(feature_dicts, scheduling_scores)
                 if not ready:
                     # Wait for running features to complete
                     if current > 0:
-                        await self._wait_for_agent_completion()
+                        await self._wait_for_event()
                         continue
                     else:
                         # No ready features and nothing running
                         # Force a fresh database check before declaring blocked
                         # This handles the case where subprocess commits weren't visible yet
-                        session = self.get_session()
-                        try:
-                            session.expire_all()
-                            fresh_dicts = [f.to_dict() for f in session.query(Feature).all()]
-                        finally:
-                            session.close()
+                        if graph.refresh():
+                            feature_dicts = graph.feature_dicts()
 
                         # Recheck if all features are now complete
-                        if self.get_all_complete(fresh_dicts):
+                        if self.get_all_complete(feature_dicts):
                             print("\nAll features complete!", flush=True)
+                            self._events.emit(agent_events.ALL_COMPLETE)
                             break
 
                         # Still have pending features but all are blocked by dependencies
                         print("No ready features available. All remaining features may be blocked by dependencies.", flush=True)
-                        await self._wait_for_agent_completion(timeout=POLL_INTERVAL * 2)
+                        self._events.emit(agent_events.BLOCKED, count=sum(1 for f in feature_dicts if not f["passes"]))
+                        await self._wait_for_event(timeout=POLL_INTERVAL * 2)
                         continue
 
                 # Build dependency-aware batches from ready features
@@ -1614,23 +2152,28 @@ class ParallelOrchestrator:
                 logger.debug("Spawning loop: %d ready, %d slots available, %d batches built",
                     len(ready), slots, len(batches))
 
+                self._events.emit(agent_events.CAPACITY, ready=len(ready), slots=slots, running=current,
+                    max_concurrency=self.max_concurrency)
                 debug_log.log("SPAWN", "Starting feature batches",
                     ready_count=len(ready),
                     slots_available=slots,
                     batch_count=len(batches),
                     batches=[[f['id'] for f in b] for b in batches[:slots]])
 
+                started = 0
                 for batch in batches[:slots]:
                     batch_ids = [f["id"] for f in batch]
                     batch_names = [f"{f['id']}:{f['name']}" for f in batch]
                     logger.debug("Starting batch: %s", batch_ids)
-                    success, msg = self.start_feature_batch(batch_ids)
+                    success, msg = await self.start_feature_batch(batch_ids)
                     if not success:
                         logger.debug("Failed to start batch %s: %s", batch_ids, msg)
                         debug_log.log("SPAWN", f"FAILED to start batch {batch_ids}",
                             batch_names=batch_names,
                             error=msg)
                     else:
+                        self.slot_metrics.slot_filled()
+                        started += 1
                         logger.debug("Successfully started batch %s", batch_ids)
                         with self._lock:
                             running_count = len(self.running_coding_agents)
@@ -1639,11 +2182,13 @@ class ParallelOrchestrator:
                             batch_names=batch_names,
                             running_coding_agents=running_count)
 
-                await asyncio.sleep(0.5)
+                if not started:
+                    # Every spawn failed; wait for something to change instead of spinning
+                    await self._wait_for_event()
 
             except Exception as e:
                 print(f"Orchestrator error: {e}", flush=True)
-                await self._wait_for_agent_completion()
+                await self._wait_for_event()
 
         # Wait for remaining agents to complete
         print("Waiting for running agents to complete...", flush=True)
@@ -1654,12 +2199,11 @@ class ParallelOrchestrator:
                 if coding_done and testing_done:
                     break
             # Use short timeout since we're just waiting for final agents to finish
-            await self._wait_for_agent_completion(timeout=1.0)
-
-        print("Orchestrator finished.", flush=True)
+            await self._wait_for_event(timeout=1.0)
 
     def get_status(self) -> dict:
         """Get current orchestrator status."""
+        tool_metrics = self._tool_metrics_summary()
         with self._lock:
             return {
                 "running_features": list(self.running_coding_agents.keys()),
@@ -1670,8 +2214,22 @@ class ParallelOrchestrator:
                 "testing_agent_ratio": self.testing_agent_ratio,
                 "is_running": self.is_running,
                 "yolo_mode": self.yolo_mode,
+                "slot_metrics": self.slot_metrics.snapshot(),
+                "spawn_metrics": self._spawn_metrics_status(),
+                "tool_metrics": tool_metrics,
             }
 
+    def _spawn_metrics_status(self) -> dict:
+        """Cold/warm first-tool-call latency plus warm pool stats."""
+        status = self.spawn_metrics.snapshot()
+        status["pool"] = self._agent_pool.stats() if self._agent_pool is not None else None
+        return status
+
+    def _tool_metrics_summary(self) -> dict:
+        """Feature MCP tool latency and write lock waits, from the project's metrics file."""
+        from autoforge_paths import get_tool_metrics_path
+        return summarize_tool_metrics(load_tool_metrics(get_tool_metrics_path(self.project_dir)))
+
     def _check_drain_signal(self) -> bool:
         """Check if the graceful pause (drain) signal file exists."""
         from autoforge_paths import get_pause_drain_path
@@ -1708,6 +2266,9 @@ class ParallelOrchestrator:
 
         try:
             engine.dispose()
+            if self._read_engine is not None:
+                self._read_engine.dispose()
+                self._read_engine = None
             debug_log.log("CLEANUP", "Engine disposed successfully")
         except Exception as e:
             debug_log.log("CLEANUP", f"Engine dispose failed: {e}")
@@ -1754,8 +2315,7 @@ async def run_parallel_orchestrator(
     # Set up async-safe signal handler for graceful shutdown
     # Only sets flags - everything else is unsafe in signal context
     def signal_handler(signum, frame):
-        orchestrator._shutdown_requested = True
-        orchestrator.is_running = False
+        orchestrator.request_shutdown()
 
     # Register SIGTERM handler for process termination signals
     # Note: On Windows, SIGTERM handlers only fire from os.kill() calls within Python.
@@ -1770,7 +2330,12 @@ async def run_parallel_orchestrator(
         await orchestrator.run_loop()
     except KeyboardInterrupt:
         print("\n\nInterrupted by user. Stopping agents...", flush=True)
-        orchestrator.stop_all()
+        await orchestrator.stop_all()
+    except asyncio.CancelledError:
+        # asyncio.run() delivers Ctrl+C as cancellation of the main task
+        print("\n\nInterrupted by user. Stopping agents...", flush=True)
+        await orchestrator.stop_all()
+        raise
     finally:
         # CRITICAL: Always clean up database resources on exit
         # This forces WAL checkpoint and disposes connections
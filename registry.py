@@ -9,6 +9,7 @@ Uses SQLite database stored at ~/.autoforge/registry.db.
 import logging
 import os
 import re
+import sqlite3
 import threading
 import time
 from contextlib import contextmanager
@@ -16,9 +17,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer, String, create_engine, text
+from sqlalchemy import Column, DateTime, Integer, String, create_engine, event, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
+from api.sqlite_profiles import SQLITE_PROFILE_SETTING, apply_sqlite_profile, get_sqlite_profile, resolve_sqlite_profile
+
 # Module logger
 logger = logging.getLogger(__name__)
 
@@ -119,6 +122,7 @@ class Project(Base):
     path = Column(String, nullable=False)  # POSIX format for cross-platform
     created_at = Column(DateTime, nullable=False)
     default_concurrency = Column(Integer, nullable=False, default=3)
+    sqlite_profile = Column(String(20), nullable=True)  # None = use the global setting
 
 
 class Settings(Base):
@@ -175,15 +179,25 @@ def _get_engine():
             if _engine is None:
                 db_path = get_registry_path()
                 db_url = f"sqlite:///{db_path.as_posix()}"
-                _engine = create_engine(
+                profile = resolve_sqlite_profile()
+                engine = create_engine(
                     db_url,
                     connect_args={
                         "check_same_thread": False,
                         "timeout": SQLITE_TIMEOUT,
-                    }
+                    },
+                    **profile.engine_kwargs(),
                 )
-                Base.metadata.create_all(bind=_engine)
-                _migrate_add_default_concurrency(_engine)
+
+                @event.listens_for(engine, "connect")
+                def _apply_profile(dbapi_connection, connection_record):
+                    # registry.db keeps SQLite's default rollback journal
+                    apply_sqlite_profile(dbapi_connection, profile, wal=False)
+
+                Base.metadata.create_all(bind=engine)
+                _migrate_add_default_concurrency(engine)
+                _migrate_add_sqlite_profile(engine)
+                _engine = engine
                 _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
                 logger.debug("Initialized registry database at: %s", db_path)
 
@@ -203,6 +217,17 @@ def _migrate_add_default_concurrency(engine) -> None:
             logger.info("Migrated projects table: added default_concurrency column")
 
 
+def _migrate_add_sqlite_profile(engine) -> None:
+    """Add sqlite_profile column if missing (for existing databases)."""
+    with engine.connect() as conn:
+        result = conn.execute(text("PRAGMA table_info(projects)"))
+        columns = [row[1] for row in result.fetchall()]
+        if "sqlite_profile" not in columns:
+            conn.execute(text("ALTER TABLE projects ADD COLUMN sqlite_profile VARCHAR(20)"))
+            conn.commit()
+            logger.info("Migrated projects table: added sqlite_profile column")
+
+
 @contextmanager
 def _get_session():
     """
@@ -464,6 +489,103 @@ def set_project_concurrency(name: str, concurrency: int) -> bool:
     return True
 
 
+def get_project_sqlite_profile(name: str) -> str | None:
+    """
+    Get the SQLite profile chosen for a project.
+
+    Args:
+        name: The project name.
+
+    Returns:
+        The profile name, or None if the project uses the global setting.
+    """
+    _, SessionLocal = _get_engine()
+    session = SessionLocal()
+    try:
+        project = session.query(Project).filter(Project.name == name).first()
+        return project.sqlite_profile if project else None
+    finally:
+        session.close()
+
+
+def set_project_sqlite_profile(name: str, profile: str | None) -> bool:
+    """
+    Set the SQLite profile for a project (see api/sqlite_profiles.py).
+
+    Takes effect the next time the project's databases are opened.
+
+    Args:
+        name: The project name.
+        profile: A profile name, or None to follow the global setting.
+
+    Returns:
+        True if updated, False if project wasn't found.
+
+    Raises:
+        ValueError: If profile is not a known profile name.
+    """
+    if profile is not None:
+        get_sqlite_profile(profile)
+
+    with _get_session() as session:
+        project = session.query(Project).filter(Project.name == name).first()
+        if not project:
+            return False
+
+        project.sqlite_profile = profile
+
+    logger.info("Set project '%s' sqlite_profile to %s", name, profile)
+    return True
+
+
+def get_sqlite_profile_name(project_dir: Path | None = None) -> str | None:
+    """
+    Look up the SQLite profile name for a project directory, or the global one.
+
+    The project's own choice wins over the global "sqlite_profile" setting.
+    Reads registry.db with a short-lived read-only sqlite3 connection so that
+    resolving a profile never creates the registry or its engine (the registry
+    engine itself is configured from this value).
+
+    Args:
+        project_dir: The project directory, or None for the global setting.
+
+    Returns:
+        The stored profile name, or None if nothing is set.
+    """
+    db_path = get_registry_path()
+    if not db_path.exists():
+        return None
+
+    try:
+        conn = sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro", uri=True, timeout=SQLITE_TIMEOUT)
+    except sqlite3.Error as e:
+        logger.warning("Failed to open registry for SQLite profile: %s", e)
+        return None
+
+    try:
+        if project_dir is not None:
+            try:
+                row = conn.execute(
+                    "SELECT sqlite_profile FROM projects WHERE path = ?",
+                    (Path(project_dir).resolve().as_posix(),),
+                ).fetchone()
+            except sqlite3.OperationalError:
+                row = None  # Registry predates the sqlite_profile column
+            if row and row[0]:
+                return str(row[0])
+
+        row = conn.execute(
+            "SELECT value FROM settings WHERE key = ?", (SQLITE_PROFILE_SETTING,)
+        ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logger.warning("Failed to read SQLite profile from registry: %s", e)
+        return None
+    finally:
+        conn.close()
+
+
 # =============================================================================
 # Validation Functions
 # =============================================================================
@@ -6,15 +6,18 @@ Pre-tool-use hooks that validate bash commands for security.
 Uses an allowlist approach - only explicitly permitted commands can run.
 """
 
+import functools
 import logging
 import os
 import re
 import shlex
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import yaml
 
+from autoforge_paths import StatSignature, stat_signature
+
 # Logger for security-related events (fallback parsing, validation failures, etc.)
 logger = logging.getLogger(__name__)
 
@@ -141,6 +144,12 @@ DANGEROUS_COMMANDS = {
 }
 
 
+# Command chaining separators: && and ||
+_CHAIN_SPLIT_PATTERN = re.compile(r"\s*(?:&&|\|\|)\s*")
+# Semicolons that aren't next to a quote (simple heuristic)
+_SEMICOLON_SPLIT_PATTERN = re.compile(r'(?<!["\'])\s*;\s*(?!["\'])')
+
+
 def split_command_segments(command_string: str) -> list[str]:
     """
     Split a compound command into individual command segments.
@@ -153,16 +162,14 @@ def split_command_segments(command_string: str) -> list[str]:
     Returns:
         List of individual command segments
     """
-    import re
-
     # Split on && and || while preserving the ability to handle each segment
     # This regex splits on && or || that aren't inside quotes
-    segments = re.split(r"\s*(?:&&|\|\|)\s*", command_string)
+    segments = _CHAIN_SPLIT_PATTERN.split(command_string)
 
     # Further split on semicolons
     result = []
     for segment in segments:
-        sub_segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', segment)
+        sub_segments = _SEMICOLON_SPLIT_PATTERN.split(segment)
         for sub in sub_segments:
             sub = sub.strip()
             if sub:
@@ -210,6 +217,33 @@ def _extract_primary_command(segment: str) -> str | None:
     return None
 
 
+# Number of distinct command strings whose parse results are kept. Agents
+# repeat the same commands (git status, npm test, ...) many times per session.
+PARSE_CACHE_SIZE = 2048
+
+
+# Characters that make shlex.split() differ from a plain whitespace split
+_SHLEX_SPECIAL_PATTERN = re.compile(r"[\"'\\]")
+# Runs of non-whitespace, as shlex's whitespace_split mode sees them
+_WORD_PATTERN = re.compile(r"[^ \t\r\n]+")
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _tokenize(text: str) -> tuple[str, ...] | None:
+    """shlex.split() once per distinct string; None if it can't be parsed.
+
+    Without quotes or backslashes shlex only splits on whitespace, so most
+    agent commands are split with one regex scan instead of shlex's
+    character-by-character lexer.
+    """
+    if not _SHLEX_SPECIAL_PATTERN.search(text):
+        return tuple(_WORD_PATTERN.findall(text))
+    try:
+        return tuple(shlex.split(text))
+    except ValueError:
+        return None
+
+
 def extract_commands(command_string: str) -> list[str]:
     """
     Extract command names from a shell command string.
@@ -223,22 +257,27 @@ def extract_commands(command_string: str) -> list[str]:
     Returns:
         List of command names found in the string
     """
+    return list(_extract_commands_cached(command_string))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _extract_commands_cached(command_string: str) -> tuple[str, ...]:
+    """Cached implementation of extract_commands()."""
     commands = []
 
     # shlex doesn't treat ; as a separator, so we need to pre-process
 
     # Split on semicolons that aren't inside quotes (simple heuristic)
     # This handles common cases like "echo hello; ls"
-    segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', command_string)
+    segments = _SEMICOLON_SPLIT_PATTERN.split(command_string)
 
     for segment in segments:
         segment = segment.strip()
         if not segment:
             continue
 
-        try:
-            tokens = shlex.split(segment)
-        except ValueError:
+        tokens = _tokenize(segment)
+        if tokens is None:
             # Malformed command (unclosed quotes, etc.)
             # Try fallback extraction instead of blocking entirely
             fallback_cmd = _extract_primary_command(segment)
@@ -256,56 +295,116 @@ def extract_commands(command_string: str) -> list[str]:
                 )
             continue
 
-        if not tokens:
+        commands.extend(_commands_from_tokens(tokens))
+
+    return tuple(commands)
+
+
+# Shell keywords that precede commands rather than being commands
+_SHELL_KEYWORDS = frozenset({
+    "if", "then", "else", "elif", "fi", "for", "while", "until",
+    "do", "done", "case", "esac", "in", "!", "{", "}",
+})
+
+
+def _commands_from_tokens(tokens: tuple[str, ...]) -> list[str]:
+    """Base command names in one tokenized segment (see extract_commands)."""
+    commands = []
+
+    # Track when we expect a command vs arguments
+    expect_command = True
+
+    for token in tokens:
+        # Shell operators indicate a new command follows
+        if token in ("|", "||", "&&", "&"):
+            expect_command = True
+            continue
+
+        # Skip shell keywords that precede commands
+        if token in _SHELL_KEYWORDS:
+            continue
+
+        # Skip flags/options
+        if token.startswith("-"):
+            continue
+
+        # Skip variable assignments (VAR=value)
+        if "=" in token and not token.startswith("="):
             continue
 
-        # Track when we expect a command vs arguments
-        expect_command = True
-
-        for token in tokens:
-            # Shell operators indicate a new command follows
-            if token in ("|", "||", "&&", "&"):
-                expect_command = True
-                continue
-
-            # Skip shell keywords that precede commands
-            if token in (
-                "if",
-                "then",
-                "else",
-                "elif",
-                "fi",
-                "for",
-                "while",
-                "until",
-                "do",
-                "done",
-                "case",
-                "esac",
-                "in",
-                "!",
-                "{",
-                "}",
-            ):
-                continue
-
-            # Skip flags/options
-            if token.startswith("-"):
-                continue
-
-            # Skip variable assignments (VAR=value)
-            if "=" in token and not token.startswith("="):
-                continue
-
-            if expect_command:
-                # Extract the base command name (handle paths like /usr/bin/python)
-                cmd = os.path.basename(token)
-                commands.append(cmd)
-                expect_command = False
+        if expect_command:
+            # Extract the base command name (handle paths like /usr/bin/python)
+            commands.append(os.path.basename(token))
+            expect_command = False
 
     return commands
 
 
+class CommandSegment(NamedTuple):
+    """One &&/||/; separated segment of a command line."""
+
+    text: str
+    # shlex tokens of the segment, or None if it could not be tokenized
+    argv: tuple[str, ...] | None
+    # Base command names found in the segment (see extract_commands)
+    commands: tuple[str, ...]
+
+
+class ParsedCommand(NamedTuple):
+    """A command line parsed once into commands and segments.
+
+    Produced by parse_command() and shared (read-only) by the security hook
+    and all validators, so no part of a command string is tokenized twice.
+    """
+
+    text: str
+    commands: tuple[str, ...]
+    segments: tuple[CommandSegment, ...]
+
+    def segment_for(self, cmd: str) -> CommandSegment:
+        """Return the first segment that invokes cmd, or the whole command."""
+        for segment in self.segments:
+            if cmd in segment.commands:
+                return segment
+        return _make_segment(self.text)
+
+
+def _make_segment(text: str) -> CommandSegment:
+    argv = _tokenize(text)
+    if argv is None or _SEMICOLON_SPLIT_PATTERN.search(text):
+        # Untokenizable, or the whole-command fallback still holding ';'
+        return CommandSegment(text, argv, _extract_commands_cached(text))
+    # Segment commands come from the argv just tokenized
+    return CommandSegment(text, argv, tuple(_commands_from_tokens(argv)))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_command(command_string: str) -> ParsedCommand:
+    """
+    Parse a command line into commands, segments and argv, once.
+
+    Results are cached by command string. Equivalent to calling
+    extract_commands(), split_command_segments() and shlex.split() on each
+    segment, which is what the individual validators used to do separately.
+    Each distinct string is tokenized once; a segment that is also a whole
+    ';' piece (no && or ||) shares that tokenization. The command list is
+    taken from the ';' pieces rather than the segments because the &&/||
+    split is not quote-aware: commands from segments would misread
+    git commit -m "a && b".
+
+    Args:
+        command_string: The full shell command
+
+    Returns:
+        ParsedCommand for the string
+    """
+    return ParsedCommand(
+        text=command_string,
+        commands=_extract_commands_cached(command_string),
+        segments=tuple(_make_segment(seg) for seg in split_command_segments(command_string)),
+    )
+
+
 # Default pkill process names (hardcoded baseline, always available)
 DEFAULT_PKILL_PROCESSES = {
     "node",
@@ -333,14 +432,20 @@ def validate_pkill_command(
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
+    return _check_pkill_argv(_tokenize(command_string), extra_processes)
+
+
+def _check_pkill_argv(
+    tokens: tuple[str, ...] | None,
+    extra_processes: Optional[set[str] | frozenset[str]] = None,
+) -> tuple[bool, str]:
+    """validate_pkill_command() on pre-tokenized argv."""
     # Merge default processes with any extra configured processes
     allowed_process_names = DEFAULT_PKILL_PROCESSES.copy()
     if extra_processes:
         allowed_process_names |= extra_processes
 
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    if tokens is None:
         return False, "Could not parse pkill command"
 
     if not tokens:
@@ -370,6 +475,9 @@ def validate_pkill_command(
     return False, f"pkill only allowed for processes: {sorted(allowed_process_names)}"
 
 
+_CHMOD_MODE_PATTERN = re.compile(r"^[ugoa]*\+x$")
+
+
 def validate_chmod_command(command_string: str) -> tuple[bool, str]:
     """
     Validate chmod commands - only allow making files executable with +x.
@@ -377,9 +485,12 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    return _check_chmod_argv(_tokenize(command_string))
+
+
+def _check_chmod_argv(tokens: tuple[str, ...] | None) -> tuple[bool, str]:
+    """validate_chmod_command() on pre-tokenized argv."""
+    if tokens is None:
         return False, "Could not parse chmod command"
 
     if not tokens or tokens[0] != "chmod":
@@ -407,9 +518,7 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
 
     # Only allow +x variants (making files executable)
     # This matches: +x, u+x, g+x, o+x, a+x, ug+x, etc.
-    import re
-
-    if not re.match(r"^[ugoa]*\+x$", mode):
+    if not _CHMOD_MODE_PATTERN.match(mode):
         return False, f"chmod only allowed with +x mode, got: {mode}"
 
     return True, ""
@@ -422,9 +531,12 @@ def validate_init_script(command_string: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    return _check_init_script_argv(_tokenize(command_string))
+
+
+def _check_init_script_argv(tokens: tuple[str, ...] | None) -> tuple[bool, str]:
+    """validate_init_script() on pre-tokenized argv."""
+    if tokens is None:
         return False, "Could not parse init script command"
 
     if not tokens:
@@ -450,9 +562,12 @@ def validate_playwright_command(command_string: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_allowed, reason_if_blocked)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    return _check_playwright_argv(_tokenize(command_string))
+
+
+def _check_playwright_argv(tokens: tuple[str, ...] | None) -> tuple[bool, str]:
+    """validate_playwright_command() on pre-tokenized argv."""
+    if tokens is None:
         return False, "Could not parse playwright-cli command"
 
     if not tokens:
@@ -893,6 +1008,130 @@ def is_command_allowed(command: str, allowed_commands: set[str]) -> bool:
     return False
 
 
+class _PrefixTrie:
+    """Character trie answering "does any stored prefix start this string?"."""
+
+    __slots__ = ("_root",)
+
+    _END = ""  # Key marking the end of a stored prefix (never a real character)
+
+    def __init__(self, prefixes: set[str]):
+        self._root: dict = {}
+        for prefix in prefixes:
+            node = self._root
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[self._END] = True
+
+    def matches(self, command: str) -> bool:
+        node = self._root
+        for ch in command:
+            child = node.get(ch)
+            if child is None:
+                return False
+            node = child
+            if self._END in node:
+                return True
+        return False
+
+
+class SecurityPolicy:
+    """Allow/block rules for one project, compiled for fast lookups.
+
+    Built from get_effective_commands() and get_effective_pkill_processes()
+    and split by pattern kind so is_allowed() never loops over every entry:
+
+    - exact: every allowed entry, for the O(1) exact-match check
+    - prefix trie: entries ending in "*" (e.g. "swift*")
+    - script names: basenames of path entries (e.g. "./scripts/build.sh")
+
+    Semantics match is_command_allowed() / matches_pattern() exactly.
+    """
+
+    __slots__ = ("allowed", "blocked", "pkill_processes", "extra_pkill_processes",
+                 "_prefixes", "_script_names")
+
+    def __init__(self, allowed: set[str], blocked: set[str], pkill_processes: set[str]):
+        self.allowed = frozenset(allowed)
+        self.blocked = frozenset(blocked)
+        self.pkill_processes = frozenset(pkill_processes)
+        # Configured processes beyond the defaults (what validate_pkill_command expects)
+        self.extra_pkill_processes = frozenset(pkill_processes - DEFAULT_PKILL_PROCESSES)
+
+        prefixes = set()
+        script_names = set()
+        for pattern in allowed:
+            if pattern == "*":
+                continue  # Bare wildcard never matches (see matches_pattern)
+            if pattern.endswith("*"):
+                prefixes.add(pattern[:-1])
+            elif "/" in pattern:
+                script_names.add(os.path.basename(pattern))
+        self._prefixes = _PrefixTrie(prefixes)
+        self._script_names = frozenset(script_names)
+
+    def is_allowed(self, command: str) -> bool:
+        """Equivalent to is_command_allowed(command, self.allowed)."""
+        if command in self.allowed:
+            return True
+        if self._prefixes.matches(command):
+            return True
+        if self._script_names:
+            if command in self._script_names:
+                return True
+            if "/" in command and command.rsplit("/", 1)[1] in self._script_names:
+                return True
+        return False
+
+
+# (project_dir, home) -> (config file signature, compiled policy)
+_policy_cache: dict[tuple[str, str], tuple[StatSignature, SecurityPolicy]] = {}
+
+
+def _policy_config_paths(project_dir: Optional[Path]) -> list[Path]:
+    """Every config file that can influence a project's policy."""
+    home = Path.home()
+    paths = [home / ".autoforge" / "config.yaml", home / ".autocoder" / "config.yaml"]
+    if project_dir:
+        resolved = project_dir.resolve()
+        paths.append(resolved / ".autoforge" / "allowed_commands.yaml")
+        paths.append(resolved / ".autocoder" / "allowed_commands.yaml")
+    return paths
+
+
+def get_security_policy(project_dir: Optional[Path]) -> SecurityPolicy:
+    """
+    Get the compiled security policy for a project.
+
+    Cached per project; the cache entry is rebuilt when any org or project
+    config file is created, deleted or modified (by mtime/size), so the hot
+    path only stats the config files - no reads or YAML parsing.
+
+    Args:
+        project_dir: Path to the project directory, or None
+
+    Returns:
+        SecurityPolicy reflecting get_effective_commands() and
+        get_effective_pkill_processes() for the project
+    """
+    key = (str(project_dir) if project_dir else "", str(Path.home()))
+    signature = stat_signature(_policy_config_paths(project_dir))
+
+    cached = _policy_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    allowed, blocked = get_effective_commands(project_dir)
+    policy = SecurityPolicy(allowed, blocked, get_effective_pkill_processes(project_dir))
+    _policy_cache[key] = (signature, policy)
+    return policy
+
+
+def clear_security_policy_cache() -> None:
+    """Drop all compiled policies (they are rebuilt on next use)."""
+    _policy_cache.clear()
+
+
 async def bash_security_hook(input_data, tool_use_id=None, context=None):
     """
     Pre-tool-use hook that validates bash commands using an allowlist.
@@ -914,8 +1153,10 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
     if not command:
         return {}
 
-    # Extract all commands from the command string
-    commands = extract_commands(command)
+    # Parse once into commands and segments (cached by command string);
+    # every check below reuses this result instead of re-tokenizing
+    parsed = parse_command(command)
+    commands = parsed.commands
 
     if not commands:
         # Could not parse - fail safe by blocking
@@ -931,26 +1172,21 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
         if project_dir_str:
             project_dir = Path(project_dir_str)
 
-    # Get effective commands using hierarchy resolution
-    allowed_commands, blocked_commands = get_effective_commands(project_dir)
-
-    # Get effective pkill processes (includes org/project config)
-    pkill_processes = get_effective_pkill_processes(project_dir)
-
-    # Split into segments for per-command validation
-    segments = split_command_segments(command)
+    # Get the compiled policy (hierarchy-resolved allow/block lists and pkill
+    # processes), cached per project and rebuilt only when a config file changes
+    policy = get_security_policy(project_dir)
 
     # Check each command against the blocklist and allowlist
     for cmd in commands:
         # Check blocklist first (highest priority)
-        if cmd in blocked_commands:
+        if cmd in policy.blocked:
             return {
                 "decision": "block",
                 "reason": f"Command '{cmd}' is blocked at organization level and cannot be approved.",
             }
 
         # Check allowlist (with pattern matching)
-        if not is_command_allowed(cmd, allowed_commands):
+        if not policy.is_allowed(cmd):
             # Provide helpful error message with config hint
             error_msg = f"Command '{cmd}' is not allowed.\n"
             error_msg += "To allow this command:\n"
@@ -964,32 +1200,25 @@ async def bash_security_hook(input_data, tool_use_id=None, context=None):
 
         # Additional validation for sensitive commands
         if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION:
-            # Find the specific segment containing this command by searching
-            # each segment's extracted commands for a match
-            cmd_segment = ""
-            for segment in segments:
-                if cmd in extract_commands(segment):
-                    cmd_segment = segment
-                    break
-            if not cmd_segment:
-                cmd_segment = command  # Fallback to full command
+            # Validate the argv of the segment containing this command
+            # (falls back to the full command if no segment matches)
+            argv = parsed.segment_for(cmd).argv
 
             if cmd == "pkill":
                 # Pass configured extra processes (beyond defaults)
-                extra_procs = pkill_processes - DEFAULT_PKILL_PROCESSES
-                allowed, reason = validate_pkill_command(cmd_segment, extra_procs if extra_procs else None)
+                allowed, reason = _check_pkill_argv(argv, policy.extra_pkill_processes)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
             elif cmd == "chmod":
-                allowed, reason = validate_chmod_command(cmd_segment)
+                allowed, reason = _check_chmod_argv(argv)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
             elif cmd == "init.sh":
-                allowed, reason = validate_init_script(cmd_segment)
+                allowed, reason = _check_init_script_argv(argv)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
             elif cmd == "playwright-cli":
-                allowed, reason = validate_playwright_command(cmd_segment)
+                allowed, reason = _check_playwright_argv(argv)
                 if not allowed:
                     return {"decision": "block", "reason": reason}
 
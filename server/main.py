@@ -52,11 +52,32 @@ from .services.expand_chat_session import cleanup_all_expand_sessions
 from .services.process_manager import cleanup_all_managers, cleanup_orphaned_locks
 from .services.scheduler_service import cleanup_scheduler, get_scheduler
 from .services.terminal_manager import cleanup_all_terminals
+from .utils.db_executor import run_db, shutdown_db_executor
 from .websocket import project_websocket
 
 # Paths
 UI_DIST_DIR = ROOT_DIR / "ui" / "dist"
 
+# How often idle per-project database engines are swept (seconds)
+ENGINE_SWEEP_INTERVAL = 60
+
+
+async def _sweep_idle_engines() -> None:
+    """Periodically dispose database engines of projects the UI stopped using."""
+    from api.database import dispose_idle_engines as dispose_idle_features_engines
+
+    from .services.assistant_database import dispose_idle_engines as dispose_idle_assistant_engines
+
+    while True:
+        await asyncio.sleep(ENGINE_SWEEP_INTERVAL)
+        try:
+            disposed = await run_db(dispose_idle_features_engines)
+            disposed += await run_db(dispose_idle_assistant_engines)
+            if disposed:
+                logger.debug("Disposed %d idle database engines", disposed)
+        except Exception as e:
+            logger.warning("Idle engine sweep failed: %s", e)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -80,8 +101,11 @@ async def lifespan(app: FastAPI):
     scheduler = get_scheduler()
     await scheduler.start()
 
+    engine_sweeper = asyncio.create_task(_sweep_idle_engines())
+
     yield
 
+    engine_sweeper.cancel()
     # Shutdown - cleanup scheduler first to stop triggering new starts
     await cleanup_scheduler()
     # Then cleanup all running agents, sessions, terminals, and dev servers
@@ -90,6 +114,8 @@ async def lifespan(app: FastAPI):
     await cleanup_all_expand_sessions()
     await cleanup_all_terminals()
     await cleanup_all_devservers()
+    # Finally release the database worker threads
+    shutdown_db_executor()
 
 
 # Create FastAPI app
@@ -191,6 +217,20 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/health/db")
+async def database_health():
+    """Engine cache hit rates, evictions and the server's open file descriptors."""
+    from api.database import engine_cache_stats as features_engine_cache_stats
+    from api.engine_cache import count_open_fds
+
+    from .services.assistant_database import engine_cache_stats as assistant_engine_cache_stats
+
+    return {
+        "engine_caches": [*features_engine_cache_stats(), assistant_engine_cache_stats()],
+        "open_fds": count_open_fds(),
+    }
+
+
 @app.get("/api/setup/status", response_model=SetupStatus)
 async def setup_status():
     """Check system setup status."""
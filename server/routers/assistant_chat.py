@@ -25,6 +25,7 @@ from ..services.assistant_database import (
     get_conversation,
     get_conversations,
 )
+from ..utils.db_executor import run_db
 from ..utils.project_helpers import get_project_path as _get_project_path
 from ..utils.validation import validate_project_name
 
@@ -86,7 +87,7 @@ async def list_project_conversations(project_name: str):
     if not project_dir or not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    conversations = get_conversations(project_dir, project_name)
+    conversations = await run_db(get_conversations, project_dir, project_name, project=project_dir)
     return [ConversationSummary(**c) for c in conversations]
 
 
@@ -100,7 +101,7 @@ async def get_project_conversation(project_name: str, conversation_id: int):
     if not project_dir or not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    conversation = get_conversation(project_dir, conversation_id)
+    conversation = await run_db(get_conversation, project_dir, conversation_id, project=project_dir)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -124,7 +125,7 @@ async def create_project_conversation(project_name: str):
     if not project_dir or not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    conversation = create_conversation(project_dir, project_name)
+    conversation = await run_db(create_conversation, project_dir, project_name, project=project_dir)
     return ConversationSummary(
         id=int(conversation.id),
         project_name=str(conversation.project_name),
@@ -145,7 +146,7 @@ async def delete_project_conversation(project_name: str, conversation_id: int):
     if not project_dir or not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    success = delete_conversation(project_dir, conversation_id)
+    success = await run_db(delete_conversation, project_dir, conversation_id, project=project_dir)
     if not success:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
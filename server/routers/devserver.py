@@ -35,7 +35,7 @@ _root = Path(__file__).parent.parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from security import extract_commands, get_effective_commands, is_command_allowed
+from security import extract_commands, get_security_policy
 
 logger = logging.getLogger(__name__)
 
@@ -223,16 +223,16 @@ def validate_dev_command(command: str, project_dir: Path) -> None:
             detail="Could not parse command for security validation"
         )
 
-    allowed_commands, blocked_commands = get_effective_commands(project_dir)
+    policy = get_security_policy(project_dir)
 
     for cmd in commands:
-        if cmd in blocked_commands:
+        if cmd in policy.blocked:
             logger.warning("Blocked dev server command '%s' (in blocklist) for project dir %s", cmd, project_dir)
             raise HTTPException(
                 status_code=400,
                 detail=f"Command '{cmd}' is blocked and cannot be used as a dev server command"
             )
-        if not is_command_allowed(cmd, allowed_commands):
+        if not policy.is_allowed(cmd):
             logger.warning("Rejected dev server command '%s' (not in allowlist) for project dir %s", cmd, project_dir)
             raise HTTPException(
                 status_code=400,
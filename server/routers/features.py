@@ -8,9 +8,10 @@ API endpoints for feature/test case management.
 import logging
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Literal
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 
 from ..schemas import (
     DependencyGraphEdge,
@@ -20,11 +21,15 @@ from ..schemas import (
     FeatureBulkCreate,
     FeatureBulkCreateResponse,
     FeatureCreate,
+    FeatureEventListResponse,
+    FeatureImportResponse,
     FeatureListResponse,
     FeatureResponse,
     FeatureUpdate,
     HumanInputResponse,
+    ToolMetricsResponse,
 )
+from ..utils.db_executor import run_db
 from ..utils.project_helpers import get_project_path as _get_project_path
 from ..utils.validation import validate_project_name
 
@@ -50,17 +55,40 @@ def _get_db_classes():
     return _create_database, _Feature
 
 
+def _record_event(session, feature_id: int, event_type: str, data: dict | None = None) -> None:
+    """Append a feature change event in the session's current transaction."""
+    _get_db_classes()  # Ensures project root is importable
+    from api.database import record_feature_event
+    record_feature_event(session, feature_id, event_type, data)
+
+
+def _passing_dependency_ids(session, Feature, feature) -> set[int]:
+    """Return which of feature's dependencies are passing (for feature_to_response)."""
+    deps = feature.dependencies or []
+    if not deps:
+        return set()
+    rows = session.query(Feature.id).filter(Feature.id.in_(deps), Feature.passes == True)
+    return {row[0] for row in rows}
+
+
 router = APIRouter(prefix="/api/projects/{project_name}/features", tags=["features"])
 
 
 @contextmanager
-def get_db_session(project_dir: Path):
+def get_db_session(project_dir: Path, read_only: bool = False):
     """
     Context manager for database sessions.
     Ensures session is always closed, even on exceptions.
+
+    GET handlers pass read_only=True to get a deferred-transaction session
+    that doesn't wait for agents holding the write lock.
     """
     create_database, _ = _get_db_classes()
-    _, SessionLocal = create_database(project_dir)
+    if read_only:
+        from api.database import create_read_only_database
+        _, SessionLocal = create_read_only_database(project_dir)
+    else:
+        _, SessionLocal = create_database(project_dir)
     session = SessionLocal()
     try:
         yield session
@@ -111,8 +139,24 @@ def feature_to_response(f, passing_ids: set[int] | None = None) -> FeatureRespon
     )
 
 
+# Keys of FeatureResponse that ?fields= can select
+LIST_FIELDS = (
+    "id", "priority", "category", "name", "description", "steps", "passes", "in_progress",
+    "dependencies", "blocked", "blocking_dependencies",
+    "needs_human_input", "human_input_request", "human_input_response",
+)
+
+# Columns list_features reads whatever the projection, to sort features into lists
+_STATUS_COLUMNS = ("passes", "in_progress", "needs_human_input", "dependencies")
+
+
 @router.get("", response_model=FeatureListResponse)
-async def list_features(project_name: str):
+async def list_features(
+    project_name: str,
+    fields: Annotated[str | None, Query(description="Comma-separated feature keys to return (id is always included)")] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000, description="Features per page (default: all)")] = None,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+):
     """
     List all features for a project organized by status.
 
@@ -120,6 +164,10 @@ async def list_features(project_name: str):
     - pending: passes=False, not currently being worked on
     - in_progress: features currently being worked on (tracked via agent output)
     - done: passes=True
+
+    With ?limit=, features are paged in priority order across all lists and
+    next_cursor is set while more remain. With ?fields=, each feature only
+    carries the named keys and only those columns are read.
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -136,41 +184,58 @@ async def list_features(project_name: str):
         return FeatureListResponse(pending=[], in_progress=[], done=[])
 
     _, Feature = _get_db_classes()
+    from api.feature_pages import FEATURE_FIELDS, PageRequestError, feature_page, parse_fields, project
 
     try:
-        with get_db_session(project_dir) as session:
-            all_features = session.query(Feature).order_by(Feature.priority).all()
-
-            # Compute passing IDs for blocked status calculation
-            passing_ids = {f.id for f in all_features if f.passes}
-
-            pending = []
-            in_progress = []
-            done = []
-            needs_human_input_list = []
-
-            for f in all_features:
-                feature_response = feature_to_response(f, passing_ids)
-                if f.passes:
-                    done.append(feature_response)
-                elif getattr(f, 'needs_human_input', False):
-                    needs_human_input_list.append(feature_response)
-                elif f.in_progress:
-                    in_progress.append(feature_response)
-                else:
-                    pending.append(feature_response)
-
-            return FeatureListResponse(
-                pending=pending,
-                in_progress=in_progress,
-                done=done,
-                needs_human_input=needs_human_input_list,
-            )
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Database error in list_features")
-        raise HTTPException(status_code=500, detail="Database error occurred")
+        selected = parse_fields(fields, LIST_FIELDS)
+    except PageRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns = [c for c in (selected or FEATURE_FIELDS) if c in FEATURE_FIELDS] + list(_STATUS_COLUMNS)
+    with_blocked = selected is None or "blocked" in selected or "blocking_dependencies" in selected
+
+    def _db_work():
+        try:
+            with get_db_session(project_dir, read_only=True) as session:
+                page, next_cursor = feature_page(session, columns, limit, cursor)
+
+                # Passing IDs for blocked status: only the page's dependencies when paging
+                passing_ids: set[int] = set()
+                if with_blocked:
+                    query = session.query(Feature.id).filter(Feature.passes == True)
+                    if limit is not None:
+                        dep_ids = {d for f in page for d in f["dependencies"]}
+                        query = query.filter(Feature.id.in_(dep_ids))
+                    passing_ids = {row[0] for row in query}
+
+                lists: dict[str, list] = {"pending": [], "in_progress": [], "done": [], "needs_human_input": []}
+                for f in page:
+                    blocking = [d for d in f["dependencies"] if d not in passing_ids] if with_blocked else []
+                    item = {**f, "blocked": bool(blocking), "blocking_dependencies": blocking}
+                    if "steps" in item and not isinstance(item["steps"], list):
+                        item["steps"] = []
+                    if f["passes"]:
+                        status = "done"
+                    elif f["needs_human_input"]:
+                        status = "needs_human_input"
+                    elif f["in_progress"]:
+                        status = "in_progress"
+                    else:
+                        status = "pending"
+                    lists[status].append(project(item, selected) if selected else FeatureResponse(**item))
+
+                if selected is None:
+                    return FeatureListResponse(**lists, next_cursor=next_cursor)
+                # Projected features don't fit FeatureResponse; skip response_model validation
+                return JSONResponse({**lists, "next_cursor": next_cursor})
+        except PageRequestError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Database error in list_features")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.post("", response_model=FeatureResponse)
@@ -187,37 +252,42 @@ async def create_feature(project_name: str, feature: FeatureCreate):
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            # Get next priority if not specified
-            if feature.priority is None:
-                max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
-                priority = (max_priority.priority + 1) if max_priority else 1
-            else:
-                priority = feature.priority
-
-            # Create new feature
-            db_feature = Feature(
-                priority=priority,
-                category=feature.category,
-                name=feature.name,
-                description=feature.description,
-                steps=feature.steps,
-                dependencies=feature.dependencies if feature.dependencies else None,
-                passes=False,
-                in_progress=False,
-            )
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                # Get next priority if not specified
+                if feature.priority is None:
+                    max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
+                    priority = (max_priority.priority + 1) if max_priority else 1
+                else:
+                    priority = feature.priority
 
-            session.add(db_feature)
-            session.commit()
-            session.refresh(db_feature)
+                # Create new feature
+                db_feature = Feature(
+                    priority=priority,
+                    category=feature.category,
+                    name=feature.name,
+                    description=feature.description,
+                    steps=feature.steps,
+                    dependencies=feature.dependencies if feature.dependencies else None,
+                    passes=False,
+                    in_progress=False,
+                )
 
-            return feature_to_response(db_feature)
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to create feature")
-        raise HTTPException(status_code=500, detail="Failed to create feature")
+                session.add(db_feature)
+                session.flush()
+                _record_event(session, db_feature.id, "created")
+                session.commit()
+                session.refresh(db_feature)
+
+                return feature_to_response(db_feature)
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to create feature")
+            raise HTTPException(status_code=500, detail="Failed to create feature")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 # ============================================================================
@@ -259,67 +329,140 @@ async def create_features_bulk(project_name: str, bulk: FeatureBulkCreate):
         raise HTTPException(status_code=400, detail="starting_priority must be >= 1")
 
     _, Feature = _get_db_classes()
-
-    try:
-        with get_db_session(project_dir) as session:
-            # Determine starting priority
-            # Note: SQLite uses file-level locking, not row-level locking, so we rely on
-            # SQLite's transaction isolation. Concurrent bulk creates may get overlapping
-            # priorities, but this is acceptable since priorities can be reordered.
-            if bulk.starting_priority is not None:
-                current_priority = bulk.starting_priority
-            else:
-                max_priority_feature = (
-                    session.query(Feature)
-                    .order_by(Feature.priority.desc())
-                    .first()
+    from api.feature_import import FeatureImportError, bulk_insert_features
+
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                # Core executemany inserts in one transaction. Priorities start at
+                # starting_priority or after the current max.
+                inserter = bulk_insert_features(
+                    session,
+                    (f.model_dump(include={"category", "name", "description", "steps", "dependencies"})
+                     for f in bulk.features),
+                    start_priority=bulk.starting_priority,
                 )
-                current_priority = (max_priority_feature.priority + 1) if max_priority_feature else 1
+                session.commit()
+
+                # The write lock was held for the whole insert, so the IDs are contiguous
+                created_features = [
+                    feature_to_response(db_feature)
+                    for db_feature in session.query(Feature)
+                    .filter(Feature.id.between(inserter.ids[0], inserter.ids[-1]))
+                    .order_by(Feature.priority)
+                    .all()
+                ]
+
+                return FeatureBulkCreateResponse(
+                    created=len(created_features),
+                    features=created_features
+                )
+        except FeatureImportError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to bulk create features")
+            raise HTTPException(status_code=500, detail="Failed to bulk create features")
+
+    return await run_db(_db_work, project=project_dir)
+
+
+async def _request_lines(request: Request):
+    """Yield the request body one line at a time as it arrives."""
+    pending = b""
+    async for block in request.stream():
+        pending += block
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+@router.post("/import", response_model=FeatureImportResponse)
+async def import_features(
+    project_name: str,
+    request: Request,
+    starting_priority: Annotated[int | None, Query(ge=1)] = None,
+):
+    """
+    Import features from an NDJSON body (one feature object per line).
 
-            created_ids = []
+    Lines use the feature_create_bulk item format: category, name,
+    description, steps, and optionally depends_on_indices (0-based positions
+    in this import) and dependencies (existing feature IDs).
 
-            for feature_data in bulk.features:
-                db_feature = Feature(
-                    priority=current_priority,
-                    category=feature_data.category,
-                    name=feature_data.name,
-                    description=feature_data.description,
-                    steps=feature_data.steps,
-                    dependencies=feature_data.dependencies if feature_data.dependencies else None,
-                    passes=False,
-                    in_progress=False,
-                )
-                session.add(db_feature)
-                session.flush()  # Flush to get the ID immediately
-                created_ids.append(db_feature.id)
-                current_priority += 1
+    The body is decoded as it streams in and inserted in chunks, each
+    committed on its own so agents are not locked out during large imports.
+    If a line is invalid, the chunks before it stay imported and the 400
+    response says how many features that was.
+    """
+    project_name = validate_project_name(project_name)
+    project_dir = _get_project_path(project_name)
 
-            session.commit()
+    if not project_dir:
+        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found in registry")
+
+    if not project_dir.exists():
+        raise HTTPException(status_code=404, detail="Project directory not found")
 
-            # Query created features by their IDs (avoids relying on priority range)
-            created_features = []
-            for db_feature in session.query(Feature).filter(
-                Feature.id.in_(created_ids)
-            ).order_by(Feature.priority).all():
-                created_features.append(feature_to_response(db_feature))
+    _get_db_classes()  # Ensures project root is importable
+    from api.feature_import import (
+        BULK_INSERT_CHUNK_SIZE,
+        FeatureBulkInserter,
+        FeatureImportError,
+        parse_ndjson_line,
+    )
 
-            return FeatureBulkCreateResponse(
-                created=len(created_features),
-                features=created_features
-            )
-    except HTTPException:
-        raise
+    inserter = FeatureBulkInserter(starting_priority)
+
+    def _insert_chunk(chunk: list[dict]) -> None:
+        with get_db_session(project_dir) as session:
+            inserter.add_chunk(session, chunk)
+            session.commit()
+
+    chunk: list[dict] = []
+    index = 0
+    try:
+        async for line in _request_lines(request):
+            item = parse_ndjson_line(line, index)
+            if item is None:
+                continue
+            chunk.append(item)
+            index += 1
+            if len(chunk) >= BULK_INSERT_CHUNK_SIZE:
+                await run_db(_insert_chunk, chunk, project=project_dir)
+                chunk = []
+        await run_db(_insert_chunk, chunk, project=project_dir)
+    except FeatureImportError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{e} ({inserter.created} features were imported before the error)",
+        )
     except Exception:
-        logger.exception("Failed to bulk create features")
-        raise HTTPException(status_code=500, detail="Failed to bulk create features")
+        logger.exception("Failed to import features")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to import features ({inserter.created} were imported before the error)",
+        )
+
+    return FeatureImportResponse(created=inserter.created, with_dependencies=inserter.with_dependencies)
 
 
 @router.get("/graph", response_model=DependencyGraphResponse)
-async def get_dependency_graph(project_name: str):
+async def get_dependency_graph(
+    project_name: str,
+    fields: Annotated[str | None, Query(description="Comma-separated node keys to return (id is always included)")] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000, description="Nodes per page (default: all)")] = None,
+    cursor: Annotated[str | None, Query(description="next_cursor of the previous page")] = None,
+):
     """Return dependency graph data for visualization.
 
     Returns nodes (features) and edges (dependencies) suitable for
-    rendering with React Flow or similar graph libraries.
+    rendering with React Flow or similar graph libraries. With ?limit=,
+    nodes are paged in ID order and each page carries the edges leading
+    into its nodes.
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -335,50 +478,105 @@ async def get_dependency_graph(project_name: str):
     if not db_file.exists():
         return DependencyGraphResponse(nodes=[], edges=[])
 
-    _, Feature = _get_db_classes()
+    _get_db_classes()  # Ensures project root is importable
+    from api.feature_pages import GRAPH_NODE_FIELDS, PageRequestError, graph_page, parse_fields, project
 
     try:
-        with get_db_session(project_dir) as session:
-            all_features = session.query(Feature).all()
-            passing_ids = {f.id for f in all_features if f.passes}
-
-            nodes = []
-            edges = []
-
-            for f in all_features:
-                deps = f.dependencies or []
-                blocking = [d for d in deps if d not in passing_ids]
-
-                status: Literal["pending", "in_progress", "done", "blocked", "needs_human_input"]
-                if f.passes:
-                    status = "done"
-                elif getattr(f, 'needs_human_input', False):
-                    status = "needs_human_input"
-                elif blocking:
-                    status = "blocked"
-                elif f.in_progress:
-                    status = "in_progress"
-                else:
-                    status = "pending"
-
-                nodes.append(DependencyGraphNode(
-                    id=f.id,
-                    name=f.name,
-                    category=f.category,
-                    status=status,
-                    priority=f.priority,
-                    dependencies=deps
-                ))
-
-                for dep_id in deps:
-                    edges.append(DependencyGraphEdge(source=dep_id, target=f.id))
-
-            return DependencyGraphResponse(nodes=nodes, edges=edges)
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to get dependency graph")
-        raise HTTPException(status_code=500, detail="Failed to get dependency graph")
+        selected = parse_fields(fields, GRAPH_NODE_FIELDS)
+    except PageRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def _db_work():
+        try:
+            with get_db_session(project_dir, read_only=True) as session:
+                nodes, edges, next_cursor = graph_page(session, limit, cursor)
+
+            if selected is not None:
+                # Projected nodes don't fit DependencyGraphNode; skip response_model validation
+                return JSONResponse({
+                    "nodes": [project(node, selected) for node in nodes],
+                    "edges": [{"source": dep_id, "target": feature_id} for feature_id, dep_id in edges],
+                    "next_cursor": next_cursor,
+                })
+            return DependencyGraphResponse(
+                nodes=[DependencyGraphNode(**node) for node in nodes],
+                edges=[DependencyGraphEdge(source=dep_id, target=feature_id) for feature_id, dep_id in edges],
+                next_cursor=next_cursor,
+            )
+        except PageRequestError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to get dependency graph")
+            raise HTTPException(status_code=500, detail="Failed to get dependency graph")
+
+    return await run_db(_db_work, project=project_dir)
+
+
+@router.get("/events", response_model=FeatureEventListResponse)
+async def list_feature_events(
+    project_name: str,
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Return feature change events committed after the ``since`` cursor.
+
+    Clients tail the change log by passing back the returned cursor instead
+    of re-fetching the full feature list. The log only keeps recent events;
+    ``trimmed`` is set when some after ``since`` are gone.
+    """
+    project_name = validate_project_name(project_name)
+    project_dir = _get_project_path(project_name)
+
+    if not project_dir:
+        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found in registry")
+
+    if not project_dir.exists():
+        raise HTTPException(status_code=404, detail="Project directory not found")
+
+    from autoforge_paths import get_features_db_path
+    db_file = get_features_db_path(project_dir)
+    if not db_file.exists():
+        return FeatureEventListResponse(events=[], cursor=since)
+
+    _get_db_classes()
+    from api.database import feature_events_since, feature_events_trimmed
+
+    def _db_work():
+        try:
+            with get_db_session(project_dir, read_only=True) as session:
+                events, cursor = feature_events_since(session, since, limit)
+                trimmed = feature_events_trimmed(session, since)
+                return FeatureEventListResponse(events=events, cursor=cursor, trimmed=trimmed)
+        except Exception:
+            logger.exception("Failed to list feature events")
+            raise HTTPException(status_code=500, detail="Failed to list feature events")
+
+    return await run_db(_db_work, project=project_dir)
+
+
+@router.get("/metrics", response_model=ToolMetricsResponse)
+async def get_tool_metrics(project_name: str):
+    """Return per-tool latency and write lock waits of the feature MCP server.
+
+    Aggregated from every MCP server process that ran for the project;
+    tools are ordered by total time spent in them.
+    """
+    project_name = validate_project_name(project_name)
+    project_dir = _get_project_path(project_name)
+
+    if not project_dir:
+        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found in registry")
+
+    if not project_dir.exists():
+        raise HTTPException(status_code=404, detail="Project directory not found")
+
+    _get_db_classes()  # Ensures project root is importable
+    from api.tool_metrics import load_tool_metrics, summarize_tool_metrics
+    from autoforge_paths import get_tool_metrics_path
+
+    return ToolMetricsResponse(**summarize_tool_metrics(load_tool_metrics(get_tool_metrics_path(project_dir))))
 
 
 # ============================================================================
@@ -405,19 +603,22 @@ async def get_feature(project_name: str, feature_id: int):
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
+    def _db_work():
+        try:
+            with get_db_session(project_dir, read_only=True) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            return feature_to_response(feature)
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Database error in get_feature")
-        raise HTTPException(status_code=500, detail="Database error occurred")
+                return feature_to_response(feature)
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Database error in get_feature")
+            raise HTTPException(status_code=500, detail="Database error occurred")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.patch("/{feature_id}", response_model=FeatureResponse)
@@ -440,47 +641,51 @@ async def update_feature(project_name: str, feature_id: int, update: FeatureUpda
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
-
-            # Prevent editing completed features
-            if feature.passes:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Cannot edit a completed feature. Features marked as done are immutable."
-                )
-
-            # Apply updates for non-None fields
-            if update.category is not None:
-                feature.category = update.category
-            if update.name is not None:
-                feature.name = update.name
-            if update.description is not None:
-                feature.description = update.description
-            if update.steps is not None:
-                feature.steps = update.steps
-            if update.priority is not None:
-                feature.priority = update.priority
-            if update.dependencies is not None:
-                feature.dependencies = update.dependencies if update.dependencies else None
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
-            session.commit()
-            session.refresh(feature)
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            # Compute passing IDs for response
-            all_features = session.query(Feature).all()
-            passing_ids = {f.id for f in all_features if f.passes}
+                # Prevent editing completed features
+                if feature.passes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Cannot edit a completed feature. Features marked as done are immutable."
+                    )
 
-            return feature_to_response(feature, passing_ids)
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to update feature")
-        raise HTTPException(status_code=500, detail="Failed to update feature")
+                # Apply updates for non-None fields
+                if update.category is not None:
+                    feature.category = update.category
+                if update.name is not None:
+                    feature.name = update.name
+                if update.description is not None:
+                    feature.description = update.description
+                if update.steps is not None:
+                    feature.steps = update.steps
+                if update.priority is not None:
+                    feature.priority = update.priority
+                if update.dependencies is not None:
+                    feature.dependencies = update.dependencies if update.dependencies else None
+
+                changed = update.model_dump(exclude_none=True)
+                _record_event(session, feature_id, "updated", {"fields": sorted(changed)})
+                session.commit()
+                session.refresh(feature)
+
+                # Blocked status only needs this feature's own dependencies
+                passing_ids = _passing_dependency_ids(session, Feature, feature)
+
+                return feature_to_response(feature, passing_ids)
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to update feature")
+            raise HTTPException(status_code=500, detail="Failed to update feature")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.delete("/{feature_id}")
@@ -501,37 +706,42 @@ async def delete_feature(project_name: str, feature_id: int):
         raise HTTPException(status_code=404, detail="Project directory not found")
 
     _, Feature = _get_db_classes()
+    from api.database import get_dependent_ids
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            # Clean up dependency references in other features
-            # This prevents orphaned dependencies that would block features forever
-            affected_features = []
-            for f in session.query(Feature).all():
-                if f.dependencies and feature_id in f.dependencies:
+                # Clean up dependency references in other features
+                # This prevents orphaned dependencies that would block features forever
+                affected_features = get_dependent_ids(session, feature_id)
+                dependents = session.query(Feature).filter(Feature.id.in_(affected_features)).all()
+                for f in dependents:
                     # Remove the deleted feature from this feature's dependencies
-                    deps = [d for d in f.dependencies if d != feature_id]
+                    deps = [d for d in (f.dependencies or []) if d != feature_id]
                     f.dependencies = deps if deps else None
-                    affected_features.append(f.id)
+                    _record_event(session, f.id, "dependencies_changed", {"dependencies": deps})
 
-            session.delete(feature)
-            session.commit()
+                session.delete(feature)
+                _record_event(session, feature_id, "deleted")
+                session.commit()
 
-            message = f"Feature {feature_id} deleted"
-            if affected_features:
-                message += f". Removed from dependencies of features: {affected_features}"
+                message = f"Feature {feature_id} deleted"
+                if affected_features:
+                    message += f". Removed from dependencies of features: {affected_features}"
 
-            return {"success": True, "message": message, "affected_features": affected_features}
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to delete feature")
-        raise HTTPException(status_code=500, detail="Failed to delete feature")
+                return {"success": True, "message": message, "affected_features": affected_features}
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to delete feature")
+            raise HTTPException(status_code=500, detail="Failed to delete feature")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.patch("/{feature_id}/skip")
@@ -553,25 +763,29 @@ async def skip_feature(project_name: str, feature_id: int):
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
 
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            # Set priority to max + 1 to push to end (consistent with MCP server)
-            max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
-            feature.priority = (max_priority.priority + 1) if max_priority else 1
+                # Set priority to max + 1 to push to end (consistent with MCP server)
+                max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
+                feature.priority = (max_priority.priority + 1) if max_priority else 1
+                _record_event(session, feature_id, "skipped", {"priority": feature.priority})
 
-            session.commit()
+                session.commit()
 
-            return {"success": True, "message": f"Feature {feature_id} moved to end of queue"}
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to skip feature")
-        raise HTTPException(status_code=500, detail="Failed to skip feature")
+                return {"success": True, "message": f"Feature {feature_id} moved to end of queue"}
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to skip feature")
+            raise HTTPException(status_code=500, detail="Failed to skip feature")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.post("/{feature_id}/resolve-human-input", response_model=FeatureResponse)
@@ -592,51 +806,54 @@ async def resolve_human_input(project_name: str, feature_id: int, response: Huma
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
-
-            if not getattr(feature, 'needs_human_input', False):
-                raise HTTPException(status_code=400, detail="Feature is not waiting for human input")
-
-            # Validate required fields
-            request_data = feature.human_input_request
-            if request_data and isinstance(request_data, dict):
-                for field_def in request_data.get("fields", []):
-                    if field_def.get("required", True):
-                        field_id = field_def.get("id")
-                        if field_id not in response.fields or response.fields[field_id] in (None, ""):
-                            raise HTTPException(
-                                status_code=400,
-                                detail=f"Required field '{field_def.get('label', field_id)}' is missing"
-                            )
-
-            # Store response and return to pending queue
-            from datetime import datetime, timezone
-            response_data = {
-                "fields": {k: v for k, v in response.fields.items()},
-                "responded_at": datetime.now(timezone.utc).isoformat(),
-            }
-            feature.human_input_response = response_data
-            feature.needs_human_input = False
-            # Keep in_progress=False, passes=False so it returns to pending
-
-            session.commit()
-            session.refresh(feature)
-
-            # Compute passing IDs for response
-            all_features = session.query(Feature).all()
-            passing_ids = {f.id for f in all_features if f.passes}
-
-            return feature_to_response(feature, passing_ids)
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to resolve human input")
-        raise HTTPException(status_code=500, detail="Failed to resolve human input")
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
+
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+
+                if not getattr(feature, 'needs_human_input', False):
+                    raise HTTPException(status_code=400, detail="Feature is not waiting for human input")
+
+                # Validate required fields
+                request_data = feature.human_input_request
+                if request_data and isinstance(request_data, dict):
+                    for field_def in request_data.get("fields", []):
+                        if field_def.get("required", True):
+                            field_id = field_def.get("id")
+                            if field_id not in response.fields or response.fields[field_id] in (None, ""):
+                                raise HTTPException(
+                                    status_code=400,
+                                    detail=f"Required field '{field_def.get('label', field_id)}' is missing"
+                                )
+
+                # Store response and return to pending queue
+                from datetime import datetime, timezone
+                response_data = {
+                    "fields": {k: v for k, v in response.fields.items()},
+                    "responded_at": datetime.now(timezone.utc).isoformat(),
+                }
+                feature.human_input_response = response_data
+                feature.needs_human_input = False
+                # Keep in_progress=False, passes=False so it returns to pending
+                _record_event(session, feature_id, "human_input_resolved")
+
+                session.commit()
+                session.refresh(feature)
+
+                # Blocked status only needs this feature's own dependencies
+                passing_ids = _passing_dependency_ids(session, Feature, feature)
+
+                return feature_to_response(feature, passing_ids)
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to resolve human input")
+            raise HTTPException(status_code=500, detail="Failed to resolve human input")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 # ============================================================================
@@ -650,8 +867,9 @@ def _get_dependency_resolver():
     root = Path(__file__).parent.parent.parent
     if str(root) not in sys.path:
         sys.path.insert(0, str(root))
-    from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE, would_create_circular_dependency
-    return would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE
+    from api.database import would_create_circular_dependency_db
+    from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE
+    return would_create_circular_dependency_db, MAX_DEPENDENCIES_PER_FEATURE
 
 
 @router.post("/{feature_id}/dependencies/{dep_id}")
@@ -678,41 +896,44 @@ async def add_dependency(project_name: str, feature_id: int, dep_id: int):
     would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-            dependency = session.query(Feature).filter(Feature.id == dep_id).first()
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
+                dependency = session.query(Feature).filter(Feature.id == dep_id).first()
 
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
-            if not dependency:
-                raise HTTPException(status_code=404, detail=f"Dependency {dep_id} not found")
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+                if not dependency:
+                    raise HTTPException(status_code=404, detail=f"Dependency {dep_id} not found")
 
-            current_deps = feature.dependencies or []
+                current_deps = feature.dependencies or []
 
-            # Security: Limit check
-            if len(current_deps) >= MAX_DEPENDENCIES_PER_FEATURE:
-                raise HTTPException(status_code=400, detail=f"Maximum {MAX_DEPENDENCIES_PER_FEATURE} dependencies allowed")
+                # Security: Limit check
+                if len(current_deps) >= MAX_DEPENDENCIES_PER_FEATURE:
+                    raise HTTPException(status_code=400, detail=f"Maximum {MAX_DEPENDENCIES_PER_FEATURE} dependencies allowed")
 
-            if dep_id in current_deps:
-                raise HTTPException(status_code=400, detail="Dependency already exists")
+                if dep_id in current_deps:
+                    raise HTTPException(status_code=400, detail="Dependency already exists")
 
-            # Security: Circular dependency check
-            # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            if would_create_circular_dependency(all_features, feature_id, dep_id):
-                raise HTTPException(status_code=400, detail="Would create circular dependency")
+                # Security: Circular dependency check
+                # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
+                if would_create_circular_dependency(session, feature_id, dep_id):
+                    raise HTTPException(status_code=400, detail="Would create circular dependency")
 
-            current_deps.append(dep_id)
-            feature.dependencies = sorted(current_deps)
-            session.commit()
+                current_deps.append(dep_id)
+                feature.dependencies = sorted(current_deps)
+                _record_event(session, feature_id, "dependencies_changed", {"dependencies": feature.dependencies})
+                session.commit()
 
-            return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies}
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to add dependency")
-        raise HTTPException(status_code=500, detail="Failed to add dependency")
+                return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies}
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to add dependency")
+            raise HTTPException(status_code=500, detail="Failed to add dependency")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.delete("/{feature_id}/dependencies/{dep_id}")
@@ -729,26 +950,30 @@ async def remove_dependency(project_name: str, feature_id: int, dep_id: int):
 
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            current_deps = feature.dependencies or []
-            if dep_id not in current_deps:
-                raise HTTPException(status_code=400, detail="Dependency does not exist")
+                current_deps = feature.dependencies or []
+                if dep_id not in current_deps:
+                    raise HTTPException(status_code=400, detail="Dependency does not exist")
 
-            current_deps.remove(dep_id)
-            feature.dependencies = current_deps if current_deps else None
-            session.commit()
+                current_deps.remove(dep_id)
+                feature.dependencies = current_deps if current_deps else None
+                _record_event(session, feature_id, "dependencies_changed", {"dependencies": current_deps})
+                session.commit()
 
-            return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies or []}
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to remove dependency")
-        raise HTTPException(status_code=500, detail="Failed to remove dependency")
+                return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies or []}
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to remove dependency")
+            raise HTTPException(status_code=500, detail="Failed to remove dependency")
+
+    return await run_db(_db_work, project=project_dir)
 
 
 @router.put("/{feature_id}/dependencies")
@@ -779,43 +1004,42 @@ async def set_dependencies(project_name: str, feature_id: int, update: Dependenc
     would_create_circular_dependency, _ = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
-    try:
-        with get_db_session(project_dir) as session:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-            if not feature:
-                raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
-
-            # Validate all dependencies exist
-            all_feature_ids = {f.id for f in session.query(Feature).all()}
-            missing = [d for d in dependency_ids if d not in all_feature_ids]
-            if missing:
-                raise HTTPException(status_code=400, detail=f"Dependencies not found: {missing}")
-
-            # Check for circular dependencies
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            # Temporarily update the feature's dependencies for cycle check
-            test_features = []
-            for f in all_features:
-                if f["id"] == feature_id:
-                    test_features.append({**f, "dependencies": dependency_ids})
-                else:
-                    test_features.append(f)
-
-            for dep_id in dependency_ids:
-                # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-                if would_create_circular_dependency(test_features, feature_id, dep_id):
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Cannot add dependency {dep_id}: would create circular dependency"
-                    )
-
-            # Set dependencies
-            feature.dependencies = sorted(dependency_ids) if dependency_ids else None
-            session.commit()
-
-            return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies or []}
-    except HTTPException:
-        raise
-    except Exception:
-        logger.exception("Failed to set dependencies")
-        raise HTTPException(status_code=500, detail="Failed to set dependencies")
+    def _db_work():
+        try:
+            with get_db_session(project_dir) as session:
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
+                if not feature:
+                    raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
+
+                # Validate all dependencies exist
+                existing_ids = {
+                    row[0] for row in session.query(Feature.id).filter(Feature.id.in_(dependency_ids))
+                }
+                missing = [d for d in dependency_ids if d not in existing_ids]
+                if missing:
+                    raise HTTPException(status_code=400, detail=f"Dependencies not found: {missing}")
+
+                # Check for circular dependencies. A path from a new dependency
+                # back to feature_id is a cycle whatever feature_id depends on
+                # now, so its current edges needn't be swapped out first.
+                for dep_id in dependency_ids:
+                    # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
+                    if would_create_circular_dependency(session, feature_id, dep_id):
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Cannot add dependency {dep_id}: would create circular dependency"
+                        )
+
+                # Set dependencies
+                feature.dependencies = sorted(dependency_ids) if dependency_ids else None
+                _record_event(session, feature_id, "dependencies_changed", {"dependencies": sorted(dependency_ids)})
+                session.commit()
+
+                return {"success": True, "feature_id": feature_id, "dependencies": feature.dependencies or []}
+        except HTTPException:
+            raise
+        except Exception:
+            logger.exception("Failed to set dependencies")
+            raise HTTPException(status_code=500, detail="Failed to set dependencies")
+
+    return await run_db(_db_work, project=project_dir)
@@ -6,6 +6,7 @@ API endpoints for project management.
 Uses project registry for path lookups instead of fixed generations/ directory.
 """
 
+import asyncio
 import re
 import shutil
 import sys
@@ -23,6 +24,7 @@ from ..schemas import (
     ProjectStats,
     ProjectSummary,
 )
+from ..utils.db_executor import run_db
 
 # Lazy imports to avoid circular dependencies
 # These are initialized by _init_imports() before first use.
@@ -121,7 +123,7 @@ async def list_projects():
      get_project_concurrency, _) = _get_registry_functions()
 
     projects = list_registered_projects()
-    result = []
+    valid_projects = []
 
     for name, info in projects.items():
         project_dir = Path(info["path"])
@@ -130,9 +132,18 @@ async def list_projects():
         is_valid, _ = validate_project_path(project_dir)
         if not is_valid:
             continue
+        valid_projects.append((name, info, project_dir))
+
+    # Query every project's stats concurrently on the DB executor so one
+    # locked database doesn't serialize the rest (or block the event loop)
+    all_stats = await asyncio.gather(*(
+        run_db(get_project_stats, project_dir, project=project_dir)
+        for _, _, project_dir in valid_projects
+    ))
 
+    result = []
+    for (name, info, project_dir), stats in zip(valid_projects, all_stats):
         has_spec = _check_spec_exists(project_dir)
-        stats = get_project_stats(project_dir)
 
         result.append(ProjectSummary(
             name=name,
@@ -244,7 +255,7 @@ async def get_project(name: str):
         raise HTTPException(status_code=404, detail=f"Project directory no longer exists: {project_dir}")
 
     has_spec = _check_spec_exists(project_dir)
-    stats = get_project_stats(project_dir)
+    stats = await run_db(get_project_stats, project_dir, project=project_dir)
     prompts_dir = _get_project_prompts_dir(project_dir)
 
     return ProjectDetail(
@@ -283,6 +294,14 @@ async def delete_project(name: str, delete_files: bool = False):
             detail="Cannot delete project while agent is running. Stop the agent first."
         )
 
+    # Dispose of database engines so they don't outlive the project, and to
+    # release file locks before deleting files (required on Windows)
+    from api.database import dispose_engine as dispose_features_engine
+    from server.services.assistant_database import dispose_engine as dispose_assistant_engine
+
+    dispose_features_engine(project_dir)
+    dispose_assistant_engine(project_dir)
+
     # Optionally delete files
     if delete_files and project_dir.exists():
         try:
@@ -379,7 +398,7 @@ async def get_project_stats_endpoint(name: str):
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project directory not found")
 
-    return get_project_stats(project_dir)
+    return await run_db(get_project_stats, project_dir, project=project_dir)
 
 
 @router.post("/{name}/reset")
@@ -509,9 +528,21 @@ async def update_project_settings(name: str, settings: ProjectSettingsUpdate):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update concurrency")
 
+    # Update SQLite profile if provided; "" clears the per-project override
+    if settings.sqlite_profile is not None:
+        from registry import set_project_sqlite_profile
+        if not set_project_sqlite_profile(name, settings.sqlite_profile or None):
+            raise HTTPException(status_code=500, detail="Failed to update SQLite profile")
+
+        # Drop cached engines so the next session opens with the new profile
+        from api.database import dispose_engine as dispose_features_engine
+        from server.services.assistant_database import dispose_engine as dispose_assistant_engine
+        dispose_features_engine(project_dir)
+        dispose_assistant_engine(project_dir)
+
     # Return updated project details
     has_spec = _check_spec_exists(project_dir)
-    stats = get_project_stats(project_dir)
+    stats = await run_db(get_project_stats, project_dir, project=project_dir)
     prompts_dir = _get_project_prompts_dir(project_dir)
 
     return ProjectDetail(
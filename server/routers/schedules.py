@@ -9,7 +9,7 @@ Provides CRUD operations for time-based schedule configuration.
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Generator, Tuple
+from typing import TYPE_CHECKING, Generator
 
 from fastapi import APIRouter, HTTPException
 from sqlalchemy.orm import Session
@@ -24,6 +24,7 @@ from ..schemas import (
     ScheduleResponse,
     ScheduleUpdate,
 )
+from ..utils.db_executor import run_db
 from ..utils.project_helpers import get_project_path as _get_project_path
 from ..utils.validation import validate_project_name
 
@@ -46,17 +47,8 @@ router = APIRouter(
 )
 
 
-@contextmanager
-def _get_db_session(project_name: str) -> Generator[Tuple[Session, Path], None, None]:
-    """Get database session for a project as a context manager.
-
-    Usage:
-        with _get_db_session(project_name) as (db, project_path):
-            # ... use db ...
-        # db is automatically closed
-    """
-    from api.database import create_database
-
+def _get_project_dir(project_name: str) -> Path:
+    """Resolve a registered project's directory, or raise 404."""
     project_name = validate_project_name(project_name)
     project_path = _get_project_path(project_name)
 
@@ -72,10 +64,27 @@ def _get_db_session(project_name: str) -> Generator[Tuple[Session, Path], None,
             detail=f"Project directory not found: {project_path}"
         )
 
-    _, SessionLocal = create_database(project_path)
+    return project_path
+
+
+@contextmanager
+def _get_db_session(project_path: Path, read_only: bool = False) -> Generator[Session, None, None]:
+    """Get database session for a project as a context manager.
+
+    Usage:
+        with _get_db_session(project_path) as db:
+            # ... use db ...
+        # db is automatically closed
+
+    read_only=True gives a deferred-transaction session for GET handlers.
+    Blocking: call it from a run_db() worker, not the event loop.
+    """
+    from api.database import create_database, create_read_only_database
+
+    _, SessionLocal = (create_read_only_database if read_only else create_database)(project_path)
     db = SessionLocal()
     try:
-        yield db, project_path
+        yield db
     except Exception:
         db.rollback()
         raise
@@ -83,19 +92,35 @@ def _get_db_session(project_name: str) -> Generator[Tuple[Session, Path], None,
         db.close()
 
 
+def _has_stop_override(db: Session, schedule_id: int, now: datetime) -> bool:
+    """Whether a manual stop currently overrides the schedule."""
+    from api.database import ScheduleOverride
+
+    return db.query(ScheduleOverride).filter(
+        ScheduleOverride.schedule_id == schedule_id,
+        ScheduleOverride.override_type == "stop",
+        ScheduleOverride.expires_at > now,
+    ).first() is not None
+
+
 @router.get("", response_model=ScheduleListResponse)
 async def list_schedules(project_name: str):
     """Get all schedules for a project."""
     from api.database import Schedule
 
-    with _get_db_session(project_name) as (db, _):
-        schedules = db.query(Schedule).filter(
-            Schedule.project_name == project_name
-        ).order_by(Schedule.start_time).all()
+    project_path = _get_project_dir(project_name)
 
-        return ScheduleListResponse(
-            schedules=[_schedule_to_response(s) for s in schedules]
-        )
+    def _db_work():
+        with _get_db_session(project_path, read_only=True) as db:
+            schedules = db.query(Schedule).filter(
+                Schedule.project_name == project_name
+            ).order_by(Schedule.start_time).all()
+
+            return ScheduleListResponse(
+                schedules=[_schedule_to_response(s) for s in schedules]
+            )
+
+    return await run_db(_db_work, project=project_path)
 
 
 @router.post("", response_model=ScheduleResponse, status_code=201)
@@ -105,132 +130,136 @@ async def create_schedule(project_name: str, data: ScheduleCreate):
 
     from ..services.scheduler_service import get_scheduler
 
-    with _get_db_session(project_name) as (db, project_path):
-        # Check schedule limit to prevent resource exhaustion
-        existing_count = db.query(Schedule).filter(
-            Schedule.project_name == project_name
-        ).count()
-
-        if existing_count >= MAX_SCHEDULES_PER_PROJECT:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Maximum schedules per project ({MAX_SCHEDULES_PER_PROJECT}) exceeded"
+    project_path = _get_project_dir(project_name)
+
+    def _db_work():
+        with _get_db_session(project_path) as db:
+            # Check schedule limit to prevent resource exhaustion
+            existing_count = db.query(Schedule).filter(
+                Schedule.project_name == project_name
+            ).count()
+
+            if existing_count >= MAX_SCHEDULES_PER_PROJECT:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Maximum schedules per project ({MAX_SCHEDULES_PER_PROJECT}) exceeded"
+                )
+
+            # Create schedule record
+            schedule = Schedule(
+                project_name=project_name,
+                start_time=data.start_time,
+                duration_minutes=data.duration_minutes,
+                days_of_week=data.days_of_week,
+                enabled=data.enabled,
+                yolo_mode=data.yolo_mode,
+                model=data.model,
             )
+            db.add(schedule)
+            db.commit()
+            db.refresh(schedule)
+            # Refreshed attributes stay loaded after the session closes
+            return schedule
 
-        # Create schedule record
-        schedule = Schedule(
-            project_name=project_name,
-            start_time=data.start_time,
-            duration_minutes=data.duration_minutes,
-            days_of_week=data.days_of_week,
-            enabled=data.enabled,
-            yolo_mode=data.yolo_mode,
-            model=data.model,
-        )
-        db.add(schedule)
-        db.commit()
-        db.refresh(schedule)
+    schedule = await run_db(_db_work, project=project_path)
 
-        # Register with APScheduler if enabled
-        if schedule.enabled:
-            import logging
-            logger = logging.getLogger(__name__)
+    # Register with APScheduler if enabled
+    if schedule.enabled:
+        import logging
+        logger = logging.getLogger(__name__)
 
-            scheduler = get_scheduler()
-            await scheduler.add_schedule(project_name, schedule, project_path)
-            logger.info(f"Registered schedule {schedule.id} with APScheduler")
+        scheduler = get_scheduler()
+        await scheduler.add_schedule(project_name, schedule, project_path)
+        logger.info(f"Registered schedule {schedule.id} with APScheduler")
 
-            # Check if we're currently within this schedule's window
-            # If so, start the agent immediately (cron won't trigger until next occurrence)
-            now = datetime.now(timezone.utc)
-            is_within = scheduler._is_within_window(schedule, now)
-            logger.info(f"Schedule {schedule.id}: is_within_window={is_within}, now={now}, start={schedule.start_time}")
-
-            if is_within:
-                # Check for manual stop override
-                from api.database import ScheduleOverride
-                override = db.query(ScheduleOverride).filter(
-                    ScheduleOverride.schedule_id == schedule.id,
-                    ScheduleOverride.override_type == "stop",
-                    ScheduleOverride.expires_at > now,
-                ).first()
-
-                logger.info(f"Schedule {schedule.id}: has_override={override is not None}")
-
-                if not override:
-                    # Start agent immediately
-                    logger.info(
-                        f"Schedule {schedule.id} is within active window, starting agent immediately"
-                    )
-                    try:
-                        await scheduler._start_agent(project_name, project_path, schedule)
-                        logger.info(f"Successfully started agent for schedule {schedule.id}")
-                    except Exception as e:
-                        logger.error(f"Failed to start agent for schedule {schedule.id}: {e}", exc_info=True)
-
-        return _schedule_to_response(schedule)
+        # Check if we're currently within this schedule's window
+        # If so, start the agent immediately (cron won't trigger until next occurrence)
+        now = datetime.now(timezone.utc)
+        is_within = scheduler._is_within_window(schedule, now)
+        logger.info(f"Schedule {schedule.id}: is_within_window={is_within}, now={now}, start={schedule.start_time}")
+
+        if is_within:
+            def _check_override():
+                with _get_db_session(project_path, read_only=True) as db:
+                    return _has_stop_override(db, schedule.id, now)
+
+            # Check for manual stop override
+            has_override = await run_db(_check_override, project=project_path)
+            logger.info(f"Schedule {schedule.id}: has_override={has_override}")
+
+            if not has_override:
+                # Start agent immediately
+                logger.info(
+                    f"Schedule {schedule.id} is within active window, starting agent immediately"
+                )
+                try:
+                    await scheduler._start_agent(project_name, project_path, schedule)
+                    logger.info(f"Successfully started agent for schedule {schedule.id}")
+                except Exception as e:
+                    logger.error(f"Failed to start agent for schedule {schedule.id}: {e}", exc_info=True)
+
+    return _schedule_to_response(schedule)
 
 
 @router.get("/next", response_model=NextRunResponse)
 async def get_next_scheduled_run(project_name: str):
     """Calculate next scheduled run across all enabled schedules."""
-    from api.database import Schedule, ScheduleOverride
+    from api.database import Schedule
 
     from ..services.scheduler_service import get_scheduler
 
-    with _get_db_session(project_name) as (db, _):
-        schedules = db.query(Schedule).filter(
-            Schedule.project_name == project_name,
-            Schedule.enabled == True,  # noqa: E712
-        ).all()
+    project_path = _get_project_dir(project_name)
+
+    def _db_work():
+        with _get_db_session(project_path, read_only=True) as db:
+            schedules = db.query(Schedule).filter(
+                Schedule.project_name == project_name,
+                Schedule.enabled == True,  # noqa: E712
+            ).all()
+
+            if not schedules:
+                return NextRunResponse(
+                    has_schedules=False,
+                    next_start=None,
+                    next_end=None,
+                    is_currently_running=False,
+                    active_schedule_count=0,
+                )
+
+            now = datetime.now(timezone.utc)
+            scheduler = get_scheduler()
+
+            # Find active schedules and calculate next run
+            active_count = 0
+            next_start = None
+            latest_end = None
+
+            for schedule in schedules:
+                if scheduler._is_within_window(schedule, now):
+                    # Check for manual stop override
+                    if not _has_stop_override(db, schedule.id, now):
+                        # Schedule is active and not manually stopped
+                        active_count += 1
+                        # Calculate end time for this window
+                        end_time = _calculate_window_end(schedule, now)
+                        if latest_end is None or end_time > latest_end:
+                            latest_end = end_time
+                    # If override exists, treat schedule as not active
+                else:
+                    # Calculate next start time
+                    next_schedule_start = _calculate_next_start(schedule, now)
+                    if next_schedule_start and (next_start is None or next_schedule_start < next_start):
+                        next_start = next_schedule_start
 
-        if not schedules:
             return NextRunResponse(
-                has_schedules=False,
-                next_start=None,
-                next_end=None,
-                is_currently_running=False,
-                active_schedule_count=0,
+                has_schedules=True,
+                next_start=next_start if active_count == 0 else None,
+                next_end=latest_end,
+                is_currently_running=active_count > 0,
+                active_schedule_count=active_count,
             )
 
-        now = datetime.now(timezone.utc)
-        scheduler = get_scheduler()
-
-        # Find active schedules and calculate next run
-        active_count = 0
-        next_start = None
-        latest_end = None
-
-        for schedule in schedules:
-            if scheduler._is_within_window(schedule, now):
-                # Check for manual stop override
-                override = db.query(ScheduleOverride).filter(
-                    ScheduleOverride.schedule_id == schedule.id,
-                    ScheduleOverride.override_type == "stop",
-                    ScheduleOverride.expires_at > now,
-                ).first()
-
-                if not override:
-                    # Schedule is active and not manually stopped
-                    active_count += 1
-                    # Calculate end time for this window
-                    end_time = _calculate_window_end(schedule, now)
-                    if latest_end is None or end_time > latest_end:
-                        latest_end = end_time
-                # If override exists, treat schedule as not active
-            else:
-                # Calculate next start time
-                next_schedule_start = _calculate_next_start(schedule, now)
-                if next_schedule_start and (next_start is None or next_schedule_start < next_start):
-                    next_start = next_schedule_start
-
-        return NextRunResponse(
-            has_schedules=True,
-            next_start=next_start if active_count == 0 else None,
-            next_end=latest_end,
-            is_currently_running=active_count > 0,
-            active_schedule_count=active_count,
-        )
+    return await run_db(_db_work, project=project_path)
 
 
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
@@ -238,16 +267,21 @@ async def get_schedule(project_name: str, schedule_id: int):
     """Get a single schedule by ID."""
     from api.database import Schedule
 
-    with _get_db_session(project_name) as (db, _):
-        schedule = db.query(Schedule).filter(
-            Schedule.id == schedule_id,
-            Schedule.project_name == project_name,
-        ).first()
+    project_path = _get_project_dir(project_name)
 
-        if not schedule:
-            raise HTTPException(status_code=404, detail="Schedule not found")
+    def _db_work():
+        with _get_db_session(project_path, read_only=True) as db:
+            schedule = db.query(Schedule).filter(
+                Schedule.id == schedule_id,
+                Schedule.project_name == project_name,
+            ).first()
 
-        return _schedule_to_response(schedule)
+            if not schedule:
+                raise HTTPException(status_code=404, detail="Schedule not found")
+
+            return _schedule_to_response(schedule)
+
+    return await run_db(_db_work, project=project_path)
 
 
 @router.patch("/{schedule_id}", response_model=ScheduleResponse)
@@ -261,36 +295,42 @@ async def update_schedule(
 
     from ..services.scheduler_service import get_scheduler
 
-    with _get_db_session(project_name) as (db, project_path):
-        schedule = db.query(Schedule).filter(
-            Schedule.id == schedule_id,
-            Schedule.project_name == project_name,
-        ).first()
+    project_path = _get_project_dir(project_name)
 
-        if not schedule:
-            raise HTTPException(status_code=404, detail="Schedule not found")
+    def _db_work():
+        with _get_db_session(project_path) as db:
+            schedule = db.query(Schedule).filter(
+                Schedule.id == schedule_id,
+                Schedule.project_name == project_name,
+            ).first()
 
-        was_enabled = schedule.enabled
+            if not schedule:
+                raise HTTPException(status_code=404, detail="Schedule not found")
 
-        # Update only fields that were explicitly provided
-        # This allows sending {"model": null} to clear it vs omitting the field entirely
-        update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(schedule, field, value)
+            was_enabled = schedule.enabled
 
-        db.commit()
-        db.refresh(schedule)
+            # Update only fields that were explicitly provided
+            # This allows sending {"model": null} to clear it vs omitting the field entirely
+            update_data = data.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(schedule, field, value)
 
-        # Update APScheduler jobs
-        scheduler = get_scheduler()
-        if schedule.enabled:
-            # Re-register with updated times
-            await scheduler.add_schedule(project_name, schedule, project_path)
-        elif was_enabled:
-            # Was enabled, now disabled - remove jobs
-            scheduler.remove_schedule(schedule_id)
+            db.commit()
+            db.refresh(schedule)
+            return schedule, was_enabled
 
-        return _schedule_to_response(schedule)
+    schedule, was_enabled = await run_db(_db_work, project=project_path)
+
+    # Update APScheduler jobs
+    scheduler = get_scheduler()
+    if schedule.enabled:
+        # Re-register with updated times
+        await scheduler.add_schedule(project_name, schedule, project_path)
+    elif was_enabled:
+        # Was enabled, now disabled - remove jobs
+        scheduler.remove_schedule(schedule_id)
+
+    return _schedule_to_response(schedule)
 
 
 @router.delete("/{schedule_id}", status_code=204)
@@ -300,22 +340,25 @@ async def delete_schedule(project_name: str, schedule_id: int):
 
     from ..services.scheduler_service import get_scheduler
 
-    with _get_db_session(project_name) as (db, _):
-        schedule = db.query(Schedule).filter(
-            Schedule.id == schedule_id,
-            Schedule.project_name == project_name,
-        ).first()
+    project_path = _get_project_dir(project_name)
 
-        if not schedule:
-            raise HTTPException(status_code=404, detail="Schedule not found")
+    def _db_work():
+        with _get_db_session(project_path) as db:
+            schedule = db.query(Schedule).filter(
+                Schedule.id == schedule_id,
+                Schedule.project_name == project_name,
+            ).first()
 
-        # Remove APScheduler jobs
-        scheduler = get_scheduler()
-        scheduler.remove_schedule(schedule_id)
+            if not schedule:
+                raise HTTPException(status_code=404, detail="Schedule not found")
+
+            db.delete(schedule)
+            db.commit()
+
+    await run_db(_db_work, project=project_path)
 
-        # Delete from database
-        db.delete(schedule)
-        db.commit()
+    # Remove APScheduler jobs
+    get_scheduler().remove_schedule(schedule_id)
 
 
 def _calculate_window_end(schedule, now: datetime) -> datetime:
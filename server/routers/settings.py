@@ -21,6 +21,7 @@ mimetypes.add_type("text/javascript", ".js", True)
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from api.sqlite_profiles import DEFAULT_SQLITE_PROFILE, SQLITE_PROFILE_SETTING
 from registry import (
     API_PROVIDERS,
     AVAILABLE_MODELS,
@@ -117,6 +118,7 @@ async def get_settings():
         api_base_url=all_settings.get("api_base_url"),
         api_has_auth_token=bool(all_settings.get("api_auth_token")),
         api_model=all_settings.get("api_model"),
+        sqlite_profile=all_settings.get(SQLITE_PROFILE_SETTING, DEFAULT_SQLITE_PROFILE),
     )
 
 
@@ -163,6 +165,10 @@ async def update_settings(update: SettingsUpdate):
     if update.api_model is not None:
         set_setting("api_model", update.api_model)
 
+    # Applies to databases opened after the change (engines are cached)
+    if update.sqlite_profile is not None:
+        set_setting(SQLITE_PROFILE_SETTING, update.sqlite_profile)
+
     # Return updated settings
     all_settings = get_all_settings()
     api_provider = all_settings.get("api_provider", "claude")
@@ -181,4 +187,5 @@ async def update_settings(update: SettingsUpdate):
         api_base_url=all_settings.get("api_base_url"),
         api_has_auth_token=bool(all_settings.get("api_auth_token")),
         api_model=all_settings.get("api_model"),
+        sqlite_profile=all_settings.get(SQLITE_PROFILE_SETTING, DEFAULT_SQLITE_PROFILE),
     )
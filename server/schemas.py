@@ -18,6 +18,7 @@ _root = Path(__file__).parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+from api.sqlite_profiles import DEFAULT_SQLITE_PROFILE, SQLITE_PROFILES
 from registry import DEFAULT_MODEL, VALID_MODELS
 
 # ============================================================================
@@ -75,6 +76,7 @@ class ProjectPromptsUpdate(BaseModel):
 class ProjectSettingsUpdate(BaseModel):
     """Request schema for updating project-level settings."""
     default_concurrency: int | None = None
+    sqlite_profile: str | None = None  # "" = follow the global setting
 
     @field_validator('default_concurrency')
     @classmethod
@@ -83,6 +85,13 @@ class ProjectSettingsUpdate(BaseModel):
             raise ValueError("default_concurrency must be between 1 and 5")
         return v
 
+    @field_validator('sqlite_profile')
+    @classmethod
+    def validate_sqlite_profile(cls, v: str | None) -> str | None:
+        if v and v not in SQLITE_PROFILES:
+            raise ValueError(f"sqlite_profile must be one of: {list(SQLITE_PROFILES)}")
+        return v
+
 
 # ============================================================================
 # Feature Schemas
@@ -155,6 +164,7 @@ class FeatureListResponse(BaseModel):
     in_progress: list[FeatureResponse]
     done: list[FeatureResponse]
     needs_human_input: list[FeatureResponse] = Field(default_factory=list)
+    next_cursor: str | None = None  # Set when ?limit= left more features
 
 
 class FeatureBulkCreate(BaseModel):
@@ -169,6 +179,12 @@ class FeatureBulkCreateResponse(BaseModel):
     features: list[FeatureResponse]
 
 
+class FeatureImportResponse(BaseModel):
+    """Response for a streamed NDJSON feature import."""
+    created: int
+    with_dependencies: int
+
+
 # ============================================================================
 # Dependency Graph Schemas
 # ============================================================================
@@ -193,6 +209,7 @@ class DependencyGraphResponse(BaseModel):
     """Response for dependency graph visualization."""
     nodes: list[DependencyGraphNode]
     edges: list[DependencyGraphEdge]
+    next_cursor: str | None = None  # Set when ?limit= left more nodes
 
 
 class DependencyUpdate(BaseModel):
@@ -200,6 +217,51 @@ class DependencyUpdate(BaseModel):
     dependency_ids: list[int] = Field(..., max_length=20)  # Security: limit
 
 
+class FeatureEventResponse(BaseModel):
+    """A single entry from the feature change log."""
+    id: int
+    feature_id: int
+    event_type: str
+    data: dict | None = None
+    created_at: datetime | None = None
+
+
+class FeatureEventListResponse(BaseModel):
+    """Change log entries after a cursor, plus the cursor to resume from."""
+    events: list[FeatureEventResponse]
+    cursor: int
+    # Events after the requested cursor were trimmed from the log; re-read
+    # the feature list instead of applying only these events
+    trimmed: bool = False
+
+
+class ToolMetricsEntry(BaseModel):
+    """Latency and write lock waits of one feature MCP tool."""
+    name: str
+    calls: int
+    errors: int
+    total_ms: float
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    transactions: int  # BEGIN IMMEDIATE write transactions
+    contended: int  # Write transactions that waited for another writer
+    lock_wait_ms: float
+    max_lock_wait_ms: float
+    sqlite_steps_avg: float  # SQLite work per call, in thousands of VM instructions
+
+
+class ToolMetricsResponse(BaseModel):
+    """Feature MCP tool metrics accumulated since the project's metrics file was created."""
+    since: str | None = None
+    updated_at: str | None = None
+    calls: int = 0
+    total_ms: float = 0.0
+    lock_wait_ms: float = 0.0
+    tools: list[ToolMetricsEntry] = Field(default_factory=list)
+
+
 # ============================================================================
 # Agent Schemas
 # ============================================================================
@@ -449,6 +511,7 @@ class SettingsResponse(BaseModel):
     api_base_url: str | None = None
     api_has_auth_token: bool = False  # Never expose actual token
     api_model: str | None = None
+    sqlite_profile: str = DEFAULT_SQLITE_PROFILE
 
 
 class ModelsResponse(BaseModel):
@@ -468,6 +531,7 @@ class SettingsUpdate(BaseModel):
     api_base_url: str | None = Field(None, max_length=500)
     api_auth_token: str | None = Field(None, max_length=500)  # Write-only, never returned
     api_model: str | None = Field(None, max_length=200)
+    sqlite_profile: str | None = None  # safe | balanced | throughput
 
     @field_validator('api_base_url')
     @classmethod
@@ -504,6 +568,13 @@ class SettingsUpdate(BaseModel):
             raise ValueError("batch_size must be between 1 and 3")
         return v
 
+    @field_validator('sqlite_profile')
+    @classmethod
+    def validate_sqlite_profile(cls, v: str | None) -> str | None:
+        if v is not None and v not in SQLITE_PROFILES:
+            raise ValueError(f"sqlite_profile must be one of: {list(SQLITE_PROFILES)}")
+        return v
+
 
 # ============================================================================
 # Dev Server Schemas
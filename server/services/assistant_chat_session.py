@@ -20,6 +20,7 @@ from typing import AsyncGenerator, Optional
 from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
 from dotenv import load_dotenv
 
+from ..utils.db_executor import run_db
 from .assistant_database import (
     add_message,
     create_conversation,
@@ -210,7 +211,7 @@ class AssistantChatSession:
 
         # Create a new conversation if we don't have one
         if is_new_conversation:
-            conv = create_conversation(self.project_dir, self.project_name)
+            conv = await run_db(create_conversation, self.project_dir, self.project_name, project=self.project_dir)
             self.conversation_id = int(conv.id)  # type coercion: Column[int] -> int
             yield {"type": "conversation_created", "conversation_id": self.conversation_id}
 
@@ -310,7 +311,7 @@ class AssistantChatSession:
                 # Store the greeting in the database
                 # conversation_id is guaranteed non-None here (set on line 206 above)
                 assert self.conversation_id is not None
-                add_message(self.project_dir, self.conversation_id, "assistant", greeting)
+                await run_db(add_message, self.project_dir, self.conversation_id, "assistant", greeting, project=self.project_dir)
 
                 yield {"type": "text", "content": greeting}
                 yield {"type": "response_done"}
@@ -345,13 +346,13 @@ class AssistantChatSession:
             return
 
         # Store user message in database
-        add_message(self.project_dir, self.conversation_id, "user", user_message)
+        await run_db(add_message, self.project_dir, self.conversation_id, "user", user_message, project=self.project_dir)
 
         # For resumed conversations, include history context in first message
         message_to_send = user_message
         if not self._history_loaded:
             self._history_loaded = True
-            history = get_messages(self.project_dir, self.conversation_id)
+            history = await run_db(get_messages, self.project_dir, self.conversation_id, project=self.project_dir)
             # Exclude the message we just added (last one)
             history = history[:-1] if history else []
             # Cap history to last 35 messages to prevent context overload
@@ -429,7 +430,7 @@ class AssistantChatSession:
 
         # Store the complete response in the database
         if full_response and self.conversation_id:
-            add_message(self.project_dir, self.conversation_id, "assistant", full_response)
+            await run_db(add_message, self.project_dir, self.conversation_id, "assistant", full_response, project=self.project_dir)
 
     def get_conversation_id(self) -> Optional[int]:
         """Get the current conversation ID."""
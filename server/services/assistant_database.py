@@ -7,28 +7,27 @@ Each project has its own assistant.db file in the project directory.
 """
 
 import logging
-import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, create_engine, func
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, create_engine, event, func
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker
 
+from api.engine_cache import EngineCache
+from api.sqlite_profiles import apply_sqlite_profile, resolve_sqlite_profile
+
 logger = logging.getLogger(__name__)
 
 class Base(DeclarativeBase):
     """SQLAlchemy 2.0 style declarative base."""
     pass
 
-# Engine cache to avoid creating new engines for each request
+# Engine cache to avoid creating new engines for each request, bounded with
+# idle expiry so projects the UI no longer uses release their file handles
 # Key: project directory path (as posix string), Value: SQLAlchemy engine
-_engine_cache: dict[str, Engine] = {}
-
-# Lock for thread-safe access to the engine cache
-# Prevents race conditions when multiple threads create engines simultaneously
-_cache_lock = threading.Lock()
+_engine_cache: EngineCache[Engine] = EngineCache("assistant", lambda engine: engine.dispose())
 
 
 def _utc_now() -> datetime:
@@ -71,57 +70,65 @@ def get_db_path(project_dir: Path) -> Path:
 def get_engine(project_dir: Path):
     """Get or create a SQLAlchemy engine for a project's assistant database.
 
-    Uses a cache to avoid creating new engines for each request, which improves
-    performance by reusing database connections.
+    Uses a bounded LRU cache (see api/engine_cache.py) to avoid creating new
+    engines for each request, which improves performance by reusing database
+    connections.
 
-    Thread-safe: Uses a lock to prevent race conditions when multiple threads
-    try to create engines simultaneously for the same project.
-    """
-    cache_key = project_dir.as_posix()
-
-    # Double-checked locking for thread safety and performance
-    if cache_key in _engine_cache:
-        return _engine_cache[cache_key]
-
-    with _cache_lock:
-        # Check again inside the lock in case another thread created it
-        if cache_key not in _engine_cache:
-            db_path = get_db_path(project_dir)
-            # Use as_posix() for cross-platform compatibility with SQLite connection strings
-            db_url = f"sqlite:///{db_path.as_posix()}"
-            engine = create_engine(
-                db_url,
-                echo=False,
-                connect_args={
-                    "check_same_thread": False,
-                    "timeout": 30,  # Wait up to 30s for locks
-                }
-            )
-            Base.metadata.create_all(engine)
-            _engine_cache[cache_key] = engine
-            logger.debug(f"Created new database engine for {cache_key}")
+    Thread-safe: the cache serializes creation per project, so concurrent
+    first requests for the same project share one engine.
 
-    return _engine_cache[cache_key]
+    Connections use the project's SQLite profile (see api/sqlite_profiles.py).
+    """
+    return _engine_cache.get_or_create(project_dir.as_posix(), lambda: _create_engine(project_dir))
+
+
+def _create_engine(project_dir: Path) -> Engine:
+    """Create the engine and tables for a project's assistant database."""
+    db_path = get_db_path(project_dir)
+    # Use as_posix() for cross-platform compatibility with SQLite connection strings
+    db_url = f"sqlite:///{db_path.as_posix()}"
+    profile = resolve_sqlite_profile(project_dir)
+    engine = create_engine(
+        db_url,
+        echo=False,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 30,  # Wait up to 30s for locks
+        },
+        **profile.engine_kwargs(),
+    )
+
+    @event.listens_for(engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record):
+        # assistant.db keeps SQLite's default rollback journal
+        apply_sqlite_profile(dbapi_connection, profile, wal=False)
+
+    Base.metadata.create_all(engine)
+    logger.debug(f"Created new database engine for {project_dir.as_posix()}")
+    return engine
 
 
 def dispose_engine(project_dir: Path) -> bool:
     """Dispose of and remove the cached engine for a project.
 
     This closes all database connections, releasing file locks on Windows.
-    Should be called before deleting the database file.
+    Should be called before deleting the database file. Waits for an engine
+    that is still being created.
 
     Returns:
         True if an engine was disposed, False if no engine was cached.
     """
-    cache_key = project_dir.as_posix()
+    return _engine_cache.dispose(project_dir.as_posix())
+
+
+def engine_cache_stats() -> dict:
+    """Return hit rate, eviction and size counters for the engine cache."""
+    return _engine_cache.stats()
 
-    if cache_key in _engine_cache:
-        engine = _engine_cache.pop(cache_key)
-        engine.dispose()
-        logger.debug(f"Disposed database engine for {cache_key}")
-        return True
 
-    return False
+def dispose_idle_engines() -> int:
+    """Dispose engines unused for longer than the cache idle timeout."""
+    return _engine_cache.dispose_idle()
 
 
 def get_session(project_dir: Path):
@@ -23,6 +23,8 @@ import psutil
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from auth import AUTH_ERROR_HELP_SERVER as AUTH_ERROR_HELP  # noqa: E402
 from auth import is_auth_error
+from server.utils import agent_events
+from server.utils.agent_events import EVENT_CHANNEL_STDOUT, EVENT_FD_ENV, split_event_line
 from server.utils.process_utils import kill_process_tree
 
 logger = logging.getLogger(__name__)
@@ -88,6 +90,7 @@ class AgentProcessManager:
 
         # Support multiple callbacks (for multiple WebSocket clients)
         self._output_callbacks: Set[Callable[[str], Awaitable[None]]] = set()
+        self._event_callbacks: Set[Callable[[dict], Awaitable[None]]] = set()
         self._status_callbacks: Set[Callable[[str], Awaitable[None]]] = set()
         self._callbacks_lock = threading.Lock()
 
@@ -137,6 +140,16 @@ class AgentProcessManager:
         with self._callbacks_lock:
             self._output_callbacks.discard(callback)
 
+    def add_event_callback(self, callback: Callable[[dict], Awaitable[None]]) -> None:
+        """Add a callback for structured orchestrator events."""
+        with self._callbacks_lock:
+            self._event_callbacks.add(callback)
+
+    def remove_event_callback(self, callback: Callable[[dict], Awaitable[None]]) -> None:
+        """Remove an event callback."""
+        with self._callbacks_lock:
+            self._event_callbacks.discard(callback)
+
     def add_status_callback(self, callback: Callable[[str], Awaitable[None]]) -> None:
         """Add a callback for status changes."""
         with self._callbacks_lock:
@@ -297,6 +310,14 @@ class AgentProcessManager:
         for callback in callbacks:
             await self._safe_callback(callback, line)
 
+    async def _broadcast_event(self, event: dict) -> None:
+        """Broadcast a structured event to all registered callbacks."""
+        with self._callbacks_lock:
+            callbacks = list(self._event_callbacks)
+
+        for callback in callbacks:
+            await self._safe_callback(callback, event)
+
     async def _stream_output(self) -> None:
         """Stream process output to callbacks."""
         if not self.process or not self.process.stdout:
@@ -316,6 +337,20 @@ class AgentProcessManager:
                     break
 
                 decoded = line.decode("utf-8", errors="replace").rstrip()
+
+                # Structured events are framed in-band; route them to event
+                # callbacks instead of the log
+                decoded, event = split_event_line(decoded)
+                if event is not None:
+                    # Graceful pause status transitions
+                    if event["type"] == agent_events.DRAIN_COMPLETE:
+                        self.status = "paused_graceful"
+                    elif event["type"] == agent_events.DRAIN_RESUME:
+                        self.status = "running"
+                    await self._broadcast_event(event)
+                    if not decoded:
+                        continue
+
                 sanitized = sanitize_output(decoded)
 
                 # Buffer recent output for auth error detection
@@ -330,12 +365,6 @@ class AgentProcessManager:
                     for help_line in AUTH_ERROR_HELP.strip().split('\n'):
                         await self._broadcast_output(help_line)
 
-                # Detect graceful pause status transitions from orchestrator output
-                if "All agents drained - paused." in decoded:
-                    self.status = "paused_graceful"
-                elif "Resuming from graceful pause..." in decoded:
-                    self.status = "running"
-
                 await self._broadcast_output(sanitized)
 
         except asyncio.CancelledError:
@@ -458,6 +487,8 @@ class AgentProcessManager:
                 "PYTHONUNBUFFERED": "1",
                 "PLAYWRIGHT_CLI_SESSION": f"agent-{self.project_name}-{os.getpid()}",
                 "NODE_COMPILE_CACHE": "",  # Disable V8 compile caching to prevent .node file accumulation in %TEMP%
+                # Orchestrator events arrive in-band on stdout, in order with its output
+                EVENT_FD_ENV: EVENT_CHANNEL_STDOUT,
                 **api_env,
             }
 
@@ -0,0 +1,168 @@
+"""
+Agent Events
+============
+
+Structured control channel between agents, the orchestrator and the server.
+
+Events are single-line JSON objects with a "type" field. They travel
+alongside the human-readable output instead of being recovered from it by
+regex:
+
+- agent -> orchestrator: a dedicated pipe whose file descriptor is passed in
+  AUTOFORGE_EVENT_FD (on Windows, where fds can't be handed to a child, the
+  value is "stdout" and events are written in-band, see below).
+- orchestrator -> server: in-band on stdout, so each event stays in order
+  with the log lines around it (the web UI attributes log lines to agents
+  announced by earlier events).
+
+In-band events are framed with a leading ASCII record separator (RS, as in
+RFC 7464 JSON text sequences), which never appears in normal output, so
+readers tell events from log lines with a single startswith()/find().
+
+A process whose environment has no AUTOFORGE_EVENT_FD (e.g. an agent or
+orchestrator run from a terminal) emits nothing.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Callable, TextIO
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the event channel: an fd number or "stdout"
+EVENT_FD_ENV = "AUTOFORGE_EVENT_FD"
+EVENT_CHANNEL_STDOUT = "stdout"
+
+# Frames an in-band event line
+EVENT_PREFIX = "\x1e"
+
+# Agent events (emitted by agent.py)
+CLAIM = "claim"            # feature_id: feature claimed via the MCP server
+PASS = "pass"              # feature_id: feature marked passing
+FAIL = "fail"              # feature_id: feature marked failing
+TOOL_START = "tool_start"  # tool: tool name
+TOOL_ERROR = "tool_error"  # tool: tool name, blocked: denied by security hook
+USAGE = "usage"            # input_tokens, output_tokens, cost_usd, num_turns
+WORKER_READY = "worker_ready"  # pid: warm worker finished startup, awaiting assignment
+
+# Orchestrator events (emitted by parallel_orchestrator.py)
+AGENT_START = "agent_start"        # agent_type, feature_ids, pid
+AGENT_COMPLETE = "agent_complete"  # agent_type, feature_ids, success
+INIT_START = "init_start"
+INIT_COMPLETE = "init_complete"
+CAPACITY = "capacity"              # ready, slots, running, max_concurrency
+AT_CAPACITY = "at_capacity"        # running, max_concurrency
+BLOCKED = "blocked"                # count: pending features with no ready work
+ALL_COMPLETE = "all_complete"
+DRAIN_START = "drain_start"
+DRAIN_COMPLETE = "drain_complete"
+DRAIN_RESUME = "drain_resume"
+
+# Shared feature MCP server events (emitted by mcp_server/feature_mcp.py --shared)
+MCP_SERVER_READY = "mcp_server_ready"  # url: streamable HTTP endpoint
+
+EventHandler = Callable[[dict], None]
+
+
+def encode_event(event: dict) -> str:
+    """Serialize an event as one line of compact JSON (no trailing newline)."""
+    return json.dumps(event, separators=(",", ":"), default=str)
+
+
+def decode_event(text: str) -> dict | None:
+    """Parse an event line; None if it is not a JSON object with a type."""
+    try:
+        event = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(event, dict) or not isinstance(event.get("type"), str):
+        return None
+    return event
+
+
+def split_event_line(line: str) -> tuple[str, dict | None]:
+    """Split an output line into (log text, in-band event).
+
+    In-band writers don't force a newline first, so the frame may follow
+    unterminated output (e.g. streamed model text); the log text is
+    everything before it.
+    """
+    index = line.find(EVENT_PREFIX)
+    if index < 0:
+        return line, None
+    return line[:index], decode_event(line[index + 1:])
+
+
+class EventChannel:
+    """Writer side of the event channel. Thread-safe; write errors are logged
+    once and then ignored so a closed reader never breaks the agent."""
+
+    def __init__(self, stream: TextIO | None, in_band: bool = False):
+        self._stream = stream
+        self._in_band = in_band
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ: dict[str, str] | None = None) -> "EventChannel":
+        """Open the channel named by AUTOFORGE_EVENT_FD (disabled if unset)."""
+        value = (os.environ if environ is None else environ).get(EVENT_FD_ENV, "")
+        if not value:
+            return cls(None)
+        if value == EVENT_CHANNEL_STDOUT:
+            return cls(sys.stdout, in_band=True)
+        try:
+            fd = int(value)
+            # Don't leak the pipe into the Claude CLI and its tools
+            os.set_inheritable(fd, False)
+            stream = open(fd, "w", encoding="utf-8", buffering=1, closefd=True)
+        except (ValueError, OSError) as e:
+            logger.warning("Event channel %s=%r unavailable: %s", EVENT_FD_ENV, value, e)
+            return cls(None)
+        return cls(stream)
+
+    @property
+    def enabled(self) -> bool:
+        return self._stream is not None
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        """Write one event (no-op when the channel is disabled)."""
+        if self._stream is None:
+            return
+        line = encode_event({"type": event_type, **fields})
+        if self._in_band:
+            line = EVENT_PREFIX + line
+        with self._lock:
+            try:
+                self._stream.write(line + "\n")
+                self._stream.flush()
+            except (OSError, ValueError) as e:
+                logger.debug("Event channel closed: %s", e)
+                self._stream = None
+
+    def close(self) -> None:
+        """Close a dedicated pipe (stdout is left open)."""
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None and not self._in_band:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+_process_channel: EventChannel | None = None
+
+
+def get_event_channel() -> EventChannel:
+    """The process-wide channel named by the environment (opened once).
+
+    A warm worker announces itself on the channel before it is assigned work,
+    and the agent keeps using the same pipe afterwards.
+    """
+    global _process_channel
+    if _process_channel is None:
+        _process_channel = EventChannel.from_env()
+    return _process_channel
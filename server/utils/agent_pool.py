@@ -0,0 +1,239 @@
+"""
+Warm Agent Pool
+===============
+
+Pre-started agent workers, so a new feature doesn't wait for a cold
+interpreter.
+
+A cold agent spawn pays for a fresh Python interpreter importing
+claude_agent_sdk, SQLAlchemy and the prompt/security/client modules before it
+can create its client. A warm worker is the same agent entry point started
+ahead of time with --warm-worker: it does the imports, announces itself with a
+worker_ready event, then blocks reading one JSON line from stdin:
+
+    {"argv": ["--project-dir", "...", "--agent-type", "coding", ...],
+     "env": {"PLAYWRIGHT_CLI_SESSION": "coding-12"}}
+
+and continues exactly as if it had been launched with that argv. Workers are
+single-use (each runs one agent session and exits, like a cold spawn); the
+pool starts a replacement as soon as one is handed out, so the import cost is
+paid while the previous agent works.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Awaitable
+
+from server.utils.agent_events import WORKER_READY, EventHandler
+from server.utils.agent_supervisor import AgentSupervisor, ExitHandler, LineHandler, SupervisedAgent
+
+logger = logging.getLogger(__name__)
+
+# Output lines kept from a worker before it is assigned (startup banner)
+MAX_BUFFERED_LINES = 50
+
+# Consecutive workers dying before assignment that disable the pool
+MAX_WARMUP_FAILURES = 3
+
+
+class _Worker:
+    """A pooled process and the handlers it forwards to once assigned."""
+
+    def __init__(self, pool: "WarmAgentPool"):
+        self._pool = pool
+        self.agent: SupervisedAgent | None = None
+        self.spawned_at = time.monotonic()
+        self.ready_at: float | None = None
+        self.assigned = False
+        self._buffer: list[str] = []
+        self._events: list[dict] = []
+        self._on_line: LineHandler | None = None
+        self._on_event: EventHandler | None = None
+        self._on_exit: ExitHandler | None = None
+
+    def assign(self, on_line: LineHandler, on_event: EventHandler | None, on_exit: ExitHandler | None) -> None:
+        self.assigned = True
+        self._on_line, self._on_event, self._on_exit = on_line, on_event, on_exit
+        buffered, self._buffer = self._buffer, []
+        for line in buffered:
+            on_line(line)
+        events, self._events = self._events, []
+        if on_event is not None:
+            for event in events:
+                on_event(event)
+
+    def on_line(self, line: str) -> None:
+        if self._on_line is not None:
+            self._on_line(line)
+        elif len(self._buffer) < MAX_BUFFERED_LINES:
+            self._buffer.append(line)
+
+    def on_event(self, event: dict) -> None:
+        if self.assigned:
+            if self._on_event is not None:
+                self._on_event(event)
+        elif event.get("type") == WORKER_READY:
+            self.ready_at = time.monotonic()
+            self._pool._worker_ready(self)
+        else:
+            # Assignment sent but not yet attached
+            self._events.append(event)
+
+    def on_exit(self, agent: SupervisedAgent) -> Awaitable[None] | None:
+        if self.assigned:
+            return self._on_exit(agent) if self._on_exit is not None else None
+        self._pool._worker_lost(self)
+        return None
+
+
+class WarmAgentPool:
+    """Keeps `size` idle agent workers ready to take an assignment."""
+
+    def __init__(
+        self,
+        supervisor: AgentSupervisor,
+        cmd: list[str],
+        *,
+        cwd: Path | str,
+        env: dict[str, str],
+        size: int,
+    ):
+        """
+        Args:
+            supervisor: Supervisor that owns the worker processes
+            cmd: Command starting one worker (the agent entry point in warm
+                worker mode)
+            cwd: Working directory for workers (the agent's cwd)
+            env: Environment shared by all agents; per-agent differences are
+                sent with the assignment
+            size: Number of idle workers to keep ready
+        """
+        self._supervisor = supervisor
+        self._cmd = cmd
+        self._cwd = cwd
+        self._env = env
+        self.size = size
+        self._idle: list[_Worker] = []      # Ready, waiting for an assignment
+        self._starting: set[_Worker] = set()  # Spawned, still warming up
+        self._failures = 0
+        self._closed = False
+        self.warmup_seconds: list[float] = []
+
+    @property
+    def enabled(self) -> bool:
+        return not self._closed and self.size > 0
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def start(self) -> None:
+        """Start workers until `size` are idle or warming up."""
+        while self.enabled and len(self._idle) + len(self._starting) < self.size:
+            if not await self._spawn_worker():
+                break
+
+    async def acquire(
+        self,
+        argv: list[str],
+        *,
+        env: dict[str, str],
+        on_line: LineHandler,
+        on_event: EventHandler | None = None,
+        on_exit: ExitHandler | None = None,
+    ) -> SupervisedAgent | None:
+        """Hand an assignment to an idle worker.
+
+        Returns the worker's SupervisedAgent, or None if no worker is ready
+        (the caller should spawn a cold agent instead). A replacement worker
+        is started in the background either way.
+        """
+        message = (json.dumps({"argv": argv, "env": env}) + "\n").encode("utf-8")
+        agent = None
+        while self._idle and agent is None:
+            worker = self._idle.pop(0)
+            assert worker.agent is not None
+            try:
+                await worker.agent.send_input(message)
+            except (ConnectionError, OSError) as e:
+                logger.debug("Warm worker %d unusable: %s", worker.agent.pid, e)
+                continue
+            if worker.agent.done():
+                # Exited while the assignment was being written
+                continue
+            # Output produced meanwhile was buffered and is delivered now
+            worker.assign(on_line, on_event, on_exit)
+            agent = worker.agent
+        if self.enabled:
+            asyncio.get_running_loop().create_task(self.start())
+        return agent
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop all idle and warming workers (assigned agents are untouched)."""
+        self._closed = True
+        workers = self._idle + list(self._starting)
+        self._idle.clear()
+        self._starting.clear()
+        await asyncio.gather(
+            *(self._supervisor.stop(w.agent, timeout) for w in workers if w.agent is not None),
+            return_exceptions=True,
+        )
+
+    def stats(self) -> dict:
+        """Pool size and worker warm-up times (spawn to ready)."""
+        warmups = sorted(self.warmup_seconds)
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "warming": len(self._starting),
+            "warmup_ms_avg": round(sum(warmups) / len(warmups) * 1000, 1) if warmups else 0.0,
+        }
+
+    async def _spawn_worker(self) -> bool:
+        worker = _Worker(self)
+        self._starting.add(worker)
+        try:
+            worker.agent = await self._supervisor.spawn(
+                self._cmd,
+                cwd=self._cwd,
+                env=self._env,
+                on_line=worker.on_line,
+                on_event=worker.on_event,
+                on_exit=worker.on_exit,
+                stdin_pipe=True,
+            )
+        except OSError as e:
+            self._starting.discard(worker)
+            logger.warning("Failed to start warm agent worker: %s", e)
+            self._warmup_failed()
+            return False
+        return True
+
+    def _worker_ready(self, worker: _Worker) -> None:
+        self._starting.discard(worker)
+        if self._closed:
+            return
+        self._failures = 0
+        if worker.ready_at is not None:
+            self.warmup_seconds.append(worker.ready_at - worker.spawned_at)
+        self._idle.append(worker)
+
+    def _worker_lost(self, worker: _Worker) -> None:
+        """An unassigned worker exited (crash during warm-up, or stopped)."""
+        was_pooled = worker in self._starting or worker in self._idle
+        self._starting.discard(worker)
+        if worker in self._idle:
+            self._idle.remove(worker)
+        if was_pooled and not self._closed:
+            self._warmup_failed()
+            if self.enabled:
+                asyncio.get_running_loop().create_task(self.start())
+
+    def _warmup_failed(self) -> None:
+        self._failures += 1
+        if self._failures >= MAX_WARMUP_FAILURES:
+            logger.warning("Warm agent workers keep failing to start; using cold spawns")
+            self._closed = True
@@ -0,0 +1,325 @@
+"""
+Agent Supervisor
+================
+
+asyncio-native supervision of agent subprocesses.
+
+Agents are started with asyncio.create_subprocess_exec. Each agent's stdout
+is read by a task on the event loop rather than a dedicated reader thread, and
+its exit is exposed as an awaitable. Exit handlers run on the event loop in
+the order processes finish, and stopping an agent kills its whole process
+tree (cancelling the reader if the pipe stays open).
+
+Agents can also be given a structured event channel (see agent_events): a
+dedicated pipe on POSIX, in-band framed stdout lines on Windows. Events are
+decoded and delivered to their own handler, separate from output lines.
+
+On Python 3.11 asyncio's default Unix child watcher still starts a waitpid
+thread per child; where the kernel supports pidfds the supervisor switches to
+PidfdChildWatcher so exits are also observed on the event loop (3.12+ does
+this by default; Windows uses the proactor and needs neither).
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from server.utils.agent_events import (
+    EVENT_CHANNEL_STDOUT,
+    EVENT_FD_ENV,
+    EventHandler,
+    decode_event,
+    split_event_line,
+)
+from server.utils.process_utils import KillResult, kill_process_tree_async
+
+logger = logging.getLogger(__name__)
+
+# Longest stdout line delivered intact; longer lines are delivered in pieces
+LINE_LIMIT = 1024 * 1024
+
+LineHandler = Callable[[str], None]
+ExitHandler = Callable[["SupervisedAgent"], Optional[Awaitable[None]]]
+
+
+_pidfd_watcher = None  # PidfdChildWatcher installed by this module, if any
+
+
+def _prefer_pidfd_child_watcher() -> None:
+    """Replace the thread-per-child watcher with PidfdChildWatcher if possible.
+
+    Must be called from the event loop that will spawn processes.
+    """
+    global _pidfd_watcher
+    if sys.version_info >= (3, 12) or sys.platform == "win32" or not hasattr(os, "pidfd_open"):
+        return
+    policy = asyncio.get_event_loop_policy()
+    if _pidfd_watcher is None:
+        try:
+            os.close(os.pidfd_open(os.getpid()))  # Kernel support (Linux 5.3+)
+        except OSError:
+            return
+        # Only replace the default; respect a watcher configured by the host app
+        if type(policy.get_child_watcher()) is not asyncio.ThreadedChildWatcher:
+            return
+        _pidfd_watcher = asyncio.PidfdChildWatcher()
+        policy.set_child_watcher(_pidfd_watcher)
+    if policy.get_child_watcher() is _pidfd_watcher and not _pidfd_watcher.is_active():
+        # First use, or the previous event loop has stopped
+        _pidfd_watcher.attach_loop(asyncio.get_running_loop())
+
+
+class SupervisedAgent:
+    """A running agent subprocess and the task supervising it.
+
+    Attributes:
+        proc: The asyncio subprocess
+        stopping: True once stop() was requested
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.stopping = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    @property
+    def returncode(self) -> int | None:
+        return self.proc.returncode
+
+    def done(self) -> bool:
+        """True once the process exited and its exit handler finished."""
+        return self._task is not None and self._task.done()
+
+    async def send_input(self, data: bytes, close: bool = True) -> None:
+        """Write to the agent's stdin (spawned with stdin_pipe=True).
+
+        Raises:
+            ConnectionError: If the process has exited or closed its stdin
+        """
+        stdin = self.proc.stdin
+        if stdin is None:
+            raise ConnectionError("agent was not started with a stdin pipe")
+        stdin.write(data)
+        await stdin.drain()
+        if close:
+            stdin.close()
+
+    async def wait(self) -> int | None:
+        """Wait for the process to exit and its exit handler to finish.
+
+        Cancelling the caller does not cancel supervision.
+        """
+        assert self._task is not None
+        await asyncio.shield(self._task)
+        return self.proc.returncode
+
+
+class AgentSupervisor:
+    """Spawns and supervises agent subprocesses on the running event loop."""
+
+    def __init__(self, kill_timeout: float = 2.0):
+        """
+        Args:
+            kill_timeout: Seconds to wait for leftover children to exit after
+                an agent finishes (before force-killing them)
+        """
+        self.kill_timeout = kill_timeout
+        self._agents: set[SupervisedAgent] = set()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    async def spawn(
+        self,
+        cmd: list[str],
+        *,
+        cwd: Path | str,
+        env: dict[str, str],
+        on_line: LineHandler,
+        on_exit: ExitHandler | None = None,
+        on_event: EventHandler | None = None,
+        stdin_pipe: bool = False,
+    ) -> SupervisedAgent:
+        """Start a subprocess and supervise it.
+
+        stdout and stderr are merged and delivered line by line (decoded as
+        UTF-8 with replacement, trailing newline removed) to on_line. When
+        on_event is given, the child gets an event channel and each event it
+        emits is delivered to on_event as a dict; otherwise any channel
+        inherited through env is removed. stdin is /dev/null unless
+        stdin_pipe is set (see SupervisedAgent.send_input). When the process
+        exits, leftover children are killed and on_exit is called (and
+        awaited, if it returns an awaitable).
+
+        Raises:
+            OSError: If the process could not be started
+        """
+        env = dict(env)
+        env.pop(EVENT_FD_ENV, None)
+        kwargs: dict[str, Any] = {
+            # stdin=DEVNULL prevents blocking on stdin reads
+            "stdin": subprocess.PIPE if stdin_pipe else subprocess.DEVNULL,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.STDOUT,
+            "cwd": str(cwd),
+            "env": env,
+            "limit": LINE_LIMIT,
+        }
+        if sys.platform == "win32":
+            # CREATE_NO_WINDOW on Windows prevents console window pop-ups
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        event_read_fd = event_write_fd = None
+        if on_event is not None:
+            if sys.platform == "win32":
+                env[EVENT_FD_ENV] = EVENT_CHANNEL_STDOUT
+            else:
+                event_read_fd, event_write_fd = os.pipe()
+                env[EVENT_FD_ENV] = str(event_write_fd)
+                kwargs["pass_fds"] = (event_write_fd,)
+
+        _prefer_pidfd_child_watcher()
+        try:
+            proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+        except BaseException:
+            if event_read_fd is not None:
+                os.close(event_read_fd)
+            raise
+        finally:
+            # The child holds the write end now; EOF arrives when it exits
+            if event_write_fd is not None:
+                os.close(event_write_fd)
+
+        events = None
+        if event_read_fd is not None:
+            events = await self._open_event_pipe(event_read_fd)
+        agent = SupervisedAgent(proc)
+        self._agents.add(agent)
+        agent._task = asyncio.create_task(
+            self._supervise(agent, on_line, on_exit, on_event, events),
+            name=f"agent-{proc.pid}",
+        )
+        return agent
+
+    @staticmethod
+    async def _open_event_pipe(fd: int) -> tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+        """Wrap the read end of an event pipe in a StreamReader."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=LINE_LIMIT)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), open(fd, "rb", buffering=0)
+        )
+        return reader, transport
+
+    async def stop(self, agent: SupervisedAgent, timeout: float = 5.0) -> KillResult:
+        """Kill an agent's process tree and wait for its exit handler.
+
+        If the output pipe is still held open (e.g. by an escaped grandchild)
+        after the tree is dead, the reader is cancelled.
+        """
+        agent.stopping = True
+        result = await kill_process_tree_async(agent.proc, timeout=timeout)
+        if agent._task is not None and not agent._task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(agent._task), timeout=timeout)
+            except asyncio.TimeoutError:
+                agent._task.cancel()
+                await asyncio.gather(agent._task, return_exceptions=True)
+        return result
+
+    async def stop_all(self, timeout: float = 5.0) -> list[KillResult]:
+        """Stop every supervised agent concurrently."""
+        agents = list(self._agents)
+        return await asyncio.gather(*(self.stop(a, timeout) for a in agents))
+
+    async def _supervise(
+        self,
+        agent: SupervisedAgent,
+        on_line: LineHandler,
+        on_exit: ExitHandler | None,
+        on_event: EventHandler | None,
+        events: tuple[asyncio.StreamReader, asyncio.BaseTransport] | None,
+    ) -> None:
+        proc = agent.proc
+        try:
+            if on_event is None:
+                await self._pump(proc.stdout, on_line)
+            elif events is None:
+                # In-band events (Windows): split them out of stdout
+                await self._pump(proc.stdout, self._in_band_splitter(on_line, on_event))
+            else:
+                await asyncio.gather(
+                    self._pump(proc.stdout, on_line),
+                    self._pump(events[0], self._event_decoder(on_event)),
+                )
+            await proc.wait()
+        finally:
+            if events is not None:
+                events[1].close()
+            # Clean up any child processes left behind (e.g. the Claude CLI)
+            try:
+                await kill_process_tree_async(proc, timeout=self.kill_timeout)
+            except Exception as e:
+                logger.debug("Error killing process tree for PID %d: %s", proc.pid, e)
+            self._agents.discard(agent)
+            if on_exit is not None:
+                try:
+                    result = on_exit(agent)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception("Exit handler for PID %d failed", proc.pid)
+
+    @staticmethod
+    def _event_decoder(on_event: EventHandler) -> LineHandler:
+        """Line handler for a dedicated event pipe."""
+        def on_line(line: str) -> None:
+            event = decode_event(line)
+            if event is not None:
+                on_event(event)
+            elif line:
+                logger.debug("Ignoring malformed agent event: %.200s", line)
+        return on_line
+
+    @staticmethod
+    def _in_band_splitter(on_line: LineHandler, on_event: EventHandler) -> LineHandler:
+        """Line handler that separates framed events from stdout output."""
+        def handle(line: str) -> None:
+            text, event = split_event_line(line)
+            if event is None:
+                on_line(line)
+                return
+            if text:
+                on_line(text)
+            on_event(event)
+        return handle
+
+    @staticmethod
+    async def _pump(stream: asyncio.StreamReader | None, on_line: LineHandler) -> None:
+        """Deliver lines from stream to on_line until EOF."""
+        if stream is None:
+            return
+        while True:
+            try:
+                raw = await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                raw = e.partial  # Final line without newline (or EOF)
+                if not raw:
+                    return
+            except asyncio.LimitOverrunError as e:
+                # Line longer than LINE_LIMIT: deliver what is buffered
+                raw = await stream.readexactly(e.consumed)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            try:
+                on_line(line)
+            except Exception:
+                logger.exception("Output handler failed")
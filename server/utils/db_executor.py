@@ -0,0 +1,95 @@
+"""
+Database Executor
+=================
+
+Bounded thread pool for running synchronous SQLAlchemy/sqlite3 work from
+async request handlers without blocking the event loop.
+
+SQLite waits up to 30 seconds on a locked database (busy_timeout). Run inline
+in an ``async def`` handler, that wait stalls every WebSocket stream and
+terminal session the server hosts. Handlers instead ``await run_db(...)``.
+
+Each project is additionally limited to a few in-flight jobs, so a project
+whose database is locked can only tie up its own slots, never the whole pool.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Total worker threads shared by all projects
+DB_EXECUTOR_MAX_WORKERS = int(os.environ.get("AUTOFORGE_DB_WORKERS", "8"))
+
+# Maximum concurrent jobs for a single project (must be < max workers so a
+# locked project always leaves workers free for everyone else)
+DB_EXECUTOR_PER_PROJECT = max(1, min(2, DB_EXECUTOR_MAX_WORKERS - 1))
+
+_executor: ThreadPoolExecutor | None = None
+
+# project key -> (event loop, semaphore). asyncio primitives bind to the loop
+# they are first awaited on, so a semaphore is recreated if the loop changes.
+_project_slots: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the shared executor on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="autoforge-db",
+        )
+    return _executor
+
+
+def _get_project_slot(key: str) -> asyncio.Semaphore:
+    """Return the per-project semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    entry = _project_slots.get(key)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(DB_EXECUTOR_PER_PROJECT))
+        _project_slots[key] = entry
+    return entry[1]
+
+
+async def run_db(
+    fn: Callable[..., T],
+    *args: Any,
+    project: Path | str | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking database call on the bounded DB executor.
+
+    Args:
+        fn: Synchronous function to run
+        *args: Positional arguments for fn
+        project: Project directory or name the call touches. When given, the
+            call also takes one of that project's slots.
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Whatever fn returns. Exceptions (including HTTPException) propagate.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+
+    if project is None:
+        return await loop.run_in_executor(_get_executor(), call)
+
+    key = project.as_posix() if isinstance(project, Path) else project
+    async with _get_project_slot(key):
+        return await loop.run_in_executor(_get_executor(), call)
+
+
+def shutdown_db_executor() -> None:
+    """Stop accepting work and release worker threads (server shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    _project_slots.clear()
@@ -8,10 +8,9 @@ Real-time updates for project progress, agent output, and dev server output.
 import asyncio
 import json
 import logging
-import re
 from datetime import datetime
 from pathlib import Path
-from typing import Set
+from typing import TYPE_CHECKING, Set
 
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -19,70 +18,61 @@ from .schemas import AGENT_MASCOTS
 from .services.chat_constants import ROOT_DIR
 from .services.dev_server_manager import get_devserver_manager
 from .services.process_manager import get_manager
+from .utils import agent_events
 from .utils.project_helpers import get_project_path as _get_project_path
 from .utils.validation import is_valid_project_name as validate_project_name
 
+if TYPE_CHECKING:
+    from autoforge_paths import StatSignature
+
+try:
+    from watchfiles import awatch
+except ImportError:  # Optional: installed with uvicorn[standard]
+    awatch = None  # type: ignore[assignment]
+
 # Lazy imports
 _count_passing_tests = None
 
 logger = logging.getLogger(__name__)
 
-# Pattern to extract feature ID from parallel orchestrator output
-# Both coding and testing agents now use the same [Feature #X] format
-FEATURE_ID_PATTERN = re.compile(r'\[Feature #(\d+)\]\s*(.*)')
-
-# Pattern to detect testing agent start message (includes feature ID)
-# Matches: "Started testing agent for feature #123 (PID xxx)"
-TESTING_AGENT_START_PATTERN = re.compile(r'Started testing agent for feature #(\d+)')
-
-# Pattern to detect testing agent completion
-# Matches: "Feature #123 testing completed" or "Feature #123 testing failed"
-TESTING_AGENT_COMPLETE_PATTERN = re.compile(r'Feature #(\d+) testing (completed|failed)')
-
-# Pattern to detect batch coding agent start message
-# Matches: "Started coding agent for features #5, #8, #12"
-BATCH_CODING_AGENT_START_PATTERN = re.compile(r'Started coding agent for features (#\d+(?:,\s*#\d+)*)')
-
-# Pattern to detect batch completion
-# Matches: "Features #5, #8, #12 completed" or "Features #5, #8, #12 failed"
-BATCH_FEATURES_COMPLETE_PATTERN = re.compile(r'Features (#\d+(?:,\s*#\d+)*)\s+(completed|failed)')
-
-# Patterns for detecting agent activity and thoughts
-THOUGHT_PATTERNS = [
-    # Claude's tool usage patterns (actual format: [Tool: name])
-    (re.compile(r'\[Tool:\s*Read\]', re.I), 'thinking'),
-    (re.compile(r'\[Tool:\s*(?:Write|Edit|NotebookEdit)\]', re.I), 'working'),
-    (re.compile(r'\[Tool:\s*Bash\]', re.I), 'testing'),
-    (re.compile(r'\[Tool:\s*(?:Glob|Grep)\]', re.I), 'thinking'),
-    (re.compile(r'\[Tool:\s*(\w+)\]', re.I), 'working'),  # Fallback for other tools
-    # Claude's internal thoughts
-    (re.compile(r'(?:Reading|Analyzing|Checking|Looking at|Examining)\s+(.+)', re.I), 'thinking'),
-    (re.compile(r'(?:Creating|Writing|Adding|Implementing|Building)\s+(.+)', re.I), 'working'),
-    (re.compile(r'(?:Testing|Verifying|Running tests|Validating)\s+(.+)', re.I), 'testing'),
-    (re.compile(r'(?:Error|Failed|Cannot|Unable to|Exception)\s+(.+)', re.I), 'struggling'),
-    # Test results
-    (re.compile(r'(?:PASS|passed|success)', re.I), 'testing'),
-    (re.compile(r'(?:FAIL|failed|error)', re.I), 'struggling'),
-]
-
-# Orchestrator event patterns for Mission Control observability
-ORCHESTRATOR_PATTERNS = {
-    'init_start': re.compile(r'Running initializer agent'),
-    'init_complete': re.compile(r'INITIALIZATION COMPLETE'),
-    'capacity_check': re.compile(r'\[DEBUG\] Spawning loop: (\d+) ready, (\d+) slots'),
-    'at_capacity': re.compile(r'At max capacity|at max testing agents|At max total agents'),
-    'feature_start': re.compile(r'Starting feature \d+/\d+: #(\d+) - (.+)'),
-    'coding_spawn': re.compile(r'Started coding agent for features? #(\d+)'),
-    'testing_spawn': re.compile(r'Started testing agent for feature #(\d+)'),
-    'coding_complete': re.compile(r'Features? #(\d+)(?:,\s*#\d+)* (completed|failed)'),
-    'testing_complete': re.compile(r'Feature #(\d+) testing (completed|failed)'),
-    'all_complete': re.compile(r'All features complete'),
-    'blocked_features': re.compile(r'(\d+) blocked by dependencies'),
-    'drain_start': re.compile(r'Graceful pause requested'),
-    'drain_complete': re.compile(r'All agents drained'),
-    'drain_resume': re.compile(r'Resuming from graceful pause'),
+# Prefix the orchestrator puts on agent output lines: "[Feature #X] content"
+FEATURE_LINE_PREFIX = "[Feature #"
+
+# Agent state shown while a tool runs (other tools: 'working')
+TOOL_STATES = {
+    'Read': 'thinking',
+    'Glob': 'thinking',
+    'Grep': 'thinking',
+    'Write': 'working',
+    'Edit': 'working',
+    'NotebookEdit': 'working',
+    'Bash': 'testing',
 }
 
+# Events after which feature counts have probably changed
+PROGRESS_EVENTS = frozenset({
+    agent_events.CLAIM,
+    agent_events.PASS,
+    agent_events.FAIL,
+    agent_events.AGENT_START,
+    agent_events.AGENT_COMPLETE,
+    agent_events.ALL_COMPLETE,
+})
+
+
+def _line_feature_id(line: str) -> int | None:
+    """Feature ID from a "[Feature #X] ..." output line, else None."""
+    if not line.startswith(FEATURE_LINE_PREFIX):
+        return None
+    end = line.find("]", len(FEATURE_LINE_PREFIX))
+    digits = line[len(FEATURE_LINE_PREFIX):end]
+    return int(digits) if end > 0 and digits.isdigit() else None
+
+
+def _short_tool_name(tool: str) -> str:
+    """Drop the MCP server prefix: mcp__features__feature_get_ready -> feature_get_ready."""
+    return tool.rsplit("__", 1)[-1] if tool.startswith("mcp__") else tool
+
 
 class AgentTracker:
     """Tracks active agents and their states for multi-agent mode.
@@ -98,126 +88,80 @@ class AgentTracker:
         self._next_agent_index = 0
         self._lock = asyncio.Lock()
 
-    async def process_line(self, line: str) -> dict | None:
+    async def process_event(self, event: dict) -> dict | None:
         """
-        Process an output line and return an agent_update message if relevant.
+        Process an orchestrator event and return an agent_update message if relevant.
 
         Returns None if no update should be emitted.
         """
-        # Check for orchestrator status messages first
-        # These don't have [Feature #X] prefix
-
-        # Batch coding agent start: "Started coding agent for features #5, #8, #12"
-        batch_start_match = BATCH_CODING_AGENT_START_PATTERN.match(line)
-        if batch_start_match:
-            try:
-                feature_ids = [int(x.strip().lstrip('#')) for x in batch_start_match.group(1).split(',')]
-                if feature_ids:
-                    return await self._handle_batch_agent_start(feature_ids, "coding")
-            except ValueError:
-                pass
+        event_type = event.get('type')
+        agent_type = event.get('agent_type', 'coding')
+
+        if event_type == agent_events.AGENT_START:
+            feature_ids = [fid for fid in event.get('feature_ids', []) if isinstance(fid, int)]
+            if len(feature_ids) > 1 and agent_type == 'coding':
+                return await self._handle_batch_agent_start(feature_ids, agent_type)
+            if feature_ids:
+                return await self._handle_agent_start(feature_ids[0], agent_type=agent_type)
+            return None
 
-        # Single coding agent start: "Started coding agent for feature #X"
-        if line.startswith("Started coding agent for feature #"):
-            m = re.search(r'#(\d+)', line)
-            if m:
-                try:
-                    feature_id = int(m.group(1))
-                    return await self._handle_agent_start(feature_id, line, agent_type="coding")
-                except ValueError:
-                    pass
-
-        # Testing agent start: "Started testing agent for feature #X (PID xxx)"
-        testing_start_match = TESTING_AGENT_START_PATTERN.match(line)
-        if testing_start_match:
-            feature_id = int(testing_start_match.group(1))
-            return await self._handle_agent_start(feature_id, line, agent_type="testing")
-
-        # Testing agent complete: "Feature #X testing completed/failed"
-        testing_complete_match = TESTING_AGENT_COMPLETE_PATTERN.match(line)
-        if testing_complete_match:
-            feature_id = int(testing_complete_match.group(1))
-            is_success = testing_complete_match.group(2) == "completed"
-            return await self._handle_agent_complete(feature_id, is_success, agent_type="testing")
-
-        # Batch features complete: "Features #5, #8, #12 completed/failed"
-        batch_complete_match = BATCH_FEATURES_COMPLETE_PATTERN.match(line)
-        if batch_complete_match:
-            try:
-                feature_ids = [int(x.strip().lstrip('#')) for x in batch_complete_match.group(1).split(',')]
-                is_success = batch_complete_match.group(2) == "completed"
-                if feature_ids:
-                    return await self._handle_batch_agent_complete(feature_ids, is_success, "coding")
-            except ValueError:
-                pass
+        if event_type == agent_events.AGENT_COMPLETE:
+            feature_ids = [fid for fid in event.get('feature_ids', []) if isinstance(fid, int)]
+            is_success = bool(event.get('success'))
+            if len(feature_ids) > 1:
+                return await self._handle_batch_agent_complete(feature_ids, is_success, agent_type)
+            if feature_ids:
+                return await self._handle_agent_complete(feature_ids[0], is_success, agent_type=agent_type)
+            return None
 
-        # Coding agent complete: "Feature #X completed/failed" (without "testing" keyword)
-        if line.startswith("Feature #") and ("completed" in line or "failed" in line) and "testing" not in line:
-            m = re.search(r'#(\d+)', line)
-            if m:
-                try:
-                    feature_id = int(m.group(1))
-                    is_success = "completed" in line
-                    return await self._handle_agent_complete(feature_id, is_success, agent_type="coding")
-                except ValueError:
-                    pass
-
-        # Check for feature-specific output lines: [Feature #X] content
-        # Both coding and testing agents use this format now
-        match = FEATURE_ID_PATTERN.match(line)
-        if not match:
+        # Activity reported by an agent (forwarded by the orchestrator)
+        feature_id = event.get('feature_id')
+        agent_feature_id = event.get('agent_feature_id', feature_id)
+        if not isinstance(feature_id, int) or not isinstance(agent_feature_id, int):
             return None
 
-        feature_id = int(match.group(1))
-        content = match.group(2)
+        if event_type == agent_events.TOOL_START:
+            tool = _short_tool_name(str(event.get('tool', '')))
+            state, thought = TOOL_STATES.get(tool, 'working'), f'[Tool: {tool}]'
+        elif event_type == agent_events.TOOL_ERROR:
+            tool = _short_tool_name(str(event.get('tool', '')))
+            state = 'struggling'
+            thought = f'{tool} blocked' if event.get('blocked') else f'{tool} failed'
+        elif event_type == agent_events.CLAIM:
+            state, thought = 'working', f'Claimed Feature #{feature_id}'
+        elif event_type == agent_events.PASS:
+            state, thought = 'testing', f'Feature #{feature_id} passing'
+        elif event_type == agent_events.FAIL:
+            state, thought = 'struggling', f'Feature #{feature_id} regression found'
+        else:
+            return None
 
         async with self._lock:
-            # Check if either coding or testing agent exists for this feature
-            # This prevents creating ghost agents when a testing agent outputs [Feature #X] lines
-            coding_key = (feature_id, 'coding')
-            testing_key = (feature_id, 'testing')
-
-            if coding_key in self.active_agents:
-                key = coding_key
-            elif testing_key in self.active_agents:
-                key = testing_key
-            else:
-                # Neither exists, create a new coding agent entry (implicit tracking)
-                key = coding_key
+            key = (agent_feature_id, agent_type)
+            if key not in self.active_agents:
+                # Started before this tracker was created: track implicitly
                 agent_index = self._next_agent_index
                 self._next_agent_index += 1
                 self.active_agents[key] = {
                     'name': AGENT_MASCOTS[agent_index % len(AGENT_MASCOTS)],
                     'agent_index': agent_index,
-                    'agent_type': 'coding',
-                    'feature_ids': [feature_id],
+                    'agent_type': agent_type,
+                    'feature_ids': [agent_feature_id],
                     'state': 'thinking',
-                    'feature_name': f'Feature #{feature_id}',
+                    'feature_name': f'Feature #{agent_feature_id}',
                     'last_thought': None,
                 }
 
             agent = self.active_agents[key]
 
-            # Update current_feature_id for batch agents when output comes from a different feature
-            if 'current_feature_id' in agent and feature_id in agent.get('feature_ids', []):
+            # Batch agents move between the features of their batch
+            if 'current_feature_id' in agent:
                 agent['current_feature_id'] = feature_id
 
-            # Detect state and thought from content
-            state = 'working'
-            thought = None
-
-            for pattern, detected_state in THOUGHT_PATTERNS:
-                m = pattern.search(content)
-                if m:
-                    state = detected_state
-                    thought = m.group(1) if m.lastindex else content[:100]
-                    break
-
             # Only emit update if state changed or we have a new thought
             if state != agent['state'] or thought != agent['last_thought']:
                 agent['state'] = state
-                if thought:
-                    agent['last_thought'] = thought
+                agent['last_thought'] = thought
 
                 return {
                     'type': 'agent_update',
@@ -265,18 +209,13 @@ class AgentTracker:
             self.active_agents.clear()
             self._next_agent_index = 0
 
-    async def _handle_agent_start(self, feature_id: int, line: str, agent_type: str = "coding") -> dict | None:
-        """Handle agent start message from orchestrator."""
+    async def _handle_agent_start(self, feature_id: int, agent_type: str = "coding") -> dict | None:
+        """Handle agent start event from orchestrator."""
         async with self._lock:
             key = (feature_id, agent_type)  # Composite key for separate tracking
             agent_index = self._next_agent_index
             self._next_agent_index += 1
-
-            # Try to extract feature name from line
             feature_name = f'Feature #{feature_id}'
-            name_match = re.search(r'#\d+:\s*(.+)$', line)
-            if name_match:
-                feature_name = name_match.group(1)
 
             self.active_agents[key] = {
                 'name': AGENT_MASCOTS[agent_index % len(AGENT_MASCOTS)],
@@ -302,7 +241,7 @@ class AgentTracker:
             }
 
     async def _handle_batch_agent_start(self, feature_ids: list[int], agent_type: str = "coding") -> dict | None:
-        """Handle batch agent start message from orchestrator."""
+        """Handle batch agent start event from orchestrator."""
         if not feature_ids:
             return None
         primary_id = feature_ids[0]
@@ -436,7 +375,7 @@ class AgentTracker:
 class OrchestratorTracker:
     """Tracks orchestrator state for Mission Control observability.
 
-    Parses orchestrator stdout for key events and emits orchestrator_update
+    Consumes the orchestrator's structured events and emits orchestrator_update
     WebSocket messages showing what decisions the orchestrator is making.
     """
 
@@ -444,70 +383,60 @@ class OrchestratorTracker:
         self.state = 'idle'
         self.coding_agents = 0
         self.testing_agents = 0
-        self.max_concurrency = 3  # Default, will be updated from output
+        self.max_concurrency = 3  # Default, updated from capacity events
         self.ready_count = 0
         self.blocked_count = 0
         self.recent_events: list[dict] = []
         self._lock = asyncio.Lock()
 
-    async def process_line(self, line: str) -> dict | None:
+    async def process_event(self, event: dict) -> dict | None:
         """
-        Process an output line and return an orchestrator_update message if relevant.
+        Process an orchestrator event and return an orchestrator_update message if relevant.
 
         Returns None if no update should be emitted.
         """
+        event_type = event.get('type')
+        agent_type = event.get('agent_type')
+        feature_ids = event.get('feature_ids') or [None]
+        feature_id = feature_ids[0]
+
         async with self._lock:
             update = None
 
-            # Check for initializer start
-            if ORCHESTRATOR_PATTERNS['init_start'].search(line):
+            if isinstance(event.get('max_concurrency'), int):
+                self.max_concurrency = event['max_concurrency']
+
+            if event_type == agent_events.INIT_START:
                 self.state = 'initializing'
                 update = self._create_update(
                     'init_start',
                     'Initializing project features...'
                 )
 
-            # Check for initializer complete
-            elif ORCHESTRATOR_PATTERNS['init_complete'].search(line):
+            elif event_type == agent_events.INIT_COMPLETE:
                 self.state = 'scheduling'
                 update = self._create_update(
                     'init_complete',
                     'Initialization complete, preparing to schedule features'
                 )
 
-            # Check for capacity status
-            elif match := ORCHESTRATOR_PATTERNS['capacity_check'].search(line):
-                self.ready_count = int(match.group(1))
-                slots = int(match.group(2))
+            elif event_type == agent_events.CAPACITY:
+                self.ready_count = int(event.get('ready', 0))
+                slots = int(event.get('slots', 0))
                 self.state = 'scheduling' if self.ready_count > 0 else 'monitoring'
                 update = self._create_update(
                     'capacity_check',
                     f'{self.ready_count} features ready, {slots} slots available'
                 )
 
-            # Check for at capacity
-            elif ORCHESTRATOR_PATTERNS['at_capacity'].search(line):
+            elif event_type == agent_events.AT_CAPACITY:
                 self.state = 'monitoring'
                 update = self._create_update(
                     'at_capacity',
                     'At maximum capacity, monitoring active agents'
                 )
 
-            # Check for feature start
-            elif match := ORCHESTRATOR_PATTERNS['feature_start'].search(line):
-                feature_id = int(match.group(1))
-                feature_name = match.group(2).strip()
-                self.state = 'spawning'
-                update = self._create_update(
-                    'feature_start',
-                    f'Preparing Feature #{feature_id}: {feature_name}',
-                    feature_id=feature_id,
-                    feature_name=feature_name
-                )
-
-            # Check for coding agent spawn
-            elif match := ORCHESTRATOR_PATTERNS['coding_spawn'].search(line):
-                feature_id = int(match.group(1))
+            elif event_type == agent_events.AGENT_START and agent_type == 'coding':
                 self.coding_agents += 1
                 self.state = 'spawning'
                 update = self._create_update(
@@ -516,9 +445,7 @@ class OrchestratorTracker:
                     feature_id=feature_id
                 )
 
-            # Check for testing agent spawn
-            elif match := ORCHESTRATOR_PATTERNS['testing_spawn'].search(line):
-                feature_id = int(match.group(1))
+            elif event_type == agent_events.AGENT_START and agent_type == 'testing':
                 self.testing_agents += 1
                 self.state = 'spawning'
                 update = self._create_update(
@@ -527,22 +454,16 @@ class OrchestratorTracker:
                     feature_id=feature_id
                 )
 
-            # Check for coding agent complete
-            elif match := ORCHESTRATOR_PATTERNS['coding_complete'].search(line):
-                # Only match if "testing" is not in the line
-                if 'testing' not in line.lower():
-                    feature_id = int(match.group(1))
-                    self.coding_agents = max(0, self.coding_agents - 1)
-                    self.state = 'monitoring'
-                    update = self._create_update(
-                        'coding_complete',
-                        f'Coding agent finished Feature #{feature_id}',
-                        feature_id=feature_id
-                    )
-
-            # Check for testing agent complete
-            elif match := ORCHESTRATOR_PATTERNS['testing_complete'].search(line):
-                feature_id = int(match.group(1))
+            elif event_type == agent_events.AGENT_COMPLETE and agent_type == 'coding':
+                self.coding_agents = max(0, self.coding_agents - 1)
+                self.state = 'monitoring'
+                update = self._create_update(
+                    'coding_complete',
+                    f'Coding agent finished Feature #{feature_id}',
+                    feature_id=feature_id
+                )
+
+            elif event_type == agent_events.AGENT_COMPLETE and agent_type == 'testing':
                 self.testing_agents = max(0, self.testing_agents - 1)
                 self.state = 'monitoring'
                 update = self._create_update(
@@ -551,12 +472,10 @@ class OrchestratorTracker:
                     feature_id=feature_id
                 )
 
-            # Check for blocked features count
-            elif match := ORCHESTRATOR_PATTERNS['blocked_features'].search(line):
-                self.blocked_count = int(match.group(1))
+            elif event_type == agent_events.BLOCKED:
+                self.blocked_count = int(event.get('count', 0))
 
-            # Check for all complete
-            elif ORCHESTRATOR_PATTERNS['all_complete'].search(line):
+            elif event_type == agent_events.ALL_COMPLETE:
                 self.state = 'complete'
                 self.coding_agents = 0
                 self.testing_agents = 0
@@ -566,14 +485,14 @@ class OrchestratorTracker:
                 )
 
             # Graceful pause (drain mode) events
-            elif ORCHESTRATOR_PATTERNS['drain_start'].search(line):
+            elif event_type == agent_events.DRAIN_START:
                 self.state = 'draining'
                 update = self._create_update(
                     'drain_start',
                     'Draining active agents...'
                 )
 
-            elif ORCHESTRATOR_PATTERNS['drain_complete'].search(line):
+            elif event_type == agent_events.DRAIN_COMPLETE:
                 self.state = 'paused'
                 self.coding_agents = 0
                 self.testing_agents = 0
@@ -582,7 +501,7 @@ class OrchestratorTracker:
                     'All agents drained. Paused.'
                 )
 
-            elif ORCHESTRATOR_PATTERNS['drain_resume'].search(line):
+            elif event_type == agent_events.DRAIN_RESUME:
                 self.state = 'scheduling'
                 update = self._create_update(
                     'drain_resume',
@@ -658,28 +577,170 @@ def _get_count_passing_tests():
     return _count_passing_tests
 
 
+def _progress_message(project_dir: Path) -> dict:
+    """Build a progress message from a single aggregate query."""
+    count_passing_tests = _get_count_passing_tests()
+    passing, in_progress, total, needs_human_input = count_passing_tests(project_dir)
+    percentage = (passing / total * 100) if total > 0 else 0
+    return {
+        "type": "progress",
+        "passing": passing,
+        "in_progress": in_progress,
+        "total": total,
+        "percentage": round(percentage, 1),
+        "needs_human_input": needs_human_input,
+    }
+
+
+class ProgressPublisher:
+    """Computes progress once per project and fans it out to every subscriber.
+
+    Recomputation is triggered by changes to the features database or its WAL
+    file (via watchfiles, falling back to cheap os.stat polling) and by
+    notify(), which callers use when orchestrator output signals a state
+    change. Replaces the per-socket 2 second poll, so N dashboards on one
+    project cost one query per change instead of N queries every 2 seconds.
+    """
+
+    # Coarse safety net in case a file event is missed (e.g. network drives)
+    RESYNC_INTERVAL = 30.0
+    # Stat polling interval when file notifications are unavailable
+    STAT_POLL_INTERVAL = 2.0
+
+    def __init__(self, project_name: str, project_dir: Path, connection_manager: "ConnectionManager"):
+        self.project_name = project_name
+        self.project_dir = project_dir
+        self._connection_manager = connection_manager
+        self._changed = asyncio.Event()
+        self._changed.set()  # Compute once on start
+        self.latest: dict | None = None
+        self._tasks: list[asyncio.Task] = []
+
+        from autoforge_paths import get_features_db_path
+        self._db_path = get_features_db_path(project_dir)
+        self._watched_names = {self._db_path.name, self._db_path.name + "-wal"}
+
+    def start(self) -> None:
+        """Start the publish and file-watch tasks."""
+        self._tasks = [
+            asyncio.create_task(self._publish_loop()),
+            asyncio.create_task(self._watch_loop()),
+        ]
+
+    async def stop(self) -> None:
+        """Cancel background tasks and wait for them to finish."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Request a recompute (e.g. a feature was claimed or completed)."""
+        self._changed.set()
+
+    async def _publish_loop(self) -> None:
+        """Recompute on change and broadcast only when the counts differ."""
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.RESYNC_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+            try:
+                message = await asyncio.to_thread(_progress_message, self.project_dir)
+            except Exception as e:
+                logger.warning(f"Progress computation error for {self.project_name}: {e}")
+                continue
+            if message != self.latest:
+                self.latest = message
+                await self._connection_manager.broadcast_to_project(self.project_name, message)
+
+    def _stat_signature(self) -> "StatSignature":
+        """(mtime_ns, size) of the database and WAL files, None if missing."""
+        from autoforge_paths import stat_signature
+
+        return stat_signature((self._db_path, self._db_path.with_name(self._db_path.name + "-wal")))
+
+    async def _watch_loop(self) -> None:
+        """Set the change flag whenever the database or WAL file is written."""
+        use_notifications = awatch is not None
+        while True:
+            watch_dir = self._db_path.parent
+            if use_notifications and watch_dir.exists():
+                try:
+                    async for _changes in awatch(
+                        watch_dir,
+                        watch_filter=lambda _change, path: Path(path).name in self._watched_names,
+                        debounce=200,
+                        recursive=False,
+                    ):
+                        self._changed.set()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.debug(f"File watching unavailable for {self.project_name}, polling instead: {e}")
+                    use_notifications = False
+                continue
+
+            # Fallback: compare file stats (no database connection involved).
+            # Also used until the database directory exists, then re-checked.
+            signature = self._stat_signature()
+            await asyncio.sleep(self.STAT_POLL_INTERVAL)
+            if self._stat_signature() != signature:
+                self._changed.set()
+
+
 class ConnectionManager:
     """Manages WebSocket connections per project."""
 
     def __init__(self):
         # project_name -> set of WebSocket connections
         self.active_connections: dict[str, Set[WebSocket]] = {}
+        # project_name -> progress publisher shared by that project's connections
+        self._publishers: dict[str, ProgressPublisher] = {}
         self._lock = asyncio.Lock()
 
-    async def connect(self, websocket: WebSocket, project_name: str):
-        """Register a WebSocket connection for a project (must already be accepted)."""
+    async def connect(self, websocket: WebSocket, project_name: str, project_dir: Path | None = None):
+        """Register a WebSocket connection for a project (must already be accepted).
+
+        When project_dir is given, the project's progress publisher is started
+        on the first connection.
+        """
         async with self._lock:
             if project_name not in self.active_connections:
                 self.active_connections[project_name] = set()
             self.active_connections[project_name].add(websocket)
+            if project_dir is not None and project_name not in self._publishers:
+                publisher = ProgressPublisher(project_name, project_dir, self)
+                self._publishers[project_name] = publisher
+                publisher.start()
 
     async def disconnect(self, websocket: WebSocket, project_name: str):
-        """Remove a WebSocket connection."""
+        """Remove a WebSocket connection, stopping the publisher after the last one."""
+        publisher = None
         async with self._lock:
             if project_name in self.active_connections:
                 self.active_connections[project_name].discard(websocket)
                 if not self.active_connections[project_name]:
                     del self.active_connections[project_name]
+                    publisher = self._publishers.pop(project_name, None)
+        if publisher is not None:
+            await publisher.stop()
+
+    def get_progress(self, project_name: str) -> dict | None:
+        """Return the last published progress message for a project, if any."""
+        publisher = self._publishers.get(project_name)
+        return publisher.latest if publisher else None
+
+    def notify_progress(self, project_name: str) -> None:
+        """Ask the project's publisher to recompute progress."""
+        publisher = self._publishers.get(project_name)
+        if publisher:
+            publisher.notify()
 
     async def broadcast_to_project(self, project_name: str, message: dict):
         """Broadcast a message to all connections for a project."""
@@ -709,45 +770,6 @@ class ConnectionManager:
 # Global connection manager
 manager = ConnectionManager()
 
-async def poll_progress(websocket: WebSocket, project_name: str, project_dir: Path):
-    """Poll database for progress changes and send updates."""
-    count_passing_tests = _get_count_passing_tests()
-    last_passing = -1
-    last_in_progress = -1
-    last_total = -1
-
-    last_needs_human_input = -1
-
-    while True:
-        try:
-            passing, in_progress, total, needs_human_input = count_passing_tests(project_dir)
-
-            # Only send if changed
-            if (passing != last_passing or in_progress != last_in_progress
-                    or total != last_total or needs_human_input != last_needs_human_input):
-                last_passing = passing
-                last_in_progress = in_progress
-                last_total = total
-                last_needs_human_input = needs_human_input
-                percentage = (passing / total * 100) if total > 0 else 0
-
-                await websocket.send_json({
-                    "type": "progress",
-                    "passing": passing,
-                    "in_progress": in_progress,
-                    "total": total,
-                    "percentage": round(percentage, 1),
-                    "needs_human_input": needs_human_input,
-                })
-
-            await asyncio.sleep(2)  # Poll every 2 seconds
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.warning(f"Progress polling error: {e}")
-            break
-
-
 async def project_websocket(websocket: WebSocket, project_name: str):
     """
     WebSocket endpoint for project updates.
@@ -776,7 +798,7 @@ async def project_websocket(websocket: WebSocket, project_name: str):
         await websocket.close(code=4004, reason="Project directory not found")
         return
 
-    await manager.connect(websocket, project_name)
+    await manager.connect(websocket, project_name, project_dir)
 
     # Get agent manager and register callbacks
     agent_manager = get_manager(project_name, project_dir, ROOT_DIR)
@@ -790,12 +812,10 @@ async def project_websocket(websocket: WebSocket, project_name: str):
     async def on_output(line: str):
         """Handle agent output - broadcast to this WebSocket."""
         try:
-            # Extract feature ID from line if present
-            feature_id = None
+            # Attribute "[Feature #X] ..." lines to the feature and its agent
+            feature_id = _line_feature_id(line)
             agent_index = None
-            match = FEATURE_ID_PATTERN.match(line)
-            if match:
-                feature_id = int(match.group(1))
+            if feature_id is not None:
                 agent_index, _ = await agent_tracker.get_agent_info(feature_id)
 
             # Send the raw log line with optional feature/agent attribution
@@ -810,17 +830,22 @@ async def project_websocket(websocket: WebSocket, project_name: str):
                 log_msg["agentIndex"] = agent_index
 
             await websocket.send_json(log_msg)
+        except Exception:
+            pass  # Connection may be closed
 
-            # Check if this line indicates agent activity (parallel mode)
-            # and emit agent_update messages if so
-            agent_update = await agent_tracker.process_line(line)
+    async def on_event(event: dict):
+        """Handle a structured orchestrator event - update trackers and broadcast."""
+        try:
+            agent_update = await agent_tracker.process_event(event)
             if agent_update:
                 await websocket.send_json(agent_update)
 
-            # Also check for orchestrator events and emit orchestrator_update messages
-            orch_update = await orchestrator_tracker.process_line(line)
+            orch_update = await orchestrator_tracker.process_event(event)
             if orch_update:
                 await websocket.send_json(orch_update)
+
+            if event.get('type') in PROGRESS_EVENTS:
+                manager.notify_progress(project_name)
         except Exception:
             pass  # Connection may be closed
 
@@ -840,6 +865,7 @@ async def project_websocket(websocket: WebSocket, project_name: str):
 
     # Register callbacks
     agent_manager.add_output_callback(on_output)
+    agent_manager.add_event_callback(on_event)
     agent_manager.add_status_callback(on_status_change)
 
     # Get dev server manager and register callbacks
@@ -871,9 +897,6 @@ async def project_websocket(websocket: WebSocket, project_name: str):
     devserver_manager.add_output_callback(on_dev_output)
     devserver_manager.add_status_callback(on_dev_status_change)
 
-    # Start progress polling task
-    poll_task = asyncio.create_task(poll_progress(websocket, project_name, project_dir))
-
     try:
         # Send initial agent status
         await websocket.send_json({
@@ -888,18 +911,12 @@ async def project_websocket(websocket: WebSocket, project_name: str):
             "url": devserver_manager.detected_url,
         })
 
-        # Send initial progress
-        count_passing_tests = _get_count_passing_tests()
-        passing, in_progress, total, needs_human_input = count_passing_tests(project_dir)
-        percentage = (passing / total * 100) if total > 0 else 0
-        await websocket.send_json({
-            "type": "progress",
-            "passing": passing,
-            "in_progress": in_progress,
-            "total": total,
-            "percentage": round(percentage, 1),
-            "needs_human_input": needs_human_input,
-        })
+        # Send initial progress (the publisher broadcasts subsequent changes).
+        # On first connect the publisher's initial computation reaches this
+        # socket through the broadcast instead.
+        progress = manager.get_progress(project_name)
+        if progress is not None:
+            await websocket.send_json(progress)
 
         # Keep connection alive and handle incoming messages
         while True:
@@ -921,14 +938,9 @@ async def project_websocket(websocket: WebSocket, project_name: str):
 
     finally:
         # Clean up
-        poll_task.cancel()
-        try:
-            await poll_task
-        except asyncio.CancelledError:
-            pass
-
         # Unregister agent callbacks
         agent_manager.remove_output_callback(on_output)
+        agent_manager.remove_event_callback(on_event)
         agent_manager.remove_status_callback(on_status_change)
 
         # Unregister dev server callbacks
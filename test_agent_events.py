@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Agent Event Channel Tests
+=========================
+
+Tests the structured JSON-lines channel that carries agent and orchestrator
+events (claims, tool use, agent start/complete) alongside normal output, and
+the websocket trackers that consume it.
+Run with: python -m pytest test_agent_events.py -v
+"""
+
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import parallel_orchestrator as po
+from api.database import create_database, dispose_engine
+from parallel_orchestrator import ParallelOrchestrator
+from server.services.process_manager import AgentProcessManager
+from server.utils import agent_events
+from server.utils.agent_events import (
+    EVENT_CHANNEL_STDOUT,
+    EVENT_FD_ENV,
+    EVENT_PREFIX,
+    EventChannel,
+    split_event_line,
+)
+from server.utils.agent_supervisor import AgentSupervisor
+from server.websocket import AgentTracker, OrchestratorTracker
+
+ROOT = Path(__file__).parent
+
+# Child that writes output lines and events the way agent.py does
+EMITTER = textwrap.dedent(f"""
+    import sys
+    sys.path.insert(0, {str(ROOT)!r})
+    from server.utils.agent_events import EventChannel
+    events = EventChannel.from_env()
+    print("[Tool: mcp__features__feature_claim_and_get]", flush=True)
+    events.emit("tool_start", tool="mcp__features__feature_claim_and_get")
+    events.emit("claim", feature_id=7)
+    print("working on it", flush=True)
+    events.emit("pass", feature_id=7)
+    events.close()
+""")
+
+
+def test_split_event_line():
+    assert split_event_line("plain output") == ("plain output", None)
+    assert split_event_line(EVENT_PREFIX + '{"type":"claim","feature_id":3}') == (
+        "", {"type": "claim", "feature_id": 3},
+    )
+    # Event written right after unterminated output
+    assert split_event_line('partial text' + EVENT_PREFIX + '{"type":"pass"}') == (
+        "partial text", {"type": "pass"},
+    )
+    # Malformed frames are not events
+    assert split_event_line(EVENT_PREFIX + "not json")[1] is None
+    assert split_event_line(EVENT_PREFIX + '["no", "type"]')[1] is None
+
+
+def test_channel_disabled_without_env():
+    channel = EventChannel.from_env({})
+    assert not channel.enabled
+    channel.emit("claim", feature_id=1)  # No-op
+
+
+def test_in_band_channel_frames_events(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    channel = EventChannel.from_env({EVENT_FD_ENV: EVENT_CHANNEL_STDOUT})
+    channel.emit("claim", feature_id=4)
+    text, event = split_event_line(out.getvalue().rstrip("\n"))
+    assert text == ""
+    assert event == {"type": "claim", "feature_id": 4}
+
+
+@pytest.mark.asyncio
+async def test_supervisor_delivers_events_separately():
+    lines: list[str] = []
+    events: list[dict] = []
+    supervisor = AgentSupervisor(kill_timeout=1)
+    agent = await supervisor.spawn(
+        [sys.executable, "-c", EMITTER],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        on_line=lines.append,
+        on_event=events.append,
+    )
+    assert await asyncio.wait_for(agent.wait(), timeout=30) == 0
+
+    assert lines == ["[Tool: mcp__features__feature_claim_and_get]", "working on it"]
+    assert [e["type"] for e in events] == ["tool_start", "claim", "pass"]
+    assert events[1]["feature_id"] == 7
+
+
+def test_in_band_splitter_routes_events():
+    lines: list[str] = []
+    events: list[dict] = []
+    handle = AgentSupervisor._in_band_splitter(lines.append, events.append)
+    handle("hello")
+    handle("text" + EVENT_PREFIX + '{"type":"claim","feature_id":2}')
+    handle(EVENT_PREFIX + '{"type":"pass","feature_id":2}')
+    assert lines == ["hello", "text"]
+    assert [e["type"] for e in events] == ["claim", "pass"]
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setattr(po, "debug_log", po.DebugLogger(tmp_path / "orchestrator_debug.log"))
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    create_database(project_dir)
+    output: list[tuple[int, str]] = []
+    orch = ParallelOrchestrator(project_dir, on_output=lambda fid, line: output.append((fid, line)))
+    orch.output = output
+    yield orch
+    orch.cleanup()
+    dispose_engine(project_dir)
+
+
+def test_orchestrator_follows_claims_and_forwards_events(orchestrator):
+    forwarded = io.StringIO()
+    orchestrator._events = EventChannel(forwarded, in_band=True)
+    handlers = orchestrator._agent_handlers(5, "coding")
+
+    handlers["on_line"]("first")
+    handlers["on_event"]({"type": "claim", "feature_id": 6})
+    handlers["on_line"]("second")
+    handlers["on_event"]({"type": "tool_start", "tool": "Bash"})
+
+    # Output is attributed to the claimed feature, without parsing it
+    assert orchestrator.output == [(5, "first"), (6, "second")]
+    # (str.splitlines() would also split on the RS frame byte)
+    events = [split_event_line(line)[1] for line in forwarded.getvalue().split("\n") if line]
+    assert events == [
+        {"type": "claim", "agent_type": "coding", "agent_feature_id": 5, "feature_id": 6},
+        {"type": "tool_start", "agent_type": "coding", "agent_feature_id": 5, "tool": "Bash", "feature_id": 6},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_trackers_consume_events():
+    agents = AgentTracker()
+    orch = OrchestratorTracker()
+
+    start = {"type": agent_events.AGENT_START, "agent_type": "coding", "feature_ids": [5, 6], "pid": 1}
+    update = await agents.process_event(start)
+    assert update["featureIds"] == [5, 6] and update["state"] == "thinking"
+    assert (await orch.process_event(start))["eventType"] == "coding_spawn"
+    assert orch.coding_agents == 1
+
+    tool = {"type": agent_events.TOOL_START, "agent_type": "coding", "agent_feature_id": 5,
+            "feature_id": 6, "tool": "Bash"}
+    update = await agents.process_event(tool)
+    assert update["agentIndex"] == 0
+    assert update["featureId"] == 6
+    assert update["state"] == "testing"
+    # Same state and thought again: nothing new to report
+    assert await agents.process_event(tool) is None
+
+    complete = {"type": agent_events.AGENT_COMPLETE, "agent_type": "coding", "feature_ids": [5, 6],
+                "success": True}
+    update = await agents.process_event(complete)
+    assert update["state"] == "success"
+    assert agents.active_agents == {}
+    assert (await orch.process_event(complete))["eventType"] == "coding_complete"
+    assert orch.coding_agents == 0
+
+    update = await orch.process_event({"type": agent_events.CAPACITY, "ready": 3, "slots": 2,
+                                       "running": 1, "max_concurrency": 3})
+    assert update["readyCount"] == 3 and update["maxConcurrency"] == 3
+
+
+@pytest.mark.asyncio
+async def test_process_manager_routes_events(tmp_path):
+    manager = AgentProcessManager("events-test", tmp_path, ROOT)
+    logs: list[str] = []
+    events: list[dict] = []
+
+    async def on_output(line: str) -> None:
+        logs.append(line)
+
+    async def on_event(event: dict) -> None:
+        events.append(event)
+
+    manager.add_output_callback(on_output)
+    manager.add_event_callback(on_event)
+    script = (
+        "print('Started coding agent for feature #1');"
+        f"print({EVENT_PREFIX!r} + '{{\"type\":\"agent_start\",\"agent_type\":\"coding\",\"feature_ids\":[1]}}');"
+        f"print({EVENT_PREFIX!r} + '{{\"type\":\"drain_complete\"}}');"
+        "print('[Feature #1] hello')"
+    )
+    manager.process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    manager._status = "running"
+    await asyncio.wait_for(manager._stream_output(), timeout=30)
+
+    assert logs == ["Started coding agent for feature #1", "[Feature #1] hello"]
+    assert [e["type"] for e in events] == ["agent_start", "drain_complete"]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Warm Agent Pool Tests
+=====================
+
+Tests that pre-started agent workers take assignments over stdin, that a warm
+start skips the worker's startup cost, and that the real agent entry point
+works in warm worker mode.
+Run with: python -m pytest test_agent_pool.py -v
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parallel_orchestrator import SpawnLatencyMetrics
+from server.utils.agent_events import TOOL_START, WORKER_READY
+from server.utils.agent_pool import WarmAgentPool
+from server.utils.agent_supervisor import AgentSupervisor
+
+ROOT = Path(__file__).parent
+
+# Worker with a 300 ms "import" phase, then the warm-worker handshake. Its
+# first action after assignment is a tool call, reported like agent.py does.
+FAKE_WORKER = textwrap.dedent(f"""
+    import json, sys, time
+    sys.path.insert(0, {str(ROOT)!r})
+    time.sleep(0.3)
+    from server.utils.agent_events import get_event_channel
+    events = get_event_channel()
+    events.emit("worker_ready")
+    line = sys.stdin.readline()
+    if not line.strip():
+        sys.exit(0)
+    assignment = json.loads(line)
+    print("assigned", assignment["argv"], assignment["env"]["SESSION"], flush=True)
+    events.emit("tool_start", tool="Bash")
+""")
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+
+async def _wait_until(predicate, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def _time_to_first_tool(start_agent) -> tuple[float, list[str]]:
+    """Seconds from start_agent() to the agent's first tool_start event."""
+    lines: list[str] = []
+    first_tool = asyncio.get_running_loop().create_future()
+
+    def on_event(event: dict) -> None:
+        if event["type"] == TOOL_START and not first_tool.done():
+            first_tool.set_result(time.monotonic())
+
+    started = time.monotonic()
+    agent = await start_agent(lines.append, on_event)
+    assert agent is not None
+    latency = await asyncio.wait_for(first_tool, timeout=30) - started
+    assert await asyncio.wait_for(agent.wait(), timeout=30) == 0
+    return latency, lines
+
+
+@pytest.mark.asyncio
+async def test_warm_start_skips_worker_startup():
+    supervisor = AgentSupervisor(kill_timeout=1)
+    cmd = [sys.executable, "-c", FAKE_WORKER]
+    assignment = b'{"argv": ["--feature-id", "1"], "env": {"SESSION": "cold"}}\n'
+
+    async def cold(on_line, on_event):
+        agent = await supervisor.spawn(cmd, cwd=ROOT, env=_env(), on_line=on_line,
+                                       on_event=on_event, stdin_pipe=True)
+        await agent.send_input(assignment)
+        return agent
+
+    pool = WarmAgentPool(supervisor, cmd, cwd=ROOT, env=_env(), size=1)
+    try:
+        await pool.start()
+        await _wait_until(lambda: pool.idle_count == 1)
+
+        async def warm(on_line, on_event):
+            return await pool.acquire(["--feature-id", "2"], env={"SESSION": "warm"},
+                                      on_line=on_line, on_event=on_event)
+
+        cold_latency, _ = await _time_to_first_tool(cold)
+        warm_latency, warm_lines = await _time_to_first_tool(warm)
+
+        assert warm_lines == ["assigned ['--feature-id', '2'] warm"]
+        assert cold_latency >= 0.3
+        assert warm_latency < cold_latency - 0.2, (cold_latency, warm_latency)
+
+        # A replacement worker was started when the first was handed out
+        await _wait_until(lambda: pool.idle_count == 1)
+        assert pool.stats()["warmup_ms_avg"] >= 300
+    finally:
+        await pool.close()
+    assert len(supervisor) == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_without_idle_worker_returns_none():
+    supervisor = AgentSupervisor(kill_timeout=1)
+    pool = WarmAgentPool(supervisor, [sys.executable, "-c", FAKE_WORKER], cwd=ROOT, env=_env(), size=1)
+    try:
+        await pool.start()
+        # Still warming up: the caller must spawn cold
+        assert await pool.acquire([], env={}, on_line=print) is None
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failing_workers_disable_pool():
+    supervisor = AgentSupervisor(kill_timeout=1)
+    pool = WarmAgentPool(supervisor, [sys.executable, "-c", "raise SystemExit(1)"],
+                         cwd=ROOT, env=_env(), size=1)
+    await pool.start()
+    await _wait_until(lambda: not pool.enabled)
+    assert await pool.acquire([], env={}, on_line=print) is None
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_agent_entry_point_warm_worker_mode(tmp_path):
+    """autonomous_agent_demo.py --warm-worker announces readiness and exits on EOF."""
+    supervisor = AgentSupervisor(kill_timeout=1)
+    events: list[dict] = []
+    agent = await supervisor.spawn(
+        [sys.executable, "-u", str(ROOT / "autonomous_agent_demo.py"),
+         "--project-dir", str(tmp_path), "--warm-worker"],
+        cwd=tmp_path,
+        env=_env(),
+        on_line=lambda line: None,
+        on_event=events.append,
+        stdin_pipe=True,
+    )
+    try:
+        await _wait_until(lambda: any(e["type"] == WORKER_READY for e in events), timeout=60)
+        assert events[0]["pid"] == agent.pid
+        await agent.send_input(b"")  # Pool shutdown: close stdin without an assignment
+        assert await asyncio.wait_for(agent.wait(), timeout=30) == 0
+    finally:
+        if not agent.done():
+            await supervisor.stop(agent)
+
+
+def test_spawn_latency_metrics():
+    metrics = SpawnLatencyMetrics()
+    metrics.record(False, 2.0)
+    metrics.record(False, 4.0)
+    metrics.record(True, 0.5)
+    snap = metrics.snapshot()
+    assert snap["cold"] == {"count": 2, "first_tool_ms_avg": 3000.0, "first_tool_ms_p95": 2000.0}
+    assert snap["warm"]["count"] == 1 and snap["warm"]["first_tool_ms_avg"] == 500.0
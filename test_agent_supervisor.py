@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Agent Supervisor Tests
+======================
+
+Tests for asyncio-native agent subprocess supervision: line streaming, exit
+handlers, process tree cleanup on stop, and that supervising many agents does
+not cost a thread per agent.
+Run with: python -m pytest test_agent_supervisor.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psutil
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from server.utils.agent_supervisor import AgentSupervisor
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-u", "-c", code]
+
+
+@pytest.mark.asyncio
+async def test_streams_lines_and_runs_exit_handler(tmp_path):
+    supervisor = AgentSupervisor()
+    lines: list[str] = []
+    exits: list[int | None] = []
+
+    agent = await supervisor.spawn(
+        _python("import sys\nprint('one')\nprint('two', file=sys.stderr)\nsys.stdout.write('three')\nsys.exit(3)"),
+        cwd=tmp_path,
+        env=dict(os.environ),
+        on_line=lines.append,
+        on_exit=lambda a: exits.append(a.returncode),
+    )
+    assert await asyncio.wait_for(agent.wait(), timeout=10) == 3
+    assert lines == ["one", "two", "three"]
+    assert exits == [3]
+    assert len(supervisor) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_exit_handlers_run_in_exit_order(tmp_path):
+    supervisor = AgentSupervisor()
+    order: list[str] = []
+
+    async def on_exit(name):
+        await asyncio.sleep(0)
+        order.append(name)
+
+    slow = await supervisor.spawn(
+        _python("import time; time.sleep(0.5)"), cwd=tmp_path, env=dict(os.environ),
+        on_line=lambda line: None, on_exit=lambda a: on_exit("slow"),
+    )
+    fast = await supervisor.spawn(
+        _python("pass"), cwd=tmp_path, env=dict(os.environ),
+        on_line=lambda line: None, on_exit=lambda a: on_exit("fast"),
+    )
+    await asyncio.wait_for(asyncio.gather(slow.wait(), fast.wait()), timeout=10)
+    assert order == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_stop_kills_process_tree(tmp_path):
+    supervisor = AgentSupervisor()
+    lines: list[str] = []
+    exited = asyncio.Event()
+
+    # Parent spawns a long-running child and reports its PID
+    code = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    agent = await supervisor.spawn(
+        _python(code), cwd=tmp_path, env=dict(os.environ),
+        on_line=lines.append, on_exit=lambda a: exited.set(),
+    )
+    deadline = time.monotonic() + 10
+    while not lines and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    child_pid = int(lines[0])
+    assert psutil.pid_exists(child_pid)
+
+    result = await asyncio.wait_for(supervisor.stop(agent, timeout=1), timeout=20)
+    assert result.children_found == 1
+    assert exited.is_set()
+    assert agent.done()
+    assert not psutil.pid_exists(child_pid) or psutil.Process(child_pid).status() == psutil.STATUS_ZOMBIE
+
+
+@pytest.mark.asyncio
+async def test_many_agents_do_not_need_a_thread_each(tmp_path):
+    supervisor = AgentSupervisor()
+    baseline = threading.active_count()
+    release = tmp_path / "release"
+    code = (
+        "import os, time\n"
+        f"while not os.path.exists({str(release)!r}):\n"
+        "    print('tick', flush=True); time.sleep(0.05)\n"
+    )
+    agents = [
+        await supervisor.spawn(_python(code), cwd=tmp_path, env=dict(os.environ), on_line=lambda line: None)
+        for _ in range(20)
+    ]
+    await asyncio.sleep(0.5)
+    # Twenty agents streaming output; the old design had twenty reader threads
+    # here. Without pidfd support asyncio still waits on each child in a thread.
+    if hasattr(os, "pidfd_open") and sys.version_info < (3, 12):
+        assert threading.active_count() - baseline < 5
+    assert len(supervisor) == 20
+
+    release.touch()
+    await asyncio.wait_for(asyncio.gather(*(a.wait() for a in agents)), timeout=20)
+    assert len(supervisor) == 0
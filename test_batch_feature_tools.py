@@ -0,0 +1,90 @@
+"""
+Unit tests for the batch feature MCP tools.
+
+Tests feature_get_many, feature_claim_batch and feature_mark_passing_many,
+and that the agent reports one pass event per feature a batch applies to.
+"""
+
+import json
+
+import pytest
+
+from agent import _emit_feature_event
+from api.database import Feature, FeatureEvent
+from mcp_server import feature_mcp
+
+
+@pytest.fixture
+def db(feature_db):
+    """1 pending, 2 in progress, 3 passing, 4 waiting for human input."""
+    feature_db.add(*(
+        {"id": fid, "priority": fid, "in_progress": fid == 2, "passes": fid == 3, "needs_human_input": fid == 4}
+        for fid in range(1, 5)
+    ))
+    return feature_db
+
+
+def _state(db) -> dict[int, tuple[bool, bool]]:
+    session = db.session_maker()
+    try:
+        return {f.id: (f.passes, f.in_progress) for f in session.query(Feature).all()}
+    finally:
+        session.close()
+
+
+def _events(db) -> list[tuple[int, str]]:
+    session = db.session_maker()
+    try:
+        return [(e.feature_id, e.event_type) for e in session.query(FeatureEvent).order_by(FeatureEvent.id)]
+    finally:
+        session.close()
+
+
+def test_get_many(db):
+    result = json.loads(feature_mcp.feature_get_many([3, 1, 99, 3]))
+    assert [f["id"] for f in result["features"]] == [3, 1]
+    assert result["features"][0]["steps"] == ["s"]
+    assert result["not_found"] == [99]
+
+
+def test_claim_batch(db):
+    result = json.loads(feature_mcp.feature_claim_batch([2, 1, 3, 4, 99]))
+
+    assert [(f["id"], f["in_progress"], f["already_claimed"]) for f in result["features"]] == [
+        (2, True, True), (1, True, False),
+    ]
+    assert [e["feature_id"] for e in result["errors"]] == [3, 4, 99]
+    assert _state(db)[1] == (False, True)
+    assert _events(db) == [(1, "claimed")]
+
+
+def test_mark_passing_many(db):
+    result = json.loads(feature_mcp.feature_mark_passing_many([1, 2, 3, 99]))
+
+    assert result == {
+        "passed": [{"id": 1, "name": "f1"}, {"id": 2, "name": "f2"}],
+        "already_passing": [3],
+        "not_found": [99],
+    }
+    state = _state(db)
+    assert (state[1], state[2]) == ((True, False), (True, False))
+    assert _events(db) == [(1, "passed"), (2, "passed")]
+
+
+def test_agent_emits_pass_per_feature_but_no_batch_claims(db):
+    emitted = []
+
+    class Channel:
+        def emit(self, event_type, **fields):
+            emitted.append((event_type, fields["feature_id"]))
+
+    _emit_feature_event(
+        Channel(), "mcp__features__feature_claim_batch", {"feature_ids": [1, 2, 3]},
+        feature_mcp.feature_claim_batch([1, 2, 3]),
+    )
+    _emit_feature_event(
+        Channel(), "mcp__features__feature_mark_passing_many", {"feature_ids": [1, 3]},
+        feature_mcp.feature_mark_passing_many([1, 3]),
+    )
+    # Batch claims would leave the agent attributed to the last claimed ID
+    assert emitted == [("pass", 1)]
@@ -18,7 +18,9 @@ from client import (
     EXTRA_READ_PATHS_VAR,
     convert_model_for_vertex,
     get_extra_read_paths,
+    get_feature_mcp_config,
 )
+from mcp_server import FEATURE_MCP_TOKEN_ENV, FEATURE_MCP_URL_ENV
 
 
 class TestConvertModelForVertex(unittest.TestCase):
@@ -268,5 +270,44 @@ class TestExtraReadPathsBlocklist(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestGetFeatureMcpConfig(unittest.TestCase):
+    """Tests for get_feature_mcp_config function."""
+
+    def setUp(self):
+        """Save original env state."""
+        self._orig = {var: os.environ.get(var) for var in (FEATURE_MCP_URL_ENV, FEATURE_MCP_TOKEN_ENV)}
+
+    def tearDown(self):
+        """Restore original env state."""
+        for var, value in self._orig.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+    def test_stdio_server_without_shared_url(self):
+        """Without a shared server URL each agent starts its own stdio server."""
+        os.environ.pop(FEATURE_MCP_URL_ENV, None)
+        config = get_feature_mcp_config(Path("/tmp/project"))
+        self.assertEqual(config["args"], ["-m", "mcp_server.feature_mcp"])
+        self.assertEqual(config["env"]["PROJECT_DIR"], str(Path("/tmp/project").resolve()))
+
+    def test_empty_shared_url_means_stdio(self):
+        """An empty URL (shared server gone) falls back to stdio."""
+        os.environ[FEATURE_MCP_URL_ENV] = ""
+        self.assertIn("command", get_feature_mcp_config(Path("/tmp/project")))
+
+    def test_shared_server_over_http(self):
+        """A shared server URL is attached to over HTTP with the bearer token."""
+        os.environ[FEATURE_MCP_URL_ENV] = "http://127.0.0.1:4242/mcp"
+        os.environ[FEATURE_MCP_TOKEN_ENV] = "secret"
+        config = get_feature_mcp_config(Path("/tmp/project"))
+        self.assertEqual(config, {
+            "type": "http",
+            "url": "http://127.0.0.1:4242/mcp",
+            "headers": {"Authorization": "Bearer secret"},
+        })
+
+
 if __name__ == "__main__":
     unittest.main()
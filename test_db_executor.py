@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+DB Executor Latency Tests
+=========================
+
+Tests that feature and schedule endpoints run their SQLite work on the bounded DB executor,
+so a database lock held on one project neither blocks the event loop nor
+delays requests to another project.
+Run with: python -m pytest test_db_executor.py -v
+"""
+
+import asyncio
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import Feature, create_database, dispose_engine, get_database_path
+from server.routers import features as features_router
+from server.routers import schedules as schedules_router
+from server.schemas import FeatureCreate, ScheduleCreate, ScheduleUpdate
+from server.utils.db_executor import DB_EXECUTOR_PER_PROJECT, run_db
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    """Two projects with one feature each, registered under fake names."""
+    dirs = {}
+    for name in ("locked-project", "free-project"):
+        project_dir = tmp_path / name
+        project_dir.mkdir()
+        _, session_maker = create_database(project_dir)
+        session = session_maker()
+        try:
+            session.add(Feature(priority=1, category="c", name="f", description="d", steps=[]))
+            session.commit()
+        finally:
+            session.close()
+        dirs[name] = project_dir
+
+    monkeypatch.setattr(features_router, "_get_project_path", lambda name: dirs.get(name))
+    monkeypatch.setattr(schedules_router, "_get_project_path", lambda name: dirs.get(name))
+    yield dirs
+    for project_dir in dirs.values():
+        dispose_engine(project_dir)
+
+
+@pytest.mark.asyncio
+async def test_locked_project_does_not_delay_other_project(projects):
+    # Hold a write lock on one project's database. Write sessions begin with
+    # BEGIN IMMEDIATE, so writes to that project wait on busy_timeout.
+    lock_conn = sqlite3.connect(get_database_path(projects["locked-project"]), isolation_level=None)
+    lock_conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Reads use deferred transactions and don't wait for the lock
+        response = await asyncio.wait_for(features_router.list_features("locked-project"), timeout=5)
+        assert len(response.pending) == 1
+
+        # More blocked requests than the per-project limit, to show they can't
+        # take over the shared pool
+        blocked = [
+            asyncio.create_task(features_router.create_feature(
+                "locked-project",
+                FeatureCreate(category="c", name=f"new {i}", description="d", steps=["s"]),
+            ))
+            for i in range(DB_EXECUTOR_PER_PROJECT + 3)
+        ]
+        await asyncio.sleep(0.2)
+        assert not any(task.done() for task in blocked)
+
+        # Event loop stays responsive
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        assert time.perf_counter() - start < 0.5
+
+        # The other project is served promptly
+        start = time.perf_counter()
+        response = await asyncio.wait_for(features_router.list_features("free-project"), timeout=5)
+        elapsed = time.perf_counter() - start
+        assert len(response.pending) == 1
+        assert elapsed < 2.0, f"free project took {elapsed:.2f}s while another project was locked"
+    finally:
+        lock_conn.rollback()
+        lock_conn.close()
+
+    # Once the lock is released the queued requests complete normally
+    results = await asyncio.wait_for(asyncio.gather(*blocked), timeout=10)
+    assert sorted(r.name for r in results) == [f"new {i}" for i in range(DB_EXECUTOR_PER_PROJECT + 3)]
+
+
+@pytest.mark.asyncio
+async def test_schedule_endpoints_do_not_block_event_loop(projects):
+    lock_conn = sqlite3.connect(get_database_path(projects["locked-project"]), isolation_level=None)
+    lock_conn.execute("BEGIN IMMEDIATE")
+    try:
+        blocked = asyncio.create_task(schedules_router.create_schedule(
+            "locked-project", ScheduleCreate(start_time="09:00", duration_minutes=60, enabled=False),
+        ))
+        await asyncio.sleep(0.2)
+        assert not blocked.done()
+
+        # Event loop stays responsive, and reads don't wait for the lock
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        assert time.perf_counter() - start < 0.5
+        listed = await asyncio.wait_for(schedules_router.list_schedules("locked-project"), timeout=5)
+        assert listed.schedules == []
+    finally:
+        lock_conn.rollback()
+        lock_conn.close()
+
+    created = await asyncio.wait_for(blocked, timeout=10)
+    updated = await schedules_router.update_schedule(
+        "locked-project", created.id, ScheduleUpdate(duration_minutes=30),
+    )
+    assert updated.duration_minutes == 30
+    assert (await schedules_router.get_schedule("locked-project", created.id)).id == created.id
+    assert not (await schedules_router.get_next_scheduled_run("locked-project")).has_schedules
+    await schedules_router.delete_schedule("locked-project", created.id)
+    assert (await schedules_router.list_schedules("locked-project")).schedules == []
+
+
+@pytest.mark.asyncio
+async def test_run_db_propagates_exceptions():
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await run_db(boom, project="some-project")
@@ -0,0 +1,107 @@
+"""
+Unit tests for the feature_dependencies edge table.
+
+Tests that triggers keep the table in sync with Feature.dependencies, that
+the v1 -> v2 migration backfills it, and the indexed queries built on it.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from api.database import (
+    Feature,
+    atomic_transaction,
+    create_database,
+    dispose_engine,
+    get_blocking_dependencies,
+    get_database_path,
+    get_dependency_edges,
+    get_dependent_ids,
+    would_create_circular_dependency_db,
+)
+from api.dependency_resolver import would_create_circular_dependency
+
+
+class TestDependencyEdges(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = Path(self._tmp.name)
+        _, self.session_maker = create_database(self.project_dir)
+        # 1 <- 2 <- 3, 1 <- 4 (diamond closes at 5), 6 depends on a deleted feature
+        deps = {1: None, 2: [1], 3: [2], 4: [1], 5: [3, 4], 6: [99]}
+        with atomic_transaction(self.session_maker) as session:
+            for fid, dep_ids in deps.items():
+                session.add(Feature(id=fid, priority=fid, category="c", name=f"f{fid}",
+                                    description="d", steps=[], dependencies=dep_ids))
+
+    def tearDown(self):
+        dispose_engine(self.project_dir)
+        self._tmp.cleanup()
+
+    def _edges(self):
+        session = self.session_maker()
+        try:
+            return get_dependency_edges(session)
+        finally:
+            session.close()
+
+    def test_insert_update_delete_maintain_edges(self):
+        self.assertEqual(self._edges(), [(2, 1), (3, 2), (4, 1), (5, 3), (5, 4), (6, 99)])
+
+        with atomic_transaction(self.session_maker) as session:
+            session.get(Feature, 5).dependencies = [4]
+            session.delete(session.get(Feature, 3))
+        self.assertEqual(self._edges(), [(2, 1), (4, 1), (5, 4), (6, 99)])
+
+        with atomic_transaction(self.session_maker) as session:
+            session.get(Feature, 2).dependencies = None
+        self.assertEqual(self._edges(), [(4, 1), (5, 4), (6, 99)])
+
+    def test_migration_backfills_existing_rows(self):
+        dispose_engine(self.project_dir)
+        conn = sqlite3.connect(get_database_path(self.project_dir))
+        conn.executescript("""
+            DROP TRIGGER trg_feature_dependencies_insert;
+            DROP TRIGGER trg_feature_dependencies_update;
+            DROP TRIGGER trg_feature_dependencies_delete;
+            DROP TABLE feature_dependencies;
+            UPDATE features SET dependencies = '[1, "x", 1.5]' WHERE id = 4;
+            UPDATE features SET dependencies = 'not json' WHERE id = 6;
+            PRAGMA user_version = 1;
+        """)
+        conn.close()
+
+        _, self.session_maker = create_database(self.project_dir)
+        self.assertEqual(self._edges(), [(2, 1), (3, 2), (4, 1), (5, 3), (5, 4)])
+
+    def test_reverse_and_blocked_queries(self):
+        with atomic_transaction(self.session_maker) as session:
+            session.get(Feature, 1).passes = True
+
+        session = self.session_maker()
+        try:
+            self.assertEqual(get_dependent_ids(session, 1), [2, 4])
+            # 2 and 4 are unblocked by 1 passing; a deleted dependency blocks
+            self.assertEqual(get_blocking_dependencies(session), {3: [2], 5: [3, 4], 6: [99]})
+        finally:
+            session.close()
+
+    def test_cycle_detection_matches_in_memory(self):
+        session = self.session_maker()
+        try:
+            features = [f.to_dict() for f in session.query(Feature).all()]
+            for source in range(1, 7):
+                for target in range(1, 7):
+                    self.assertEqual(
+                        would_create_circular_dependency_db(session, source, target),
+                        would_create_circular_dependency(features, source, target),
+                        (source, target),
+                    )
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,11 +7,17 @@ Tests for the dependency resolver functions including cycle detection.
 Run with: python test_dependency_resolver.py
 """
 
+import os
+import random
+import struct
 import sys
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FuturesTimeoutError
 
+import pytest
+
 from api.dependency_resolver import (
     are_dependencies_satisfied,
     compute_scheduling_scores,
@@ -21,6 +27,23 @@ from api.dependency_resolver import (
     resolve_dependencies,
     would_create_circular_dependency,
 )
+from api.score_engine import (
+    DOWNSTREAM_DISTINCT,
+    DOWNSTREAM_PATHS,
+    SCORE_DOWNSTREAM_ENV,
+    FeatureCSR,
+    SchedulingScoreEngine,
+    _bfs_order_numpy,
+    _bfs_order_python,
+    _can_use_numpy,
+    _distinct_downstream_counts,
+    _downstream_counts,
+    _env_downstream_mode,
+    _scores_numpy,
+    _scores_python,
+    compute_scores,
+)
+from api.score_engine import np as numpy_module
 
 
 def test_compute_scheduling_scores_simple_chain():
@@ -270,6 +293,358 @@ def test_resolve_dependencies_with_cycle():
         return False
 
 
+def test_resolve_dependencies_reports_each_cycle():
+    """Test that every independent cycle is reported, and blocked features are not."""
+    print("\nTesting resolve_dependencies with several cycles:")
+
+    features = [
+        {"id": 1, "priority": 1, "dependencies": [2]},
+        {"id": 2, "priority": 2, "dependencies": [1]},
+        {"id": 3, "priority": 3, "dependencies": [3]},  # Self-reference
+        {"id": 4, "priority": 4, "dependencies": [1]},  # Behind a cycle, not in one
+        {"id": 5, "priority": 5, "dependencies": []},
+    ]
+
+    result = resolve_dependencies(features)
+    cycles = sorted(sorted(c) for c in result["circular_dependencies"])
+
+    if cycles != [[1, 2], [3]]:
+        print(f"  FAIL: Expected [[1, 2], [3]], got {cycles}")
+        return False
+    if len(result["ordered_features"]) != len(features):
+        print("  FAIL: Cyclic features should still be appended to the order")
+        return False
+    print(f"  PASS: Reported cycles {cycles}")
+    return True
+
+
+def test_resolve_dependencies_large_graph():
+    """Benchmark resolve_dependencies on 10k features with long cycles.
+
+    A single 2,000-feature cycle exceeds the default recursion limit, so this
+    also checks that cycle detection does not recurse per node.
+    """
+    print("\nTesting resolve_dependencies on 10k features:")
+
+    n = 10_000
+    features = []
+    for i in range(1, n + 1):
+        if i <= 2000:
+            # One long cycle: 1 -> 2 -> ... -> 2000 -> 1
+            deps = [i % 2000 + 1]
+        elif i <= 4000:
+            # 500 small cycles of 4
+            base = 2001 + ((i - 2001) // 4) * 4
+            deps = [base + (i - base + 1) % 4]
+        else:
+            # Acyclic remainder hanging off earlier features
+            deps = [i - 1, i // 2] if i > 4001 else []
+        features.append({"id": i, "priority": i % 10, "dependencies": deps, "passes": False})
+
+    start = time.time()
+    result = resolve_dependencies(features)
+    elapsed = time.time() - start
+
+    cycle_sizes = sorted(len(c) for c in result["circular_dependencies"])
+    print(f"  resolve_dependencies: {elapsed * 1000:.1f} ms for {n} features")
+
+    if cycle_sizes != [4] * 500 + [2000]:
+        print(f"  FAIL: Unexpected cycles ({len(cycle_sizes)} found)")
+        return False
+    if len(result["ordered_features"]) != n:
+        print(f"  FAIL: Expected {n} ordered features, got {len(result['ordered_features'])}")
+        return False
+    if elapsed > 2.0:
+        print(f"  FAIL: Took {elapsed:.2f}s (expected < 2s)")
+        return False
+    print("  PASS: Found 501 cycles without recursion")
+    return True
+
+
+def _reference_scheduling_scores(features: list[dict]) -> dict[int, float]:
+    """The original dict-based compute_scheduling_scores, kept as an oracle."""
+    if not features:
+        return {}
+    children: dict[int, list[int]] = {f["id"]: [] for f in features}
+    parents: dict[int, list[int]] = {f["id"]: [] for f in features}
+    for f in features:
+        for dep_id in (f.get("dependencies") or []):
+            if dep_id in children:
+                children[dep_id].append(f["id"])
+                parents[f["id"]].append(dep_id)
+    depths: dict[int, int] = {}
+    visited: set[int] = set()
+    roots = [f["id"] for f in features if not parents[f["id"]]]
+    bfs_queue: deque[tuple[int, int]] = deque((root, 0) for root in roots)
+    while bfs_queue:
+        node_id, depth = bfs_queue.popleft()
+        if node_id in visited:
+            continue
+        visited.add(node_id)
+        depths[node_id] = depth
+        for child_id in children[node_id]:
+            if child_id not in visited:
+                bfs_queue.append((child_id, depth + 1))
+    for f in features:
+        if f["id"] not in depths:
+            depths[f["id"]] = 0
+    downstream: dict[int, int] = {f["id"]: 0 for f in features}
+    for fid in sorted(depths.keys(), key=lambda x: -depths[x]):
+        for parent_id in parents[fid]:
+            downstream[parent_id] += 1 + downstream[fid]
+    max_depth = max(depths.values()) if depths else 0
+    max_downstream = max(downstream.values()) if downstream else 0
+    scores: dict[int, float] = {}
+    for f in features:
+        fid = f["id"]
+        unblock = downstream[fid] / max_downstream if max_downstream > 0 else 0
+        depth_score = 1 - (depths[fid] / max_depth) if max_depth > 0 else 1
+        priority = f.get("priority", 999)
+        priority_factor = (10 - min(priority, 10)) / 10
+        scores[fid] = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
+    return scores
+
+
+def _random_feature_graph(rng: random.Random, n: int) -> list[dict]:
+    """Random graph with diamonds, cycles, self-references and missing deps."""
+    ids = rng.sample(range(1, n * 3), n)
+    features = []
+    for fid in ids:
+        deps = [rng.choice(ids) for _ in range(rng.randint(0, 4))]
+        if rng.random() < 0.05:
+            deps.append(fid)  # Self-reference
+        if rng.random() < 0.05:
+            deps.append(n * 10 + fid)  # Missing dependency
+        features.append({"id": fid, "priority": rng.randint(-2, 15), "dependencies": deps})
+    return features
+
+
+def _same_bits(a: dict[int, float], b: dict[int, float]) -> bool:
+    return a.keys() == b.keys() and all(
+        struct.pack("<d", a[k]) == struct.pack("<d", b[k]) for k in a
+    )
+
+
+def test_score_engine_matches_reference():
+    """Test that the CSR score engine is bit-for-bit identical to the dict algorithm."""
+    print("\nTesting score engine against reference implementation:")
+
+    rng = random.Random(1234)
+    backends = [False] + ([True] if numpy_module is not None else [])
+    graphs = [_random_feature_graph(rng, n) for n in (1, 2, 5, 20, 200, 1500) for _ in range(5)]
+    # Layered DAG whose path counts overflow 64 bits
+    layered = [{"id": i, "priority": 1, "dependencies": [i - 3, i - 2, i - 1] if i > 3 else []}
+               for i in range(1, 200)]
+    graphs.append(layered)
+
+    for features in graphs:
+        expected = _reference_scheduling_scores(features)
+        for use_numpy in backends:
+            actual = compute_scores(features, use_numpy=use_numpy)
+            if not _same_bits(expected, actual):
+                print(f"  FAIL: Scores differ for {len(features)} features (numpy={use_numpy})")
+                return False
+
+    print(f"  PASS: {len(graphs)} graphs identical across backends {backends}")
+    return True
+
+
+def test_score_engine_memoizes_on_version():
+    """Test that scores are reused for the same version key and recomputed for a new one."""
+    print("\nTesting score engine memoization:")
+
+    engine = SchedulingScoreEngine(max_entries=2)
+    features = [
+        {"id": 1, "priority": 1, "dependencies": []},
+        {"id": 2, "priority": 2, "dependencies": [1]},
+    ]
+
+    first = engine.scores(features, version=1)
+    if engine.scores(features, version=1) is not first:
+        print("  FAIL: Same version should return the cached result")
+        return False
+
+    features[1]["dependencies"] = []
+    second = engine.scores(features, version=2)
+    if second == first or second != _reference_scheduling_scores(features):
+        print("  FAIL: New version should recompute scores")
+        return False
+
+    print("  PASS: Cached per version key")
+    return True
+
+
+def test_score_engine_large_graph():
+    """Benchmark compute_scheduling_scores against the reference on 10k features."""
+    print("\nTesting score engine on 10k features:")
+
+    features = _random_feature_graph(random.Random(99), 10_000)
+
+    start = time.perf_counter()
+    expected = _reference_scheduling_scores(features)
+    reference_time = time.perf_counter() - start
+
+    timings = {}
+    for use_numpy in [False] + ([True] if numpy_module is not None else []):
+        start = time.perf_counter()
+        actual = compute_scores(features, use_numpy=use_numpy)
+        timings["numpy" if use_numpy else "python"] = time.perf_counter() - start
+        if not _same_bits(expected, actual):
+            print(f"  FAIL: Scores differ (numpy={use_numpy})")
+            return False
+
+    engine = SchedulingScoreEngine()
+    engine.scores(features, version="v1")
+    start = time.perf_counter()
+    engine.scores(features, version="v1")
+    timings["memoized"] = time.perf_counter() - start
+
+    print(f"  reference: {reference_time * 1000:8.2f} ms")
+    for name, elapsed in timings.items():
+        print(f"  {name:9}: {elapsed * 1000:8.2f} ms")
+    print("  PASS: Identical scores")
+    return True
+
+
+def _layered_dag(layers: int, width: int) -> list[dict]:
+    """Layered DAG where every feature depends on every feature of the previous layer."""
+    features = []
+    for layer in range(layers):
+        for col in range(width):
+            fid = layer * width + col + 1
+            deps = [(layer - 1) * width + c + 1 for c in range(width)] if layer else []
+            features.append({"id": fid, "priority": col % 10, "dependencies": deps})
+    return features
+
+
+@pytest.mark.skipif(numpy_module is None, reason="numpy is not installed")
+def test_numpy_backend_matches_python():
+    """Test the NumPy BFS and score kernels against the pure-Python ones."""
+    print("\nTesting NumPy backend against pure Python:")
+    if numpy_module is None:  # run_all_tests() doesn't honor the skip marker
+        print("  SKIP: numpy is not installed")
+        return True
+
+    rng = random.Random(4321)
+    graphs = [_layered_dag(layers, width) for layers, width in ((1, 1), (3, 2), (8, 6), (40, 3))]
+    graphs += [_random_feature_graph(rng, n) for n in (1, 2, 5, 50, 500, 2000) for _ in range(3)]
+
+    compared = 0
+    for features in graphs:
+        csr = FeatureCSR(features)
+        depth, order = _bfs_order_python(csr)
+        assert _bfs_order_numpy(csr) == (depth, order), f"BFS differs for {len(features)} features"
+
+        for downstream in (_downstream_counts(csr, depth, order), _distinct_downstream_counts(csr)):
+            if not _can_use_numpy(csr, downstream):
+                continue  # compute_scores stays in Python for these
+            expected = _scores_python(csr, depth, downstream)
+            assert _same_bits(_scores_numpy(csr, depth, downstream), expected), (
+                f"Scores differ for {len(features)} features"
+            )
+            compared += 1
+
+        for mode in (DOWNSTREAM_PATHS, DOWNSTREAM_DISTINCT):
+            assert _same_bits(
+                compute_scores(features, use_numpy=True, downstream_mode=mode),
+                compute_scores(features, use_numpy=False, downstream_mode=mode),
+            ), f"compute_scores differs for {len(features)} features ({mode})"
+
+    print(f"  PASS: {len(graphs)} graphs, {compared} score comparisons identical")
+    return True
+
+
+def test_distinct_downstream_counts():
+    """Test distinct mode counts each transitive dependent once, including through cycles."""
+    print("\nTesting distinct downstream counts:")
+
+    # Diamond: 2 and 3 depend on 1, 4 depends on both. Paths mode counts 4 twice.
+    diamond = [
+        {"id": 1, "priority": 1, "dependencies": []},
+        {"id": 2, "priority": 1, "dependencies": [1]},
+        {"id": 3, "priority": 1, "dependencies": [1]},
+        {"id": 4, "priority": 1, "dependencies": [2, 3]},
+    ]
+    if _distinct_downstream_counts(FeatureCSR(diamond)) != [3, 1, 1, 0]:
+        print("  FAIL: Diamond root should have 3 distinct dependents")
+        return False
+
+    # Brute force reachability on random graphs with cycles and self-references
+    rng = random.Random(7)
+    for n in (1, 5, 30, 300):
+        features = _random_feature_graph(rng, n)
+        csr = FeatureCSR(features)
+        expected = []
+        for i in range(len(csr)):
+            seen: set[int] = set()
+            todo = [csr.child_indices[k] for k in range(csr.child_indptr[i], csr.child_indptr[i + 1])]
+            while todo:
+                j = todo.pop()
+                if j not in seen:
+                    seen.add(j)
+                    todo.extend(csr.child_indices[csr.child_indptr[j]:csr.child_indptr[j + 1]])
+            seen.discard(i)
+            expected.append(len(seen))
+        if _distinct_downstream_counts(csr) != expected:
+            print(f"  FAIL: Distinct counts wrong for random graph of {n}")
+            return False
+
+    print("  PASS: Distinct counts match brute-force reachability")
+    return True
+
+
+def test_downstream_mode_from_environment():
+    """Test an unknown AUTOFORGE_SCORE_DOWNSTREAM falls back to paths instead of failing every call."""
+    print("\nTesting downstream mode from the environment:")
+    saved = os.environ.get(SCORE_DOWNSTREAM_ENV)
+    try:
+        for value, expected in (("", DOWNSTREAM_PATHS), (" Distinct ", DOWNSTREAM_DISTINCT),
+                                ("bogus", DOWNSTREAM_PATHS)):
+            os.environ[SCORE_DOWNSTREAM_ENV] = value
+            if _env_downstream_mode() != expected:
+                print(f"  FAIL: {value!r} should select {expected!r}")
+                return False
+    finally:
+        if saved is None:
+            os.environ.pop(SCORE_DOWNSTREAM_ENV, None)
+        else:
+            os.environ[SCORE_DOWNSTREAM_ENV] = saved
+
+    print("  PASS: Unknown modes are ignored")
+    return True
+
+
+def test_distinct_mode_layered_dag_benchmark():
+    """Benchmark paths vs distinct downstream modes on a 5k-node layered DAG."""
+    print("\nTesting downstream modes on 5k-node layered DAG:")
+
+    features = _layered_dag(layers=500, width=10)
+    timings = {}
+    results = {}
+    for mode in (DOWNSTREAM_PATHS, DOWNSTREAM_DISTINCT):
+        start = time.perf_counter()
+        results[mode] = compute_scores(features, use_numpy=False, downstream_mode=mode)
+        timings[mode] = time.perf_counter() - start
+        print(f"  {mode:8}: {timings[mode] * 1000:8.1f} ms")
+
+    distinct = results[DOWNSTREAM_DISTINCT]
+    # Every layer but the last unblocks strictly more than the next one
+    layer_scores = [distinct[layer * 10 + 1] for layer in range(500)]
+    if not all(a > b for a, b in zip(layer_scores, layer_scores[1:])):
+        print("  FAIL: Distinct scores should decrease layer by layer")
+        return False
+
+    # Paths mode saturates: path counts grow 10x per layer, so every layer
+    # below the top few rounds to an unblock score of zero
+    paths = results[DOWNSTREAM_PATHS]
+    if paths[11] - paths[21] > 100:
+        print("  FAIL: Expected paths-mode unblock weighting to collapse")
+        return False
+
+    print("  PASS: Distinct mode keeps a meaningful unblock gradient")
+    return True
+
+
 def test_are_dependencies_satisfied():
     """Test dependency satisfaction checking."""
     print("\nTesting are_dependencies_satisfied:")
@@ -393,8 +768,17 @@ def run_all_tests():
         test_compute_scheduling_scores_complex_cycle,
         test_compute_scheduling_scores_diamond,
         test_compute_scheduling_scores_empty,
+        test_score_engine_matches_reference,
+        test_score_engine_memoizes_on_version,
+        test_score_engine_large_graph,
+        test_numpy_backend_matches_python,
+        test_distinct_downstream_counts,
+        test_downstream_mode_from_environment,
+        test_distinct_mode_layered_dag_benchmark,
         test_would_create_circular_dependency,
         test_resolve_dependencies_with_cycle,
+        test_resolve_dependencies_reports_each_cycle,
+        test_resolve_dependencies_large_graph,
         test_are_dependencies_satisfied,
         test_get_blocking_dependencies,
         test_get_ready_features,
@@ -0,0 +1,134 @@
+"""
+Unit tests for the bounded per-project engine cache.
+
+Tests LRU and idle eviction, the hit/miss counters, and that dispose_engine()
+waits for an engine that is still being created.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from api import database
+from api.database import create_database, create_read_only_database, dispose_engine
+from api.engine_cache import EngineCache, count_open_fds
+
+
+class TestEngineCache(unittest.TestCase):
+    def setUp(self):
+        self.disposed: list[str] = []
+        self.cache = EngineCache("test", self.disposed.append, max_size=2, idle_timeout=0)
+
+    def test_lru_eviction(self):
+        self.cache.get_or_create("a", lambda: "A")
+        self.cache.get_or_create("b", lambda: "B")
+        self.cache.get_or_create("a", lambda: "unused")  # a is now most recent
+        self.cache.get_or_create("c", lambda: "C")
+
+        self.assertEqual(self.disposed, ["B"])
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 3, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.25)
+
+    def test_idle_expiry(self):
+        self.cache.idle_timeout = 0.05
+        self.cache.get_or_create("a", lambda: "A")
+        time.sleep(0.1)
+        self.cache.get_or_create("b", lambda: "B")
+
+        self.assertEqual(self.disposed, ["A"])
+        self.assertEqual(self.cache.stats()["idle_evictions"], 1)
+
+        time.sleep(0.1)
+        self.assertEqual(self.cache.dispose_idle(), 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_dispose_waits_for_creation(self):
+        creating, release = threading.Event(), threading.Event()
+
+        def slow_factory():
+            creating.set()
+            release.wait(5)
+            return "A"
+
+        creator = threading.Thread(target=self.cache.get_or_create, args=("a", slow_factory))
+        creator.start()
+        creating.wait(5)
+
+        result = []
+        disposer = threading.Thread(target=lambda: result.append(self.cache.dispose("a")))
+        disposer.start()
+        time.sleep(0.05)
+        self.assertTrue(disposer.is_alive())  # Blocked until creation finishes
+
+        release.set()
+        creator.join(5)
+        disposer.join(5)
+        self.assertEqual(result, [True])
+        self.assertEqual(self.disposed, ["A"])
+        self.assertNotIn("a", self.cache)
+
+    def test_count_open_fds(self):
+        before = count_open_fds()
+        if before is None:
+            self.skipTest("FD count not available on this platform")
+        with tempfile.TemporaryFile():
+            self.assertEqual(count_open_fds(), before + 1)
+
+
+class TestDatabaseEngineCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.projects = [Path(self._tmp.name) / f"p{i}" for i in range(3)]
+        for project in self.projects:
+            project.mkdir()
+
+        self.disposed = []
+
+        def dispose(entry):
+            self.disposed.append(entry[0])
+            entry[0].dispose()
+
+        patchers = [
+            mock.patch.object(database, "_engine_cache", EngineCache("features", dispose, max_size=2)),
+            mock.patch.object(database, "_read_engine_cache", EngineCache("features-read", dispose, max_size=2)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        for project in self.projects:
+            dispose_engine(project)
+        self._tmp.cleanup()
+
+    def test_engines_are_bounded(self):
+        engines = [create_database(project)[0] for project in self.projects]
+
+        self.assertEqual(len(database._engine_cache), 2)
+        self.assertNotIn(self.projects[0].as_posix(), database._engine_cache)
+        self.assertEqual(self.disposed, [engines[0]])
+
+        # The evicted project reopens transparently
+        self.assertIsNot(create_database(self.projects[0])[0], engines[0])
+        self.assertEqual(database.engine_cache_stats()[0]["evictions"], 2)
+
+    def test_dispose_engine_removes_both_engines(self):
+        create_read_only_database(self.projects[0])
+        key = self.projects[0].as_posix()
+        self.assertIn(key, database._engine_cache)
+        self.assertIn(key, database._read_engine_cache)
+
+        self.assertTrue(dispose_engine(self.projects[0]))
+        self.assertNotIn(key, database._engine_cache)
+        self.assertNotIn(key, database._read_engine_cache)
+        self.assertFalse(dispose_engine(self.projects[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
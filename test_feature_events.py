@@ -0,0 +1,133 @@
+"""
+Unit tests for the feature change log (feature_events table).
+
+Tests that MCP mutations append events in the same transaction and that
+feature_events_since() tails them by cursor.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import func
+
+from api.database import (
+    FEATURE_EVENT_RETENTION,
+    FEATURE_EVENT_TRIM_INTERVAL,
+    Feature,
+    FeatureEvent,
+    atomic_transaction,
+    create_database,
+    dispose_engine,
+    feature_events_since,
+    feature_events_trimmed,
+    record_feature_events,
+)
+from mcp_server import feature_mcp
+
+
+class TestFeatureEvents(unittest.TestCase):
+    """Tests for change-log writes from the MCP server and the since() reader."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = Path(self._tmp.name)
+        self.engine, self.session_maker = create_database(self.project_dir)
+        self._orig_session_maker = feature_mcp._session_maker
+        feature_mcp._session_maker = self.session_maker
+
+    def tearDown(self):
+        feature_mcp._session_maker = self._orig_session_maker
+        dispose_engine(self.project_dir)
+        self._tmp.cleanup()
+
+    def _events(self, cursor=0):
+        session = self.session_maker()
+        try:
+            return feature_events_since(session, cursor)
+        finally:
+            session.close()
+
+    def test_mutations_append_events_in_order(self):
+        """Create, claim and pass each leave one event, in commit order."""
+        feature_mcp.feature_create_bulk([
+            {"category": "c", "name": "a", "description": "d", "steps": ["s"]},
+            {"category": "c", "name": "b", "description": "d", "steps": ["s"], "depends_on_indices": [0]},
+        ])
+        feature_mcp.feature_mark_in_progress(1)
+        feature_mcp.feature_mark_passing(1)
+
+        events, cursor = self._events()
+        self.assertEqual(
+            [(e["feature_id"], e["event_type"]) for e in events],
+            [(1, "created"), (2, "created"), (1, "claimed"), (1, "passed")],
+        )
+        self.assertEqual(cursor, events[-1]["id"])
+
+    def test_since_cursor_returns_only_new_events(self):
+        """Passing back the cursor yields only events committed afterwards."""
+        feature_mcp.feature_create("c", "a", "d", ["s"])
+        _, cursor = self._events()
+
+        self.assertEqual(self._events(cursor), ([], cursor))
+
+        feature_mcp.feature_skip(1)
+        events, new_cursor = self._events(cursor)
+        self.assertEqual([e["event_type"] for e in events], ["skipped"])
+        self.assertGreater(new_cursor, cursor)
+
+    def test_failed_mutation_records_nothing(self):
+        """A guarded update that matches no row must not emit an event."""
+        feature_mcp.feature_create("c", "a", "d", ["s"])
+        feature_mcp.feature_mark_passing(1)
+        _, cursor = self._events()
+
+        result = json.loads(feature_mcp.feature_mark_passing(1))
+        self.assertIn("error", result)
+        self.assertEqual(self._events(cursor), ([], cursor))
+
+    def test_rolled_back_transaction_drops_event(self):
+        """Events share the mutation's transaction, so a rollback removes both."""
+        from api.database import record_feature_event
+
+        session = self.session_maker()
+        try:
+            session.add(Feature(priority=1, category="c", name="a", description="d", steps=[]))
+            session.flush()
+            record_feature_event(session, 1, "created")
+            session.rollback()
+            self.assertEqual(session.query(FeatureEvent).count(), 0)
+        finally:
+            session.close()
+
+    def test_log_keeps_newest_events(self):
+        """Old events are trimmed; ids keep counting and readers learn about the gap."""
+        total = FEATURE_EVENT_RETENTION + FEATURE_EVENT_TRIM_INTERVAL + 5
+        with atomic_transaction(self.session_maker) as session:
+            record_feature_events(session, [{"feature_id": 1, "event_type": "updated"}] * total)
+
+        session = self.session_maker()
+        try:
+            count, oldest, newest = session.query(
+                func.count(FeatureEvent.id), func.min(FeatureEvent.id), func.max(FeatureEvent.id)
+            ).one()
+            self.assertEqual(newest, total)
+            self.assertLess(count, FEATURE_EVENT_RETENTION + FEATURE_EVENT_TRIM_INTERVAL)
+            self.assertGreaterEqual(count, FEATURE_EVENT_RETENTION)
+            self.assertEqual(count, newest - oldest + 1)
+
+            self.assertTrue(feature_events_trimmed(session, 0))
+            self.assertTrue(feature_events_trimmed(session, oldest - 2))
+            self.assertFalse(feature_events_trimmed(session, oldest - 1))
+            self.assertFalse(feature_events_trimmed(session, newest))
+        finally:
+            session.close()
+
+        feature_mcp.feature_create("c", "a", "d", ["s"])
+        events, _ = self._events(newest)
+        self.assertEqual([(e["id"], e["event_type"]) for e in events], [(newest + 1, "created")])
+
+
+if __name__ == "__main__":
+    unittest.main()
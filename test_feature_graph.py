@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Feature Graph Tests
+===================
+
+Tests the orchestrator's incrementally refreshed feature snapshot: changed
+rows are applied without a reload, the passing and ready sets follow status
+and dependency changes, and deletes are noticed even when an insert follows.
+Run with: python -m pytest test_feature_graph.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import Feature, atomic_transaction
+from api.feature_graph import FeatureGraph
+
+
+@pytest.fixture
+def db(feature_db):
+    """Write session maker and a loaded graph over features 1 <- 2 <- 3 (3 depends on 2, 2 on 1)."""
+    feature_db.add(*({"id": fid, "priority": fid, "steps": [], "dependencies": [fid - 1] if fid > 1 else None}
+                     for fid in (1, 2, 3)))
+    graph = FeatureGraph(feature_db.read_session_maker)
+    assert graph.refresh()
+    return feature_db.session_maker, graph
+
+
+def _execute(session_maker, sql: str) -> None:
+    with atomic_transaction(session_maker) as session:
+        session.execute(text(sql))
+
+
+def test_refresh_applies_only_changes(db):
+    session_maker, graph = db
+    assert graph.ready_ids == {1}
+    version = graph.version
+    assert not graph.refresh()
+    assert graph.version == version
+
+    _execute(session_maker, "UPDATE features SET name = 'renamed' WHERE id = 3")
+    snapshot_before = graph.get(1)
+    assert graph.refresh()
+    assert graph.version == version + 1
+    assert graph.get(3)["name"] == "renamed"
+    assert graph.get(1) is snapshot_before  # Unchanged rows are not re-read
+
+
+def test_ready_set_follows_status_and_dependencies(db):
+    session_maker, graph = db
+
+    _execute(session_maker, "UPDATE features SET in_progress = 1 WHERE id = 1")
+    graph.refresh()
+    assert (graph.ready_ids, graph.in_progress_ids) == (set(), {1})
+
+    _execute(session_maker, "UPDATE features SET passes = 1, in_progress = 0 WHERE id = 1")
+    graph.refresh()
+    assert (graph.passing_ids, graph.ready_ids) == ({1}, {2})
+
+    _execute(session_maker, "UPDATE features SET needs_human_input = 1 WHERE id = 2")
+    graph.refresh()
+    assert graph.ready_ids == set()
+
+    # Dropping 3's dependency makes it ready on its own
+    _execute(session_maker, "UPDATE features SET dependencies = NULL WHERE id = 3")
+    graph.refresh()
+    assert graph.ready_ids == {3}
+
+    _execute(session_maker, "UPDATE features SET passes = 0 WHERE id = 1")
+    graph.refresh()
+    assert (graph.passing_ids, graph.ready_ids) == (set(), {1, 3})
+
+
+def test_delete_then_insert_is_seen(db):
+    session_maker, graph = db
+    _execute(session_maker, "UPDATE features SET passes = 1 WHERE id IN (1, 2)")
+    _execute(session_maker, "UPDATE features SET name = 'last written' WHERE id = 3")
+    graph.refresh()
+    assert graph.ready_ids == {3}
+
+    # Same row count, and with MAX(change_seq) + 1 #4 would reuse the seq of #3
+    _execute(session_maker, "DELETE FROM features WHERE id = 3")
+    with atomic_transaction(session_maker) as session:
+        session.add(Feature(id=4, priority=4, category="c", name="f4", description="d", steps=[]))
+    assert graph.refresh()
+    assert graph.get(3) is None
+    assert graph.get(4)["name"] == "f4"
+    assert graph.ready_ids == {4}
+
+    # Later writes to the new row keep arriving incrementally
+    _execute(session_maker, "UPDATE features SET in_progress = 1 WHERE id = 4")
+    assert graph.refresh()
+    assert graph.in_progress_ids == {4}
+
+
+def test_delete_alone_is_seen(db):
+    session_maker, graph = db
+    _execute(session_maker, "DELETE FROM features WHERE id = 1")
+    assert graph.refresh()
+    assert len(graph) == 2
+    assert graph.get(1) is None
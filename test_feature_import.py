@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Bulk Feature Import Tests
+=========================
+
+Tests the core-level bulk insert behind feature_create_bulk and the REST
+bulk endpoints: chunked executemany inserts, index-based dependencies that
+cross chunk boundaries, all-or-nothing versus chunked commits, and the
+streamed NDJSON import endpoint.
+Run with: python -m pytest test_feature_import.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import Feature, FeatureEvent, create_database, dispose_engine, get_dependency_edges
+from api.feature_import import FeatureImportError, bulk_insert_features, iter_ndjson
+from server.routers import features as features_router
+
+
+def _item(i: int, **extra) -> dict:
+    return {"category": "c", "name": f"f{i}", "description": "d", "steps": ["s"], **extra}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    _, session_maker = create_database(project_dir)
+    session = session_maker()
+    try:
+        session.add(Feature(priority=10, category="c", name="existing", description="d", steps=[]))
+        session.commit()
+    finally:
+        session.close()
+    monkeypatch.setattr(features_router, "_get_project_path", lambda name: project_dir if name == "proj" else None)
+    yield project_dir, session_maker
+    dispose_engine(project_dir)
+
+
+def _features(session_maker) -> list[tuple]:
+    session = session_maker()
+    try:
+        return [(f.id, f.priority, f.name, f.dependencies) for f in session.query(Feature).order_by(Feature.id)]
+    finally:
+        session.close()
+
+
+def test_chunks_resolve_indices_across_boundaries(project):
+    _, session_maker = project
+    items = [_item(0), _item(1, depends_on_indices=[0]), _item(2), _item(3, depends_on_indices=[1, 2]),
+             _item(4, dependencies=[1], depends_on_indices=[3])]
+    session = session_maker()
+    try:
+        inserter = bulk_insert_features(session, items, chunk_size=2)
+        session.commit()
+        edges = get_dependency_edges(session)
+        events = session.query(FeatureEvent).count()
+    finally:
+        session.close()
+
+    assert inserter.ids == [2, 3, 4, 5, 6]
+    assert inserter.with_dependencies == 3
+    assert _features(session_maker)[1:] == [
+        (2, 11, "f0", None), (3, 12, "f1", [2]), (4, 13, "f2", None), (5, 14, "f3", [3, 4]), (6, 15, "f4", [1, 5]),
+    ]
+    # Triggers derived the edge table from the inserted JSON
+    assert edges == [(3, 2), (5, 3), (5, 4), (6, 1), (6, 5)]
+    assert events == 5
+
+
+def test_invalid_item_rolls_back_or_keeps_committed_chunks(project):
+    _, session_maker = project
+    items = [_item(0), _item(1), _item(2, depends_on_indices=[5])]
+
+    session = session_maker()
+    try:
+        with pytest.raises(FeatureImportError, match="forward reference") as exc:
+            bulk_insert_features(session, items, chunk_size=2)
+        session.rollback()
+        assert exc.value.created == 0
+        assert len(_features(session_maker)) == 1
+
+        with pytest.raises(FeatureImportError) as exc:
+            bulk_insert_features(session, items, chunk_size=2, commit_chunks=True)
+        assert (exc.value.index, exc.value.created) == (2, 2)
+        session.rollback()
+    finally:
+        session.close()
+    assert [f[2] for f in _features(session_maker)] == ["existing", "f0", "f1"]
+
+
+def test_iter_ndjson():
+    lines = [json.dumps(_item(0)), "", json.dumps(_item(1)) + "\n", "[1, 2]"]
+    decoded = iter_ndjson(lines)
+    assert [next(decoded)["name"], next(decoded)["name"]] == ["f0", "f1"]
+    with pytest.raises(FeatureImportError, match="index 2 is not a JSON object"):
+        next(decoded)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_import_endpoint(project, monkeypatch):
+    _, session_maker = project
+    monkeypatch.setattr("api.feature_import.BULK_INSERT_CHUNK_SIZE", 2)
+    app = FastAPI()
+    app.include_router(features_router.router)
+
+    body = "\n".join(json.dumps(_item(i, depends_on_indices=[i - 1] if i else [])) for i in range(5))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/projects/proj/features/import?starting_priority=1",
+                                     content=body, headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 200, response.text
+        assert response.json() == {"created": 5, "with_dependencies": 4}
+
+        # The first full chunk is committed; the line after it is broken
+        body = "\n".join(json.dumps(_item(i)) for i in range(3)) + "\n{broken"
+        response = await client.post("/api/projects/proj/features/import", content=body)
+        assert response.status_code == 400
+        assert "index 3 is not valid JSON" in response.json()["detail"]
+        assert "2 features were imported" in response.json()["detail"]
+
+    rows = _features(session_maker)
+    assert [(r[1], r[3]) for r in rows[1:6]] == [(1, None), (2, [2]), (3, [3]), (4, [4]), (5, [5])]
+    assert [r[2] for r in rows[6:]] == ["f0", "f1"]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Feature Projection and Pagination Tests
+=======================================
+
+Tests the fields= and cursor= parameters of the list-returning feature MCP
+tools and REST endpoints: projected features only carry the requested
+keys, and following next_cursor visits every item exactly once.
+Run with: python -m pytest test_feature_pages.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.feature_pages import PageRequestError, decode_cursor, encode_cursor, parse_fields
+from mcp_server import feature_mcp
+from server.routers import features as features_router
+
+
+@pytest.fixture
+def project(feature_db, monkeypatch):
+    """Nine features: 1-3 passing, 4-6 ready, 7-9 each blocked by the one before."""
+    feature_db.add(*(
+        {"id": fid, "priority": 10 - fid, "description": "d" * 100, "passes": fid <= 3,
+         "dependencies": [fid - 1] if fid >= 7 else None}
+        for fid in range(1, 10)
+    ))
+    project_dir = feature_db.project_dir
+    monkeypatch.setattr(features_router, "_get_project_path", lambda name: project_dir if name == "proj" else None)
+    return project_dir
+
+
+def _pages(tool, list_key: str, **kwargs) -> list[list[dict]]:
+    """Call a paged MCP tool until next_cursor runs out."""
+    pages, cursor = [], None
+    while True:
+        result = json.loads(tool(cursor=cursor, **kwargs))
+        pages.append(result[list_key])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_parse_fields_and_cursors():
+    assert parse_fields(None) is None
+    assert parse_fields("name, passes") == ["id", "name", "passes"]
+    with pytest.raises(PageRequestError, match="Unknown fields"):
+        parse_fields(["name", "secret"])
+
+    assert decode_cursor(encode_cursor((-1.5, 3, 7)), 3) == (-1.5, 3, 7)
+    for cursor in ("not-a-cursor", encode_cursor((1, 2))):
+        with pytest.raises(PageRequestError, match="Invalid cursor"):
+            decode_cursor(cursor, 3)
+
+
+def test_ready_pages_with_projection(project):
+    pages = _pages(feature_mcp.feature_get_ready, "features", limit=2, fields=["name"])
+
+    assert [len(page) for page in pages] == [2, 1]
+    assert sorted(f["id"] for page in pages for f in page) == [4, 5, 6]
+    assert all(set(f) == {"id", "name"} for page in pages for f in page)
+    assert "error" in json.loads(feature_mcp.feature_get_ready(fields=["bogus"]))
+
+
+def test_blocked_pages(project):
+    pages = _pages(feature_mcp.feature_get_blocked, "features", limit=2, fields=["passes"])
+
+    assert [[(f["id"], f["blocked_by"]) for f in page] for page in pages] == [[(7, [6]), (8, [7])], [(9, [8])]]
+    assert set(pages[0][0]) == {"id", "passes", "blocked_by"}
+
+
+def test_graph_pages_cover_whole_graph(project):
+    whole = json.loads(feature_mcp.feature_get_graph())
+    pages, edges, cursor = [], [], None
+    while True:
+        result = json.loads(feature_mcp.feature_get_graph(fields=["status"], limit=4, cursor=cursor))
+        pages.append(result["nodes"])
+        edges.extend(result["edges"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [4, 4, 1]
+    assert [n["status"] for page in pages for n in page] == [n["status"] for n in whole["nodes"]]
+    assert set(pages[0][0]) == {"id", "status"}
+    assert edges == whole["edges"] == [{"source": 6, "target": 7}, {"source": 7, "target": 8},
+                                       {"source": 8, "target": 9}]
+
+
+@pytest.mark.asyncio
+async def test_rest_list_and_graph_paging(project):
+    app = FastAPI()
+    app.include_router(features_router.router)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        full = (await client.get("/api/projects/proj/features")).json()
+        assert full["next_cursor"] is None
+        assert [f["id"] for f in full["pending"]] == [9, 8, 7, 6, 5, 4]
+
+        # Pages follow priority order across the status lists
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 4, "fields": "name,blocked"}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/projects/proj/features", params=params)
+            assert response.status_code == 200, response.text
+            page = response.json()
+            seen.extend(f for status in ("pending", "in_progress", "done", "needs_human_input")
+                        for f in page[status])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(f["id"] for f in seen) == list(range(1, 10))
+        assert all(set(f) == {"id", "name", "blocked"} for f in seen)
+        assert {f["id"] for f in seen if f["blocked"]} == {7, 8, 9}
+
+        response = await client.get("/api/projects/proj/features", params={"cursor": "garbage", "limit": 2})
+        assert response.status_code == 400
+        response = await client.get("/api/projects/proj/features", params={"fields": "nope"})
+        assert response.status_code == 400
+
+        graph = (await client.get("/api/projects/proj/features/graph", params={"limit": 5})).json()
+        assert [n["id"] for n in graph["nodes"]] == [1, 2, 3, 4, 5]
+        assert graph["edges"] == []
+        rest = (await client.get("/api/projects/proj/features/graph",
+                                 params={"cursor": graph["next_cursor"], "fields": "status"})).json()
+        assert rest["nodes"] == [{"id": 6, "status": "pending"}, {"id": 7, "status": "blocked"},
+                                 {"id": 8, "status": "blocked"}, {"id": 9, "status": "blocked"}]
+        assert len(rest["edges"]) == 3 and rest["next_cursor"] is None
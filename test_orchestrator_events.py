@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Event Loop Tests
+=============================
+
+Tests that the scheduling loop reacts to events (agent exit, database and
+drain file changes) instead of fixed sleeps, that freed coding slots are
+refilled within milliseconds, and that debug logging stays off the caller's
+path.
+Run with: python -m pytest test_orchestrator_events.py -v
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import parallel_orchestrator as po
+from api.database import Feature, FeatureEvent, create_database, dispose_engine
+from autoforge_paths import get_pause_drain_path
+from parallel_orchestrator import DebugLogger, ParallelOrchestrator, SlotIdleMetrics
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator over a project with four independent features."""
+    monkeypatch.setattr(po, "debug_log", po.DebugLogger(tmp_path / "orchestrator_debug.log"))
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    _, session_maker = create_database(project_dir)
+    session = session_maker()
+    try:
+        for i in range(1, 5):
+            session.add(Feature(priority=i, category="c", name=f"f{i}", description="d", steps=[]))
+        session.commit()
+    finally:
+        session.close()
+
+    orch = ParallelOrchestrator(project_dir, max_concurrency=1, yolo_mode=True, batch_size=1)
+    monkeypatch.setattr(orch, "_run_inter_session_cleanup", lambda: None)
+    yield orch
+    orch.cleanup()
+    dispose_engine(project_dir)
+
+
+def _bind_loop(orch: ParallelOrchestrator) -> None:
+    """Set up the wake event the way run_loop does."""
+    orch._wake_event = asyncio.Event()
+    orch._event_loop = asyncio.get_running_loop()
+
+
+def test_slot_idle_metrics():
+    metrics = SlotIdleMetrics()
+    metrics.slot_freed()
+    time.sleep(0.02)
+    metrics.slot_filled()
+    snap = metrics.snapshot()
+    assert snap["refills"] == 1
+    assert 15 <= snap["refill_latency_ms_max"] < 1000
+
+    # A slot freed while nothing is schedulable is starved, not a latency sample
+    metrics.slot_freed()
+    metrics.observe(1, has_work=False)
+    metrics.slot_filled()
+    assert metrics.snapshot()["refills"] == 1
+
+    # Idle slot-seconds only accumulate while work is waiting
+    metrics.observe(2, has_work=True)
+    time.sleep(0.05)
+    metrics.observe(0, has_work=True)
+    assert 0.09 <= metrics.snapshot()["idle_slot_seconds"] < 1.0
+
+
+@pytest.mark.asyncio
+async def test_agent_exit_wakes_loop_from_thread(orchestrator):
+    _bind_loop(orchestrator)
+    threading.Timer(0.05, orchestrator._signal_agent_completed).start()
+
+    start = time.perf_counter()
+    reasons = await orchestrator._wait_for_event(timeout=5)
+    assert reasons == {"agent_exited"}
+    assert time.perf_counter() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_drain_file_change_wakes_loop(orchestrator):
+    _bind_loop(orchestrator)
+    watcher = asyncio.create_task(orchestrator._watch_files())
+    try:
+        await asyncio.sleep(po.WATCH_INTERVAL)
+        drain = get_pause_drain_path(orchestrator.project_dir)
+        drain.parent.mkdir(parents=True, exist_ok=True)
+        drain.touch()
+
+        reasons = await orchestrator._wait_for_event(timeout=5)
+        assert "drain_changed" in reasons
+    finally:
+        watcher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_freed_slot_refilled_within_milliseconds(orchestrator, monkeypatch):
+    """One slot, four features, each fake agent passes its feature after 50 ms."""
+    spawned: list[int] = []
+
+    def fake_agent(feature_id: int) -> None:
+        time.sleep(0.05)
+        session = orchestrator.get_session()
+        try:
+            session.query(Feature).filter(Feature.id == feature_id).update({"passes": True})
+            session.commit()
+        finally:
+            session.close()
+        orchestrator._on_agent_complete(feature_id, 0, "coding", None)
+
+    async def fake_spawn(feature_id: int) -> tuple[bool, str]:
+        spawned.append(feature_id)
+        with orchestrator._lock:
+            orchestrator.running_coding_agents[feature_id] = object()
+        threading.Thread(target=fake_agent, args=(feature_id,), daemon=True).start()
+        return True, "started"
+
+    monkeypatch.setattr(orchestrator, "_spawn_coding_agent", fake_spawn)
+
+    start = time.perf_counter()
+    await asyncio.wait_for(orchestrator.run_loop(), timeout=10)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(spawned) == [1, 2, 3, 4]
+    metrics = orchestrator.get_status()["slot_metrics"]
+    assert metrics["refills"] == 3
+    assert metrics["refill_latency_ms_max"] < 100, metrics
+    # Four 50 ms agents back to back; fixed 0.5 s sleeps would take > 2 s
+    assert elapsed < 1.5
+
+
+@pytest.mark.asyncio
+async def test_claims_and_releases_recorded_as_events(orchestrator, monkeypatch):
+    async def launch_fails(*args):
+        raise OSError("no agent")
+
+    monkeypatch.setattr(orchestrator, "_launch_agent", launch_fails)
+    assert not (await orchestrator.start_feature(1))[0]
+    assert not (await orchestrator.start_feature_batch([2, 3]))[0]
+
+    async def fake_spawn(feature_id: int) -> tuple[bool, str]:
+        return True, "started"
+
+    monkeypatch.setattr(orchestrator, "_spawn_coding_agent", fake_spawn)
+    assert (await orchestrator.start_feature(4))[0]
+    orchestrator._on_agent_complete(4, 1, "coding", None)  # Agent failed
+
+    session = orchestrator.get_session()
+    try:
+        events = [(e.feature_id, e.event_type) for e in session.query(FeatureEvent).order_by(FeatureEvent.id)]
+    finally:
+        session.close()
+    assert events == [
+        (1, "claimed"), (1, "released"),
+        (2, "claimed"), (3, "claimed"), (2, "released"), (3, "released"),
+        (4, "claimed"), (4, "released"),
+    ]
+
+
+def test_debug_logger_writes_jsonl(tmp_path):
+    log = DebugLogger(tmp_path / "debug.jsonl")
+    log.start_session()
+    log.section("STARTUP")
+    log.log("SPAWN", "Started batch", feature_ids=[1, 2], path=Path("x"))
+    assert log.flush()
+
+    records = [json.loads(line) for line in (tmp_path / "debug.jsonl").read_text().splitlines()]
+    assert [r["category"] for r in records] == ["SESSION", "SECTION", "SPAWN"]
+    assert records[2]["data"] == {"feature_ids": [1, 2], "path": "x"}
+    log.close()
+
+
+def test_debug_logger_does_not_block_callers(tmp_path):
+    log = DebugLogger(tmp_path / "debug.jsonl")
+    start = time.perf_counter()
+    for i in range(20_000):
+        log.log("LOOP", f"Iteration {i}", running_coding_agents=[1, 2, 3])
+    enqueue_seconds = time.perf_counter() - start
+    assert log.flush(timeout=30)
+    log.close()
+
+    assert len((tmp_path / "debug.jsonl").read_text().splitlines()) == 20_000
+    # Queueing only: well under the cost of an open/write/close per call
+    assert enqueue_seconds < 1.0
+
+
+def test_debug_logger_stays_closed(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(po.atexit, "register", registered.append)
+    log = DebugLogger(tmp_path / "debug.jsonl")
+    log.log("LOOP", "before close")
+    log.close()
+
+    # Logging during shutdown neither restarts the writer nor re-registers
+    log.log("LOOP", "after close")
+    assert log._thread is None
+    assert registered == [log.close]
+    assert [json.loads(line)["message"] for line in (tmp_path / "debug.jsonl").read_text().splitlines()] == [
+        "before close",
+    ]
+
+
+def test_debug_logger_rotates_and_compresses(tmp_path):
+    path = tmp_path / "debug.jsonl"
+    log = DebugLogger(path, max_bytes=4096, backups=2)
+    for i in range(500):
+        log.log("LOOP", f"Iteration {i}", padding="x" * 50)
+        if i % 50 == 0:
+            log.flush()  # Several batches, so rotation happens more than once
+    log.close()
+
+    segments = sorted(p.name for p in tmp_path.iterdir())
+    assert segments == ["debug.jsonl", "debug.jsonl.1.gz", "debug.jsonl.2.gz"]
+    with gzip.open(tmp_path / "debug.jsonl.1.gz", "rt") as f:
+        assert all(json.loads(line)["category"] == "LOOP" for line in f)
+
+    # A new session starts a fresh file and keeps the old one as a segment
+    log = DebugLogger(path, max_bytes=0, backups=2)
+    log.start_session()
+    log.close()
+    assert [json.loads(line)["category"] for line in path.read_text().splitlines()] == ["SESSION"]
@@ -0,0 +1,68 @@
+"""
+Unit tests for read-only database sessions.
+
+Tests that sessions from create_read_only_database() read without waiting
+for a writer's BEGIN IMMEDIATE lock, see committed changes, and refuse
+writes.
+"""
+
+import json
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from api.database import Feature, create_read_only_database
+from mcp_server import feature_mcp
+
+
+@pytest.fixture
+def db(feature_db):
+    feature_db.add({"id": 1, "priority": 1})
+    return feature_db
+
+
+def test_cached_per_project(db):
+    assert create_read_only_database(db.project_dir)[1] is db.read_session_maker
+
+
+def test_read_does_not_wait_for_writer(db):
+    writer = db.session_maker()
+    try:
+        # Writer holds the write lock (BEGIN IMMEDIATE) with an uncommitted change
+        writer.query(Feature).filter(Feature.id == 1).update({"passes": True})
+
+        reader = db.read_session_maker()
+        try:
+            start = time.perf_counter()
+            feature = reader.query(Feature).filter(Feature.id == 1).one()
+            assert time.perf_counter() - start < 1.0
+            assert not feature.passes  # Last committed state
+        finally:
+            reader.close()
+        writer.commit()
+    finally:
+        writer.close()
+
+    reader = db.read_session_maker()
+    try:
+        assert reader.query(Feature).filter(Feature.id == 1).one().passes
+    finally:
+        reader.close()
+
+
+def test_writes_are_rejected(db):
+    session = db.read_session_maker()
+    try:
+        with pytest.raises(OperationalError):
+            session.query(Feature).filter(Feature.id == 1).update({"passes": True})
+    finally:
+        session.rollback()
+        session.close()
+
+
+def test_mcp_read_tools_use_read_only_sessions(db, monkeypatch):
+    monkeypatch.setattr(feature_mcp, "_session_maker", None)  # Any write-session use would raise
+    assert json.loads(feature_mcp.feature_get_stats())["total"] == 1
+    assert json.loads(feature_mcp.feature_get_by_id(1))["name"] == "f1"
+    assert json.loads(feature_mcp.feature_get_graph())["nodes"][0]["id"] == 1
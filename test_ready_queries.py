@@ -0,0 +1,152 @@
+"""
+Unit tests for the SQL-backed ready and blocked feature queries.
+
+Tests that feature_get_ready and feature_get_blocked match the in-memory
+dependency_resolver results and that the v2 -> v3 migration adds the partial
+indexes the ready query reads candidates through.
+"""
+
+import json
+import random
+import sqlite3
+
+import pytest
+
+from api.database import (
+    Feature,
+    atomic_transaction,
+    create_database,
+    dispose_engine,
+    get_database_path,
+    get_feature_graph_seq,
+    get_ready_feature_keys,
+)
+from api.dependency_resolver import get_blocked_features, get_ready_features
+from api.score_engine import score_engine
+from mcp_server import feature_mcp
+
+
+@pytest.fixture
+def db(feature_db):
+    """120 features with random priorities, statuses and dependencies."""
+    rng = random.Random(7)
+    features = []
+    for fid in range(1, 121):
+        deps = rng.sample(range(1, fid), k=min(fid - 1, rng.randint(0, 3))) if fid > 1 else None
+        if fid % 37 == 0:
+            deps = (deps or []) + [999]  # Deleted dependency
+        features.append({
+            "id": fid, "priority": rng.randint(1, 20), "steps": [], "dependencies": deps,
+            "passes": rng.random() < 0.4, "in_progress": rng.random() < 0.1,
+            "needs_human_input": rng.random() < 0.05,
+        })
+    feature_db.add(*features)
+    return feature_db
+
+
+def _feature_dicts(db) -> list[dict]:
+    session = db.session_maker()
+    try:
+        return [f.to_dict() for f in session.query(Feature).order_by(Feature.id).all()]
+    finally:
+        session.close()
+
+
+def _ready_ids() -> list[int]:
+    return [f["id"] for f in json.loads(feature_mcp.feature_get_ready())["features"]]
+
+
+def test_ready_matches_in_memory(db):
+    features = _feature_dicts(db)
+    # The MCP tool also skips features waiting for human input
+    expected = [
+        f for f in get_ready_features(features, limit=len(features))
+        if not f["needs_human_input"]
+    ]
+
+    result = json.loads(feature_mcp.feature_get_ready(limit=10))
+    assert [f["id"] for f in result["features"]] == [f["id"] for f in expected[:10]]
+    assert result["features"][0] == expected[0]
+    assert result["total_ready"] == len(expected)
+
+    # Second call between writes reuses the memoized scores
+    assert json.loads(feature_mcp.feature_get_ready(limit=10)) == result
+
+
+def test_memoized_scores_follow_delete_then_insert(db):
+    with atomic_transaction(db.session_maker) as session:
+        session.query(Feature).delete()
+    db.add({"id": 201, "priority": 5, "steps": []})
+    db.add({"id": 202, "priority": 5, "steps": []})
+    assert _ready_ids() == [201, 202]
+
+    # Same row count, and 203 would get the change_seq 202 had
+    with atomic_transaction(db.session_maker) as session:
+        session.query(Feature).filter(Feature.id == 202).delete()
+    db.add({"id": 203, "priority": 1, "steps": []})
+    # Scored afresh, 203's higher priority puts it first
+    assert _ready_ids() == [203, 201]
+
+
+def test_memoized_scores_survive_status_changes(db):
+    def graph_version():
+        session = db.read_session_maker()
+        try:
+            return (str(db.project_dir), get_feature_graph_seq(session))
+        finally:
+            session.close()
+
+    feature_mcp.feature_get_ready()
+    version = graph_version()
+    assert score_engine.cached(version) is not None
+
+    # Claims and passes leave the graph, and so the memoized scores, alone
+    feature_mcp.feature_mark_in_progress(_ready_ids()[0])
+    feature_mcp.feature_mark_passing(_ready_ids()[0])
+    assert graph_version() == version
+
+    with atomic_transaction(db.session_maker) as session:
+        session.query(Feature).filter(Feature.id == 1).update({"priority": 99})
+    assert graph_version() != version
+
+
+def test_blocked_matches_in_memory(db):
+    expected = get_blocked_features(_feature_dicts(db))
+
+    result = json.loads(feature_mcp.feature_get_blocked(limit=5))
+    assert [(f["id"], f["blocked_by"]) for f in result["features"]] == [
+        (f["id"], sorted(f["blocked_by"])) for f in expected[:5]
+    ]
+    assert result["total_blocked"] == len(expected)
+
+
+def test_migration_adds_partial_indexes(db):
+    session = db.session_maker()
+    try:
+        ready_keys = get_ready_feature_keys(session)
+    finally:
+        session.close()
+
+    dispose_engine(db.project_dir)
+    conn = sqlite3.connect(get_database_path(db.project_dir))
+    try:
+        conn.execute("DROP INDEX ix_features_ready")
+        conn.execute("DROP INDEX ix_features_not_passing")
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+    finally:
+        conn.close()
+
+    _, session_maker = create_database(db.project_dir)
+    session = session_maker()
+    try:
+        # INDEXED BY raises "no such index" unless the migration recreated it
+        assert get_ready_feature_keys(session) == ready_keys
+        plan = " ".join(str(row[-1]) for row in session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT f.id FROM features f INDEXED BY ix_features_ready "
+            "WHERE f.passes = 0 AND f.in_progress = 0 AND f.needs_human_input = 0 "
+            "ORDER BY f.priority, f.id"
+        ))
+        assert "TEMP B-TREE" not in plan  # Index order serves the ORDER BY
+    finally:
+        session.close()
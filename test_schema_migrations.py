@@ -0,0 +1,188 @@
+"""
+Unit tests for versioned schema migrations (PRAGMA user_version).
+
+Tests that a pre-versioning database is upgraded once, and that opening an
+up-to-date database skips the migration transaction entirely.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from api import database
+from api.database import (
+    SCHEMA_VERSION,
+    create_database,
+    dispose_engine,
+    get_database_path,
+)
+
+
+def _user_version(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return int(conn.execute("PRAGMA user_version").fetchone()[0])
+    finally:
+        conn.close()
+
+
+class TestSchemaMigrations(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = Path(self._tmp.name)
+        self.db_path = get_database_path(self.project_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self):
+        dispose_engine(self.project_dir)
+        self._tmp.cleanup()
+
+    def test_new_database_is_current(self):
+        create_database(self.project_dir)
+        self.assertEqual(_user_version(self.db_path), SCHEMA_VERSION)
+
+    def test_legacy_database_is_upgraded(self):
+        # Database from before versioning: early columns only, NULL flags
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            CREATE TABLE features (
+                id INTEGER PRIMARY KEY, priority INTEGER, category VARCHAR(100),
+                name VARCHAR(255), description TEXT, steps JSON, passes BOOLEAN
+            );
+            INSERT INTO features VALUES (1, 1, 'c', 'legacy', 'd', '[]', NULL);
+        """)
+        conn.close()
+
+        _, session_maker = create_database(self.project_dir)
+
+        self.assertEqual(_user_version(self.db_path), SCHEMA_VERSION)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(features)")}
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            passes, in_progress = conn.execute("SELECT passes, in_progress FROM features").fetchone()
+        finally:
+            conn.close()
+        self.assertTrue({"in_progress", "dependencies", "needs_human_input", "change_seq"} <= columns)
+        self.assertTrue({"feature_events", "schedules", "schedule_overrides"} <= tables)
+        self.assertEqual((passes, in_progress), (0, 0))
+
+    def test_current_database_skips_migrations(self):
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+
+        with mock.patch.object(database, "_migrate_schema", side_effect=AssertionError("migrated")):
+            create_database(self.project_dir)
+
+    def test_outdated_database_migrates_once(self):
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA user_version = 0")
+        conn.close()
+
+        with mock.patch.object(database, "_migrate_schema", wraps=database._migrate_schema) as migrate:
+            create_database(self.project_dir)
+            dispose_engine(self.project_dir)
+            create_database(self.project_dir)
+        self.assertEqual(migrate.call_count, 1)
+        self.assertEqual(_user_version(self.db_path), SCHEMA_VERSION)
+
+
+    def test_change_counter_continues_after_v3(self):
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        # A v3 database without the counter, holding change_seq values up to 7
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP TRIGGER trg_features_change_seq_insert;
+            DROP TRIGGER trg_features_change_seq_update;
+            DROP TRIGGER trg_features_change_seq_delete;
+            DROP TRIGGER trg_features_graph_seq_insert;
+            DROP TRIGGER trg_features_graph_seq_delete;
+            DROP TRIGGER trg_features_graph_seq_update;
+            DROP TABLE feature_change_counter;
+            INSERT INTO features (id, priority, category, name, description, steps, passes, in_progress,
+                                  needs_human_input, change_seq)
+            VALUES (1, 1, 'c', 'a', 'd', '[]', 0, 0, 0, 1), (2, 2, 'c', 'b', 'd', '[]', 0, 0, 0, 7);
+            PRAGMA user_version = 3;
+        """)
+        conn.close()
+
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM features WHERE id = 2")
+            conn.execute("INSERT INTO features (id, priority, category, name, description, steps, passes, "
+                         "in_progress, needs_human_input) VALUES (3, 3, 'c', 'c', 'd', '[]', 0, 0, 0)")
+            conn.commit()
+            change_seq = conn.execute("SELECT change_seq FROM features WHERE id = 3").fetchone()[0]
+            counter = conn.execute("SELECT seq FROM feature_change_counter").fetchone()[0]
+        finally:
+            conn.close()
+        # Seeded at 7, bumped by the delete and the insert
+        self.assertEqual((change_seq, counter), (9, 9))
+
+    def test_event_log_trimmed_after_v4(self):
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        # A v4 database whose change log grew without bound
+        total = database.FEATURE_EVENT_RETENTION + 10
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP TRIGGER trg_feature_events_retention")
+        conn.executemany(
+            "INSERT INTO feature_events (feature_id, event_type, created_at) VALUES (1, 'updated', '2026-01-01')",
+            [()] * total,
+        )
+        conn.execute("PRAGMA user_version = 4")
+        conn.commit()
+        conn.close()
+
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            oldest, count = conn.execute("SELECT MIN(id), COUNT(*) FROM feature_events").fetchone()
+            trigger = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_feature_events_retention'"
+            ).fetchone()
+        finally:
+            conn.close()
+        self.assertEqual((oldest, count), (11, database.FEATURE_EVENT_RETENTION))
+        self.assertIsNotNone(trigger)
+
+    def test_graph_counter_added_after_v5(self):
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        # A v5 database whose counter has no graph_seq column
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP TRIGGER trg_features_graph_seq_insert;
+            DROP TRIGGER trg_features_graph_seq_delete;
+            DROP TRIGGER trg_features_graph_seq_update;
+            ALTER TABLE feature_change_counter DROP COLUMN graph_seq;
+            PRAGMA user_version = 5;
+        """)
+        conn.close()
+
+        create_database(self.project_dir)
+        dispose_engine(self.project_dir)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("INSERT INTO features (id, priority, category, name, description, steps, passes, "
+                         "in_progress, needs_human_input) VALUES (1, 1, 'c', 'a', 'd', '[]', 0, 0, 0)")
+            conn.execute("UPDATE features SET in_progress = 1, priority = 1 WHERE id = 1")
+            conn.execute("UPDATE features SET dependencies = '[2]' WHERE id = 1")
+            conn.commit()
+            seq, graph_seq = conn.execute("SELECT seq, graph_seq FROM feature_change_counter").fetchone()
+        finally:
+            conn.close()
+        # Every write bumps seq; the unchanged priority doesn't bump graph_seq
+        self.assertEqual((seq, graph_seq), (3, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
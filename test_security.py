@@ -14,14 +14,19 @@ import tempfile
 from contextlib import contextmanager
 from pathlib import Path
 
+import security as security_module
 from security import (
+    SecurityPolicy,
     bash_security_hook,
     extract_commands,
     get_effective_commands,
     get_effective_pkill_processes,
+    get_security_policy,
+    is_command_allowed,
     load_org_config,
     load_project_commands,
     matches_pattern,
+    parse_command,
     validate_chmod_command,
     validate_init_script,
     validate_pkill_command,
@@ -988,6 +993,203 @@ def test_playwright_cli_validation():
     return passed, failed
 
 
+def test_compiled_policy():
+    """Test the compiled, cached SecurityPolicy used by the hook."""
+    print("\nTesting compiled security policy:\n")
+    passed = 0
+    failed = 0
+
+    # is_allowed() must agree with is_command_allowed() for every pattern kind
+    allowed = {"npm", "swift*", "./scripts/build.sh", "tests/run.test.js", "*", "go"}
+    policy = SecurityPolicy(allowed, set(), set())
+    commands = [
+        "npm", "npx", "swift", "swiftc", "swif", "build.sh", "./scripts/build.sh",
+        "scripts/build.sh", "/abs/scripts/build.sh", "test.sh", "run.test.js",
+        "/x/run.test.js", "*", "go", "gofmt", "anything", "",
+    ]
+    mismatches = [c for c in commands if policy.is_allowed(c) != is_command_allowed(c, allowed)]
+    if not mismatches:
+        print("  PASS: compiled matcher agrees with is_command_allowed")
+        passed += 1
+    else:
+        print(f"  FAIL: compiled matcher disagrees for {mismatches}")
+        failed += 1
+
+    with tempfile.TemporaryDirectory() as tmphome:
+        with tempfile.TemporaryDirectory() as tmpproject:
+            with temporary_home(tmphome):
+                project_dir = Path(tmpproject)
+                config_dir = project_dir / ".autoforge"
+                config_dir.mkdir()
+                config_path = config_dir / "allowed_commands.yaml"
+                config_path.write_text("version: 1\ncommands:\n  - name: swift\n")
+
+                # Cached: same object while config is unchanged
+                first = get_security_policy(project_dir)
+                second = get_security_policy(project_dir)
+                if first is second and first.is_allowed("swift"):
+                    print("  PASS: policy is cached while config is unchanged")
+                    passed += 1
+                else:
+                    print("  FAIL: policy should be cached and allow 'swift'")
+                    failed += 1
+
+                # Invalidated: editing the project config rebuilds the policy
+                config_path.write_text("version: 1\ncommands:\n  - name: cargo\n  - name: rustc\n")
+                third = get_security_policy(project_dir)
+                if third is not first and third.is_allowed("cargo") and not third.is_allowed("swift"):
+                    print("  PASS: config change invalidates cached policy")
+                    passed += 1
+                else:
+                    print("  FAIL: config change should rebuild the policy")
+                    failed += 1
+
+                # Invalidated: removing the config falls back to defaults
+                config_path.unlink()
+                fourth = get_security_policy(project_dir)
+                if not fourth.is_allowed("cargo"):
+                    print("  PASS: deleting config invalidates cached policy")
+                    passed += 1
+                else:
+                    print("  FAIL: deleted config should no longer allow 'cargo'")
+                    failed += 1
+
+    return passed, failed
+
+
+# Representative Bash commands issued by coding/testing agents
+AGENT_COMMAND_CORPUS = [
+    "ls -la",
+    "git status",
+    "git diff --stat",
+    "git add -A && git commit -m 'Implement feature #12: login form'",
+    "npm install",
+    "npm run build 2>&1 | tail -20",
+    "npm test -- --watchAll=false",
+    "cd frontend && npm run lint",
+    "cat package.json | grep version",
+    "grep -rn 'TODO' src/ | head -50",
+    "chmod +x init.sh && ./init.sh",
+    "pkill -f 'node server.js'; sleep 2; npm run dev &",
+    "playwright-cli open http://localhost:3000",
+    "playwright-cli -s=agent-1 snapshot",
+    "curl -s http://localhost:3000/api/health | head -c 200",
+    "mkdir -p src/components && touch src/components/Login.tsx",
+    "node -e \"console.log(require('./package.json').name)\"",
+    "ps aux | grep node",
+    "sleep 3 && curl -s localhost:5173",
+    "echo 'done'",
+]
+
+
+def _baseline_extract_commands(command_string: str) -> list[str]:
+    """extract_commands() as it ran before the parse cache: shlex per ';' piece."""
+    import shlex
+
+    commands = []
+    for piece in security_module._SEMICOLON_SPLIT_PATTERN.split(command_string):
+        piece = piece.strip()
+        if not piece:
+            continue
+        try:
+            tokens = tuple(shlex.split(piece))
+        except ValueError:
+            fallback_cmd = security_module._extract_primary_command(piece)
+            commands.extend([fallback_cmd] if fallback_cmd else [])
+            continue
+        commands.extend(security_module._commands_from_tokens(tokens))
+    return commands
+
+
+def _baseline_parse(command_string: str) -> None:
+    """The hook's parsing before parse_command(): each helper re-tokenizes.
+
+    extract_commands() on the whole command, split_command_segments(), then
+    for each command needing extra validation, extract_commands() on every
+    segment to find it and shlex.split() of that segment in the validator.
+    """
+    import shlex
+
+    segments = security_module.split_command_segments(command_string)
+    for cmd in _baseline_extract_commands(command_string):
+        if cmd in security_module.COMMANDS_NEEDING_EXTRA_VALIDATION:
+            segment = next((seg for seg in segments if cmd in _baseline_extract_commands(seg)), command_string)
+            try:
+                shlex.split(segment)
+            except ValueError:
+                pass
+
+
+def test_parse_cache_benchmark():
+    """Benchmark parsing against the pre-cache helpers, cold and warm, on an agent command corpus."""
+    import shlex
+    import time
+
+    print("\nBenchmarking single-pass parse:\n")
+    passed = 0
+    failed = 0
+    rounds = 50
+    calls = rounds * len(AGENT_COMMAND_CORPUS)
+
+    def clear_caches() -> None:
+        parse_command.cache_clear()
+        security_module._tokenize.cache_clear()
+        security_module._extract_commands_cached.cache_clear()
+
+    def time_parse(parse, clear_each_call: bool) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for cmd in AGENT_COMMAND_CORPUS:
+                if clear_each_call:
+                    clear_caches()
+                parse(cmd)
+        return time.perf_counter() - start
+
+    # Clearing costs the same in both timed runs, so it cancels out
+    baseline_time = time_parse(_baseline_parse, clear_each_call=True)
+    cold_time = time_parse(parse_command, clear_each_call=True)
+    warm_time = time_parse(parse_command, clear_each_call=False)
+    print(f"  baseline helpers: {baseline_time / calls * 1e6:8.1f} us/call")
+    print(f"  parse (miss):     {cold_time / calls * 1e6:8.1f} us/call "
+          f"({baseline_time / cold_time:.2f}x baseline)")
+    print(f"  parse (hit):      {warm_time / calls * 1e6:8.1f} us/call")
+
+    async def decide(clear_each_call: bool) -> list:
+        decisions = []
+        for cmd in AGENT_COMMAND_CORPUS:
+            if clear_each_call:
+                clear_caches()
+            input_data = {"tool_name": "Bash", "tool_input": {"command": cmd}}
+            decisions.append((await bash_security_hook(input_data)).get("decision"))
+        return decisions
+
+    if asyncio.run(decide(clear_each_call=True)) == asyncio.run(decide(clear_each_call=False)):
+        print("  PASS: cached parse yields identical decisions")
+        passed += 1
+    else:
+        print("  FAIL: cached parse changed hook decisions")
+        failed += 1
+
+    # parse_command must agree with the helpers it replaces
+    mismatched = []
+    for cmd in AGENT_COMMAND_CORPUS:
+        clear_caches()
+        parsed = parse_command(cmd)
+        if (list(parsed.commands) != _baseline_extract_commands(cmd)
+                or [seg.text for seg in parsed.segments] != security_module.split_command_segments(cmd)
+                or any(seg.argv != tuple(shlex.split(seg.text)) for seg in parsed.segments)
+                or any(list(seg.commands) != _baseline_extract_commands(seg.text) for seg in parsed.segments)):
+            mismatched.append(cmd)
+    if not mismatched:
+        print("  PASS: parse_command matches the baseline helpers")
+        passed += 1
+    else:
+        print(f"  FAIL: parse_command disagrees for {mismatched}")
+        failed += 1
+
+    return passed, failed
+
+
 def main():
     print("=" * 70)
     print("  SECURITY HOOK TESTS")
@@ -1061,6 +1263,16 @@ def main():
     passed += pw_passed
     failed += pw_failed
 
+    # Test compiled policy cache
+    policy_passed, policy_failed = test_compiled_policy()
+    passed += policy_passed
+    failed += policy_failed
+
+    # Benchmark single-pass parse cache
+    bench_passed, bench_failed = test_parse_cache_benchmark()
+    passed += bench_passed
+    failed += bench_failed
+
     # Commands that SHOULD be blocked
     # Note: blocklisted commands (sudo, shutdown, dd, aws) are tested in
     # test_blocklist_enforcement(). chmod validation is tested in
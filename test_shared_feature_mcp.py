@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Shared Feature MCP Server Tests
+===============================
+
+Tests the orchestrator-hosted feature MCP server: it starts once per project,
+serves several agents' sessions over streamable HTTP with one database
+connection pool, rejects requests without the bearer token, and keeps
+answering reads while a write waits for SQLite's write lock.
+Run with: python -m pytest test_shared_feature_mcp.py -v
+"""
+
+import asyncio
+import inspect
+import json
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from mcp.types import TextContent
+from sqlalchemy import event
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import parallel_orchestrator as po
+from api.database import Feature, create_database, dispose_engine, get_database_path
+from mcp_server import FEATURE_MCP_TOKEN_ENV, FEATURE_MCP_URL_ENV, feature_mcp
+from parallel_orchestrator import ParallelOrchestrator
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setattr(po, "debug_log", po.DebugLogger(tmp_path / "orchestrator_debug.jsonl"))
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    _, session_maker = create_database(project_dir)
+    session = session_maker()
+    try:
+        for i in range(1, 4):
+            session.add(Feature(priority=i, category="c", name=f"f{i}", description="d", steps=["s"]))
+        session.commit()
+    finally:
+        session.close()
+    orch = ParallelOrchestrator(project_dir)
+    yield orch
+    orch.cleanup()
+    dispose_engine(project_dir)
+
+
+async def _call_tool(url: str, token: str, name: str, arguments: dict | None = None) -> dict:
+    """One agent session: connect, call a tool, disconnect."""
+    async with httpx.AsyncClient(headers={"Authorization": f"Bearer {token}"}) as http_client:
+        async with streamable_http_client(url, http_client=http_client) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                result = await session.call_tool(name, arguments or {})
+                content = result.content[0]
+                assert isinstance(content, TextContent)
+                payload: dict = json.loads(content.text)
+                return payload
+
+
+@pytest.mark.asyncio
+async def test_agents_share_one_server(orchestrator):
+    await orchestrator._start_feature_mcp_server()
+    try:
+        url = orchestrator._feature_mcp_url
+        assert url and url.startswith("http://127.0.0.1:")
+        env = orchestrator._agent_session_env("coding-1")
+        assert env[FEATURE_MCP_URL_ENV] == url
+        token = env[FEATURE_MCP_TOKEN_ENV]
+
+        # Concurrent sessions (one per agent) claiming different features
+        claims = await asyncio.wait_for(asyncio.gather(*(
+            _call_tool(url, token, "feature_claim_and_get", {"feature_id": fid}) for fid in (1, 2, 3)
+        )), timeout=60)
+        assert sorted(c["id"] for c in claims) == [1, 2, 3]
+        assert all(c["in_progress"] for c in claims)
+
+        stats = await asyncio.wait_for(_call_tool(url, token, "feature_get_stats"), timeout=30)
+        assert stats["in_progress"] == 3 and stats["total"] == 3
+
+        # Without the token the server refuses the request
+        request = urllib.request.Request(url, data=b"{}", headers={"Content-Type": "application/json"})
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            await asyncio.to_thread(urllib.request.urlopen, request, timeout=10)
+        assert excinfo.value.code == 401
+    finally:
+        await orchestrator._stop_feature_mcp_server()
+
+    assert orchestrator._feature_mcp_url is None
+    # Agents started now get their own stdio server
+    assert orchestrator._agent_session_env()[FEATURE_MCP_URL_ENV] == ""
+
+
+def test_write_tools_are_marked():
+    """Every tool that opens a write session runs behind the shared server's write limiter."""
+    for tool in feature_mcp.mcp._tool_manager.list_tools():
+        source = inspect.getsource(tool.fn)
+        writes = "get_session()" in source or "atomic_transaction(" in source
+        assert writes == getattr(tool.fn, "_feature_writes", False), tool.name
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_do_not_overlap(feature_db, monkeypatch):
+    """With the shared server's dispatch, writes from many agents run one at a time."""
+    for tool in feature_mcp.mcp._tool_manager.list_tools():
+        monkeypatch.setattr(tool, "fn", tool.fn)
+        monkeypatch.setattr(tool, "is_async", tool.is_async)
+    feature_mcp.mcp.run_sync_tools_in_threads()
+
+    engine = feature_db.session_maker.kw["bind"]
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def on_checkout(*_):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+
+    def on_checkin(*_):
+        with lock:
+            active["now"] -= 1
+
+    def hold(conn):
+        time.sleep(0.01)  # A slower write, holding SQLite's write lock
+
+    # A write session holds a connection from before its BEGIN IMMEDIATE until
+    # it closes, so a write waiting for the lock counts as overlapping
+    listeners = [("checkout", on_checkout), ("checkin", on_checkin), ("begin", hold)]
+    for name, fn in listeners:
+        event.listen(engine, name, fn)
+    try:
+        await asyncio.wait_for(asyncio.gather(*(
+            feature_mcp.mcp.call_tool("feature_create", {
+                "category": "c", "name": f"n{i}", "description": "d", "steps": ["s"],
+            })
+            for i in range(20)
+        ), *(feature_mcp.mcp.call_tool("feature_get_stats", {}) for _ in range(20))), timeout=30)
+    finally:
+        for name, fn in listeners:
+            event.remove(engine, name, fn)
+
+    assert json.loads(feature_mcp.feature_get_stats())["total"] == 20
+    # Never two write transactions at once, so none waits in busy_timeout for another agent
+    assert active["max"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_waiting_for_lock_does_not_stall_reads(orchestrator):
+    await orchestrator._start_feature_mcp_server()
+    url = orchestrator._feature_mcp_url
+    token = orchestrator._agent_session_env()[FEATURE_MCP_TOKEN_ENV]
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_write_lock():
+        # Another process (say, the web UI) holding SQLite's write lock
+        conn = sqlite3.connect(get_database_path(orchestrator.project_dir), isolation_level=None)
+        conn.execute("BEGIN IMMEDIATE")
+        locked.set()
+        release.wait(timeout=10)
+        conn.execute("COMMIT")
+        conn.close()
+
+    holder = threading.Thread(target=hold_write_lock)
+    holder.start()
+    try:
+        await asyncio.to_thread(locked.wait)
+        write = asyncio.create_task(_call_tool(url, token, "feature_claim_and_get", {"feature_id": 1}))
+        await asyncio.sleep(0.5)  # The claim is now in busy_timeout
+
+        started = time.perf_counter()
+        stats = await asyncio.wait_for(_call_tool(url, token, "feature_get_stats"), timeout=5)
+        elapsed = time.perf_counter() - started
+        assert not write.done()
+        assert stats["total"] == 3
+        print(f"read while a write waits for the lock: {elapsed * 1000:.0f} ms")
+
+        release.set()
+        claim = await asyncio.wait_for(write, timeout=30)
+        assert claim["id"] == 1 and claim["in_progress"]
+    finally:
+        release.set()
+        holder.join()
+        await orchestrator._stop_feature_mcp_server()
+
+
+@pytest.mark.asyncio
+async def test_start_failure_falls_back(orchestrator, monkeypatch):
+    monkeypatch.setattr(po, "FEATURE_MCP_START_TIMEOUT", 0.01)
+    await orchestrator._start_feature_mcp_server()
+    assert orchestrator._feature_mcp is None
+    assert orchestrator._agent_session_env()[FEATURE_MCP_URL_ENV] == ""
@@ -0,0 +1,135 @@
+"""
+Unit tests for SQLite performance profiles.
+
+Tests that the selected profile's PRAGMAs and pool size reach the features,
+assistant and registry databases, and that per-project registry choices win
+over the global setting.
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import registry
+from api.database import create_database, create_read_only_database, dispose_engine
+from api.sqlite_profiles import (
+    DEFAULT_SQLITE_PROFILE,
+    SQLITE_PROFILE_ENV,
+    SQLITE_PROFILE_SETTING,
+    get_sqlite_profile,
+    resolve_sqlite_profile,
+)
+from server.services import assistant_database
+
+SYNCHRONOUS = {0: "OFF", 1: "NORMAL", 2: "FULL"}
+
+
+def _pragmas(engine) -> dict:
+    with engine.connect() as conn:
+        return {
+            "synchronous": SYNCHRONOUS[conn.exec_driver_sql("PRAGMA synchronous").scalar()],
+            "cache_size": conn.exec_driver_sql("PRAGMA cache_size").scalar(),
+            "wal_autocheckpoint": conn.exec_driver_sql("PRAGMA wal_autocheckpoint").scalar(),
+        }
+
+
+class TestSQLiteProfiles(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        self.project_dir = tmp / "project"
+        self.project_dir.mkdir()
+
+        config_dir = tmp / "config"
+        config_dir.mkdir()
+        patchers = [
+            mock.patch.object(registry, "get_config_dir", return_value=config_dir),
+            mock.patch.object(registry, "_engine", None),
+            mock.patch.object(registry, "_SessionLocal", None),
+            mock.patch.dict("os.environ", {SQLITE_PROFILE_ENV: ""}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        dispose_engine(self.project_dir)
+        assistant_database.dispose_engine(self.project_dir)
+        if registry._engine is not None:
+            registry._engine.dispose()
+        self._tmp.cleanup()
+
+    def test_default_profile_without_registry(self):
+        self.assertEqual(resolve_sqlite_profile(self.project_dir).name, DEFAULT_SQLITE_PROFILE)
+
+    def test_default_profile_keeps_sqlite_defaults(self):
+        # Nobody gets relaxed durability without choosing a profile
+        engine, _ = create_database(self.project_dir)
+        defaults = sqlite3.connect(":memory:")
+        try:
+            expected = {
+                "synchronous": SYNCHRONOUS[defaults.execute("PRAGMA synchronous").fetchone()[0]],
+                "cache_size": defaults.execute("PRAGMA cache_size").fetchone()[0],
+                "wal_autocheckpoint": defaults.execute("PRAGMA wal_autocheckpoint").fetchone()[0],
+            }
+        finally:
+            defaults.close()
+        self.assertEqual(_pragmas(engine), expected)
+
+    def test_features_database_uses_profile(self):
+        with mock.patch.dict("os.environ", {SQLITE_PROFILE_ENV: "throughput"}):
+            engine, _ = create_database(self.project_dir)
+            read_engine, _ = create_read_only_database(self.project_dir)
+
+        profile = get_sqlite_profile("throughput")
+        expected = {
+            "synchronous": "OFF",
+            "cache_size": profile.cache_size,
+            "wal_autocheckpoint": profile.wal_autocheckpoint,
+        }
+        self.assertEqual(_pragmas(engine), expected)
+        self.assertEqual(_pragmas(read_engine), expected)
+        self.assertEqual(engine.pool.size(), profile.pool_size)
+
+    def test_assistant_database_uses_profile(self):
+        assistant_database.get_db_path(self.project_dir).parent.mkdir(parents=True, exist_ok=True)
+        with mock.patch.dict("os.environ", {SQLITE_PROFILE_ENV: "safe"}):
+            engine = assistant_database.get_engine(self.project_dir)
+        self.assertEqual(_pragmas(engine)["synchronous"], "FULL")
+
+    def test_project_setting_overrides_global(self):
+        registry.register_project("proj", self.project_dir)
+        registry.set_setting(SQLITE_PROFILE_SETTING, "throughput")
+        self.assertEqual(resolve_sqlite_profile(self.project_dir).name, "throughput")
+
+        self.assertTrue(registry.set_project_sqlite_profile("proj", "safe"))
+        self.assertEqual(registry.get_project_sqlite_profile("proj"), "safe")
+        self.assertEqual(resolve_sqlite_profile(self.project_dir).name, "safe")
+
+        engine, _ = create_database(self.project_dir)
+        self.assertEqual(_pragmas(engine)["synchronous"], "FULL")
+
+        # Clearing the override falls back to the global setting
+        registry.set_project_sqlite_profile("proj", None)
+        self.assertEqual(resolve_sqlite_profile(self.project_dir).name, "throughput")
+
+    def test_unknown_profile(self):
+        registry.register_project("proj", self.project_dir)
+        with self.assertRaises(ValueError):
+            registry.set_project_sqlite_profile("proj", "turbo")
+
+        # Bad stored values are ignored instead of breaking the database open
+        registry.set_setting(SQLITE_PROFILE_SETTING, "turbo")
+        self.assertEqual(resolve_sqlite_profile(self.project_dir).name, DEFAULT_SQLITE_PROFILE)
+
+    def test_non_wal_keeps_full_sync(self):
+        pragmas = get_sqlite_profile("throughput").connection_pragmas(wal=False)
+        self.assertIn("PRAGMA synchronous=FULL", pragmas)
+        self.assertIn("PRAGMA mmap_size=0", pragmas)
+        self.assertFalse(any("wal_autocheckpoint" in p for p in pragmas))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Feature Tool Metrics Tests
+==========================
+
+Tests the per-tool metrics of the feature MCP server: every call through
+the server is timed, write lock waits and SQLite work are attributed to the
+running call, and separate server processes merge into one metrics file
+that the REST endpoint summarizes.
+Run with: python -m pytest test_tool_metrics.py -v
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import get_database_path
+from api.tool_metrics import ToolMetrics, load_tool_metrics, summarize_tool_metrics
+from autoforge_paths import get_tool_metrics_path
+from mcp_server import feature_mcp
+from server.routers import features as features_router
+
+
+@pytest.fixture
+def metrics():
+    # Created before the feature_db engines, as in init_database(), so connections count steps
+    return ToolMetrics()
+
+
+@pytest.fixture
+def project(metrics, feature_db, monkeypatch):
+    project_dir = feature_db.project_dir
+    metrics.path = get_tool_metrics_path(project_dir)
+    feature_db.add(*({"id": fid, "priority": fid} for fid in range(1, 201)))
+    monkeypatch.setattr(feature_mcp, "_tool_metrics", metrics)
+    monkeypatch.setattr(features_router, "_get_project_path", lambda name: project_dir if name == "proj" else None)
+    return project_dir, metrics
+
+
+def _call(name: str, **arguments) -> None:
+    asyncio.run(feature_mcp.mcp.call_tool(name, arguments))
+
+
+def test_calls_are_timed_with_errors_and_sqlite_work(project):
+    _, metrics = project
+    _call("feature_get_stats")
+    _call("feature_get_stats")
+    _call("feature_get_by_id", feature_id=999)
+    _call("feature_mark_passing", feature_id=1)
+
+    tools = metrics.snapshot()
+    assert {name: (t["calls"], t["errors"]) for name, t in tools.items()} == {
+        "feature_get_stats": (2, 0), "feature_get_by_id": (1, 1), "feature_mark_passing": (1, 0),
+    }
+    assert sum(tools["feature_get_stats"]["buckets"]) == 2
+    # Counting 200 rows takes far more SQLite work than one primary key lookup
+    assert tools["feature_get_stats"]["sqlite_steps"] > tools["feature_get_by_id"]["sqlite_steps"]
+    assert tools["feature_get_stats"]["transactions"] == 0
+    assert tools["feature_mark_passing"]["transactions"] >= 1
+
+
+def test_write_lock_wait_is_attributed_to_the_call(project):
+    project_dir, metrics = project
+    locked = threading.Event()
+
+    def hold_write_lock():
+        conn = sqlite3.connect(get_database_path(project_dir), isolation_level=None)
+        conn.execute("BEGIN IMMEDIATE")
+        locked.set()
+        time.sleep(0.3)
+        conn.execute("COMMIT")
+        conn.close()
+
+    holder = threading.Thread(target=hold_write_lock)
+    holder.start()
+    locked.wait()
+    _call("feature_mark_passing", feature_id=2)
+    holder.join()
+
+    stats = metrics.snapshot()["feature_mark_passing"]
+    assert stats["contended"] == 1
+    assert stats["lock_wait_ms"] >= 200
+    assert stats["total_ms"] >= stats["lock_wait_ms"]
+
+
+def test_processes_merge_into_one_file(project):
+    project_dir, metrics = project
+    _call("feature_get_stats")
+    assert metrics.flush()
+    assert metrics.snapshot() == {}
+
+    # A second server process for the same project
+    other = ToolMetrics(get_tool_metrics_path(project_dir))
+    with other.track("feature_get_stats"):
+        pass
+    with other.track("feature_claim_and_get") as call:
+        call.error = True
+    assert other.flush()
+
+    data = load_tool_metrics(get_tool_metrics_path(project_dir))
+    assert data["tools"]["feature_get_stats"]["calls"] == 2
+    assert data["tools"]["feature_claim_and_get"]["errors"] == 1
+    assert not get_tool_metrics_path(project_dir).with_name("tool_metrics.json.lock").exists()
+
+    summary = summarize_tool_metrics(data)
+    assert summary["calls"] == 3
+    stats = next(t for t in summary["tools"] if t["name"] == "feature_get_stats")
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(project):
+    project_dir, metrics = project
+    app = FastAPI()
+    app.include_router(features_router.router)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/projects/proj/features/metrics")
+        assert response.status_code == 200
+        assert response.json()["calls"] == 0
+
+        with metrics.track("feature_get_ready"):
+            pass
+        metrics.flush()
+        response = await client.get("/api/projects/proj/features/metrics")
+    body = response.json()
+    assert body["calls"] == 1
+    assert [t["name"] for t in body["tools"]] == ["feature_get_ready"]
+    assert json.loads(get_tool_metrics_path(project_dir).read_text())["since"] == body["since"]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+WebSocket Progress Publisher Tests
+==================================
+
+Tests that progress is computed once per project and fanned out to every
+subscribed WebSocket, driven by database changes rather than per-socket polling.
+Run with: python -m pytest test_websocket_progress.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from api.database import Feature, create_database, dispose_engine
+from server import websocket as ws_module
+from server.websocket import ConnectionManager
+
+
+class FakeWebSocket:
+    """Records messages sent through send_json."""
+
+    def __init__(self):
+        self.messages: list[dict] = []
+
+    async def send_json(self, message: dict):
+        self.messages.append(message)
+
+    def progress(self) -> list[dict]:
+        return [m for m in self.messages if m.get("type") == "progress"]
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    """Poll predicate until true or fail after timeout."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    _, session_maker = create_database(tmp_path)
+    session = session_maker()
+    try:
+        for i in range(1, 4):
+            session.add(Feature(priority=i, category="c", name=f"f{i}", description="d", steps=[]))
+        session.commit()
+    finally:
+        session.close()
+    yield tmp_path
+    dispose_engine(tmp_path)
+
+
+@pytest.fixture
+def counted_queries(monkeypatch):
+    """Wrap count_passing_tests to count how often the database is queried."""
+    calls = {"n": 0}
+    real = ws_module._get_count_passing_tests()
+
+    def counting(project_dir):
+        calls["n"] += 1
+        return real(project_dir)
+
+    monkeypatch.setattr(ws_module, "_count_passing_tests", counting)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_one_query_fans_out_to_all_subscribers(project_dir, counted_queries):
+    manager = ConnectionManager()
+    sockets = [FakeWebSocket() for _ in range(5)]
+    for sock in sockets:
+        await manager.connect(sock, "proj", project_dir)
+    try:
+        await _wait_for(lambda: all(s.progress() for s in sockets))
+        assert sockets[0].progress()[-1]["total"] == 3
+        # Five subscribers, one computation
+        assert counted_queries["n"] == 1
+    finally:
+        for sock in sockets:
+            await manager.disconnect(sock, "proj")
+
+
+@pytest.mark.asyncio
+async def test_database_change_triggers_broadcast(project_dir, counted_queries):
+    manager = ConnectionManager()
+    sock = FakeWebSocket()
+    await manager.connect(sock, "proj", project_dir)
+    try:
+        await _wait_for(lambda: sock.progress())
+
+        _, session_maker = create_database(project_dir)
+        session = session_maker()
+        try:
+            session.query(Feature).filter(Feature.id == 1).update({"passes": True})
+            session.commit()
+        finally:
+            session.close()
+        # notify() stands in for an orchestrator event; file watching may also fire
+        manager.notify_progress("proj")
+
+        await _wait_for(lambda: sock.progress()[-1]["passing"] == 1)
+        assert manager.get_progress("proj")["passing"] == 1
+    finally:
+        await manager.disconnect(sock, "proj")
+
+
+@pytest.mark.asyncio
+async def test_publisher_stops_after_last_disconnect(project_dir, counted_queries):
+    manager = ConnectionManager()
+    first, second = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(first, "proj", project_dir)
+    await manager.connect(second, "proj", project_dir)
+    await _wait_for(lambda: first.progress())
+
+    await manager.disconnect(first, "proj")
+    assert manager.get_progress("proj") is not None
+
+    await manager.disconnect(second, "proj")
+    assert manager.get_progress("proj") is None
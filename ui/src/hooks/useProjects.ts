@@ -306,6 +306,7 @@ const DEFAULT_SETTINGS: Settings = {
   api_base_url: null,
   api_has_auth_token: false,
   api_model: null,
+  sqlite_profile: 'safe',
 }
 
 const DEFAULT_PROVIDERS: ProvidersResponse = {
@@ -14,6 +14,7 @@ import type {
   FeatureBulkCreate,
   FeatureBulkCreateResponse,
   DependencyGraph,
+  ToolMetricsResponse,
   AgentStatusResponse,
   AgentActionResponse,
   SetupStatus,
@@ -236,6 +237,14 @@ export async function setDependencies(
   )
 }
 
+// ============================================================================
+// Feature Tool Metrics API
+// ============================================================================
+
+export async function getToolMetrics(projectName: string): Promise<ToolMetricsResponse> {
+  return fetchJSON(`/projects/${encodeURIComponent(projectName)}/features/metrics`)
+}
+
 // ============================================================================
 // Agent API
 // ============================================================================
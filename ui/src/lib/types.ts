@@ -116,6 +116,7 @@ export interface GraphEdge {
 export interface DependencyGraph {
   nodes: GraphNode[]
   edges: GraphEdge[]
+  next_cursor?: string | null
 }
 
 export interface FeatureListResponse {
@@ -123,6 +124,33 @@ export interface FeatureListResponse {
   in_progress: Feature[]
   done: Feature[]
   needs_human_input: Feature[]
+  next_cursor?: string | null
+}
+
+// Feature MCP tool latency and write lock waits
+export interface ToolMetricsEntry {
+  name: string
+  calls: number
+  errors: number
+  total_ms: number
+  avg_ms: number
+  p50_ms: number
+  p95_ms: number
+  max_ms: number
+  transactions: number
+  contended: number
+  lock_wait_ms: number
+  max_lock_wait_ms: number
+  sqlite_steps_avg: number
+}
+
+export interface ToolMetricsResponse {
+  since: string | null
+  updated_at: string | null
+  calls: number
+  total_ms: number
+  lock_wait_ms: number
+  tools: ToolMetricsEntry[]
 }
 
 export interface FeatureCreate {
@@ -584,6 +612,7 @@ export interface Settings {
   api_base_url: string | null
   api_has_auth_token: boolean
   api_model: string | null
+  sqlite_profile: string  // safe | balanced | throughput
 }
 
 export interface SettingsUpdate {
@@ -596,10 +625,12 @@ export interface SettingsUpdate {
   api_base_url?: string
   api_auth_token?: string
   api_model?: string
+  sqlite_profile?: string
 }
 
 export interface ProjectSettingsUpdate {
   default_concurrency?: number
+  sqlite_profile?: string  // '' follows the global setting
 }
 
 // ============================================================================